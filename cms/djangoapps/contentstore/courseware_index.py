@@ -1,12 +1,16 @@
 """ Code to allow module store to interface with courseware index """
 
 
+import hashlib
+import json
 import logging
 import re
+import zlib
 from abc import ABCMeta, abstractmethod
 from datetime import timedelta
 
 from django.conf import settings
+from django.core.cache import cache
 from django.urls import resolve
 from django.utils.translation import ugettext as _
 from django.utils.translation import ugettext_lazy
@@ -30,15 +34,20 @@ REINDEX_AGE = timedelta(0, 60)  # 60 seconds
 
 log = logging.getLogger('edx.modulestore')
 
+# Compiled once as they are applied to the content of every html item indexed
+WHITESPACE_PATTERN = re.compile(r"(\s|&nbsp;|//)+")
+CDATA_PATTERN = re.compile(r"<!\[CDATA\[.*\]\]>")
+COMMENT_PATTERN = re.compile(r"<!--.*-->")
+
 
 def strip_html_content_to_text(html_content):
     """ Gets only the textual part for html content - useful for building text to be searched """
     # Removing HTML-encoded non-breaking space characters
-    text_content = re.sub(r"(\s|&nbsp;|//)+", " ", html_to_text(html_content))
+    text_content = WHITESPACE_PATTERN.sub(" ", html_to_text(html_content))
     # Removing HTML CDATA
-    text_content = re.sub(r"<!\[CDATA\[.*\]\]>", "", text_content)
+    text_content = CDATA_PATTERN.sub("", text_content)
     # Removing HTML comments
-    text_content = re.sub(r"<!--.*-->", "", text_content)
+    text_content = COMMENT_PATTERN.sub("", text_content)
 
     return text_content
 
@@ -50,6 +59,13 @@ def indexing_is_enabled():
     return settings.FEATURES.get('ENABLE_COURSEWARE_INDEX', False)
 
 
+def incremental_indexing_is_enabled():
+    """
+    Checks to see if publishes only index the items changed since the last indexing
+    """
+    return settings.FEATURES.get('ENABLE_INCREMENTAL_COURSEWARE_INDEX', False)
+
+
 class SearchIndexingError(Exception):
     """ Indicates some error(s) occured during indexing """
 
@@ -68,6 +84,8 @@ class SearchIndexerBase(object):
     INDEX_NAME = None
     DOCUMENT_TYPE = None
     ENABLE_INDEXING_KEY = None
+    # The number of items sent to the search engine with each bulk index request
+    INDEX_BATCH_SIZE = 500
 
     INDEX_EVENT = {
         'name': None,
@@ -116,7 +134,56 @@ class SearchIndexerBase(object):
         searcher.remove(cls.DOCUMENT_TYPE, result_ids)
 
     @classmethod
-    def index(cls, modulestore, structure_key, triggered_at=None, reindex_age=REINDEX_AGE):
+    def _index_items(cls, searcher, items_index):
+        """
+        Adds the items index dictionaries to the index, INDEX_BATCH_SIZE items per bulk request
+        """
+        for start in range(0, max(len(items_index), 1), cls.INDEX_BATCH_SIZE):
+            searcher.index(cls.DOCUMENT_TYPE, items_index[start:start + cls.INDEX_BATCH_SIZE])
+
+    @classmethod
+    def _snapshot_cache_key(cls, structure_key):
+        """ Cache key of the index snapshot of the given structure """
+        return u'{}.snapshot.{}'.format(cls.INDEX_NAME, text_type(structure_key))
+
+    @classmethod
+    def _get_index_snapshot(cls, structure_key):
+        """
+        Returns the snapshot stored by the last full or incremental indexing of
+        the structure: a dictionary mapping the id of each indexed item to the
+        fingerprint of its index document, or None if there is none.
+        """
+        data = cache.get(cls._snapshot_cache_key(structure_key))
+        if data is None:
+            return None
+        return json.loads(zlib.decompress(data).decode('utf-8'))
+
+    @classmethod
+    def _set_index_snapshot(cls, structure_key, snapshot):
+        """ Stores the index snapshot of the structure, compressed as snapshots of large courses are large """
+        data = zlib.compress(json.dumps(snapshot).encode('utf-8'))
+        cache.set(cls._snapshot_cache_key(structure_key), data, None)
+
+    @classmethod
+    def _delete_index_snapshot(cls, structure_key):
+        """ Deletes the index snapshot of the structure, so that the next incremental indexing is a full one """
+        cache.delete(cls._snapshot_cache_key(structure_key))
+
+    @classmethod
+    def _index_fingerprint(cls, item, content_groups, supplemental_fields):
+        """
+        Returns a fingerprint of what the index document of the item is built
+        from, which changes whenever the item, its start date, its content
+        groups or the names of its ancestors do.
+        """
+        return hashlib.md5(json.dumps(
+            [item.edited_on, item.start, content_groups, supplemental_fields],
+            default=text_type,
+            sort_keys=True
+        ).encode('utf-8')).hexdigest()
+
+    @classmethod
+    def index(cls, modulestore, structure_key, triggered_at=None, reindex_age=REINDEX_AGE, incremental=False):
         """
         Process course for indexing
 
@@ -132,6 +199,12 @@ class SearchIndexerBase(object):
             which items may need to be removed from the index
             If None, then a full reindex takes place
 
+        incremental (bool) - only index the items whose index documents have
+            changed since the last full or incremental indexing of the structure,
+            and remove those no longer in it, as found by comparing the published
+            structure with the snapshot stored by that indexing.  If there is no
+            snapshot, a full reindex takes place.
+
         Returns:
         Number of items that have been added to the index
         """
@@ -159,6 +232,12 @@ class SearchIndexerBase(object):
         # instead of per item index API call.
         items_index = []
 
+        # snapshot maps the id of each item with an index document to the fingerprint of
+        # that document; previous_snapshot is the one stored by the last indexing.
+        snapshot = {}
+        snapshot_stored = False
+        previous_snapshot = cls._get_index_snapshot(structure_key) if incremental else None
+
         def get_item_location(item):
             """
             Gets the version agnostic item location
@@ -180,10 +259,13 @@ class SearchIndexerBase(object):
             Returns:
             item_content_groups - content groups assigned to indexed item
             """
+            item_id = text_type(cls._id_modifier(item.scope_ids.usage_id))
+            previous_fingerprint = previous_snapshot.get(item_id) if previous_snapshot else None
             is_indexable = hasattr(item, "index_dictionary")
-            item_index_dictionary = item.index_dictionary() if is_indexable else None
+            # the index dictionary of items indexed before is only built if their fingerprint has changed
+            item_index_dictionary = item.index_dictionary() if is_indexable and not previous_fingerprint else None
             # if it's not indexable and it does not have children, then ignore
-            if not item_index_dictionary and not item.has_children:
+            if not item_index_dictionary and not previous_fingerprint and not item.has_children:
                 return
 
             item_content_groups = None
@@ -208,7 +290,6 @@ class SearchIndexerBase(object):
                 item_location = get_item_location(item)
                 item_content_groups = groups_usage_info.get(text_type(item_location), None)
 
-            item_id = text_type(cls._id_modifier(item.scope_ids.usage_id))
             indexed_items.add(item_id)
             if item.has_children:
                 # determine if it's okay to skip adding the children herein based upon how recently any may have changed
@@ -227,20 +308,34 @@ class SearchIndexerBase(object):
                 if None in children_groups_usage:
                     item_content_groups = None
 
-            if skip_index or not item_index_dictionary:
+            if skip_index or not (item_index_dictionary or previous_fingerprint):
                 return
 
             item_index = {}
             # if it has something to add to the index, then add it
             try:
+                content_groups = item_content_groups if item_content_groups else None
+                supplemental_fields = cls.supplemental_fields(item)
+                fingerprint = cls._index_fingerprint(item, content_groups, supplemental_fields)
+                if fingerprint == previous_fingerprint:
+                    snapshot[item_id] = fingerprint
+                    return item_content_groups
+                if item_index_dictionary is None:
+                    item_index_dictionary = item.index_dictionary()
+                    if not item_index_dictionary:
+                        # its document is to be removed from the index
+                        indexed_items.discard(item_id)
+                        return
+
                 item_index.update(location_info)
                 item_index.update(item_index_dictionary)
                 item_index['id'] = item_id
                 if item.start:
                     item_index['start_date'] = item.start
-                item_index['content_groups'] = item_content_groups if item_content_groups else None
-                item_index.update(cls.supplemental_fields(item))
+                item_index['content_groups'] = content_groups
+                item_index.update(supplemental_fields)
                 items_index.append(item_index)
+                snapshot[item_id] = fingerprint
                 indexed_count["count"] += 1
                 return item_content_groups
             except Exception as err:  # pylint: disable=broad-except
@@ -259,8 +354,17 @@ class SearchIndexerBase(object):
                 # Now index the content
                 for item in structure.get_children():
                     prepare_item_index(item, groups_usage_info=groups_usage_info)
-                searcher.index(cls.DOCUMENT_TYPE, items_index)
-                cls.remove_deleted_items(searcher, structure_key, indexed_items)
+                cls._index_items(searcher, items_index)
+                if previous_snapshot is None:
+                    cls.remove_deleted_items(searcher, structure_key, indexed_items)
+                else:
+                    removed_items = set(previous_snapshot) - indexed_items
+                    if removed_items:
+                        searcher.remove(cls.DOCUMENT_TYPE, list(removed_items))
+                # Items skipped for their age have no fingerprint, so only complete walks leave a snapshot.
+                if triggered_at is None and not error_list:
+                    cls._set_index_snapshot(structure_key, snapshot)
+                    snapshot_stored = True
         except Exception as err:  # pylint: disable=broad-except
             # broad exception so that index operation does not prevent the rest of the application from working
             log.exception(
@@ -270,6 +374,11 @@ class SearchIndexerBase(object):
             )
             error_list.append(_('General indexing error occurred'))
 
+        if not snapshot_stored:
+            # Items this run indexed may be missing from the previous snapshot, which
+            # then wouldn't find them to remove from the index once they are deleted.
+            cls._delete_index_snapshot(structure_key)
+
         if error_list:
             raise SearchIndexingError('Error(s) present during indexing', error_list)
 
@@ -0,0 +1,180 @@
+""" Management command to rebuild the search index of all courses and libraries in parallel """
+
+
+import io
+import logging
+import multiprocessing
+import os
+import time
+from textwrap import dedent
+
+from django.core.management import BaseCommand, CommandError
+from django.db import connections
+from opaque_keys.edx.keys import CourseKey
+from opaque_keys.edx.locator import LibraryLocator
+
+from contentstore.courseware_index import CoursewareSearchIndexer, LibrarySearchIndexer
+from xmodule.modulestore.django import clear_existing_modulestores, modulestore
+
+log = logging.getLogger(__name__)
+
+
+def _init_worker(batch_size):
+    """
+    Sets up a worker process: connections inherited from the parent process
+    can't be shared with it, so they are reopened on first use.
+    """
+    connections.close_all()
+    clear_existing_modulestores()
+    _set_batch_size(batch_size)
+
+
+def _set_batch_size(batch_size):
+    """ Sets the number of items sent to the search engine with each bulk index request """
+    if batch_size:
+        CoursewareSearchIndexer.INDEX_BATCH_SIZE = batch_size
+        LibrarySearchIndexer.INDEX_BATCH_SIZE = batch_size
+
+
+def _reindex_structure(structure_id):
+    """
+    Reindexes the course or library with the given key string.
+
+    Returns (structure_id, indexed_count, error), error being the message of
+    the exception raised by the indexing if any.
+    """
+    structure_key = CourseKey.from_string(structure_id)
+    try:
+        if isinstance(structure_key, LibraryLocator):
+            indexed_count = LibrarySearchIndexer.do_library_reindex(modulestore(), structure_key)
+        else:
+            indexed_count = CoursewareSearchIndexer.do_course_reindex(modulestore(), structure_key)
+    except Exception as err:  # pylint: disable=broad-except
+        # broad exception so that one structure failing doesn't stop the others from being reindexed
+        log.exception(u'Error reindexing %s', structure_id)
+        return structure_id, 0, u'{}'.format(err)
+    return structure_id, indexed_count or 0, None
+
+
+class Command(BaseCommand):
+    """
+    Command to rebuild the search index of all courses and libraries, e.g.
+    after a change of the search schema, with several processes at once.
+
+    The key of each course or library reindexed is appended to the checkpoint
+    file, if one is given, and those already in it are skipped, so that an
+    interrupted run can be resumed by running the command again.
+
+    Examples:
+
+        ./manage.py cms bulk_reindex --processes 8 --checkpoint /tmp/reindex.done
+        ./manage.py cms bulk_reindex --courses-only --batch-size 1000
+    """
+    help = dedent(__doc__)
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes',
+                            type=int,
+                            default=1,
+                            help='Number of processes reindexing courses and libraries at once')
+        parser.add_argument('--checkpoint',
+                            help='File recording the courses and libraries already reindexed')
+        parser.add_argument('--batch-size',
+                            type=int,
+                            default=None,
+                            help='Number of items sent to the search engine with each bulk index request')
+        parser.add_argument('--courses-only',
+                            action='store_true',
+                            help='Only reindex courses')
+        parser.add_argument('--libraries-only',
+                            action='store_true',
+                            help='Only reindex libraries')
+
+    def _get_structure_ids(self, options):
+        """ Returns the key strings of the courses and libraries to reindex """
+        store = modulestore()
+        structure_ids = []
+        if not options['libraries_only']:
+            structure_ids.extend(u'{}'.format(course.id) for course in store.get_courses())
+        if not options['courses_only']:
+            structure_ids.extend(
+                u'{}'.format(library.location.library_key.replace(branch=None)) for library in store.get_libraries()
+            )
+        return structure_ids
+
+    @staticmethod
+    def _read_checkpoint(checkpoint):
+        """ Returns the key strings of the courses and libraries recorded in the checkpoint file """
+        if not checkpoint or not os.path.exists(checkpoint):
+            return set()
+        with io.open(checkpoint, encoding='utf-8') as checkpoint_file:
+            return {line.strip() for line in checkpoint_file if line.strip()}
+
+    def handle(self, *args, **options):
+        """
+        By convention set by Django developers, this method actually executes command's actions.
+        So, there could be no better docstring than emphasize this once again.
+        """
+        if options['courses_only'] and options['libraries_only']:
+            raise CommandError(u'bulk_reindex accepts only one of --courses-only and --libraries-only.')
+        if options['processes'] < 1:
+            raise CommandError(u'--processes must be at least 1.')
+
+        done_ids = self._read_checkpoint(options['checkpoint'])
+        structure_ids = [
+            structure_id for structure_id in self._get_structure_ids(options) if structure_id not in done_ids
+        ]
+        log.info(
+            u'Reindexing %d courses and libraries with %d processes, %d already reindexed',
+            len(structure_ids), options['processes'], len(done_ids)
+        )
+
+        start_time = time.time()
+        reindexed_count = indexed_items = 0
+        failed_ids = []
+        checkpoint_file = io.open(options['checkpoint'], 'a', encoding='utf-8') if options['checkpoint'] else None
+        batch_sizes = (CoursewareSearchIndexer.INDEX_BATCH_SIZE, LibrarySearchIndexer.INDEX_BATCH_SIZE)
+        pool = None
+        try:
+            if options['processes'] > 1:
+                # Don't share the parent's connections with the worker processes.
+                connections.close_all()
+                pool = multiprocessing.Pool(
+                    options['processes'], initializer=_init_worker, initargs=(options['batch_size'],)
+                )
+                results = pool.imap_unordered(_reindex_structure, structure_ids)
+            else:
+                _set_batch_size(options['batch_size'])
+                results = (_reindex_structure(structure_id) for structure_id in structure_ids)
+
+            for structure_id, indexed_count, error in results:
+                if error is not None:
+                    failed_ids.append(structure_id)
+                    continue
+                reindexed_count += 1
+                indexed_items += indexed_count
+                if checkpoint_file:
+                    checkpoint_file.write(u'{}\n'.format(structure_id))
+                    checkpoint_file.flush()
+                elapsed = time.time() - start_time
+                log.info(
+                    u'Reindexed %s (%d items); %d/%d done, %.1f items/s, %.2f courses and libraries/s',
+                    structure_id, indexed_count, reindexed_count + len(failed_ids), len(structure_ids),
+                    indexed_items / elapsed if elapsed else 0, reindexed_count / elapsed if elapsed else 0
+                )
+        finally:
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+            CoursewareSearchIndexer.INDEX_BATCH_SIZE, LibrarySearchIndexer.INDEX_BATCH_SIZE = batch_sizes
+            if checkpoint_file:
+                checkpoint_file.close()
+
+        elapsed = time.time() - start_time
+        self.stdout.write(
+            u'Reindexed {} courses and libraries ({} items) in {:.1f}s: {:.1f} items/s.'.format(
+                reindexed_count, indexed_items, elapsed, indexed_items / elapsed if elapsed else 0
+            )
+        )
+        if failed_ids:
+            raise CommandError(u'Failed to reindex: {}'.format(u', '.join(failed_ids)))
@@ -0,0 +1,124 @@
+""" Tests for the bulk reindex command """
+
+
+import io
+import os
+import shutil
+import tempfile
+from multiprocessing.dummy import Pool as ThreadPool
+
+import mock
+import six
+from django.core.management import CommandError, call_command
+from search.search_engine_base import SearchEngine
+
+from contentstore.courseware_index import CoursewareSearchIndexer, LibrarySearchIndexer
+from contentstore.management.commands import bulk_reindex
+from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory, LibraryFactory
+
+
+class TestBulkReindex(ModuleStoreTestCase):
+    """ Tests for the bulk reindex command, against the in-memory search engine of the test settings """
+    COMMAND_PATH = 'contentstore.management.commands.bulk_reindex'
+
+    def setUp(self):
+        """ Setup method - create libraries and courses """
+        super(TestBulkReindex, self).setUp()
+        self.courses = []
+        for course_number in ('course1', 'course2'):
+            course = CourseFactory.create(org="test", course=course_number, default_store=ModuleStoreEnum.Type.split)
+            chapter = ItemFactory.create(parent_location=course.location, category='chapter', display_name="Week 1")
+            ItemFactory.create(parent_location=chapter.location, category='sequential', display_name="Lesson 1")
+            self.courses.append(course)
+        self.library = LibraryFactory.create(org="test", library="lib1", default_store=ModuleStoreEnum.Type.split)
+        ItemFactory.create(parent_location=self.library.location, category='html', display_name="Library Html")
+
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        self.checkpoint = os.path.join(temp_dir, 'checkpoint')
+
+    def _library_id(self):
+        """ Returns the key string of the library as it is recorded in the checkpoint """
+        return six.text_type(self.library.location.library_key.replace(branch=None))
+
+    def _search_course(self, course):
+        """ Returns the number of documents of the course in the courseware index """
+        searcher = SearchEngine.get_search_engine(CoursewareSearchIndexer.INDEX_NAME)
+        response = searcher.search(
+            doc_type=CoursewareSearchIndexer.DOCUMENT_TYPE,
+            field_dictionary={"course": six.text_type(course.id)}
+        )
+        return response["total"]
+
+    def _read_checkpoint(self):
+        """ Returns the lines of the checkpoint file """
+        with io.open(self.checkpoint, encoding='utf-8') as checkpoint_file:
+            return checkpoint_file.read().splitlines()
+
+    def test_reindex_all(self):
+        """ Test that all courses and libraries are reindexed and recorded in the checkpoint """
+        call_command('bulk_reindex', checkpoint=self.checkpoint)
+        for course in self.courses:
+            self.assertEqual(self._search_course(course), 2)
+        six.assertCountEqual(
+            self,
+            self._read_checkpoint(),
+            [six.text_type(course.id) for course in self.courses] + [self._library_id()]
+        )
+
+    def test_resume_from_checkpoint(self):
+        """ Test that the courses and libraries recorded in the checkpoint are skipped """
+        with io.open(self.checkpoint, 'w', encoding='utf-8') as checkpoint_file:
+            checkpoint_file.write(u'{}\n'.format(self.courses[0].id))
+
+        with mock.patch.object(CoursewareSearchIndexer, 'do_course_reindex', return_value=1) as patched_course, \
+                mock.patch.object(LibrarySearchIndexer, 'do_library_reindex', return_value=1) as patched_library:
+            call_command('bulk_reindex', checkpoint=self.checkpoint)
+
+        self.assertEqual([kall[0][1] for kall in patched_course.call_args_list], [self.courses[1].id])
+        self.assertEqual(patched_library.call_count, 1)
+        self.assertEqual(len(self._read_checkpoint()), 3)
+
+    def test_courses_only(self):
+        """ Test that libraries are not reindexed with --courses-only """
+        with mock.patch.object(LibrarySearchIndexer, 'do_library_reindex') as patched_library:
+            call_command('bulk_reindex', courses_only=True)
+        patched_library.assert_not_called()
+        self.assertEqual(self._search_course(self.courses[0]), 2)
+
+    def test_failures_not_checkpointed(self):
+        """ Test that a failure doesn't stop the other reindexing, nor is recorded in the checkpoint """
+        with mock.patch.object(LibrarySearchIndexer, 'do_library_reindex', side_effect=Exception("error")):
+            with self.assertRaisesRegex(CommandError, "Failed to reindex"):
+                call_command('bulk_reindex', checkpoint=self.checkpoint)
+        six.assertCountEqual(self, self._read_checkpoint(), [six.text_type(course.id) for course in self.courses])
+
+    def test_processes(self):
+        """ Test that courses and libraries are reindexed by a pool of workers, with the given batch size """
+        batch_sizes = []
+
+        def reindex(store, course_key):  # pylint: disable=unused-argument
+            """ Records the batch size set in the worker """
+            batch_sizes.append(CoursewareSearchIndexer.INDEX_BATCH_SIZE)
+            return 1
+
+        # Threads stand in for the worker processes, sharing the test database connection
+        with mock.patch(self.COMMAND_PATH + '.multiprocessing.Pool', ThreadPool), \
+                mock.patch(self.COMMAND_PATH + '._init_worker', bulk_reindex._set_batch_size), \
+                mock.patch(self.COMMAND_PATH + '.connections'), \
+                mock.patch.object(CoursewareSearchIndexer, 'do_course_reindex', side_effect=reindex), \
+                mock.patch.object(LibrarySearchIndexer, 'do_library_reindex', return_value=1):
+            call_command('bulk_reindex', processes=2, batch_size=50, checkpoint=self.checkpoint)
+
+        self.assertEqual(batch_sizes, [50, 50])
+        self.assertEqual(len(self._read_checkpoint()), 3)
+        self.assertNotEqual(CoursewareSearchIndexer.INDEX_BATCH_SIZE, 50)
+
+    def test_invalid_options(self):
+        """ Test that raises CommandError for incompatible options """
+        with self.assertRaises(CommandError):
+            call_command('bulk_reindex', courses_only=True, libraries_only=True)
+        with self.assertRaises(CommandError):
+            call_command('bulk_reindex', processes=0)
@@ -15,6 +15,7 @@ from contentstore.proctoring import register_special_exams
 from lms.djangoapps.grades.api import task_compute_all_grades_for_course
 from openedx.core.djangoapps.credit.signals import on_course_publish
 from openedx.core.lib.gating import api as gating_api
+from static_replace.rewrite_table import rewrite_table_enabled
 from track.event_transaction_utils import get_event_transaction_id, get_event_transaction_type
 from util.module_utils import yield_dynamic_descriptor_descendants
 from xmodule.modulestore.django import SignalHandler, modulestore
@@ -58,6 +59,13 @@ def listen_for_course_publish(sender, course_key, **kwargs):  # pylint: disable=
     # to perform any 'on_publish' workflow
     on_course_publish(course_key)
 
+    # then precompute the static URL rewrites used when rendering the course
+    if rewrite_table_enabled():
+        # import here, because signal is registered at startup, but items in tasks are not yet able to be loaded
+        from contentstore.tasks import update_static_url_rewrite_table
+
+        update_static_url_rewrite_table.delay(six.text_type(course_key))
+
     # Finally call into the course search subsystem
     # to kick off an indexing action
     if CoursewareSearchIndexer.indexing_is_enabled():
@@ -35,7 +35,12 @@ from six.moves import range
 from user_tasks.models import UserTaskArtifact, UserTaskStatus
 from user_tasks.tasks import UserTask
 
-from contentstore.courseware_index import CoursewareSearchIndexer, LibrarySearchIndexer, SearchIndexingError
+from contentstore.courseware_index import (
+    CoursewareSearchIndexer,
+    LibrarySearchIndexer,
+    SearchIndexingError,
+    incremental_indexing_is_enabled
+)
 from contentstore.storage import course_import_export_storage
 from contentstore.utils import initialize_permissions, reverse_usage_url, translation_language
 from contentstore.video_utils import scrape_youtube_thumbnail
@@ -180,7 +185,12 @@ def update_search_index(course_id, triggered_time_isoformat):
     """ Updates course search index. """
     try:
         course_key = CourseKey.from_string(course_id)
-        CoursewareSearchIndexer.index(modulestore(), course_key, triggered_at=(_parse_time(triggered_time_isoformat)))
+        if incremental_indexing_is_enabled():
+            CoursewareSearchIndexer.index(modulestore(), course_key, incremental=True)
+        else:
+            CoursewareSearchIndexer.index(
+                modulestore(), course_key, triggered_at=(_parse_time(triggered_time_isoformat))
+            )
 
     except SearchIndexingError as exc:
         LOGGER.error(u'Search indexing error for complete course %s - %s', course_id, text_type(exc))
@@ -188,12 +198,27 @@ def update_search_index(course_id, triggered_time_isoformat):
         LOGGER.debug(u'Search indexing successful for complete course %s', course_id)
 
 
+@task()
+def update_static_url_rewrite_table(course_id):
+    """ Precomputes the static URL rewrite table of a course after it is published. """
+    # Import is placed here to avoid model import at project startup.
+    from static_replace.rewrite_table import build_rewrite_table
+    course_key = CourseKey.from_string(course_id)
+    asset_urls = build_rewrite_table(course_key)
+    LOGGER.debug(u'Precomputed %d static URLs for course %s', len(asset_urls), course_id)
+
+
 @task()
 def update_library_index(library_id, triggered_time_isoformat):
     """ Updates course search index. """
     try:
         library_key = CourseKey.from_string(library_id)
-        LibrarySearchIndexer.index(modulestore(), library_key, triggered_at=(_parse_time(triggered_time_isoformat)))
+        if incremental_indexing_is_enabled():
+            LibrarySearchIndexer.index(modulestore(), library_key, incremental=True)
+        else:
+            LibrarySearchIndexer.index(
+                modulestore(), library_key, triggered_at=(_parse_time(triggered_time_isoformat))
+            )
 
     except SearchIndexingError as exc:
         LOGGER.error(u'Search indexing error for library %s - %s', library_id, text_type(exc))
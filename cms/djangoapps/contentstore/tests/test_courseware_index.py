@@ -262,6 +262,10 @@ class TestCoursewareSearchIndexer(MixedWithOptionsTestCase):
             reindex_age=(trigger_time - since_time)
         )
 
+    def index_changes(self, store):
+        """ index course incrementally """
+        return CoursewareSearchIndexer.index(store, self.course.id, incremental=True)
+
     def _get_default_search(self):
         return {"course": six.text_type(self.course.id)}
 
@@ -395,6 +399,76 @@ class TestCoursewareSearchIndexer(MixedWithOptionsTestCase):
         for result in results:
             self.assertEqual(result["data"]["start_date"], date_map[result["data"]["id"]])
 
+    def _test_incremental_index(self, store):
+        """ Make sure that an incremental index only indexes what changed since the last indexing """
+        self.publish_item(store, self.vertical.location)
+        self.assertEqual(self.reindex_course(store), 4)
+        self.assertEqual(self.index_changes(store), 0)
+
+        # changing an item indexes that item
+        self.html_unit.display_name = "Changed Html Content"
+        self.update_item(store, self.html_unit)
+        self.publish_item(store, self.vertical.location)
+        self.assertEqual(self.index_changes(store), 1)
+        response = self.search(query_string="Changed")
+        self.assertEqual(response["total"], 1)
+
+        # renaming a container indexes the items whose location it is part of
+        self.vertical.display_name = "Subsection 2"
+        self.update_item(store, self.vertical)
+        self.publish_item(store, self.vertical.location)
+        self.assertEqual(self.index_changes(store), 2)
+        response = self.search(query_string="Changed")
+        self.assertEqual(response["results"][0]["data"]["location"], ["Week 1", "Lesson 1", "Subsection 2"])
+
+        # removed items are removed from the index
+        self.delete_item(store, self.html_unit.location)
+        self.publish_item(store, self.vertical.location)
+        self.index_changes(store)
+        response = self.search()
+        self.assertEqual(response["total"], 3)
+        self.assertEqual(self.index_changes(store), 0)
+
+    def _test_incremental_index_without_snapshot(self, store):
+        """ Make sure that an incremental index of a course without a snapshot is a full reindex """
+        self.publish_item(store, self.vertical.location)
+        with patch.object(CoursewareSearchIndexer, '_get_index_snapshot', return_value=None):
+            self.assertEqual(self.index_changes(store), 4)
+        response = self.search()
+        self.assertEqual(response["total"], 4)
+
+    def _test_incremental_index_after_time_based_index(self, store):
+        """ Make sure that an incremental index removes items added by a time based index since the snapshot """
+        self.publish_item(store, self.vertical.location)
+        self.assertEqual(self.reindex_course(store), 4)
+
+        before_time = datetime.now(UTC)
+        html_unit2 = ItemFactory.create(
+            parent_location=self.vertical.location,
+            category="html",
+            display_name="Html Content 2",
+            modulestore=store,
+            publish_item=False,
+        )
+        self.publish_item(store, self.vertical.location)
+        self.index_recent_changes(store, before_time)
+        response = self.search()
+        self.assertEqual(response["total"], 5)
+
+        self.delete_item(store, html_unit2.location)
+        self.publish_item(store, self.vertical.location)
+        self.index_changes(store)
+        response = self.search()
+        self.assertEqual(response["total"], 4)
+
+    @patch.object(CoursewareSearchIndexer, 'INDEX_BATCH_SIZE', 3)
+    def _test_index_batches(self, store):
+        """ Make sure that items are indexed with a bulk request per batch """
+        self.publish_item(store, self.vertical.location)
+        with patch(settings.SEARCH_ENGINE + '.index') as mock_index:
+            self.reindex_course(store)
+        self.assertEqual([len(kall[0][1]) for kall in mock_index.call_args_list], [3, 1])
+
     @patch('django.conf.settings.SEARCH_ENGINE', None)
     def _test_search_disabled(self, store):
         """ if search setting has it as off, confirm that nothing is indexed """
@@ -576,6 +650,22 @@ class TestCoursewareSearchIndexer(MixedWithOptionsTestCase):
     def test_time_based_index(self, store_type):
         self._perform_test_using_store(store_type, self._test_time_based_index)
 
+    @ddt.data(*WORKS_WITH_STORES)
+    def test_incremental_index(self, store_type):
+        self._perform_test_using_store(store_type, self._test_incremental_index)
+
+    @ddt.data(*WORKS_WITH_STORES)
+    def test_incremental_index_without_snapshot(self, store_type):
+        self._perform_test_using_store(store_type, self._test_incremental_index_without_snapshot)
+
+    @ddt.data(*WORKS_WITH_STORES)
+    def test_incremental_index_after_time_based_index(self, store_type):
+        self._perform_test_using_store(store_type, self._test_incremental_index_after_time_based_index)
+
+    @ddt.data(*WORKS_WITH_STORES)
+    def test_index_batches(self, store_type):
+        self._perform_test_using_store(store_type, self._test_index_batches)
+
     @ddt.data(*WORKS_WITH_STORES)
     def test_exception(self, store_type):
         self._perform_test_using_store(store_type, self._test_exception)
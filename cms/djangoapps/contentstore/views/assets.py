@@ -22,6 +22,7 @@ from six import text_type
 from contentstore.views.exception import AssetNotFoundException, AssetSizeTooLargeException
 from edxmako.shortcuts import render_to_response
 from openedx.core.djangoapps.contentserver.caching import del_cached_content
+from static_replace.rewrite_table import invalidate_rewrite_table
 from student.auth import has_course_author_access
 from util.date_utils import get_default_time_display
 from util.json_request import JsonResponse
@@ -391,6 +392,7 @@ def update_course_run_asset(course_key, upload_file):
 
     contentstore().save(content)
     del_cached_content(content.location)
+    invalidate_rewrite_table(course_key)
 
     return content
 
@@ -545,6 +547,7 @@ def _update_asset(request, course_key, asset_key):
         contentstore().set_attr(asset_key, 'locked', modified_asset['locked'])
         # delete the asset from the cache so we check the lock status the next time it is requested.
         del_cached_content(asset_key)
+        invalidate_rewrite_table(course_key)
         return JsonResponse(modified_asset, status=201)
 
 
@@ -562,6 +565,7 @@ def delete_asset(course_key, asset_key):
     _delete_thumbnail(content.thumbnail_location, course_key, asset_key)
     contentstore().delete(content.get_id())
     del_cached_content(content.location)
+    invalidate_rewrite_table(course_key)
 
 
 def _check_existence_and_get_asset_content(asset_key):
@@ -387,6 +387,84 @@ FEATURES = {
     # .. toggle_status: supported
     # .. toggle_warnings: None
     'ENABLE_ORA_USER_STATE_UPLOAD_DATA': False,
+
+    # .. toggle_name: ENABLE_STATIC_URL_REWRITE_TABLE
+    # .. toggle_implementation: DjangoSetting
+    # .. toggle_default: False
+    # .. toggle_description: Resolve course /static/ URLs through the per-course, per-process rewrite table in
+    #      static_replace.rewrite_table instead of checking staticfiles storage and the contentstore for every
+    #      URL on every render. Tables are precomputed by Studio on publish.
+    # .. toggle_category: performance
+    # .. toggle_use_cases: incremental_release, open_edx
+    # .. toggle_creation_date: 2020-04-01
+    # .. toggle_expiration_date: None
+    # .. toggle_tickets: None
+    # .. toggle_status: supported
+    # .. toggle_warnings: None
+    'ENABLE_STATIC_URL_REWRITE_TABLE': False,
+
+    # .. toggle_name: ENABLE_ENROLLMENT_COUNTS
+    # .. toggle_implementation: DjangoSetting
+    # .. toggle_default: False
+    # .. toggle_description: Set to True to keep the number of active enrollments of each course and mode in the
+    #      CourseEnrollmentCount table as enrollments change, and to read enrollment counts and enforce the
+    #      maximum enrollment of courses from it rather than counting enrollments. Run the
+    #      repair_enrollment_counts management command on all courses after enabling it, and again if it was
+    #      disabled for a while.
+    # .. toggle_category: performance
+    # .. toggle_use_cases: incremental_release, open_edx
+    # .. toggle_creation_date: 2020-04-01
+    # .. toggle_expiration_date: None
+    # .. toggle_tickets: None
+    # .. toggle_status: supported
+    # .. toggle_warnings: None
+    'ENABLE_ENROLLMENT_COUNTS': False,
+
+    # .. toggle_name: ENABLE_ENROLLMENT_SNAPSHOT
+    # .. toggle_implementation: DjangoSetting
+    # .. toggle_default: False
+    # .. toggle_description: Set to True to load all of the enrollments of the user of a request at once, the first time one of
+    #      them is looked up, and to answer the later enrollment lookups of the request for that user from
+    #      them.
+    # .. toggle_category: performance
+    # .. toggle_use_cases: incremental_release, open_edx
+    # .. toggle_creation_date: 2020-04-01
+    # .. toggle_expiration_date: None
+    # .. toggle_tickets: None
+    # .. toggle_status: supported
+    # .. toggle_warnings: None
+    'ENABLE_ENROLLMENT_SNAPSHOT': False,
+
+    # .. toggle_name: ENABLE_COURSE_OVERVIEW_SHARED_CACHE
+    # .. toggle_implementation: DjangoSetting
+    # .. toggle_default: False
+    # .. toggle_description: Set to True to keep course overviews in the django cache, to read many of them with one cache round
+    #      trip, and to serve an overview of a previous CourseOverview version while it is regenerated in a
+    #      celery task instead of regenerating it during the request.
+    # .. toggle_category: performance
+    # .. toggle_use_cases: incremental_release, open_edx
+    # .. toggle_creation_date: 2020-04-01
+    # .. toggle_expiration_date: None
+    # .. toggle_tickets: None
+    # .. toggle_status: supported
+    # .. toggle_warnings: None
+    'ENABLE_COURSE_OVERVIEW_SHARED_CACHE': False,
+
+    # .. toggle_name: ENABLE_INCREMENTAL_COURSEWARE_INDEX
+    # .. toggle_implementation: DjangoSetting
+    # .. toggle_default: False
+    # .. toggle_description: Set to True to index only the items of a course or library whose index documents have changed since
+    #      its last indexing when it is published, and remove those no longer in it, rather than walking the
+    #      recently edited part of its structure. Courses without a stored snapshot of their last indexing are
+    #      fully reindexed.
+    # .. toggle_category: performance
+    # .. toggle_use_cases: incremental_release, open_edx
+    # .. toggle_creation_date: 2020-04-01
+    # .. toggle_expiration_date: None
+    # .. toggle_tickets: None
+    # .. toggle_status: supported
+    # .. toggle_warnings: None
+    'ENABLE_INCREMENTAL_COURSEWARE_INDEX': False,
 }
 
 ENABLE_JASMINE = False
@@ -7,6 +7,7 @@ import six
 from django.conf import settings
 from django.contrib.staticfiles import finders
 from django.contrib.staticfiles.storage import staticfiles_storage
+from edx_django_utils.cache import RequestCache
 from opaque_keys.edx.locator import AssetLocator
 from six import text_type
 
@@ -96,6 +97,30 @@ def replace_course_urls(text, course_key):
     return re.sub(_url_replace_regex('/course/'), replace_course_url, text)
 
 
+def _is_xblock_resource_url(prefix, rest):
+    """
+    Returns whether a matched static url is an XBlock resource link.
+    """
+    # Don't rewrite XBlock resource links.  Probably wasn't a good idea that /static
+    # works for actual static assets and for magical course asset URLs....
+    full_url = prefix + rest
+
+    starts_with_static_url = full_url.startswith(six.text_type(settings.STATIC_URL))
+    starts_with_prefix = full_url.startswith(XBLOCK_STATIC_RESOURCE_PREFIX)
+    contains_prefix = XBLOCK_STATIC_RESOURCE_PREFIX in full_url
+    return starts_with_prefix or (starts_with_static_url and contains_prefix)
+
+
+def _static_url_prefix_regex(data_dir):
+    """
+    Match the static url prefixes, excluding urls already pointing into the data directory.
+    """
+    return u'(?:{static_url}|/static/)(?!{data_dir})'.format(
+        static_url=settings.STATIC_URL,
+        data_dir=data_dir
+    )
+
+
 def process_static_urls(text, replacement_function, data_dir=None):
     """
     Run an arbitrary replacement function on any urls matching the static file
@@ -111,26 +136,12 @@ def process_static_urls(text, replacement_function, data_dir=None):
         quote = match.group('quote')
         rest = match.group('rest')
 
-        # Don't rewrite XBlock resource links.  Probably wasn't a good idea that /static
-        # works for actual static assets and for magical course asset URLs....
-        full_url = prefix + rest
-
-        starts_with_static_url = full_url.startswith(six.text_type(settings.STATIC_URL))
-        starts_with_prefix = full_url.startswith(XBLOCK_STATIC_RESOURCE_PREFIX)
-        contains_prefix = XBLOCK_STATIC_RESOURCE_PREFIX in full_url
-        if starts_with_prefix or (starts_with_static_url and contains_prefix):
+        if _is_xblock_resource_url(prefix, rest):
             return original
 
         return replacement_function(original, prefix, quote, rest)
 
-    return re.sub(
-        _url_replace_regex(u'(?:{static_url}|/static/)(?!{data_dir})'.format(
-            static_url=settings.STATIC_URL,
-            data_dir=data_dir
-        )),
-        wrap_part_extraction,
-        text
-    )
+    return re.sub(_url_replace_regex(_static_url_prefix_regex(data_dir)), wrap_part_extraction, text)
 
 
 def make_static_urls_absolute(request, html):
@@ -150,6 +161,47 @@ def make_static_urls_absolute(request, html):
     )
 
 
+def _course_static_url(course_id, rest, rewrite_table=None):
+    """
+    Returns the URL a course's static path rewrites to: the static file pipeline
+    URL when the path is a piece of static content in the edx-platform repo (e.g.
+    JS associated with an xmodule), otherwise the course asset URL in the contentstore.
+
+    When a rewrite table is given, the contentstore URL is read from it instead
+    of being canonicalized again.
+    """
+    exists_in_staticfiles_storage = False
+    try:
+        exists_in_staticfiles_storage = staticfiles_storage.exists(rest)
+    except Exception as err:
+        log.warning("staticfiles_storage couldn't find path {0}: {1}".format(
+            rest, str(err)))
+
+    if exists_in_staticfiles_storage:
+        return staticfiles_storage.url(rest)
+
+    if rewrite_table is not None:
+        return rewrite_table.asset_url(rest)
+
+    # if not, then assume it's courseware specific content and then look in the
+    # Mongo-backed database
+    # Import is placed here to avoid model import at project startup.
+    from static_replace.models import AssetBaseUrlConfig, AssetExcludedExtensionsConfig
+    base_url = AssetBaseUrlConfig.get_base_url()
+    excluded_exts = AssetExcludedExtensionsConfig.get_excluded_extensions()
+    return canonicalized_asset_url(course_id, rest, base_url, excluded_exts)
+
+
+def canonicalized_asset_url(course_key, rest, base_url, excluded_exts):
+    """
+    Returns the contentstore URL for a course static path, as served to learners.
+    """
+    url = StaticContent.get_canonicalized_asset_path(course_key, rest, base_url, excluded_exts)
+    if AssetLocator.CANONICAL_NAMESPACE in url:
+        url = url.replace('block@', 'block/', 1)
+    return url
+
+
 def replace_static_urls(text, data_directory=None, course_id=None, static_asset_path='', static_paths_out=None):
     """
     Replace /static/$stuff urls either with their correct url as generated by collectstatic,
@@ -169,6 +221,22 @@ def replace_static_urls(text, data_directory=None, course_id=None, static_asset_
     if static_paths_out is None:
         static_paths_out = []
 
+    replace_static_url = _static_url_replacer(data_directory, course_id, static_asset_path, static_paths_out)
+    return process_static_urls(text, replace_static_url, data_dir=static_asset_path or data_directory)
+
+
+def _static_url_replacer(data_directory, course_id, static_asset_path, static_paths_out):
+    """
+    Returns the function used by replace_static_urls to replace a single
+    matched static url, see replace_static_urls for the arguments.
+    """
+    rewrite_table = None
+    if course_id and not static_asset_path and not settings.DEBUG:
+        # Import is placed here to avoid model import at project startup.
+        from static_replace.rewrite_table import get_rewrite_table, rewrite_table_enabled
+        if rewrite_table_enabled():
+            rewrite_table = get_rewrite_table(course_id)
+
     def replace_static_url(original, prefix, quote, rest):
         """
         Replace a single matched url.
@@ -186,29 +254,11 @@ def replace_static_urls(text, data_directory=None, course_id=None, static_asset_
 
         # if we're running with a MongoBacked store course_namespace is not None, then use studio style urls
         elif (not static_asset_path) and course_id:
-            # first look in the static file pipeline and see if we are trying to reference
-            # a piece of static content which is in the edx-platform repo (e.g. JS associated with an xmodule)
-
-            exists_in_staticfiles_storage = False
-            try:
-                exists_in_staticfiles_storage = staticfiles_storage.exists(rest)
-            except Exception as err:
-                log.warning("staticfiles_storage couldn't find path {0}: {1}".format(
-                    rest, str(err)))
-
-            if exists_in_staticfiles_storage:
-                url = staticfiles_storage.url(rest)
-            else:
-                # if not, then assume it's courseware specific content and then look in the
-                # Mongo-backed database
-                # Import is placed here to avoid model import at project startup.
-                from static_replace.models import AssetBaseUrlConfig, AssetExcludedExtensionsConfig
-                base_url = AssetBaseUrlConfig.get_base_url()
-                excluded_exts = AssetExcludedExtensionsConfig.get_excluded_extensions()
-                url = StaticContent.get_canonicalized_asset_path(course_id, rest, base_url, excluded_exts)
-
-                if AssetLocator.CANONICAL_NAMESPACE in url:
-                    url = url.replace('block@', 'block/', 1)
+            url = rewrite_table.get(rest) if rewrite_table is not None else None
+            if url is None:
+                url = _course_static_url(course_id, rest, rewrite_table)
+                if rewrite_table is not None:
+                    rewrite_table.add(rest, url)
 
         # Otherwise, look the file up in staticfiles_storage, and append the data directory if needed
         else:
@@ -228,4 +278,85 @@ def replace_static_urls(text, data_directory=None, course_id=None, static_asset_
         static_paths_out.append((original_uri, url))
         return "".join([quote, url, quote])
 
-    return process_static_urls(text, replace_static_url, data_dir=static_asset_path or data_directory)
+    return replace_static_url
+
+
+class CourseUrlRewriter(object):
+    """
+    Applies replace_static_urls, replace_course_urls and (optionally)
+    replace_jump_to_id_urls to a piece of course content in a single regex pass.
+
+    The rewriter compiles its pattern once, so a single instance should be
+    reused for all of the content rendered for a course, see for_request.
+    """
+    def __init__(self, course_id, data_directory=None, static_asset_path='', jump_to_id_base_url=None):
+        self.course_id = course_id
+        self.data_directory = data_directory
+        self.static_asset_path = static_asset_path
+        self.jump_to_id_base_url = jump_to_id_base_url
+        self._replace_static_url = None
+
+        prefixes = [
+            u'(?P<static>{})'.format(_static_url_prefix_regex(static_asset_path or data_directory)),
+            u'(?P<course>/course/)',
+        ]
+        if jump_to_id_base_url is not None:
+            prefixes.append(u'(?P<jump_to_id>/jump_to_id/)')
+        self._pattern = re.compile(_url_replace_regex(u'|'.join(prefixes)))
+        self._course_url_base = '/courses/' + text_type(course_id) + '/'
+
+    @classmethod
+    def for_request(cls, course_id, data_directory=None, static_asset_path='', jump_to_id_base_url=None):
+        """
+        Returns the rewriter with the given arguments, created once per request.
+        """
+        cache_key = (course_id, data_directory, static_asset_path, jump_to_id_base_url)
+        rewriters = RequestCache('static_replace.course_url_rewriters').data
+        if cache_key not in rewriters:
+            rewriters[cache_key] = cls(course_id, data_directory, static_asset_path, jump_to_id_base_url)
+        return rewriters[cache_key]
+
+    def rewrite(self, text, preserved=()):
+        """
+        Returns `text` with all of its course urls rewritten.
+
+        preserved: an ordered iterable of strings that have already been
+            rewritten (e.g. the rendered content of child blocks) and are to
+            be copied through as-is wherever they are found in `text`.
+        """
+        if self._replace_static_url is None:
+            self._replace_static_url = _static_url_replacer(
+                self.data_directory, self.course_id, self.static_asset_path, []
+            )
+        replace_static_url = self._replace_static_url
+
+        def replace_url(match):
+            """
+            Replace a single matched url according to the prefix it matched.
+            """
+            original = match.group(0)
+            prefix = match.group('prefix')
+            quote = match.group('quote')
+            rest = match.group('rest')
+
+            if match.group('static') is not None:
+                if _is_xblock_resource_url(prefix, rest):
+                    return original
+                return replace_static_url(original, prefix, quote, rest)
+            elif match.group('course') is not None:
+                return "".join([quote, self._course_url_base, rest, quote])
+            return "".join([quote, self.jump_to_id_base_url + rest, quote])
+
+        pieces = []
+        position = 0
+        for preserved_text in preserved:
+            if not preserved_text:
+                continue
+            start = text.find(preserved_text, position)
+            if start == -1:
+                continue
+            pieces.append(self._pattern.sub(replace_url, text[position:start]))
+            pieces.append(preserved_text)
+            position = start + len(preserved_text)
+        pieces.append(self._pattern.sub(replace_url, text[position:]))
+        return u''.join(pieces)
@@ -0,0 +1,234 @@
+"""
+Per-course tables of precomputed static URL rewrites.
+
+Resolving a course ``/static/`` URL normally costs a ``staticfiles_storage.exists``
+call and a contentstore lookup (to find out whether the asset is locked and what
+its content digest is).  Neither answer changes between asset edits, so each
+process keeps a table per course mapping the ``rest`` of a static URL to the
+final URL it rewrites to.  The contentstore half of that work is precomputed
+when the course is published and shared through the cache, so a process that
+has never rendered the course before still avoids the contentstore.
+
+Tables are versioned per course through a token kept in the shared cache.
+Changing an asset (upload, lock toggle, delete) or republishing the course
+replaces the token, which makes every process drop its table on the next read.
+
+A process keeps the tables of at most ``MAX_PROCESS_TABLES`` courses, and each
+table at most ``MAX_TABLE_URLS`` rewritten URLs, dropping the least recently
+used first.
+"""
+
+
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+
+import six
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import InvalidCacheBackendError
+from edx_django_utils.cache import RequestCache
+
+from static_replace import canonicalized_asset_url
+
+log = logging.getLogger(__name__)
+
+# See if there's a "course_assets" cache configured, and if not, fallback to the default cache.
+REWRITE_TABLE_CACHE = caches['default']
+try:
+    REWRITE_TABLE_CACHE = caches['course_assets']
+except InvalidCacheBackendError:
+    pass
+
+REWRITE_TABLE_CACHE_TIMEOUT = 24 * 60 * 60
+REQUEST_CACHE_NAMESPACE = u'static_replace.rewrite_table'
+MAX_PROCESS_TABLES = 100
+MAX_TABLE_URLS = 1000
+
+
+class LeastRecentlyUsedDict(OrderedDict):
+    """
+    A dict holding at most ``max_size`` items, which drops the least recently
+    read or written item when a new one doesn't fit.
+
+    Reads and writes are locked, as the dict is shared between request threads.
+    """
+    def __init__(self, max_size):
+        super(LeastRecentlyUsedDict, self).__init__()
+        self.max_size = max_size
+        self._lock = threading.RLock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                self.move_to_end(key)
+            except KeyError:
+                return default
+            return self[key]
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            super(LeastRecentlyUsedDict, self).__setitem__(key, value)
+            self.move_to_end(key)
+            while len(self) > self.max_size:
+                self.popitem(last=False)
+
+    def pop(self, key, *args):
+        with self._lock:
+            return super(LeastRecentlyUsedDict, self).pop(key, *args)
+
+
+# Process-local tables, keyed by course id string.
+_PROCESS_TABLES = LeastRecentlyUsedDict(MAX_PROCESS_TABLES)
+
+
+def rewrite_table_enabled():
+    """
+    Returns whether course static URLs should be resolved through rewrite tables.
+    """
+    return settings.FEATURES.get('ENABLE_STATIC_URL_REWRITE_TABLE', False)
+
+
+class StaticUrlRewriteTable(object):
+    """
+    The static URL rewrites known for one version of a course's assets.
+
+    ``asset_urls`` holds the canonicalized contentstore URL of each asset, as
+    precomputed on publish and shared between processes.  ``urls`` holds the
+    final rewritten URL of the static paths most recently seen by this process,
+    whichever storage they resolved to.
+    """
+    def __init__(self, course_key, version, base_url, excluded_exts, asset_urls=None):
+        self.course_key = course_key
+        self.version = version
+        self.base_url = base_url
+        self.excluded_exts = excluded_exts
+        self.asset_urls = asset_urls or {}
+        self.urls = LeastRecentlyUsedDict(MAX_TABLE_URLS)
+
+    def get(self, rest):
+        """
+        Returns the rewritten URL for the given static path, or None if it hasn't been resolved yet.
+        """
+        return self.urls.get(rest)
+
+    def add(self, rest, url):
+        """
+        Records the rewritten URL for the given static path.
+        """
+        self.urls[rest] = url
+
+    def asset_url(self, rest):
+        """
+        Returns the canonicalized contentstore URL for the given static path.
+        """
+        url = self.asset_urls.get(rest)
+        if url is None:
+            url = canonicalized_asset_url(self.course_key, rest, self.base_url, self.excluded_exts)
+        return url
+
+    def matches_config(self, base_url, excluded_exts):
+        """
+        Returns whether the table was built with the given asset configuration.
+        """
+        return self.base_url == base_url and self.excluded_exts == excluded_exts
+
+
+def _version_cache_key(course_key):
+    return u'static_replace.rewrite_table.version.{}'.format(course_key)
+
+
+def _table_cache_key(course_key, version):
+    return u'static_replace.rewrite_table.{}.{}'.format(course_key, version)
+
+
+def _asset_config():
+    """
+    Returns the (base_url, excluded_exts) pair currently used to canonicalize asset paths.
+    """
+    # Import is placed here to avoid model import at project startup.
+    from static_replace.models import AssetBaseUrlConfig, AssetExcludedExtensionsConfig
+    return AssetBaseUrlConfig.get_base_url(), AssetExcludedExtensionsConfig.get_excluded_extensions()
+
+
+def _current_version(course_key):
+    """
+    Returns the current table version token for the course, reading the
+    shared cache at most once per request.
+    """
+    request_cache = RequestCache(REQUEST_CACHE_NAMESPACE)
+    cached_response = request_cache.get_cached_response(six.text_type(course_key))
+    if cached_response.is_found:
+        return cached_response.value
+
+    version = REWRITE_TABLE_CACHE.get(_version_cache_key(course_key))
+    if version is None:
+        version = uuid.uuid4().hex
+        # Another process may have set a version in the meantime; keep theirs if so.
+        if not REWRITE_TABLE_CACHE.add(_version_cache_key(course_key), version, REWRITE_TABLE_CACHE_TIMEOUT):
+            version = REWRITE_TABLE_CACHE.get(_version_cache_key(course_key), version)
+    request_cache.set(six.text_type(course_key), version)
+    return version
+
+
+def get_rewrite_table(course_key):
+    """
+    Returns the StaticUrlRewriteTable for the given course, loading the shared
+    precomputed asset URLs the first time this process sees a new version.
+    """
+    version = _current_version(course_key)
+    base_url, excluded_exts = _asset_config()
+
+    table = _PROCESS_TABLES.get(six.text_type(course_key))
+    if table is not None and table.version == version and table.matches_config(base_url, excluded_exts):
+        return table
+
+    shared = REWRITE_TABLE_CACHE.get(_table_cache_key(course_key, version))
+    asset_urls = None
+    if shared is not None and shared['base_url'] == base_url and shared['excluded_exts'] == excluded_exts:
+        asset_urls = dict(shared['asset_urls'])
+
+    table = StaticUrlRewriteTable(course_key, version, base_url, excluded_exts, asset_urls)
+    _PROCESS_TABLES[six.text_type(course_key)] = table
+    return table
+
+
+def build_rewrite_table(course_key):
+    """
+    Precomputes the canonicalized URL of every asset in the course and
+    publishes it to the shared cache under a new version.
+    """
+    # Import is placed here to avoid contentstore setup at project startup.
+    from xmodule.contentstore.django import contentstore
+
+    base_url, excluded_exts = _asset_config()
+    assets, __ = contentstore().get_all_content_for_course(course_key)
+    asset_urls = {}
+    for asset in assets:
+        rest = asset['asset_key'].block_id
+        try:
+            asset_urls[rest] = canonicalized_asset_url(course_key, rest, base_url, excluded_exts)
+        except Exception as err:  # pylint: disable=broad-except
+            log.warning(u"Couldn't precompute static URL for %s in %s: %s", rest, course_key, err)
+
+    version = uuid.uuid4().hex
+    REWRITE_TABLE_CACHE.set(
+        _table_cache_key(course_key, version),
+        {'base_url': base_url, 'excluded_exts': excluded_exts, 'asset_urls': asset_urls},
+        REWRITE_TABLE_CACHE_TIMEOUT,
+    )
+    REWRITE_TABLE_CACHE.set(_version_cache_key(course_key), version, REWRITE_TABLE_CACHE_TIMEOUT)
+    RequestCache(REQUEST_CACHE_NAMESPACE).delete(six.text_type(course_key))
+    return asset_urls
+
+
+def invalidate_rewrite_table(course_key):
+    """
+    Drops the rewrite tables for the given course in every process.
+
+    Call this whenever an asset of the course is added, changed or removed.
+    """
+    REWRITE_TABLE_CACHE.delete(_version_cache_key(course_key))
+    RequestCache(REQUEST_CACHE_NAMESPACE).delete(six.text_type(course_key))
+    _PROCESS_TABLES.pop(six.text_type(course_key), None)
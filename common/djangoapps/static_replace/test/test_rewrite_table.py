@@ -0,0 +1,124 @@
+"""Tests for the static URL rewrite tables"""
+
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+from edx_django_utils.cache import RequestCache
+from mock import patch
+from opaque_keys.edx.keys import CourseKey
+
+from static_replace import replace_static_urls
+from static_replace import rewrite_table
+from static_replace.rewrite_table import (
+    LeastRecentlyUsedDict,
+    build_rewrite_table,
+    get_rewrite_table,
+    invalidate_rewrite_table
+)
+
+COURSE_KEY = CourseKey.from_string('course-v1:org+course+run')
+FEATURES_WITH_REWRITE_TABLE = dict(settings.FEATURES, ENABLE_STATIC_URL_REWRITE_TABLE=True)
+
+# A unit page referencing the same handful of assets many times over, the way
+# problem and HTML blocks in a vertical tend to.
+PAGE = u''.join(
+    u'<img src="/static/image{0}.png"/><a href="/static/handout{0}.pdf">x</a>'.format(index % 10)
+    for index in range(200)
+)
+
+
+@override_settings(FEATURES=FEATURES_WITH_REWRITE_TABLE)
+@patch('static_replace.models.AssetBaseUrlConfig.get_base_url', lambda: u'')
+@patch('static_replace.models.AssetExcludedExtensionsConfig.get_excluded_extensions', lambda: [u'html'])
+@patch('static_replace.StaticContent')
+@patch('static_replace.staticfiles_storage')
+class StaticUrlRewriteTableTest(TestCase):
+    """
+    Tests that course static URLs are resolved once per course asset version.
+    """
+    def setUp(self):
+        super(StaticUrlRewriteTableTest, self).setUp()
+        invalidate_rewrite_table(COURSE_KEY)
+        self.addCleanup(invalidate_rewrite_table, COURSE_KEY)
+        self.addCleanup(RequestCache.clear_all_namespaces)
+
+    def _configure(self, mock_storage, mock_static_content):
+        mock_storage.exists.return_value = False
+        mock_static_content.get_canonicalized_asset_path.side_effect = (
+            lambda course_key, path, base_url, excluded_exts: u'/asset-v1:org+course+run+type@asset+block@' + path
+        )
+
+    def test_render_benchmark(self, mock_storage, mock_static_content):
+        self._configure(mock_storage, mock_static_content)
+
+        first_render = replace_static_urls(PAGE, course_id=COURSE_KEY)
+        self.assertIn(u'"/asset-v1:org+course+run+type@asset+block/image3.png"', first_render)
+        # Each distinct URL is resolved once, not once per occurrence.
+        self.assertEqual(mock_storage.exists.call_count, 20)
+        self.assertEqual(mock_static_content.get_canonicalized_asset_path.call_count, 20)
+
+        for __ in range(50):
+            RequestCache.clear_all_namespaces()
+            self.assertEqual(replace_static_urls(PAGE, course_id=COURSE_KEY), first_render)
+
+        # Later renders are dictionary lookups with no storage I/O.
+        self.assertEqual(mock_storage.exists.call_count, 20)
+        self.assertEqual(mock_static_content.get_canonicalized_asset_path.call_count, 20)
+
+    def test_disabled(self, mock_storage, mock_static_content):
+        self._configure(mock_storage, mock_static_content)
+        with override_settings(FEATURES=dict(settings.FEATURES, ENABLE_STATIC_URL_REWRITE_TABLE=False)):
+            replace_static_urls(PAGE, course_id=COURSE_KEY)
+            replace_static_urls(PAGE, course_id=COURSE_KEY)
+        self.assertEqual(mock_storage.exists.call_count, 800)
+        self.assertEqual(mock_static_content.get_canonicalized_asset_path.call_count, 800)
+
+    def test_invalidate(self, mock_storage, mock_static_content):
+        self._configure(mock_storage, mock_static_content)
+        replace_static_urls(PAGE, course_id=COURSE_KEY)
+
+        invalidate_rewrite_table(COURSE_KEY)
+        replace_static_urls(PAGE, course_id=COURSE_KEY)
+        self.assertEqual(mock_static_content.get_canonicalized_asset_path.call_count, 40)
+
+    def test_bounded(self, mock_storage, mock_static_content):
+        self._configure(mock_storage, mock_static_content)
+        with patch.object(rewrite_table, 'MAX_TABLE_URLS', 5):
+            invalidate_rewrite_table(COURSE_KEY)
+            replace_static_urls(PAGE, course_id=COURSE_KEY)
+        self.assertEqual(len(get_rewrite_table(COURSE_KEY).urls), 5)
+
+        urls = LeastRecentlyUsedDict(2)
+        urls['a'] = 1
+        urls['b'] = 2
+        self.assertEqual(urls.get('a'), 1)
+        urls['c'] = 3
+        self.assertEqual(list(urls), ['a', 'c'])
+        self.assertIsNone(urls.get('b'))
+
+    def test_version_change_from_other_process(self, mock_storage, mock_static_content):
+        self._configure(mock_storage, mock_static_content)
+        table = get_rewrite_table(COURSE_KEY)
+
+        # Another process bumping the version is picked up on the next request.
+        rewrite_table.REWRITE_TABLE_CACHE.set(rewrite_table._version_cache_key(COURSE_KEY), u'other')  # pylint: disable=protected-access
+        self.assertIs(get_rewrite_table(COURSE_KEY), table)
+        RequestCache.clear_all_namespaces()
+        self.assertIsNot(get_rewrite_table(COURSE_KEY), table)
+        self.assertEqual(get_rewrite_table(COURSE_KEY).version, u'other')
+
+    @patch('xmodule.contentstore.django.contentstore')
+    def test_precomputed_on_publish(self, mock_contentstore, mock_storage, mock_static_content):
+        self._configure(mock_storage, mock_static_content)
+        mock_contentstore.return_value.get_all_content_for_course.return_value = (
+            [{'asset_key': COURSE_KEY.make_asset_key('asset', u'image{}.png'.format(index))} for index in range(10)],
+            10,
+        )
+        build_rewrite_table(COURSE_KEY)
+        self.assertEqual(mock_static_content.get_canonicalized_asset_path.call_count, 10)
+
+        # A process rendering the course after the publish reuses the precomputed asset URLs.
+        rewrite_table._PROCESS_TABLES.clear()  # pylint: disable=protected-access
+        replace_static_urls(PAGE, course_id=COURSE_KEY)
+        # Only the handouts, which weren't uploaded as assets, are canonicalized at render time.
+        self.assertEqual(mock_static_content.get_canonicalized_asset_path.call_count, 20)
@@ -123,6 +123,8 @@ def check_verify_status_by_course(user, course_enrollments):
         CourseEnrollment.enrollments_for_user(user)
     )
     recent_verification_datetime = None
+    # Whether the user is verified doesn't depend on the course, so it is only looked up once, when needed.
+    user_is_verified = None
 
     for enrollment in course_enrollments:
 
@@ -174,12 +176,14 @@ def check_verify_status_by_course(user, course_enrollments):
             )
             if status is None and not submitted:
                 if deadline is None or deadline > datetime.now(UTC):
-                    if IDVerificationService.user_is_verified(user) and verification_expiring_soon:
+                    if user_is_verified is None:
+                        user_is_verified = IDVerificationService.user_is_verified(user)
+                    if user_is_verified and verification_expiring_soon:
                         # The user has an active verification, but the verification
                         # is set to expire within "EXPIRING_SOON_WINDOW" days (default is 4 weeks).
                         # Tell the student to reverify.
                         status = VERIFY_STATUS_NEED_TO_REVERIFY
-                    elif not IDVerificationService.user_is_verified(user):
+                    elif not user_is_verified:
                         status = VERIFY_STATUS_NEED_TO_VERIFY
                 else:
                     # If a user currently has an active or pending verification,
@@ -420,7 +424,7 @@ class AccountValidationError(Exception):
         self.field = field
 
 
-def cert_info(user, course_overview):
+def cert_info(user, course_overview, cert_status=None):
     """
     Get the certificate info needed to render the dashboard section for the given
     student and course.
@@ -428,6 +432,8 @@ def cert_info(user, course_overview):
     Arguments:
         user (User): A user.
         course_overview (CourseOverview): A course.
+        cert_status (dict): The certificate status of the user in the course, as
+            returned by certificate_status_for_student, if it has already been loaded.
 
     Returns:
         dict: A dictionary with keys:
@@ -439,11 +445,9 @@ def cert_info(user, course_overview):
             'grade': if status is not 'processing'
             'can_unenroll': if status allows for unenrollment
     """
-    return _cert_info(
-        user,
-        course_overview,
-        certificate_status_for_student(user, course_overview.id)
-    )
+    if cert_status is None:
+        cert_status = certificate_status_for_student(user, course_overview.id)
+    return _cert_info(user, course_overview, cert_status)
 
 
 def _cert_info(user, course_overview, cert_status):
@@ -0,0 +1,55 @@
+"""
+Recount the active enrollments of courses in CourseEnrollmentCount.
+"""
+
+
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
+
+from student.models import CourseEnrollment, CourseEnrollmentCount
+
+log = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    Recount the active enrollments of courses in each mode, replacing their
+    counts in CourseEnrollmentCount.
+
+    Example usage:
+        $ ./manage.py lms repair_enrollment_counts course-v1:edX+DemoX+Demo_Course
+        $ ./manage.py lms repair_enrollment_counts --all
+    """
+    help = 'Recount the active enrollments of courses in CourseEnrollmentCount.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('course_ids', nargs='*', metavar='COURSE_ID', help='The courses to recount.')
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Recount every course with enrollments or counts.',
+        )
+
+    def handle(self, *args, **options):
+        if options['all']:
+            course_keys = set(CourseEnrollment.objects.values_list('course_id', flat=True).distinct())
+            course_keys.update(CourseEnrollmentCount.objects.values_list('course_id', flat=True).distinct())
+            course_keys = sorted(course_keys, key=str)
+        elif options['course_ids']:
+            try:
+                course_keys = [CourseKey.from_string(course_id) for course_id in options['course_ids']]
+            except InvalidKeyError as error:
+                raise CommandError(u'Invalid course id: {}'.format(error))
+        else:
+            raise CommandError('Pass the ids of the courses to recount, or --all.')
+
+        repaired = 0
+        for course_key in course_keys:
+            old_counts, new_counts = CourseEnrollmentCount.repair(course_key)
+            if old_counts != new_counts:
+                repaired += 1
+                log.info(u'Repaired the enrollment counts of %s from %s to %s', course_key, old_counts, new_counts)
+        log.info(u'Recounted the enrollments of %d courses, %d of which were repaired.', len(course_keys), repaired)
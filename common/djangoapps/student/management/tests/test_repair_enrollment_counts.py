@@ -0,0 +1,42 @@
+"""Tests for the repair_enrollment_counts management command."""
+
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from mock import patch
+
+from course_modes.models import CourseMode
+from student.models import CourseEnrollment, CourseEnrollmentCount
+from student.tests.factories import UserFactory
+from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
+from xmodule.modulestore.tests.factories import CourseFactory
+
+
+@patch.dict('django.conf.settings.FEATURES', {'ENABLE_ENROLLMENT_COUNTS': True})
+class RepairEnrollmentCountsTests(SharedModuleStoreTestCase):
+    """Tests for the repair_enrollment_counts management command."""
+
+    @classmethod
+    def setUpClass(cls):
+        super(RepairEnrollmentCountsTests, cls).setUpClass()
+        cls.course = CourseFactory()
+
+    def setUp(self):
+        super(RepairEnrollmentCountsTests, self).setUp()
+        for __ in range(2):
+            CourseEnrollment.enroll(UserFactory(), self.course.id, mode=CourseMode.AUDIT)
+        # Changes that don't go through CourseEnrollment.save aren't counted.
+        CourseEnrollment.objects.filter(course_id=self.course.id).update(mode=CourseMode.VERIFIED)
+
+    def test_repair_course(self):
+        self.assertEqual(CourseEnrollmentCount.get_counts(self.course.id), {CourseMode.AUDIT: 2})
+        call_command('repair_enrollment_counts', str(self.course.id))
+        self.assertEqual(CourseEnrollmentCount.get_counts(self.course.id), {CourseMode.VERIFIED: 2})
+
+    def test_repair_all(self):
+        call_command('repair_enrollment_counts', '--all')
+        self.assertEqual(CourseEnrollmentCount.get_counts(self.course.id), {CourseMode.VERIFIED: 2})
+
+    def test_no_courses(self):
+        with self.assertRaises(CommandError):
+            call_command('repair_enrollment_counts')
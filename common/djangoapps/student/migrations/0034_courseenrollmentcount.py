@@ -0,0 +1,27 @@
+# Generated by Django 2.2.12 on 2020-05-04 14:21
+
+from django.db import migrations, models
+import opaque_keys.edx.django.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('student', '0033_userprofile_state'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseEnrollmentCount',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('course_id', opaque_keys.edx.django.models.CourseKeyField(max_length=255)),
+                ('mode', models.CharField(max_length=100)),
+                ('slot', models.PositiveSmallIntegerField(default=0)),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'unique_together': {('course_id', 'mode', 'slot')},
+            },
+        ),
+    ]
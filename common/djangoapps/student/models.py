@@ -16,12 +16,14 @@ import hashlib
 import inspect
 import json
 import logging
+import random
 import uuid
 from collections import OrderedDict, defaultdict, namedtuple
 from datetime import datetime, timedelta
 from functools import total_ordering
 from importlib import import_module
 
+import crum
 import six
 from config_models.models import ConfigurationModel
 from django.apps import apps
@@ -32,8 +34,8 @@ from django.contrib.sites.models import Site
 from django.core.cache import cache
 from django.core.exceptions import MultipleObjectsReturned, ObjectDoesNotExist
 from django.core.validators import FileExtensionValidator, RegexValidator
-from django.db import IntegrityError, models
-from django.db.models import Count, Index, Q
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, F, Index, Q, Sum
 from django.db.models.signals import post_save, pre_save
 from django.db.utils import ProgrammingError
 from django.dispatch import receiver
@@ -43,6 +45,7 @@ from django.utils.translation import ugettext_lazy as _
 from django.utils.translation import ugettext_noop
 from django_countries.fields import CountryField
 from edx_django_utils.cache import RequestCache
+from edx_django_utils.monitoring import set_custom_metric
 from edx_rest_api_client.exceptions import SlumberBaseException
 from eventtracking import tracker
 from model_utils.models import TimeStampedModel
@@ -1014,6 +1017,182 @@ class AlreadyEnrolledError(CourseEnrollmentException):
     pass
 
 
+def enrollment_counts_enabled():
+    """
+    Returns whether enrollment counts are kept in and read from CourseEnrollmentCount.
+    """
+    return settings.FEATURES.get('ENABLE_ENROLLMENT_COUNTS', False)
+
+
+@python_2_unicode_compatible
+class CourseEnrollmentCount(models.Model):
+    """
+    The number of active enrollments in a course in a mode, maintained as
+    enrollments are saved so that the enrollments don't have to be counted.
+
+    The count of a course and mode is split over up to `NUM_SLOTS` rows, and
+    each change is applied to a random one, so that concurrent enrollments in
+    the same course don't all wait on the lock of the same row.
+
+    A course has no rows until the first change to its enrollments after the
+    counts are enabled, when its enrollments are counted once.  Changes made
+    without saving a CourseEnrollment (e.g. queryset updates) aren't counted;
+    the repair_enrollment_counts management command recounts courses.
+
+    The counts are cached for up to `CACHE_TIMEOUT` seconds, and changes
+    don't invalidate them, so reads that must be exact bypass the cache.
+
+    .. no_pii:
+    """
+    NUM_SLOTS = 8
+    CACHE_KEY = u'student.enrollment_counts.{}'
+    CACHE_TIMEOUT = 60
+
+    course_id = CourseKeyField(max_length=255)
+    mode = models.CharField(max_length=100)
+    slot = models.PositiveSmallIntegerField(default=0)
+    count = models.IntegerField(default=0)
+
+    class Meta(object):
+        unique_together = (('course_id', 'mode', 'slot'),)
+
+    def __str__(self):
+        return u'[CourseEnrollmentCount] {} {} ({}): {}'.format(self.course_id, self.mode, self.slot, self.count)
+
+    @classmethod
+    def cache_key(cls, course_id):
+        return cls.CACHE_KEY.format(course_id)
+
+    @classmethod
+    def _invalidate_cache(cls, course_id):
+        """
+        Deletes the cached counts of the course, now and again once the
+        current transaction commits so that counts read by other processes
+        before the commit aren't kept.
+        """
+        cache_key = cls.cache_key(course_id)
+        cache.delete(cache_key)
+        transaction.on_commit(lambda: cache.delete(cache_key))
+
+    @classmethod
+    def record_change(cls, course_id, old_state, new_state):
+        """
+        Applies a change of an enrollment in the course from `old_state` to
+        `new_state`, both CourseEnrollmentState or None for no enrollment,
+        to the counts of the course.
+
+        This is to be called in the transaction that saved the enrollment.
+        """
+        deltas = defaultdict(int)
+        if old_state is not None and old_state.is_active:
+            deltas[old_state.mode] -= 1
+        if new_state is not None and new_state.is_active:
+            deltas[new_state.mode] += 1
+        deltas = {mode: delta for mode, delta in six.iteritems(deltas) if delta}
+        if not deltas:
+            return
+
+        # Once a course's slots exist, a change is a single UPDATE per mode.
+        slot = random.randrange(cls.NUM_SLOTS)
+        missed_deltas = {
+            mode: delta for mode, delta in six.iteritems(deltas)
+            if not cls.objects.filter(course_id=course_id, mode=mode, slot=slot).update(count=F('count') + delta)
+        }
+        if not missed_deltas:
+            return
+
+        # When the course starts being counted here, the enrollments counted include the change.
+        if len(missed_deltas) == len(deltas) and not cls.objects.filter(course_id=course_id).exists():
+            if cls._start_counting(course_id):
+                return
+        for mode, delta in six.iteritems(missed_deltas):
+            cls._add_to_new_slot(course_id, mode, slot, delta)
+
+    @classmethod
+    def _add_to_new_slot(cls, course_id, mode, slot, delta):
+        """
+        Creates the count of the course and mode in `slot` with `delta`, or
+        adds `delta` to it if it was created concurrently.
+        """
+        count, created = cls.objects.get_or_create(
+            course_id=course_id, mode=mode, slot=slot, defaults={'count': delta}
+        )
+        if not created:
+            cls.objects.filter(id=count.id).update(count=F('count') + delta)
+
+    @classmethod
+    def _start_counting(cls, course_id):
+        """
+        Counts the enrollments of a course that has no counts yet.  Returns
+        whether the counts were created, which they aren't if another
+        transaction created counts of the course in the meantime.
+        """
+        counts = cls._count_enrollments(course_id)
+        if not counts:
+            return True
+        try:
+            with transaction.atomic():
+                cls.objects.bulk_create([
+                    cls(course_id=course_id, mode=mode, count=count) for mode, count in six.iteritems(counts)
+                ])
+        except IntegrityError:
+            return False
+        return True
+
+    @classmethod
+    def _count_enrollments(cls, course_id):
+        """
+        Returns a dict of the number of active enrollments in the course in each mode, counted from the enrollments.
+        """
+        query = CourseEnrollment.objects.filter(
+            course_id=course_id, is_active=True
+        ).values('mode').order_by().annotate(Count('mode'))
+        return {item['mode']: item['mode__count'] for item in query}
+
+    @classmethod
+    def get_counts(cls, course_id, use_cache=True):
+        """
+        Returns a dict of the number of active enrollments in the course in
+        each mode, or None if the enrollments of the course aren't counted.
+        """
+        if use_cache:
+            counts = cache.get(cls.cache_key(course_id))
+            if counts is not None:
+                return counts
+
+        rows = list(cls.objects.filter(course_id=course_id).values('mode').order_by().annotate(Sum('count')))
+        if not rows:
+            return None
+        counts = {row['mode']: row['count__sum'] for row in rows if row['count__sum']}
+        if use_cache:
+            cache.set(cls.cache_key(course_id), counts, cls.CACHE_TIMEOUT)
+        return counts
+
+    @classmethod
+    @transaction.atomic
+    def repair(cls, course_id):
+        """
+        Recounts the enrollments of the course.  Returns the dicts of the
+        counts of the course in each mode before and after.
+
+        Enrollments changed in the course while it is recounted may be
+        missed, so courses are best repaired when their enrollment is quiet.
+        """
+        # Lock the current counts of the course until they're replaced.
+        old_rows = cls.objects.select_for_update().filter(course_id=course_id)
+        old_counts = defaultdict(int)
+        for row in old_rows:
+            old_counts[row.mode] += row.count
+        new_counts = cls._count_enrollments(course_id)
+
+        cls.objects.filter(course_id=course_id).delete()
+        cls.objects.bulk_create([
+            cls(course_id=course_id, mode=mode, count=count) for mode, count in six.iteritems(new_counts)
+        ])
+        cls._invalidate_cache(course_id)
+        return {mode: count for mode, count in six.iteritems(old_counts) if count}, new_counts
+
+
 class CourseEnrollmentManager(models.Manager):
     """
     Custom manager for CourseEnrollment with Table-level filter methods.
@@ -1025,6 +1204,10 @@ class CourseEnrollmentManager(models.Manager):
 
         'course_id' is the course_id to return enrollments
         """
+        if enrollment_counts_enabled():
+            counts = CourseEnrollmentCount.get_counts(course_id)
+            if counts is not None:
+                return sum(counts.values())
 
         enrollment_number = super(CourseEnrollmentManager, self).get_queryset().filter(
             course_id=course_id,
@@ -1055,10 +1238,18 @@ class CourseEnrollmentManager(models.Manager):
         admins = CourseInstructorRole(course_locator).users_with_role()
         coaches = CourseCcxCoachRole(course_locator).users_with_role()
 
-        return super(CourseEnrollmentManager, self).get_queryset().filter(
+        enrollments = super(CourseEnrollmentManager, self).get_queryset().filter(
             course_id=course_id,
             is_active=1,
-        ).exclude(user__in=staff).exclude(user__in=admins).exclude(user__in=coaches).count()
+        )
+        if enrollment_counts_enabled():
+            # Not read from the cache, as this is used to enforce the maximum enrollment of the course.
+            counts = CourseEnrollmentCount.get_counts(course_id, use_cache=False)
+            if counts is not None:
+                admin_enrollments = enrollments.filter(Q(user__in=staff) | Q(user__in=admins) | Q(user__in=coaches))
+                return sum(counts.values()) - admin_enrollments.count()
+
+        return enrollments.exclude(user__in=staff).exclude(user__in=admins).exclude(user__in=coaches).count()
 
     def is_course_full(self, course):
         """
@@ -1097,6 +1288,13 @@ class CourseEnrollmentManager(models.Manager):
         Returns a dictionary that stores the total enrollment count for a course, as well as the
         enrollment count for each individual mode.
         """
+        if enrollment_counts_enabled():
+            counts = CourseEnrollmentCount.get_counts(course_id)
+            if counts is not None:
+                enroll_dict = defaultdict(int, counts)
+                enroll_dict['total'] = sum(counts.values())
+                return enroll_dict
+
         # Unfortunately, Django's "group by"-style queries look super-awkward
         query = use_read_replica_if_available(
             super(CourseEnrollmentManager, self).get_queryset().filter(course_id=course_id, is_active=True).values(
@@ -1175,6 +1373,7 @@ class CourseEnrollment(models.Model):
     COURSE_ENROLLMENT_CACHE_KEY = u"enrollment.{}.{}.mode"  # TODO Can this be removed?  It doesn't seem to be used.
 
     MODE_CACHE_NAMESPACE = u'CourseEnrollment.mode_and_active'
+    SNAPSHOT_CACHE_NAMESPACE = u'CourseEnrollment.snapshot'
 
     class Meta(object):
         unique_together = (('user', 'course'), )
@@ -1188,14 +1387,30 @@ class CourseEnrollment(models.Model):
         # When the property .course_overview is accessed for the first time, this variable will be set.
         self._course_overview = None
 
+        # The state of the enrollment as last saved, to keep CourseEnrollmentCount up to date.
+        # Deferred fields aren't loaded for it, the state is None if either is missing.
+        self._saved_state = None
+        if self.pk is not None and 'mode' in self.__dict__ and 'is_active' in self.__dict__:
+            self._saved_state = CourseEnrollmentState(self.mode, self.is_active)
+
     def __str__(self):
         return (
             "[CourseEnrollment] {}: {} ({}); active: ({})"
         ).format(self.user, self.course_id, self.created, self.is_active)
 
     def save(self, force_insert=False, force_update=False, using=None, update_fields=None):
-        super(CourseEnrollment, self).save(force_insert=force_insert, force_update=force_update, using=using,
-                                           update_fields=update_fields)
+        if enrollment_counts_enabled():
+            new_state = CourseEnrollmentState(self.mode, self.is_active)
+            with transaction.atomic(using=using):
+                created = self.pk is None
+                super(CourseEnrollment, self).save(force_insert=force_insert, force_update=force_update, using=using,
+                                                   update_fields=update_fields)
+                if created or self._saved_state is not None:
+                    CourseEnrollmentCount.record_change(self.course_id, self._saved_state, new_state)
+            self._saved_state = new_state
+        else:
+            super(CourseEnrollment, self).save(force_insert=force_insert, force_update=force_update, using=using,
+                                               update_fields=update_fields)
 
         # Delete the cached status hash, forcing the value to be recalculated the next time it is needed.
         cache.delete(self.enrollment_status_hash_cache_key(self.user))
@@ -1998,12 +2213,8 @@ class CourseEnrollment(models.Model):
         Returns: bool
 
         """
-        enrollment = cls.get_enrollment(user, course_key)
-        return (
-            enrollment is not None and
-            enrollment.is_active and
-            enrollment.is_verified_enrollment()
-        )
+        enrollment_state = cls._get_enrollment_state(user, course_key)
+        return bool(enrollment_state.is_active) and CourseMode.is_verified_slug(enrollment_state.mode)
 
     @classmethod
     def cache_key_name(cls, user_id, course_key):
@@ -2029,6 +2240,11 @@ class CourseEnrollment(models.Model):
             return CourseEnrollmentState(None, None)
         enrollment_state = cls._get_enrollment_in_request_cache(user, course_key)
         if not enrollment_state:
+            snapshot = cls._get_enrollment_snapshot(user)
+            if snapshot is not None:
+                enrollment_state = snapshot.get(course_key, CourseEnrollmentState(None, None))
+                cls._update_enrollment_in_request_cache(user, course_key, enrollment_state)
+                return enrollment_state
             try:
                 record = cls.objects.get(user=user, course_id=course_key)
                 enrollment_state = CourseEnrollmentState(record.mode, record.is_active)
@@ -2037,6 +2253,69 @@ class CourseEnrollment(models.Model):
             cls._update_enrollment_in_request_cache(user, course_key, enrollment_state)
         return enrollment_state
 
+    @classmethod
+    def _get_enrollment_snapshot(cls, user):
+        """
+        Returns a dict of the CourseEnrollmentState of each of the enrollments
+        of the user, by course key.  The enrollments are loaded at once the
+        first time they're needed in a request.
+
+        Returns None unless the snapshot is enabled and the user is the user
+        of the current request, so that the enrollments of every user looked
+        up in a request aren't all loaded.
+        """
+        if not settings.FEATURES.get('ENABLE_ENROLLMENT_SNAPSHOT', False):
+            return None
+        current_user = crum.get_current_user()
+        if current_user is None or current_user.id != user.id:
+            return None
+
+        snapshot_cache = RequestCache(cls.SNAPSHOT_CACHE_NAMESPACE)
+        cached_snapshot = snapshot_cache.get_cached_response(user.id)
+        if cached_snapshot.is_found:
+            queries_saved = snapshot_cache.data.get('queries_saved', 0) + 1
+            snapshot_cache.set('queries_saved', queries_saved)
+            set_custom_metric('enrollment_snapshot_queries_saved', queries_saved)
+            return cached_snapshot.value
+
+        snapshot = {
+            course_id: CourseEnrollmentState(mode, is_active)
+            for course_id, mode, is_active in cls.objects.filter(user=user).values_list(
+                'course_id', 'mode', 'is_active'
+            )
+        }
+        snapshot_cache.set(user.id, snapshot)
+        return snapshot
+
+    @classmethod
+    def enrollment_snapshot_queries_saved(cls):
+        """
+        Returns the number of enrollment lookups answered from the enrollment
+        snapshot in the current request, each of which would have been a query.
+        """
+        return RequestCache(cls.SNAPSHOT_CACHE_NAMESPACE).data.get('queries_saved', 0)
+
+    @classmethod
+    def _update_enrollment_snapshot(cls, user_id, course_key, enrollment_state):
+        """
+        Updates the state of the enrollment in the snapshot of the enrollments
+        of the user, if loaded.  A state of None removes the enrollment.
+        """
+        cached_snapshot = RequestCache(cls.SNAPSHOT_CACHE_NAMESPACE).get_cached_response(user_id)
+        if not cached_snapshot.is_found:
+            return
+        if enrollment_state is None:
+            cached_snapshot.value.pop(course_key, None)
+        else:
+            cached_snapshot.value[course_key] = enrollment_state
+
+    @classmethod
+    def clear_enrollment_snapshot(cls, user_id):
+        """
+        Drops the snapshot of the enrollments of the user, to be loaded again.
+        """
+        RequestCache(cls.SNAPSHOT_CACHE_NAMESPACE).delete(user_id)
+
     @classmethod
     def bulk_fetch_enrollment_states(cls, users, course_key):
         """
@@ -2115,6 +2394,30 @@ def invalidate_enrollment_mode_cache(sender, instance, **kwargs):  # pylint: dis
     cache.delete(cache_key)
 
 
+@receiver(models.signals.post_save, sender=CourseEnrollment)
+@receiver(models.signals.post_delete, sender=CourseEnrollment)
+def update_enrollment_snapshot(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Update the enrollment in the snapshot of the enrollments of its user.
+    """
+    if kwargs.get('signal') == models.signals.post_delete:
+        enrollment_state = None
+    else:
+        enrollment_state = CourseEnrollmentState(instance.mode, instance.is_active)
+    CourseEnrollment._update_enrollment_snapshot(  # pylint: disable=protected-access
+        instance.user_id, instance.course_id, enrollment_state
+    )
+
+
+@receiver(ENROLL_STATUS_CHANGE)
+def clear_enrollment_snapshot(sender, user, **kwargs):  # pylint: disable=unused-argument
+    """
+    Drop the snapshot of the enrollments of a user whose enrollment status changed.
+    """
+    if user is not None and user.id is not None:
+        CourseEnrollment.clear_enrollment_snapshot(user.id)
+
+
 @receiver(models.signals.post_save, sender=CourseEnrollment)
 def update_expiry_email_date(sender, instance, **kwargs):  # pylint: disable=unused-argument
     """
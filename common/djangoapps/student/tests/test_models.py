@@ -4,17 +4,21 @@ import hashlib
 import ddt
 import factory
 import pytz
+from crum import impersonate
 from django.contrib.auth.models import AnonymousUser
 from django.core.cache import cache
 from django.db.models import signals
 from django.db.models.functions import Lower
 from django.test import TestCase
+from edx_django_utils.cache import RequestCache
+from mock import patch
 from opaque_keys.edx.keys import CourseKey
 
 from course_modes.models import CourseMode
 from course_modes.tests.factories import CourseModeFactory
 from lms.djangoapps.courseware.models import DynamicUpgradeDeadlineConfiguration
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+from openedx.core.djangoapps.content.course_overviews.tests.factories import CourseOverviewFactory
 from openedx.core.djangoapps.schedules.models import Schedule
 from openedx.core.djangoapps.schedules.tests.factories import ScheduleFactory
 from openedx.core.djangolib.testing.utils import skip_unless_lms
@@ -23,10 +27,13 @@ from student.models import (
     AccountRecovery,
     CourseEnrollment,
     CourseEnrollmentAllowed,
+    CourseEnrollmentCount,
+    CourseEnrollmentState,
     ManualEnrollmentAudit,
     PendingEmailChange,
     PendingNameChange
 )
+from student.roles import CourseStaffRole
 from student.tests.factories import AccountRecoveryFactory, CourseEnrollmentFactory, UserFactory
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory
@@ -243,6 +250,139 @@ class CourseEnrollmentTests(SharedModuleStoreTestCase):
         self.assertEqual(enrollment_refetched.all()[0], enrollment)
 
 
+@patch.dict('django.conf.settings.FEATURES', {'ENABLE_ENROLLMENT_SNAPSHOT': True})
+class CourseEnrollmentSnapshotTests(TestCase):
+    """
+    Tests of the snapshot of the enrollments of the user of a request.
+    """
+    def setUp(self):
+        super(CourseEnrollmentSnapshotTests, self).setUp()
+        self.user = UserFactory()
+        self.course_keys = [CourseOverviewFactory().id for __ in range(3)]
+        CourseEnrollmentFactory(user=self.user, course_id=self.course_keys[0], mode=CourseMode.VERIFIED)
+        CourseEnrollmentFactory(user=self.user, course_id=self.course_keys[1], mode=CourseMode.AUDIT, is_active=False)
+        RequestCache.clear_all_namespaces()
+
+    def test_lookups_share_snapshot(self):
+        with impersonate(self.user):
+            with self.assertNumQueries(1):
+                self.assertTrue(CourseEnrollment.is_enrolled(self.user, self.course_keys[0]))
+                self.assertTrue(CourseEnrollment.is_enrolled_as_verified(self.user, self.course_keys[0]))
+                self.assertEqual(
+                    CourseEnrollment.enrollment_mode_for_user(self.user, self.course_keys[1]),
+                    (CourseMode.AUDIT, False)
+                )
+                self.assertFalse(CourseEnrollment.is_enrolled(self.user, self.course_keys[2]))
+        self.assertEqual(CourseEnrollment.enrollment_snapshot_queries_saved(), 2)
+
+    def test_other_users_not_snapshotted(self):
+        other_user = UserFactory()
+        CourseEnrollmentFactory(user=other_user, course_id=self.course_keys[0])
+        with impersonate(self.user):
+            with self.assertNumQueries(2):
+                self.assertTrue(CourseEnrollment.is_enrolled(other_user, self.course_keys[0]))
+                self.assertFalse(CourseEnrollment.is_enrolled(other_user, self.course_keys[1]))
+        self.assertEqual(CourseEnrollment.enrollment_snapshot_queries_saved(), 0)
+
+    def test_snapshot_follows_enrollment_changes(self):
+        with impersonate(self.user):
+            self.assertFalse(CourseEnrollment.is_enrolled(self.user, self.course_keys[2]))
+            CourseEnrollment.enroll(self.user, self.course_keys[2])
+            self.assertTrue(CourseEnrollment.is_enrolled(self.user, self.course_keys[2]))
+
+            enrollment = CourseEnrollment.objects.get(user=self.user, course_id=self.course_keys[0])
+            enrollment.mode = CourseMode.HONOR
+            enrollment.save()
+            RequestCache(CourseEnrollment.MODE_CACHE_NAMESPACE).clear()
+            self.assertEqual(
+                CourseEnrollment.enrollment_mode_for_user(self.user, self.course_keys[0]),
+                (CourseMode.HONOR, True)
+            )
+
+
+@patch.dict('django.conf.settings.FEATURES', {'ENABLE_ENROLLMENT_COUNTS': True})
+class CourseEnrollmentCountTests(SharedModuleStoreTestCase):
+    """
+    Tests of the enrollment counts kept in CourseEnrollmentCount.
+    """
+    @classmethod
+    def setUpClass(cls):
+        super(CourseEnrollmentCountTests, cls).setUpClass()
+        cls.course = CourseFactory()
+
+    def setUp(self):
+        super(CourseEnrollmentCountTests, self).setUp()
+        self.users = [UserFactory() for __ in range(3)]
+
+    def assert_counts(self, expected):
+        """
+        Asserts that the counts of the course, cached and not, are `expected` and match the enrollments.
+        """
+        self.assertEqual(CourseEnrollmentCount.get_counts(self.course.id, use_cache=False), expected)
+        cache.delete(CourseEnrollmentCount.cache_key(self.course.id))
+        self.assertEqual(CourseEnrollmentCount.get_counts(self.course.id), expected)
+        with patch.dict('django.conf.settings.FEATURES', {'ENABLE_ENROLLMENT_COUNTS': False}):
+            self.assertEqual(
+                CourseEnrollment.objects.enrollment_counts(self.course.id),
+                dict(expected, total=sum(expected.values()))
+            )
+
+    def test_enroll_and_unenroll(self):
+        self.assertIsNone(CourseEnrollmentCount.get_counts(self.course.id))
+
+        CourseEnrollment.enroll(self.users[0], self.course.id, mode=CourseMode.AUDIT)
+        CourseEnrollment.enroll(self.users[1], self.course.id, mode=CourseMode.AUDIT)
+        self.assert_counts({CourseMode.AUDIT: 2})
+
+        CourseEnrollment.enroll(self.users[1], self.course.id, mode=CourseMode.VERIFIED)
+        self.assert_counts({CourseMode.AUDIT: 1, CourseMode.VERIFIED: 1})
+
+        CourseEnrollment.unenroll(self.users[0], self.course.id)
+        self.assert_counts({CourseMode.VERIFIED: 1})
+        self.assertEqual(CourseEnrollment.objects.num_enrolled_in(self.course.id), 1)
+
+    def test_change_is_single_update(self):
+        for user in self.users[:2]:
+            CourseEnrollment.enroll(user, self.course.id, mode=CourseMode.AUDIT)
+        # The counting started with the first enrollment, in slot 0.
+        with patch('student.models.random.randrange', return_value=0):
+            with self.assertNumQueries(1):
+                CourseEnrollmentCount.record_change(
+                    self.course.id, CourseEnrollmentState(CourseMode.AUDIT, True), None
+                )
+        self.assertEqual(CourseEnrollmentCount.get_counts(self.course.id, use_cache=False), {CourseMode.AUDIT: 1})
+
+    def test_cached_counts_not_invalidated(self):
+        CourseEnrollment.enroll(self.users[0], self.course.id, mode=CourseMode.AUDIT)
+        self.assert_counts({CourseMode.AUDIT: 1})
+
+        CourseEnrollment.enroll(self.users[1], self.course.id, mode=CourseMode.AUDIT)
+        self.assertEqual(CourseEnrollmentCount.get_counts(self.course.id), {CourseMode.AUDIT: 1})
+        self.assertEqual(CourseEnrollmentCount.get_counts(self.course.id, use_cache=False), {CourseMode.AUDIT: 2})
+
+    def test_counting_starts_from_existing_enrollments(self):
+        with patch.dict('django.conf.settings.FEATURES', {'ENABLE_ENROLLMENT_COUNTS': False}):
+            for user in self.users[:2]:
+                CourseEnrollment.enroll(user, self.course.id, mode=CourseMode.AUDIT)
+        self.assertIsNone(CourseEnrollmentCount.get_counts(self.course.id))
+
+        CourseEnrollment.enroll(self.users[2], self.course.id, mode=CourseMode.HONOR)
+        self.assert_counts({CourseMode.AUDIT: 2, CourseMode.HONOR: 1})
+
+    def test_is_course_full(self):
+        course_overview = CourseOverview.get_from_id(self.course.id)
+        course_overview.max_student_enrollments_allowed = 2
+        staff = UserFactory()
+        CourseStaffRole(self.course.id).add_users(staff)
+        CourseEnrollment.enroll(staff, self.course.id)
+        CourseEnrollment.enroll(self.users[0], self.course.id)
+        self.assertFalse(CourseEnrollment.objects.is_course_full(course_overview))
+
+        CourseEnrollment.enroll(self.users[1], self.course.id)
+        self.assertTrue(CourseEnrollment.objects.is_course_full(course_overview))
+        self.assertEqual(CourseEnrollment.objects.num_enrolled_in_exclude_admins(self.course.id), 2)
+
+
 class PendingNameChangeTests(SharedModuleStoreTestCase):
     """
     Tests the deletion of PendingNameChange records
@@ -14,7 +14,8 @@ import six
 from completion.test_utils import CompletionWaffleTestMixin, submit_completions_for_testing
 from django.conf import settings
 from django.test import TestCase
-from django.test.utils import override_settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
 from django.urls import reverse
 from django.utils.timezone import now
 from milestones.tests.utils import MilestonesTestCaseMixin
@@ -185,6 +186,8 @@ class StudentDashboardTests(SharedModuleStoreTestCase, MilestonesTestCaseMixin,
             'DASHBOARD_TWITTER': True,
         },
     }
+    # Course modes, certificates, bulk email configuration and authorizations, and registration codes.
+    DASHBOARD_DATA_QUERIES = 6
     MOCK_SETTINGS_HIDE_COURSES = {
         'FEATURES': {
             'HIDE_DASHBOARD_COURSES_UNTIL_ACTIVATED': True,
@@ -527,12 +530,11 @@ class StudentDashboardTests(SharedModuleStoreTestCase, MilestonesTestCaseMixin,
         self.assertContains(response, 'Related Programs:')
 
     @patch('openedx.core.djangoapps.catalog.utils.get_course_runs_for_course')
-    @patch('student.views.dashboard.is_bulk_email_feature_enabled')
-    def test_email_settings_fulfilled_entitlement(self, mock_email_feature, mock_get_course_runs):
+    @patch('student.views.dashboard.get_bulk_email_feature_enabled_courses', side_effect=set)
+    def test_email_settings_fulfilled_entitlement(self, _mock_email_feature, mock_get_course_runs):
         """
         Assert that the Email Settings action is shown when the user has a fulfilled entitlement.
         """
-        mock_email_feature.return_value = True
         course_overview = CourseOverviewFactory(
             start=self.TOMORROW, self_paced=True, enrollment_end=self.TOMORROW
         )
@@ -548,12 +550,11 @@ class StudentDashboardTests(SharedModuleStoreTestCase, MilestonesTestCaseMixin,
         self.assertEqual(pq(response.content)(self.EMAIL_SETTINGS_ELEMENT_ID).length, 1)
 
     @patch.object(CourseOverview, 'get_from_id')
-    @patch('student.views.dashboard.is_bulk_email_feature_enabled')
-    def test_email_settings_unfulfilled_entitlement(self, mock_email_feature, mock_course_overview):
+    @patch('student.views.dashboard.get_bulk_email_feature_enabled_courses', side_effect=set)
+    def test_email_settings_unfulfilled_entitlement(self, _mock_email_feature, mock_course_overview):
         """
         Assert that the Email Settings action is not shown when the entitlement is not fulfilled.
         """
-        mock_email_feature.return_value = True
         mock_course_overview.return_value = CourseOverviewFactory(start=self.TOMORROW)
         CourseEntitlementFactory(user=self.user)
         response = self.client.get(self.path)
@@ -610,6 +611,61 @@ class StudentDashboardTests(SharedModuleStoreTestCase, MilestonesTestCaseMixin,
         response = self.client.get(reverse('dashboard'))
         self.assertContains(response, '1 results successfully populated')
 
+    def _get_dashboard_data_queries(self, num_enrollments):
+        """
+        Returns the number of queries made to load the DashboardData of the
+        user with `num_enrollments` enrollments, each with a certificate.
+        """
+        # Imported here as the dashboard is only available in the LMS.
+        from student.views.dashboard import DashboardData
+        enrollments = []
+        for __ in range(num_enrollments):
+            course_overview = CourseOverviewFactory()
+            enrollments.append(CourseEnrollmentFactory(user=self.user, course_id=course_overview.id))
+            GeneratedCertificateFactory(user=self.user, course_id=course_overview.id, mode='honor')
+        with CaptureQueriesContext(connection) as queries:
+            DashboardData(self.user, enrollments)
+        return len(queries)
+
+    @ddt.data(1, 5)
+    def test_dashboard_data_queries(self, num_enrollments):
+        """
+        The data of the dashboard is loaded with the same number of queries
+        however many enrollments are shown.
+        """
+        self.assertLessEqual(self._get_dashboard_data_queries(num_enrollments), self.DASHBOARD_DATA_QUERIES)
+
+    def _enroll_with_certificate(self):
+        """
+        Enrolls the user in a new course, with a certificate.
+        """
+        course_overview = CourseOverviewFactory()
+        CourseEnrollmentFactory(user=self.user, course_id=course_overview.id)
+        GeneratedCertificateFactory(user=self.user, course_id=course_overview.id, mode='honor')
+
+    def _get_dashboard_queries(self):
+        """
+        Returns the number of queries made to render the dashboard.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.path)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_dashboard_queries(self):
+        """
+        The dashboard is rendered with the same number of queries however
+        many enrollments are shown.
+        """
+        # Fill the caches that don't depend on the enrollments.
+        self._get_dashboard_queries()
+
+        self._enroll_with_certificate()
+        single_enrollment_queries = self._get_dashboard_queries()
+        for __ in range(4):
+            self._enroll_with_certificate()
+        self.assertEqual(self._get_dashboard_queries(), single_enrollment_queries)
+
     @staticmethod
     def _remove_whitespace_from_html_string(html):
         return ''.join(html.split())
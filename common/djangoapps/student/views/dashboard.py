@@ -20,11 +20,12 @@ from pytz import UTC
 from six import iteritems, text_type
 
 import track.views
-from bulk_email.api import is_bulk_email_feature_enabled
+from bulk_email.api import get_bulk_email_feature_enabled_courses
 from bulk_email.models import Optout
 from course_modes.models import CourseMode
 from edxmako.shortcuts import render_to_response, render_to_string
 from entitlements.models import CourseEntitlement
+from lms.djangoapps.certificates.models import certificate_statuses_for_student
 from lms.djangoapps.commerce.utils import EcommerceService
 from lms.djangoapps.courseware.access import has_access
 from lms.djangoapps.experiments.utils import get_dashboard_course_info
@@ -288,6 +289,57 @@ def get_filtered_course_entitlements(user, org_whitelist, org_blacklist):
     return filtered_entitlements, course_entitlement_available_sessions, unfulfilled_entitlement_pseudo_sessions
 
 
+class DashboardData(object):
+    """
+    The data shown on the dashboard for each of the enrollments of a user,
+    loaded for all of the enrollments at once so that the number of queries
+    doesn't grow with the number of enrollments.
+    """
+    def __init__(self, user, course_enrollments):
+        """
+        Arguments:
+            user (User): the user whose dashboard is shown.
+            course_enrollments (list[CourseEnrollment]): the enrollments shown on the dashboard.
+        """
+        self.user = user
+        course_ids = [enrollment.course_id for enrollment in course_enrollments]
+
+        # Retrieve the course modes for each course
+        __, unexpired_course_modes = CourseMode.all_and_unexpired_modes_for_courses(course_ids)
+        self.course_modes_by_course = {
+            course_id: {
+                mode.slug: mode
+                for mode in modes
+            }
+            for course_id, modes in iteritems(unexpired_course_modes)
+        }
+
+        self.cert_statuses = certificate_statuses_for_student(user, course_ids)
+        self.email_enabled_course_ids = get_bulk_email_feature_enabled_courses(course_ids)
+
+        self.redeemed_registration_codes = defaultdict(list)
+        redeemed_registration_codes = CourseRegistrationCode.objects.filter(
+            course_id__in=course_ids,
+            registrationcoderedemption__redeemed_by=user
+        ).select_related('invoice_item__invoice')
+        for redeemed_registration_code in redeemed_registration_codes:
+            self.redeemed_registration_codes[redeemed_registration_code.course_id].append(redeemed_registration_code)
+
+    def is_paid_course(self, enrollment):
+        """
+        Returns whether the enrollment is in a paid course, see CourseEnrollment.is_paid_course.
+        """
+        selectable_modes = {
+            slug: mode
+            for slug, mode in iteritems(self.course_modes_by_course.get(enrollment.course_id, {}))
+            if slug not in CourseMode.CREDIT_MODES
+        }
+        return (
+            CourseMode.is_white_label(enrollment.course_id, modes_dict=selectable_modes) or
+            CourseMode.is_professional_slug(enrollment.mode)
+        )
+
+
 def complete_course_mode_info(course_id, enrollment, modes=None):
     """
     We would like to compute some more information from the given course modes
@@ -617,16 +669,9 @@ def student_dashboard(request):
     # Sort the enrollment pairs by the enrollment date
     course_enrollments.sort(key=lambda x: x.created, reverse=True)
 
-    # Retrieve the course modes for each course
-    enrolled_course_ids = [enrollment.course_id for enrollment in course_enrollments]
-    __, unexpired_course_modes = CourseMode.all_and_unexpired_modes_for_courses(enrolled_course_ids)
-    course_modes_by_course = {
-        course_id: {
-            mode.slug: mode
-            for mode in modes
-        }
-        for course_id, modes in iteritems(unexpired_course_modes)
-    }
+    # Load the course modes, certificates and other per-course data of all enrollments at once
+    dashboard_data = DashboardData(user, course_enrollments)
+    course_modes_by_course = dashboard_data.course_modes_by_course
 
     # Check to see if the student has recently enrolled in a course.
     # If so, display a notification message confirming the enrollment.
@@ -756,14 +801,16 @@ def student_dashboard(request):
     # there is no verification messaging to display.
     verify_status_by_course = check_verify_status_by_course(user, course_enrollments)
     cert_statuses = {
-        enrollment.course_id: cert_info(request.user, enrollment.course_overview)
+        enrollment.course_id: cert_info(
+            request.user, enrollment.course_overview, dashboard_data.cert_statuses[enrollment.course_id]
+        )
         for enrollment in course_enrollments
     }
 
     # only show email settings for Mongo course and when bulk email is turned on
     show_email_settings_for = frozenset(
         enrollment.course_id for enrollment in course_enrollments if (
-            is_bulk_email_feature_enabled(enrollment.course_id)
+            enrollment.course_id in dashboard_data.email_enabled_course_ids
         )
     )
 
@@ -780,17 +827,14 @@ def student_dashboard(request):
         enrollment.course_id for enrollment in course_enrollments
         if is_course_blocked(
             request,
-            CourseRegistrationCode.objects.filter(
-                course_id=enrollment.course_id,
-                registrationcoderedemption__redeemed_by=request.user
-            ),
+            dashboard_data.redeemed_registration_codes[enrollment.course_id],
             enrollment.course_id
         )
     )
 
     enrolled_courses_either_paid = frozenset(
         enrollment.course_id for enrollment in course_enrollments
-        if enrollment.is_paid_course()
+        if dashboard_data.is_paid_course(enrollment)
     )
 
     # If there are *any* denied reverifications that have not been toggled off,
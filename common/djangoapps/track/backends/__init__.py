@@ -18,6 +18,11 @@ class BaseBackend(six.with_metaclass(abc.ABCMeta, object)):
 
     """
 
+    # Whether the backend writes events as JSON strings, in which case the
+    # tracker serializes each event once and shares the result between
+    # backends through send_serialized.
+    uses_serialized_events = False
+
     def __init__(self, **kwargs):
         pass
 
@@ -25,3 +30,12 @@ class BaseBackend(six.with_metaclass(abc.ABCMeta, object)):
     def send(self, event):
         """Send event to tracker."""
         pass
+
+    def send_serialized(self, event, event_str):  # pylint: disable=unused-argument
+        """Send event, already serialized to the JSON string `event_str`, to tracker."""
+        self.send(event)
+
+    def send_many(self, events):
+        """Send a batch of events to tracker."""
+        for event in events:
+            self.send(event)
@@ -0,0 +1,202 @@
+"""
+Event tracker backend that buffers events in process and hands them to
+another backend in batches from a background thread.
+
+Example configuration, wrapping the MongoDB backend::
+
+  TRACKING_BACKENDS = {
+      'mongo': {
+          'ENGINE': 'track.backends.buffered.BufferedBackend',
+          'OPTIONS': {
+              'backend': {
+                  'ENGINE': 'track.backends.mongodb.MongoBackend',
+                  'OPTIONS': {'database': 'track'},
+              },
+              'max_queue_size': 10000,
+              'batch_size': 100,
+              'flush_interval': 1.0,
+              'overflow_policy': 'drop_newest',
+          }
+      }
+  }
+
+"""
+
+
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+from edx_django_utils.monitoring import set_custom_metric
+
+from track.backends import BaseBackend
+
+log = logging.getLogger(__name__)
+
+# What to do with a new event when the queue is full.
+DROP_NEWEST = 'drop_newest'
+DROP_OLDEST = 'drop_oldest'
+BLOCK = 'block'
+OVERFLOW_POLICIES = (DROP_NEWEST, DROP_OLDEST, BLOCK)
+
+
+class BufferedBackend(BaseBackend):
+    """
+    Event tracker backend that queues events and sends them to the wrapped
+    backend in batches, off the request thread.
+
+    The queue is bounded.  When it is full, `overflow_policy` decides whether
+    the new event is dropped (`drop_newest`), the oldest queued event is
+    dropped to make room (`drop_oldest`), or the caller waits up to
+    `block_timeout` seconds for the queue to drain before dropping the event
+    (`block`).
+    """
+
+    def __init__(self, backend, max_queue_size=10000, batch_size=100, flush_interval=1.0,
+                 overflow_policy=DROP_NEWEST, block_timeout=0.1, **kwargs):
+        """
+        :Parameters:
+          - `backend`: configuration of the wrapped backend, a dict with
+            `ENGINE` and `OPTIONS` keys as in TRACKING_BACKENDS.
+          - `max_queue_size`: maximum number of events waiting to be sent.
+          - `batch_size`: maximum number of events handed to the wrapped
+            backend at once.
+          - `flush_interval`: maximum number of seconds an event waits in
+            the queue before being sent.
+          - `overflow_policy`: one of `drop_newest`, `drop_oldest`, `block`.
+          - `block_timeout`: seconds to wait for room in the queue under
+            the `block` policy.
+
+        """
+        super(BufferedBackend, self).__init__(**kwargs)
+
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError('Invalid overflow policy %s' % overflow_policy)
+
+        # Imported here because the tracker instantiates backends while it is being imported.
+        from track.tracker import _instantiate_backend_from_name
+        self.backend = _instantiate_backend_from_name(backend['ENGINE'], backend.get('OPTIONS', {}))
+
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow_policy = overflow_policy
+        self.block_timeout = block_timeout
+
+        self._queue = deque()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        # Held while sending, so that the exit flush and the thread's flush don't interleave batches.
+        self._flush_lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+
+        self.sent_count = 0
+        self.dropped_count = 0
+        self.last_flush_latency = 0.0
+        self.max_flush_latency = 0.0
+
+        atexit.register(self.flush)
+
+    @property
+    def queue_depth(self):
+        """The number of events waiting to be sent."""
+        return len(self._queue)
+
+    def send(self, event):
+        """Queue the event to be sent by the background thread."""
+        self._ensure_thread()
+        with self._lock:
+            if len(self._queue) >= self.max_queue_size:
+                if not self._make_room():
+                    self.dropped_count += 1
+                    set_custom_metric('tracking_buffer_dropped_events', self.dropped_count)
+                    return
+            self._queue.append(event)
+            depth = len(self._queue)
+            if depth >= self.batch_size:
+                self._not_empty.notify()
+        # Set here rather than in flush, which runs on the background thread, outside of any request.
+        set_custom_metric('tracking_buffer_queue_depth', depth)
+        set_custom_metric('tracking_buffer_flush_latency', self.last_flush_latency)
+
+    def _make_room(self):
+        """
+        Apply the overflow policy to a full queue, with the lock held.
+
+        Returns whether there is now room for a new event.
+        """
+        if self.overflow_policy == DROP_OLDEST:
+            self._queue.popleft()
+            self.dropped_count += 1
+            set_custom_metric('tracking_buffer_dropped_events', self.dropped_count)
+            return True
+        if self.overflow_policy == BLOCK:
+            self._not_empty.notify()
+            self._not_full.wait(self.block_timeout)
+            return len(self._queue) < self.max_queue_size
+        return False
+
+    def _ensure_thread(self):
+        """
+        Start the background thread, once per process.
+
+        The pid is checked so that worker processes forked after the backend
+        was created start their own thread.
+        """
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='track-buffered-backend')
+            self._thread.daemon = True
+            self._thread.start()
+
+    def _run(self):
+        """Send queued events until the process exits."""
+        while True:
+            with self._lock:
+                if len(self._queue) < self.batch_size:
+                    self._not_empty.wait(self.flush_interval)
+            self.flush()
+
+    def _take_batch(self):
+        """Remove and return up to `batch_size` queued events."""
+        with self._lock:
+            batch = [self._queue.popleft() for __ in range(min(self.batch_size, len(self._queue)))]
+            if batch:
+                self._not_full.notify_all()
+        return batch
+
+    def flush(self):
+        """Send all of the queued events to the wrapped backend."""
+        with self._flush_lock:
+            batch = self._take_batch()
+            while batch:
+                start = time.time()
+                try:
+                    self.backend.send_many(batch)
+                except Exception:  # pylint: disable=broad-except
+                    # As with the unbuffered backends, events that can't be sent are lost.
+                    log.exception(u'Error sending a batch of %d events to %s', len(batch), self.backend)
+                else:
+                    self.sent_count += len(batch)
+                self.last_flush_latency = time.time() - start
+                self.max_flush_latency = max(self.max_flush_latency, self.last_flush_latency)
+                batch = self._take_batch()
+
+    def stats(self):
+        """Return the queue depth and flush latency metrics of the backend."""
+        return {
+            'queue_depth': self.queue_depth,
+            'sent_count': self.sent_count,
+            'dropped_count': self.dropped_count,
+            'last_flush_latency': self.last_flush_latency,
+            'max_flush_latency': self.max_flush_latency,
+        }
@@ -1,13 +1,12 @@
 """Event tracker backend that saves events to a python logger."""
 
 
-import json
 import logging
 
 from django.conf import settings
 
 from track.backends import BaseBackend
-from track.utils import DateTimeJSONEncoder
+from track.utils import encode_event
 
 log = logging.getLogger('track.backends.logger')
 application_log = logging.getLogger('track.backends.application_log')  # pylint: disable=invalid-name
@@ -20,6 +19,8 @@ class LoggerBackend(BaseBackend):
 
     """
 
+    uses_serialized_events = True
+
     def __init__(self, name, **kwargs):
         """Event tracker backend that uses a python logger.
 
@@ -34,13 +35,16 @@ class LoggerBackend(BaseBackend):
 
     def send(self, event):
         try:
-            event_str = json.dumps(event, cls=DateTimeJSONEncoder)
+            event_str = encode_event(event)
         except UnicodeDecodeError:
             application_log.exception(
                 "UnicodeDecodeError Event_data: %r", event
             )
             raise
 
+        self.send_serialized(event, event_str)
+
+    def send_serialized(self, event, event_str):
         # TODO: remove trucation of the serialized event, either at a
         # higher level during the emittion of the event, or by
         # providing warnings when the events exceed certain size.
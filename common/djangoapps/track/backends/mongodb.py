@@ -98,3 +98,13 @@ class MongoBackend(BaseBackend):
             # during the next event.
             msg = 'Error inserting to MongoDB event tracker backend'
             log.exception(msg)
+
+    def send_many(self, events):
+        """Insert a batch of events in to the Mongo collection"""
+        try:
+            # insert_many adds an _id to the documents it is given, so don't
+            # let it modify events that may be shared with other backends.
+            self.collection.insert_many([dict(event) for event in events], ordered=False)
+        except (PyMongoError, BSONError):
+            msg = 'Error inserting a batch of events to MongoDB event tracker backend'
+            log.exception(msg)
@@ -0,0 +1,147 @@
+"""Tests for the buffered event tracker backend."""
+
+
+import threading
+
+from django.test import TestCase
+from mock import patch
+
+from track.backends import BaseBackend
+from track.backends.buffered import BufferedBackend
+from track.backends.mongodb import MongoBackend
+
+
+class InMemoryBackend(BaseBackend):
+    """Backend that records the batches it is sent."""
+
+    def __init__(self, **kwargs):
+        super(InMemoryBackend, self).__init__(**kwargs)
+        self.batches = []
+        self.sent = threading.Event()
+
+    def send(self, event):
+        self.send_many([event])
+
+    def send_many(self, events):
+        self.batches.append(list(events))
+        self.sent.set()
+
+
+class TestBufferedBackend(TestCase):
+    """Tests for BufferedBackend."""
+
+    def create_backend(self, **options):
+        """Returns a BufferedBackend wrapping an InMemoryBackend, without its background thread."""
+        patcher = patch.object(BufferedBackend, '_ensure_thread')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return BufferedBackend(
+            backend={'ENGINE': 'track.backends.tests.test_buffered.InMemoryBackend'},
+            **options
+        )
+
+    def test_batches(self):
+        backend = self.create_backend(batch_size=2)
+        for index in range(5):
+            backend.send({'test': index})
+        self.assertEqual(backend.queue_depth, 5)
+        self.assertEqual(backend.backend.batches, [])
+
+        backend.flush()
+        self.assertEqual(
+            backend.backend.batches,
+            [[{'test': 0}, {'test': 1}], [{'test': 2}, {'test': 3}], [{'test': 4}]]
+        )
+        self.assertEqual(backend.stats()['queue_depth'], 0)
+        self.assertEqual(backend.stats()['sent_count'], 5)
+
+    def test_drop_newest(self):
+        backend = self.create_backend(max_queue_size=2)
+        for index in range(3):
+            backend.send({'test': index})
+        backend.flush()
+        self.assertEqual(backend.backend.batches, [[{'test': 0}, {'test': 1}]])
+        self.assertEqual(backend.stats()['dropped_count'], 1)
+
+    def test_drop_oldest(self):
+        backend = self.create_backend(max_queue_size=2, overflow_policy='drop_oldest')
+        for index in range(3):
+            backend.send({'test': index})
+        backend.flush()
+        self.assertEqual(backend.backend.batches, [[{'test': 1}, {'test': 2}]])
+        self.assertEqual(backend.stats()['dropped_count'], 1)
+
+    def test_block_times_out(self):
+        backend = self.create_backend(max_queue_size=1, overflow_policy='block', block_timeout=0.01)
+        backend.send({'test': 0})
+        backend.send({'test': 1})
+        self.assertEqual(backend.queue_depth, 1)
+        self.assertEqual(backend.stats()['dropped_count'], 1)
+
+    def test_invalid_policy(self):
+        with self.assertRaises(ValueError):
+            self.create_backend(overflow_policy='unknown')
+
+    def test_send_failure(self):
+        backend = self.create_backend()
+        backend.send({'test': 0})
+        with patch.object(backend.backend, 'send_many', side_effect=Exception):
+            backend.flush()
+        self.assertEqual(backend.queue_depth, 0)
+        self.assertEqual(backend.stats()['sent_count'], 0)
+
+    @patch('track.backends.buffered.set_custom_metric')
+    def test_metrics(self, mock_set_custom_metric):
+        backend = self.create_backend(batch_size=2)
+        backend.send({'test': 0})
+        mock_set_custom_metric.assert_any_call('tracking_buffer_queue_depth', 1)
+        mock_set_custom_metric.assert_any_call('tracking_buffer_flush_latency', 0.0)
+
+        backend.flush()
+        mock_set_custom_metric.reset_mock()
+        backend.send({'test': 1})
+        mock_set_custom_metric.assert_any_call('tracking_buffer_queue_depth', 1)
+        mock_set_custom_metric.assert_any_call('tracking_buffer_flush_latency', backend.last_flush_latency)
+
+    @patch('track.backends.buffered.set_custom_metric')
+    def test_drop_metrics(self, mock_set_custom_metric):
+        for overflow_policy in ('drop_newest', 'drop_oldest'):
+            mock_set_custom_metric.reset_mock()
+            backend = self.create_backend(max_queue_size=1, overflow_policy=overflow_policy)
+            backend.send({'test': 0})
+            backend.send({'test': 1})
+            mock_set_custom_metric.assert_any_call('tracking_buffer_dropped_events', 1)
+
+    def test_flush_lock(self):
+        backend = self.create_backend()
+        backend.send({'test': 0})
+        locked = []
+        with patch.object(
+            backend.backend, 'send_many',
+            side_effect=lambda events: locked.append(backend._flush_lock.locked())  # pylint: disable=protected-access
+        ):
+            backend.flush()
+        self.assertEqual(locked, [True])
+
+    def test_background_thread(self):
+        backend = BufferedBackend(
+            backend={'ENGINE': 'track.backends.tests.test_buffered.InMemoryBackend'},
+            batch_size=1,
+        )
+        backend.send({'test': 0})
+        self.assertTrue(backend.backend.sent.wait(5))
+        self.assertEqual(backend.backend.batches, [[{'test': 0}]])
+        self.assertGreaterEqual(backend.stats()['max_flush_latency'], 0)
+
+
+class TestMongoBackendBatches(TestCase):
+    """Tests for sending batches of events to MongoBackend."""
+
+    @patch('track.backends.mongodb.MongoClient')
+    def test_send_many(self, __):
+        backend = MongoBackend()
+        events = [{'test': 1}, {'test': 2}]
+        backend.send_many(events)
+
+        backend.collection.insert_many.assert_called_once_with(events, ordered=False)
+        self.assertIsNot(backend.collection.insert_many.call_args[0][0][0], events[0])
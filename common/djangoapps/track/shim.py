@@ -1,9 +1,8 @@
 """Map new event context values to old top-level field values. Ensures events can be parsed by legacy parsers."""
 
 
-import json
-
 from .transformers import EventTransformerRegistry
+from .utils import encode_event
 
 CONTEXT_FIELDS_TO_INCLUDE = [
     'username',
@@ -28,7 +27,7 @@ class LegacyFieldMappingProcessor(object):
 
         if 'data' in event:
             if context.get('event_source', '') == 'browser' and isinstance(event['data'], dict):
-                event['event'] = json.dumps(event['data'])
+                event['event'] = encode_event(event['data'])
             else:
                 event['event'] = event['data']
             del event['data']
@@ -3,6 +3,7 @@
 from django.conf import settings
 from django.test import TestCase
 from django.test.utils import override_settings
+from mock import patch
 from six.moves import range
 
 import track.tracker as tracker
@@ -26,6 +27,15 @@ MULTI_SETTINGS = {
     }
 }
 
+SERIALIZED_SETTINGS = {
+    'first': {
+        'ENGINE': 'track.tests.test_tracker.DummySerializedBackend',
+    },
+    'second': {
+        'ENGINE': 'track.tests.test_tracker.DummySerializedBackend',
+    }
+}
+
 
 class TestTrackerInstantiation(TestCase):
     """Test that a helper function can instantiate backends from their name."""
@@ -90,6 +100,19 @@ class TestTrackerDjangoInstantiation(TestCase):
         self.assertEqual(backends[0].count, event_count)
         self.assertEqual(backends[1].count, event_count)
 
+    @override_settings(TRACKING_BACKENDS=SERIALIZED_SETTINGS.copy())
+    def test_serialized_once(self):
+        """Test that an event is serialized once for all of the backends writing JSON."""
+
+        backends = list(self._reload_backends().values())
+
+        with patch('track.tracker.encode_event', return_value='{}') as mock_encode_event:
+            tracker.send({})
+
+        mock_encode_event.assert_called_once_with({})
+        for backend in backends:
+            self.assertEqual(backend.serialized, ['{}'])
+
     @override_settings(TRACKING_BACKENDS=MULTI_SETTINGS.copy())
     def test_django_remove_settings(self):
         """Test if a backend can be remove by setting it to None."""
@@ -117,3 +140,14 @@ class DummyBackend(BaseBackend):
 
     def send(self, event):
         self.count += 1
+
+
+class DummySerializedBackend(DummyBackend):
+    uses_serialized_events = True
+
+    def __init__(self, **options):
+        super(DummySerializedBackend, self).__init__(**options)
+        self.serialized = []
+
+    def send_serialized(self, event, event_str):
+        self.serialized.append(event_str)
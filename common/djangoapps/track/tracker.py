@@ -26,6 +26,7 @@ import six
 from django.conf import settings
 
 from track.backends import BaseBackend
+from track.utils import encode_event
 
 __all__ = ['send']
 
@@ -86,10 +87,18 @@ def send(event):
     """
     Send an event object to all the initialized backends.
 
-    """
+    The event is serialized at most once, for all of the backends that
+    write JSON strings.
 
+    """
+    event_str = None
     for name, backend in six.iteritems(backends):
-        backend.send(event)
+        if backend.uses_serialized_events:
+            if event_str is None:
+                event_str = encode_event(event)
+            backend.send_serialized(event, event_str)
+        else:
+            backend.send(event)
 
 
 _initialize_backends_from_django_settings()
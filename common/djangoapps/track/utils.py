@@ -3,10 +3,48 @@
 
 import json
 from datetime import date, datetime
+from uuid import UUID
 
+import six
+from opaque_keys import OpaqueKey
 from pytz import UTC
 
 
+def _encode_default(obj):
+    """
+    Serialize the objects commonly found in events that the json module doesn't handle.
+
+    datetime and date objects are serialized in iso format, datetime objects
+    being converted to UTC.  Opaque keys and UUIDs are serialized as strings.
+    """
+    if isinstance(obj, datetime):
+        if obj.tzinfo is None:
+            # Localize to UTC naive datetime objects
+            obj = UTC.localize(obj)
+        else:
+            # Convert to UTC datetime objects from other timezones
+            obj = obj.astimezone(UTC)
+        return obj.isoformat()
+    elif isinstance(obj, date):
+        return obj.isoformat()
+    elif isinstance(obj, (OpaqueKey, UUID)):
+        return six.text_type(obj)
+
+    raise TypeError(repr(obj) + " is not JSON serializable")
+
+
+# A single encoder instance is reused for every event, rather than building
+# a new encoder for each call as json.dumps(event, cls=...) does.
+_EVENT_ENCODER = json.JSONEncoder(default=_encode_default)
+
+
+def encode_event(event):
+    """
+    Serialize an event to a JSON string.
+    """
+    return _EVENT_ENCODER.encode(event)
+
+
 class DateTimeJSONEncoder(json.JSONEncoder):
     """JSON encoder aware of datetime.datetime and datetime.date objects"""
 
@@ -16,16 +54,7 @@ class DateTimeJSONEncoder(json.JSONEncoder):
 
         datatime objects are converted to UTC.
         """
-
-        if isinstance(obj, datetime):
-            if obj.tzinfo is None:
-                # Localize to UTC naive datetime objects
-                obj = UTC.localize(obj)
-            else:
-                # Convert to UTC datetime objects from other timezones
-                obj = obj.astimezone(UTC)
-            return obj.isoformat()
-        elif isinstance(obj, date):
-            return obj.isoformat()
-
-        return super(DateTimeJSONEncoder, self).default(obj)
+        try:
+            return _encode_default(obj)
+        except TypeError:
+            return super(DateTimeJSONEncoder, self).default(obj)
@@ -121,5 +121,25 @@
                 });
             });
         });
+
+        describe('Lazily rendered units', function() {
+            beforeEach(function() {
+                $('.sequence').data('position', 1)
+                    .append('<div class="seq_contents">Unit 101</div>')
+                    .append('<div class="seq_contents" data-fetch-url="/units/2"></div>');
+                this.sequence = new Sequence($('.xblock-student_view-sequential'));
+            });
+
+            it('fetches a unit again after a failed fetch', function() {
+                spyOn($, 'ajax').and.returnValue($.Deferred().reject().promise());
+                this.sequence.render(2);
+                expect(this.sequence.content_container.text()).toContain('There was an error loading this unit');
+
+                $.ajax.and.returnValue($.Deferred().resolve({html: '<p>Unit 102</p>', resources: []}).promise());
+                this.sequence.render(2);
+                expect(this.sequence.content_container.text()).toBe('Unit 102');
+                expect($.ajax.calls.count()).toBe(2);
+            });
+        });
     });
 }).call(this);
@@ -1,5 +1,5 @@
 /* eslint-disable no-underscore-dangle */
-/* globals Logger, interpolate */
+/* globals Logger, interpolate, $script */
 
 (function() {
     'use strict';
@@ -226,9 +226,23 @@
             this.updateButtonState(nextButtonClass, this.selectNext, isLastTab, this.nextUrl);
         };
 
-        Sequence.prototype.render = function(newPosition) {
+        Sequence.prototype.render = function(newPosition, fetchFailed) {
             var bookmarked, currentTab, modxFullUrl, sequenceLinks,
                 self = this;
+            currentTab = this.contents.eq(newPosition - 1);
+            if (!fetchFailed && currentTab.data('fetch-url') && !currentTab.data('fetched')) {
+                // Units of lazily rendered sequences are fetched the first time they are shown.
+                this.fetchContent(currentTab).done(function() {
+                    if (self.position === newPosition) {
+                        // The unit is showing the error of an earlier failed fetch, replace it.
+                        self.position = null;
+                    }
+                    self.render(newPosition);
+                }).fail(function() {
+                    self.render(newPosition, true);
+                });
+                return;
+            }
             if (this.position !== newPosition) {
                 if (this.position) {
                     this.mark_visited(this.position);
@@ -247,12 +261,18 @@
                 // Added for aborting video bufferization, see ../video/10_main.js
                 this.el.trigger('sequence:change');
                 this.mark_active(newPosition);
-                currentTab = this.contents.eq(newPosition - 1);
                 bookmarked = this.el.find('.active .bookmark-icon').hasClass('bookmarked');
 
                 // update the data-attributes with latest contents only for updated problems.
+                if (fetchFailed) {
+                    // The unit is left unfetched, so that it is fetched again the next time it is shown.
+                    this.content_container.text(
+                        gettext('There was an error loading this unit. Select it again to retry.')
+                    );
+                } else {
+                    this.content_container.html(currentTab.text());  // xss-lint: disable=javascript-jquery-html
+                }
                 this.content_container
-                    .html(currentTab.text())  // xss-lint: disable=javascript-jquery-html
                     .attr('aria-labelledby', currentTab.attr('aria-labelledby'))
                     .data('bookmarked', bookmarked);
 
@@ -270,7 +290,10 @@
                             .data('attempts-used', latestResponse.attempts_used);
                     });
                 }
-                XBlock.initializeBlocks(this.content_container, this.requestToken);
+                // Fetched units were rendered by another request, with a request token of their own.
+                XBlock.initializeBlocks(
+                    this.content_container, currentTab.data('fetched') ? undefined : this.requestToken
+                );
 
                 // For embedded circuit simulator exercises in 6.002x
                 if (window.hasOwnProperty('update_schematics')) {
@@ -287,6 +310,82 @@
             }
         };
 
+        /**
+        * Fetches the rendered content of a unit that was not rendered with the
+        * sequence, and loads the resources it depends upon.
+        * @param tab The .seq_contents element of the unit
+        * @returns {Promise} A promise resolved once the content is in place, or
+        *     rejected if the content or its resources couldn't be loaded
+        */
+        Sequence.prototype.fetchContent = function(tab) {
+            var self = this;
+            return $.ajax({
+                url: tab.data('fetch-url'),
+                type: 'GET',
+                dataType: 'json'
+            }).then(function(response) {
+                var resources = _.map(response.resources, function(hashedResource) {
+                    return hashedResource[1];
+                });
+                return self.loadResources(resources).then(function() {
+                    tab.text(response.html).data('fetched', true);
+                });
+            });
+        };
+
+        Sequence.prototype.loadResources = function(resources) {
+            var self = this,
+                loaded = $.Deferred(),
+                applyResource;
+            window.loadedXBlockResources = window.loadedXBlockResources || [];
+            applyResource = function(index) {
+                var resource = resources[index];
+                if (index >= resources.length) {
+                    loaded.resolve();
+                } else if (_.findWhere(window.loadedXBlockResources, resource)) {
+                    applyResource(index + 1);
+                } else {
+                    window.loadedXBlockResources.push(resource);
+                    self.loadResource(resource).done(function() {
+                        applyResource(index + 1);
+                    }).fail(loaded.reject);
+                }
+            };
+            applyResource(0);
+            return loaded.promise();
+        };
+
+        Sequence.prototype.loadResource = function(resource) {
+            // We give XBlock fragments free-reign to add javascript and CSS to
+            // to the page, so XSS escaping doesn't matter much in this context
+            var $head = $('head'),
+                loaded;
+            if (resource.mimetype === 'text/css') {
+                if (resource.kind === 'text') {
+                    // xss-lint: disable=javascript-jquery-append,javascript-concat-html
+                    $head.append("<style type='text/css'>" + resource.data + '</style>');
+                } else if (resource.kind === 'url') {
+                    // xss-lint: disable=javascript-jquery-append,javascript-concat-html
+                    $head.append("<link rel='stylesheet' href='" + resource.data + "' type='text/css'>");
+                }
+            } else if (resource.mimetype === 'application/javascript') {
+                if (resource.kind === 'text') {
+                    // xss-lint: disable=javascript-jquery-append,javascript-concat-html
+                    $head.append('<script>' + resource.data + '</script>');
+                } else if (resource.kind === 'url') {
+                    loaded = $.Deferred();
+                    $script(resource.data, resource.data, function() {
+                        loaded.resolve();
+                    });
+                    return loaded.promise();
+                }
+            } else if (resource.mimetype === 'text/html' && resource.placement === 'head') {
+                // xss-lint: disable=javascript-jquery-append
+                $head.append(resource.data);
+            }
+            return $.Deferred().resolve().promise();
+        };
+
         Sequence.prototype.goto = function(event) {
             var alertTemplate, alertText, isBottomNav, newPosition, widgetPlacement;
             event.preventDefault();
@@ -311,14 +311,20 @@ def own_metadata(module):
 class InheritingFieldData(KvsFieldData):
     """A `FieldData` implementation that can inherit value from parents to children."""
 
-    def __init__(self, inheritable_names, **kwargs):
+    def __init__(self, inheritable_names, inherited_settings=None, **kwargs):
         """
         `inheritable_names` is a list of names that can be inherited from
         parents.
 
+        `inherited_settings`, if given, is a dict mapping each inheritable name
+        set on an ancestor of the block to the JSON value it inherits, as
+        precomputed from the block's course structure.  It is used instead of
+        walking up the parents as long as the block's field data isn't wrapped.
+
         """
         super(InheritingFieldData, self).__init__(**kwargs)
         self.inheritable_names = set(inheritable_names)
+        self.inherited_settings = inherited_settings
 
     def has_default_value(self, name):
         """
@@ -335,6 +341,14 @@ class InheritingFieldData(KvsFieldData):
         The default for an inheritable name is found on a parent.
         """
         if name in self.inheritable_names:
+            # Wrapped field data (e.g. for a student) may change what the
+            # ancestors have set, so the precomputed values only hold when
+            # the block is read through this field data directly.
+            if self.inherited_settings is not None and block._field_data is self:  # pylint: disable=protected-access
+                if name in self.inherited_settings:
+                    return self.inherited_settings[name]
+                return super(InheritingFieldData, self).default(block, name)
+
             # Walk up the content tree to find the first ancestor
             # that this field is set on. Use the field from the current
             # block so that if it has a different default than the root
@@ -358,10 +372,11 @@ class InheritingFieldData(KvsFieldData):
         return super(InheritingFieldData, self).default(block, name)
 
 
-def inheriting_field_data(kvs):
+def inheriting_field_data(kvs, inherited_settings=None):
     """Create an InheritanceFieldData that inherits the names in InheritanceMixin."""
     return InheritingFieldData(
         inheritable_names=InheritanceMixin.fields.keys(),
+        inherited_settings=inherited_settings,
         kvs=kvs,
     )
 
@@ -312,6 +312,18 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
                     course_summaries[course_id] = course_summary
         return list(course_summaries.values())
 
+    def get_course_index_last_updates(self):
+        """
+        Returns a dict mapping the keys of courses to when they last changed,
+        for the courses of the modulestores that record it in a course index.
+        """
+        last_updates = {}
+        for store in self.modulestores:
+            if hasattr(store, 'get_course_index_last_updates'):
+                for course_key, last_update in six.iteritems(store.get_course_index_last_updates()):
+                    last_updates.setdefault(course_key, last_update)
+        return last_updates
+
     @strip_key
     def get_courses(self, **kwargs):
         '''
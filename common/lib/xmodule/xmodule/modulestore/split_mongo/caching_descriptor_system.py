@@ -37,6 +37,48 @@ new_contract('CourseEnvelope', CourseEnvelope)
 new_contract('XBlock', XBlock)
 
 
+def compute_inherited_settings(structure):
+    """
+    Computes the values the blocks of a course structure inherit from their
+    ancestors.
+
+    Returns a dict mapping the BlockKey of each block to a dict of the JSON
+    value of each inheritable field set on one of its ancestors, taken from
+    the nearest such ancestor.  Children of library_content blocks are left
+    out, as they don't inherit fields that have a default value in their own
+    settings (see InheritingFieldData.default).
+    """
+    blocks = structure['blocks']
+    parent_map = {}
+    for block_key, block in six.iteritems(blocks):
+        for child in block.fields.get('children', []):
+            parent_map[BlockKey(*child)] = block_key
+
+    inheritable_names = list(InheritanceMixin.fields.keys())
+    inherited_settings = {}
+    stack = [(block_key, {}, False) for block_key in blocks if block_key not in parent_map]
+    while stack:
+        block_key, inherited, skip = stack.pop()
+        if not skip:
+            inherited_settings[block_key] = inherited
+        block = blocks.get(block_key)
+        if block is None:
+            continue
+
+        set_names = [name for name in inheritable_names if name in block.fields]
+        if set_names:
+            inherited = dict(inherited)
+            for name in set_names:
+                inherited[name] = block.fields[name]
+
+        for child in block.fields.get('children', []):
+            child = BlockKey(*child)
+            # A block with more than one parent inherits from the one in the parent map, as in xblock_from_json.
+            if parent_map[child] == block_key:
+                stack.append((child, inherited, block.block_type == 'library_content'))
+    return inherited_settings
+
+
 class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
     """
     A system that has a cache of a course version's json that it will use to load modules
@@ -45,7 +87,8 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
     Computes the settings (nee 'metadata') inheritance upon creation.
     """
     @contract(course_entry=CourseEnvelope)
-    def __init__(self, modulestore, course_entry, default_class, module_data, lazy, **kwargs):
+    def __init__(self, modulestore, course_entry, default_class, module_data, lazy,
+                 precompute_inheritance=False, **kwargs):
         """
         Computes the settings inheritance and sets up the cache.
 
@@ -58,6 +101,10 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
 
         module_data: a dict mapping Location -> json that was cached from the
             underlying modulestore
+
+        precompute_inheritance: whether to read inherited field values from a
+            table computed once for the structure, rather than by walking up
+            the parents of a block on each read
         """
         # needed by capa_problem (as runtime.filestore via this.resources_fs)
         if course_entry.course_key.course:
@@ -85,6 +132,7 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
         self.module_data = module_data
         self.default_class = default_class
         self.local_modules = {}
+        self.precompute_inheritance = precompute_inheritance
         self._services['library_tools'] = LibraryToolsService(modulestore)
 
     @lazy
@@ -96,6 +144,16 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
                 parent_map[child] = block_key
         return parent_map
 
+    @lazy
+    def _inherited_settings(self):
+        """
+        The values inherited by the blocks of the structure, see
+        compute_inherited_settings, or None unless inheritance is precomputed.
+        """
+        if not self.precompute_inheritance:
+            return None
+        return self.modulestore.get_inherited_settings(self.course_entry.course_key, self.course_entry.structure)
+
     @contract(usage_key="BlockUsageLocator | BlockKey", course_entry_override="CourseEnvelope | None")
     def _load_item(self, usage_key, course_entry_override=None, **kwargs):
         """
@@ -246,7 +304,10 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
             )
 
             if InheritanceMixin in self.modulestore.xblock_mixins:
-                field_data = inheriting_field_data(kvs)
+                inherited_settings = None
+                if self._inherited_settings is not None and not kwargs.get('field_decorator'):
+                    inherited_settings = self._inherited_settings.get(block_key)
+                field_data = inheriting_field_data(kvs, inherited_settings)
             else:
                 field_data = KvsFieldData(kvs)
 
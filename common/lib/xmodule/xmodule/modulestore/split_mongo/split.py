@@ -104,12 +104,12 @@ from xmodule.modulestore.exceptions import (
     VersionConflictError
 )
 from xmodule.modulestore.split_mongo import BlockKey, CourseEnvelope
-from xmodule.modulestore.split_mongo.mongo_connection import DuplicateKeyError, MongoConnection
+from xmodule.modulestore.split_mongo.mongo_connection import CourseStructureCache, DuplicateKeyError, MongoConnection
 from xmodule.modulestore.store_utilities import DETACHED_XBLOCK_TYPES
 from xmodule.partitions.partitions_service import PartitionService
 
 from ..exceptions import ItemNotFoundError
-from .caching_descriptor_system import CachingDescriptorSystem
+from .caching_descriptor_system import CachingDescriptorSystem, compute_inherited_settings
 
 log = logging.getLogger(__name__)
 
@@ -308,6 +308,18 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
         else:
             return self.db_connection.get_course_index(course_key, ignore_case)
 
+    def get_course_index_last_updates(self):
+        """
+        Return a dict mapping the keys of the courses with a published branch
+        to when their index was last updated, i.e. when a branch of the course
+        last changed, read with a single query.  The time is None for indexes
+        that don't record it.
+        """
+        return {
+            CourseLocator(index['org'], index['course'], index['run']): index.get('last_update')
+            for index in self.db_connection.find_matching_course_indexes(branch=ModuleStoreEnum.BranchName.published)
+        }
+
     def delete_course_index(self, course_key):
         """
         Delete the course index from cache and the db
@@ -713,9 +725,13 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
                  default_class=None,
                  error_tracker=null_error_tracker,
                  i18n_service=None, fs_service=None, user_service=None,
-                 services=None, signal_handler=None, **kwargs):
+                 services=None, signal_handler=None, precompute_inherited_metadata=False, **kwargs):
         """
         :param doc_store_config: must have a host, db, and collection entries. Other common entries: port, tz_aware.
+        :param precompute_inherited_metadata: whether blocks read the values they inherit from a table
+            computed once per structure version, instead of walking up their parents.  Only blocks read
+            through their own field data use the table, e.g. for block-structure collection; blocks bound
+            for a student, as rendered by the LMS, keep walking their parents.
         """
 
         super(SplitMongoModuleStore, self).__init__(contentstore, **kwargs)
@@ -745,6 +761,7 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             self.services["request_cache"] = self.request_cache
 
         self.signal_handler = signal_handler
+        self.precompute_inherited_metadata = precompute_inherited_metadata
 
     def close_connections(self):
         """
@@ -839,6 +856,27 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         with self.bulk_operations(course_entry.course_key, emit_signals=False):
             return [runtime.load_item(block_key, course_entry, **kwargs) for block_key in block_keys]
 
+    def get_inherited_settings(self, course_key, structure):
+        """
+        Returns the values inherited by the blocks of the structure, see
+        compute_inherited_settings.
+
+        The values are cached next to the structure, unless the structure is
+        still being changed by the current bulk operation.
+        """
+        bulk_write_record = self._get_bulk_ops_record(course_key)
+        structure_id = structure['_id']
+        if structure_id in bulk_write_record.structures and structure_id not in bulk_write_record.structures_in_db:
+            return compute_inherited_settings(structure)
+
+        cache = CourseStructureCache()
+        cache_key = u'{}.inherited_settings'.format(structure_id)
+        inherited_settings = cache.get(cache_key, course_key)
+        if inherited_settings is None:
+            inherited_settings = compute_inherited_settings(structure)
+            cache.set(cache_key, inherited_settings, course_key)
+        return inherited_settings
+
     def _get_cache(self, course_version_guid):
         """
         Find the descriptor cache for this course if it exists
@@ -3459,6 +3497,7 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             select=self.xblock_select,
             disabled_xblock_types=self.disabled_xblock_types,
             services=services,
+            precompute_inheritance=self.precompute_inherited_metadata,
         )
 
     def ensure_indexes(self):
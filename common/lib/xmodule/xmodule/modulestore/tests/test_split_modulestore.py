@@ -2049,6 +2049,52 @@ class TestInheritance(SplitModuleTest):
 #         self.assertTrue(parented_problem.visible_to_staff_only)
 
 
+class TestPrecomputedInheritance(TestInheritance):
+    """
+    Test the metadata inheritance mechanism with inherited values precomputed per structure.
+    """
+    def setUp(self):
+        super(TestPrecomputedInheritance, self).setUp()
+        modulestore().precompute_inherited_metadata = True
+
+    @patch('xmodule.tabs.CourseTab.from_json', side_effect=mock_tab_from_json)
+    def test_no_parent_walk(self, _from_json):
+        """
+        Inherited values are read without loading the ancestors of the block.
+        """
+        locator = BlockUsageLocator(
+            CourseLocator(org='testx', course='GreekHero', run="run", branch=BRANCH_NAME_DRAFT), 'problem', 'problem3_2'
+        )
+        node = modulestore().get_item(locator)
+        with patch.object(node, 'get_parent') as mock_get_parent:
+            self.assertEqual(node.graceperiod, datetime.timedelta(hours=2))
+            self.assertFalse(node.visible_to_staff_only)
+        self.assertFalse(mock_get_parent.called)
+
+    @patch('xmodule.tabs.CourseTab.from_json', side_effect=mock_tab_from_json)
+    def test_precomputed_inheritance_matches_parent_walk(self, _from_json):
+        """
+        Test that reading the inherited fields of every block of a course from the
+        precomputed table gives the same values as walking up the parents.
+        """
+        course_key = CourseLocator(org='testx', course='GreekHero', run="run", branch=BRANCH_NAME_DRAFT)
+        names = ('start', 'due', 'graded', 'visible_to_staff_only', 'group_access', 'graceperiod')
+
+        def read_fields(precompute):
+            """
+            Read the inherited fields of every block of the course from a freshly loaded structure.
+            """
+            modulestore().precompute_inherited_metadata = precompute
+            return {
+                six.text_type(block.location): [getattr(block, name) for name in names]
+                for block in modulestore().get_items(course_key)
+            }
+
+        walked = read_fields(False)
+        precomputed = read_fields(True)
+        self.assertEqual(walked, precomputed)
+
+
 class TestPublish(SplitModuleTest):
     """
     Test the publishing api
@@ -502,6 +502,10 @@ class SequenceModule(SequenceFields, ProctoringFields, XModule):
         the given display_items.
         """
         render_items = not context.get('exclude_units', False)
+        # When the runtime gives a url to fetch units from (formatted like item_url,
+        # below), only the active unit is rendered along with the sequence and the
+        # client fetches the others when they are first shown.
+        unit_fragment_url = context.get('unit_fragment_url') if view == STUDENT_VIEW else None
         is_user_authenticated = self.is_user_authenticated(context)
         completion_service = self.runtime.service(self, 'completion')
         try:
@@ -514,8 +518,16 @@ class SequenceModule(SequenceFields, ProctoringFields, XModule):
             self.get_parent().display_name_with_default,
             self.display_name_with_default
         ]
+        bookmarked = {}
+        if is_user_authenticated and bookmarks_service:
+            bookmarked = bookmarks_service.are_bookmarked([item.scope_ids.usage_id for item in display_items])
+        complete = {}
+        if is_user_authenticated and completion_service:
+            complete = completion_service.verticals_are_complete(
+                [item for item in display_items if item.location.block_type == 'vertical']
+            )
         contents = []
-        for item in display_items:
+        for position, item in enumerate(display_items, start=1):
             # NOTE (CCB): This seems like a hack, but I don't see a better method of determining the type/category.
             item_type = item.get_icon_class()
             usage_id = item.scope_ids.usage_id
@@ -525,12 +537,13 @@ class SequenceModule(SequenceFields, ProctoringFields, XModule):
 
             if is_user_authenticated and bookmarks_service:
                 show_bookmark_button = True
-                is_bookmarked = bookmarks_service.is_bookmarked(usage_key=usage_id)
+                is_bookmarked = bookmarked[usage_id]
 
             context['show_bookmark_button'] = show_bookmark_button
             context['bookmarked'] = is_bookmarked
 
-            if render_items:
+            render_item = render_items and (not unit_fragment_url or position == self.position)
+            if render_item:
                 rendered_item = item.render(view, context)
                 fragment.add_fragment_resources(rendered_item)
                 content = rendered_item.content
@@ -549,9 +562,10 @@ class SequenceModule(SequenceFields, ProctoringFields, XModule):
                 # The item url format can be defined in the template context like so:
                 # context['item_url'] = '/my/item/path/{usage_key}/whatever'
                 iteminfo['href'] = context.get('item_url', '').format(usage_key=usage_id)
-            if is_user_authenticated:
-                if item.location.block_type == 'vertical' and completion_service:
-                    iteminfo['complete'] = completion_service.vertical_is_complete(item)
+            elif not render_item:
+                iteminfo['fetch_url'] = unit_fragment_url.format(usage_key=usage_id)
+            if item.location in complete:
+                iteminfo['complete'] = complete[item.location]
 
             contents.append(iteminfo)
 
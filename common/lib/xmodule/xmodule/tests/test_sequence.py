@@ -60,6 +60,7 @@ class SequenceBlockTestCase(XModuleXmlImportTest):
         xml.ChapterFactory.build(parent=course)  # has 0 child sequences
         chapter_3 = xml.ChapterFactory.build(parent=course)  # has 1 child sequence
         chapter_4 = xml.ChapterFactory.build(parent=course)  # has 1 child sequence, with hide_after_due
+        chapter_5 = xml.ChapterFactory.build(parent=course)  # has 1 child sequence, with 20 verticals
 
         xml.SequenceFactory.build(parent=chapter_1)
         xml.SequenceFactory.build(parent=chapter_1)
@@ -73,6 +74,10 @@ class SequenceBlockTestCase(XModuleXmlImportTest):
         for _ in range(3):
             xml.VerticalFactory.build(parent=sequence_3_1)
 
+        sequence_5_1 = xml.SequenceFactory.build(parent=chapter_5)
+        for _ in range(20):
+            xml.VerticalFactory.build(parent=sequence_5_1)
+
         return course
 
     def _set_up_block(self, parent, index_in_parent):
@@ -83,9 +88,14 @@ class SequenceBlockTestCase(XModuleXmlImportTest):
 
         self._set_up_module_system(block)
 
-        block.xmodule_runtime._services['bookmarks'] = Mock()  # pylint: disable=protected-access
+        block.xmodule_runtime._services['bookmarks'] = Mock(  # pylint: disable=protected-access
+            return_value=Mock(are_bookmarked=lambda usage_keys: dict.fromkeys(usage_keys, False))
+        )
         block.xmodule_runtime._services['completion'] = Mock(  # pylint: disable=protected-access
-            return_value=Mock(vertical_is_complete=Mock(return_value=True))
+            return_value=Mock(
+                vertical_is_complete=Mock(return_value=True),
+                verticals_are_complete=lambda items: {item.location: True for item in items},
+            )
         )
         block.xmodule_runtime._services['user'] = StubUserService()  # pylint: disable=protected-access
         block.xmodule_runtime.xmodule_instance = getattr(block, '_xmodule', None)
@@ -174,6 +184,42 @@ class SequenceBlockTestCase(XModuleXmlImportTest):
         for child in self.sequence_3_1.children:
             self.assertIn("'page_title': '{}'".format(child.block_id), html)
 
+    def test_lazy_unit_rendering(self):
+        html = self._get_rendered_view(
+            self.sequence_3_1,
+            requested_child='last',
+            extra_context={'unit_fragment_url': '/units/{usage_key}'},
+        )
+        # Only the active unit is rendered, the others are fetched from the given url.
+        self.assertEqual(html.count('vert_module.html'), 1)
+        children = self.sequence_3_1.children
+        for child in children[:2]:
+            self.assertIn("'fetch_url': '/units/{}'".format(child), html)
+        self.assertNotIn("'fetch_url': '/units/{}'".format(children[2]), html)
+
+    def test_lazy_unit_rendering_public_view(self):
+        html = self._get_rendered_view(
+            self.sequence_3_1,
+            extra_context={'unit_fragment_url': '/units/{usage_key}'},
+            view=PUBLIC_VIEW,
+        )
+        self.assertEqual(html.count('vert_module.html'), 3)
+        self.assertNotIn("'fetch_url'", html)
+
+    def test_lazy_unit_rendering_page_weight(self):
+        """
+        Test that a 20 unit subsection renders only the active unit, in a lighter
+        page, with lazy unit rendering.
+        """
+        results = {}
+        for mode, extra_context in (('eager', None), ('lazy', {'unit_fragment_url': '/units/{usage_key}'})):
+            html = self._get_rendered_view(self.sequence_5_1, extra_context=extra_context)
+            results[mode] = (len(html), html.count('vert_module.html'))
+
+        self.assertEqual(results['eager'][1], 20)
+        self.assertEqual(results['lazy'][1], 1)
+        self.assertLess(results['lazy'][0], results['eager'][0])
+
     def test_hidden_content_before_due(self):
         html = self._get_rendered_view(self.sequence_4_1)
         self.assertIn("seq_module.html", html)
@@ -10,6 +10,7 @@ from django.conf import settings
 from django.urls import reverse
 
 from bulk_email.models_api import (
+    get_bulk_email_feature_enabled_courses,
     is_bulk_email_enabled_for_course,
     is_bulk_email_feature_enabled,
     is_user_opted_out_for_course
@@ -317,6 +317,29 @@ class CourseEmail(Email):
         """
         return CourseEmailTemplate.get_template(name=self.template_name)
 
+    def get_recipients(self, user_id=None):
+        """
+        Gets the users in the targets of this CourseEmail who haven't opted out
+        of the emails of the course.
+
+        Result is returned in the form of a list of distinct querysets, one per
+        target. Each queryset leaves out the users of the targets before it, so
+        that no user is in more than one, and unlike the union of the querysets
+        of the targets, each can be filtered and ordered, e.g. to be read by pages.
+        """
+        optout_qset = Optout.objects.filter(course_id=self.course_id, user__isnull=False).values('user_id')
+        target_qsets = []
+        recipient_qsets = []
+        for target in self.targets.all():
+            target_qset = target.get_users(self.course_id, user_id)
+            recipient_qset = target_qset.exclude(id__in=optout_qset)
+            for previous_qset in target_qsets:
+                recipient_qset = recipient_qset.exclude(id__in=previous_qset.values('id'))
+            target_qsets.append(target_qset)
+            # The users of a target may contain duplicates, e.g. users both staff and instructor.
+            recipient_qsets.append(recipient_qset.distinct())
+        return recipient_qsets
+
 
 class Optout(models.Model):
     """
@@ -461,6 +484,13 @@ class CourseAuthorization(models.Model):
         except cls.DoesNotExist:
             return False
 
+    @classmethod
+    def instructor_email_enabled_courses(cls, course_ids):
+        """
+        Returns the set of the given course ids that email is enabled for.
+        """
+        return set(cls.objects.filter(course_id__in=course_ids, email_enabled=True).values_list('course_id', flat=True))
+
     def __str__(self):
         not_en = "Not "
         if self.email_enabled:
@@ -516,6 +546,18 @@ class BulkEmailFlag(ConfigurationModel):
         else:  # implies enabled == True and require_course_email == False, so email is globally enabled
             return True
 
+    @classmethod
+    def feature_enabled_courses(cls, course_ids):
+        """
+        Returns the set of the given course ids that the bulk email feature is
+        available for, as feature_enabled would for each of them.
+        """
+        if not BulkEmailFlag.is_enabled():
+            return set()
+        elif BulkEmailFlag.current().require_course_email_auth:
+            return CourseAuthorization.instructor_email_enabled_courses(course_ids)
+        return set(course_ids)
+
     class Meta(object):
         app_label = "bulk_email"
 
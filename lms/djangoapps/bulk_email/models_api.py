@@ -38,6 +38,18 @@ def is_bulk_email_feature_enabled(course_id=None):
     return BulkEmailFlag.feature_enabled(course_id)
 
 
+def get_bulk_email_feature_enabled_courses(course_ids):
+    """
+    Arguments:
+        course_ids (list): the course ids of the courses
+
+    Returns:
+        set: the course ids of the courses the bulk email feature is available for,
+            see is_bulk_email_feature_enabled
+    """
+    return BulkEmailFlag.feature_enabled_courses(course_ids)
+
+
 def is_bulk_email_enabled_for_course(course_id):
     """
     Arguments:
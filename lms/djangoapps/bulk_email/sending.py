@@ -0,0 +1,262 @@
+"""
+Building blocks of the bulk email sending engine: course email templates
+compiled once per email, a pool of persistent SMTP connections and a rate
+limiter, shared by the sending threads of a worker process.
+"""
+
+
+import logging
+import os
+import re
+import string
+import threading
+import time
+
+import markupsafe
+import six
+from django.conf import settings
+from django.core.mail import get_connection
+
+from bulk_email.models import COURSE_EMAIL_MESSAGE_BODY_TAG
+from openedx.core.lib.mail_utils import wrap_message
+from util.keyword_substitution import substitute_keywords_with_data
+
+log = logging.getLogger(__name__)
+
+
+def sending_engine_enabled():
+    """
+    Returns whether bulk email subtasks send their emails through the sending engine.
+    """
+    return settings.FEATURES.get('ENABLE_BULK_EMAIL_SENDING_ENGINE', False)
+
+
+class CompiledEmailTemplate(object):
+    """
+    A course email template, with the body of an email, rendered once for
+    all of the recipients of the email.
+
+    The slots of the template that depend on the recipient are kept, and
+    filled in by render, which returns the same message as
+    CourseEmailTemplate.render_plaintext or render_htmltext would.
+
+    Raises ValueError when the template can't be compiled, in which case it
+    is to be rendered for each recipient.
+    """
+    # The values of the email context that differ between recipients.
+    RECIPIENT_FIELDS = frozenset(['name', 'email', 'user_id', 'unsubscribe_link'])
+    # Bounds the number of wrapped lines kept, as lines with recipient values are rarely seen twice.
+    MAX_WRAPPED_LINES = 1000
+
+    def __init__(self, format_string, message_body, context, html=False):
+        self.html = html
+        self._context = {key: self._escape(value) for key, value in six.iteritems(context)}
+        self._message_body = message_body
+        self._substitute_keywords = '%%' in message_body
+        self._message_body_tag = COURSE_EMAIL_MESSAGE_BODY_TAG.format()
+        self._formatter = string.Formatter()
+        self._parts = self._compile(format_string)
+        self._wrapped_lines = {}
+
+    def _escape(self, value):
+        """
+        HTML-escapes string values for HTML templates, as render_htmltext does.
+        """
+        if self.html and isinstance(value, six.string_types):
+            return markupsafe.escape(value)
+        return value
+
+    def _compile(self, format_string):
+        """
+        Returns the parts of the template: strings already rendered, and
+        (field_name, format_spec, conversion) tuples for recipient slots.
+        """
+        parts = []
+        for literal_text, field_name, format_spec, conversion in self._formatter.parse(format_string):
+            if literal_text:
+                parts.append(literal_text)
+            if field_name is None:
+                continue
+            if not field_name or field_name[0].isdigit() or '{' in format_spec:
+                raise ValueError(u'Unsupported template field {!r}'.format(field_name))
+            if re.match(r'[^.\[]*', field_name).group(0) in self.RECIPIENT_FIELDS:
+                parts.append((field_name, format_spec, conversion))
+            else:
+                parts.append(self._format_field(field_name, format_spec, conversion, self._context))
+
+        # Join the consecutive rendered strings.
+        compiled = []
+        for part in parts:
+            if compiled and isinstance(part, six.string_types) and isinstance(compiled[-1], six.string_types):
+                compiled[-1] += part
+            else:
+                compiled.append(part)
+        return compiled
+
+    def _format_field(self, field_name, format_spec, conversion, context):
+        """
+        Formats a single field as str.format would.
+        """
+        value = self._formatter.get_field(field_name, (), context)[0]
+        return self._formatter.format_field(self._formatter.convert_field(value, conversion), format_spec)
+
+    def _wrap(self, message):
+        """
+        Wraps the long lines of the message as wrap_message does, line by line.
+        """
+        wrapped_lines = []
+        for line in message.split('\n'):
+            wrapped_line = self._wrapped_lines.get(line)
+            if wrapped_line is None:
+                wrapped_line = wrap_message(line)
+                if len(self._wrapped_lines) < self.MAX_WRAPPED_LINES:
+                    self._wrapped_lines[line] = wrapped_line
+            wrapped_lines.append(wrapped_line)
+        return '\n'.join(wrapped_lines)
+
+    def render(self, recipient_context):
+        """
+        Returns the message for the recipient, whose values for RECIPIENT_FIELDS
+        are given in the recipient_context dict.
+        """
+        recipient_context = {key: self._escape(value) for key, value in six.iteritems(recipient_context)}
+        message_body = self._message_body
+        if self._substitute_keywords:
+            context = dict(self._context)
+            context.update(recipient_context)
+            if 'user_id' in context and 'course_id' in context:
+                message_body = substitute_keywords_with_data(message_body, context)
+
+        result = ''.join(
+            part if isinstance(part, six.string_types) else self._format_field(*part, context=recipient_context)
+            for part in self._parts
+        )
+        result = result.replace(self._message_body_tag, message_body, 1)
+        return self._wrap(result)
+
+
+class SMTPConnectionPool(object):
+    """
+    A pool of open connections to the email backend, each used by a single
+    thread at a time and kept open between the subtasks run by the process.
+    """
+    def __init__(self, max_idle):
+        """
+        max_idle: seconds after which an idle connection is closed rather than
+            reused, as mail servers drop idle connections.
+        """
+        self.max_idle = max_idle
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def checkout(self, connection_factory=get_connection):
+        """
+        Returns an open connection, reusing an idle one if there is one, or
+        else opening one returned by connection_factory.
+        """
+        now = time.time()
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                connection, last_used = self._idle.pop()
+            if now - last_used < self.max_idle:
+                return connection
+            self._close(connection)
+
+        connection = connection_factory()
+        connection.open()
+        return connection
+
+    def checkin(self, connection, reusable=True):
+        """
+        Returns the connection to the pool, or closes it if it isn't reusable,
+        e.g. after an error that may have left it in an unknown state.
+        """
+        if not reusable:
+            self._close(connection)
+            return
+        with self._lock:
+            self._idle.append((connection, time.time()))
+
+    def close_all(self):
+        """
+        Closes all of the idle connections.
+        """
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection, __ in idle:
+            self._close(connection)
+
+    @staticmethod
+    def _close(connection):
+        """
+        Closes the connection, ignoring the errors of connections already dropped by the server.
+        """
+        try:
+            connection.close()
+        except Exception:  # pylint: disable=broad-except
+            log.info(u'BulkEmail ==> Error closing a pooled SMTP connection', exc_info=True)
+
+
+class RateLimiter(object):
+    """
+    Spaces out the calls to wait of all threads so that no more than `rate`
+    of them return per second.  A rate of None doesn't limit them.
+    """
+    def __init__(self, rate):
+        self.rate = rate
+        self._next_time = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """
+        Blocks until the caller is allowed to go ahead.
+        """
+        if not self.rate:
+            return
+        with self._lock:
+            now = time.time()
+            slot = max(now, self._next_time)
+            self._next_time = slot + 1.0 / self.rate
+        if slot > now:
+            time.sleep(slot - now)
+
+
+_pool = None
+_rate_limiter = None
+_pid = None
+_lock = threading.Lock()
+
+
+def get_connection_pool():
+    """
+    Returns the SMTPConnectionPool of this process.
+    """
+    _init_process_state()
+    return _pool
+
+
+def get_rate_limiter():
+    """
+    Returns the RateLimiter shared by the sending threads of this process.
+    """
+    _init_process_state()
+    return _rate_limiter
+
+
+def _init_process_state():
+    """
+    Creates the connection pool and the rate limiter of the process.
+
+    The pid is checked so that worker processes forked after they were
+    created don't share connections with their parent.
+    """
+    global _pool, _rate_limiter, _pid  # pylint: disable=global-statement
+    if _pid == os.getpid():
+        return
+    with _lock:
+        if _pid != os.getpid():
+            _pool = SMTPConnectionPool(getattr(settings, 'BULK_EMAIL_CONNECTION_MAX_IDLE', 60))
+            _rate_limiter = RateLimiter(getattr(settings, 'BULK_EMAIL_MAX_SENDS_PER_SECOND', None))
+            _pid = os.getpid()
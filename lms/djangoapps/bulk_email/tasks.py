@@ -9,8 +9,10 @@ import json
 import logging
 import random
 import re
+import threading
 import time
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from smtplib import SMTPConnectError, SMTPDataError, SMTPException, SMTPServerDisconnected
 from time import sleep
@@ -42,6 +44,7 @@ from six import text_type
 
 from bulk_email.models import CourseEmail, Optout
 from bulk_email.api import get_unsubscribed_link
+from bulk_email.sending import CompiledEmailTemplate, get_connection_pool, get_rate_limiter, sending_engine_enabled
 from lms.djangoapps.courseware.courses import get_course
 from lms.djangoapps.instructor_task.models import InstructorTask
 from lms.djangoapps.instructor_task.subtasks import (
@@ -99,6 +102,13 @@ BULK_EMAIL_FAILURE_ERRORS = (
 )
 
 
+def recipient_query_enabled():
+    """
+    Returns whether the recipients of bulk emails are read target by target, by pages.
+    """
+    return settings.FEATURES.get('ENABLE_BULK_EMAIL_RECIPIENT_QUERY', False)
+
+
 def _get_course_email_context(course):
     """
     Returns context arguments to apply to all emails, independent of recipient.
@@ -181,20 +191,28 @@ def perform_delegate_email_batches(entry_id, course_id, task_input, action_name)
     targets = email_obj.targets.all()
     global_email_context = _get_course_email_context(course)
 
-    recipient_qsets = [
-        target.get_users(course_id, user_id)
-        for target in targets
-    ]
-    # Use union here to combine the qsets instead of the | operator.  This avoids generating an
-    # inefficient OUTER JOIN query that would read the whole user table.
-    combined_set = recipient_qsets[0].union(*recipient_qsets[1:]) if len(recipient_qsets) > 1 \
-        else recipient_qsets[0]
+    items_per_query = None
+    if recipient_query_enabled():
+        # Read the recipients of each target by pages, as the subtasks are queued.
+        # The querysets have no users in common, so their counts add up.
+        item_querysets = email_obj.get_recipients(user_id)
+        items_per_query = settings.BULK_EMAIL_RECIPIENTS_PER_QUERY
+    else:
+        recipient_qsets = [
+            target.get_users(course_id, user_id)
+            for target in targets
+        ]
+        # Use union here to combine the qsets instead of the | operator.  This avoids generating an
+        # inefficient OUTER JOIN query that would read the whole user table.
+        combined_set = recipient_qsets[0].union(*recipient_qsets[1:]) if len(recipient_qsets) > 1 \
+            else recipient_qsets[0]
+        item_querysets = [combined_set]
     recipient_fields = ['profile__name', 'email', 'username']
 
     log.info(u"Task %s: Preparing to queue subtasks for sending emails for course %s, email %s",
              task_id, course_id, email_id)
 
-    total_recipients = combined_set.count()
+    total_recipients = sum(item_queryset.count() for item_queryset in item_querysets)
 
     routing_key = settings.BULK_EMAIL_ROUTING_KEY
 
@@ -225,10 +243,11 @@ def perform_delegate_email_batches(entry_id, course_id, task_input, action_name)
         entry,
         action_name,
         _create_send_email_subtask,
-        [combined_set],
+        item_querysets,
         recipient_fields,
         settings.BULK_EMAIL_EMAILS_PER_TASK,
         total_recipients,
+        items_per_query,
     )
 
     # We want to return progress here, as this is what will be stored in the
@@ -507,13 +526,21 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
 
     try:
         connection = get_connection()
-        connection.open()
+        start_time = time.time()
+        if sending_engine_enabled():
+            # Sends to the whole list concurrently, leaving on it only the recipients that
+            # were not processed when it raises, so that the loop below has nothing to do.
+            total_recipients_successful, total_recipients_failed = _send_with_engine(
+                to_list, course_email, course_email_template, from_addr, global_email_context,
+                subtask_status, recipients_info, parent_task_id,
+            )
+        else:
+            connection.open()
 
         # Define context values to use in all course emails:
         email_context = {'name': '', 'email': ''}
         email_context.update(global_email_context)
 
-        start_time = time.time()
         while to_list:
             # Update context with user-specific values from the user at the end of the list.
             # At the end of processing this user, they will be popped off of the to_list.
@@ -729,6 +756,164 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
         connection.close()
 
 
+def _send_with_engine(to_list, course_email, course_email_template, from_addr, global_email_context,
+                      subtask_status, recipients_info, parent_task_id):
+    """
+    Sends the course email to the recipients of `to_list`, as the loop of
+    _send_course_email does, but with the templates compiled once for the
+    email and the messages sent concurrently by BULK_EMAIL_SEND_WORKERS
+    threads, over the pooled SMTP connections of the process and within its
+    BULK_EMAIL_MAX_SENDS_PER_SECOND rate.
+
+    The recipients that were processed are removed from `to_list`, and
+    `subtask_status` and `recipients_info` are updated for them.  When a
+    send fails with an error that the task is to be retried or failed for,
+    the sends that haven't started yet are cancelled, and the first such
+    error is raised once the sends in progress are done.
+
+    Returns the numbers of recipients the email was sent to, and failed to
+    be sent to.
+    """
+    task_id = subtask_status.task_id
+    email_id = course_email.id
+    context = dict(global_email_context, course_id=course_email.course_id)
+    try:
+        templates = (
+            CompiledEmailTemplate(course_email_template.plain_template, course_email.text_message, context),
+            CompiledEmailTemplate(course_email_template.html_template, course_email.html_message, context, html=True),
+        )
+    except ValueError:
+        log.warning(u"BulkEmail ==> EmailId: %s, Could not compile the email template.", email_id, exc_info=True)
+        templates = None
+
+    # Recipients are processed from the end of the list, as in _send_course_email.
+    recipients = list(reversed(to_list))
+    processed = set()
+    messages = []
+    total_recipients_successful = 0
+    total_recipients_failed = 0
+    for index, recipient in enumerate(recipients):
+        email = recipient['email']
+        if _has_non_ascii_characters(email):
+            log.info(
+                u"BulkEmail ==> Email address %s contains non-ascii characters. Skipping sending "
+                u"email to %s, EmailId: %s ",
+                email,
+                recipient['profile__name'],
+                email_id
+            )
+            processed.add(index)
+            total_recipients_failed += 1
+            subtask_status.increment(failed=1)
+            continue
+
+        recipient_context = {
+            'email': email,
+            'name': recipient['profile__name'],
+            'user_id': recipient['pk'],
+            'unsubscribe_link': get_unsubscribed_link(recipient['username'], text_type(course_email.course_id)),
+        }
+        if templates is not None:
+            plaintext_msg, html_msg = (template.render(recipient_context) for template in templates)
+        else:
+            plaintext_msg = course_email_template.render_plaintext(
+                course_email.text_message, dict(context, **recipient_context)
+            )
+            html_msg = course_email_template.render_htmltext(
+                course_email.html_message, dict(context, **recipient_context)
+            )
+        email_msg = EmailMultiAlternatives(course_email.subject, plaintext_msg, from_addr, [email])
+        email_msg.attach_alternative(html_msg, 'text/html')
+        messages.append((index, email_msg))
+
+    pool = get_connection_pool()
+    rate_limiter = get_rate_limiter()
+    cancelled = threading.Event()
+    not_sent = object()
+
+    def send(email_msg):
+        """
+        Sends the message, returning the exception it failed with, if any.
+        """
+        if cancelled.is_set():
+            return not_sent
+        rate_limiter.wait()
+        # See the throttling of _send_course_email.
+        if subtask_status.retried_nomax > 0:
+            sleep(settings.BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS)
+        try:
+            connection = pool.checkout(get_connection)
+        except Exception as exc:  # pylint: disable=broad-except
+            cancelled.set()
+            return exc
+        reusable = True
+        try:
+            connection.send_messages([email_msg])
+        except SMTPDataError as exc:
+            if 400 <= exc.smtp_code < 500:
+                cancelled.set()
+            return exc
+        except SINGLE_EMAIL_FAILURE_ERRORS as exc:
+            return exc
+        except Exception as exc:  # pylint: disable=broad-except
+            reusable = False
+            cancelled.set()
+            return exc
+        finally:
+            pool.checkin(connection, reusable)
+        return None
+
+    with ThreadPoolExecutor(max_workers=settings.BULK_EMAIL_SEND_WORKERS) as executor:
+        results = list(executor.map(send, [email_msg for __, email_msg in messages]))
+
+    error = None
+    for (index, __), result in zip(messages, results):
+        email = recipients[index]['email']
+        if result is not_sent:
+            continue
+        if result is None:
+            total_recipients_successful += 1
+            if settings.BULK_EMAIL_LOG_SENT_EMAILS:
+                log.info(u'Email with id %s sent to %s', email_id, email)
+            else:
+                log.debug(u'Email with id %s sent to %s', email_id, email)
+            subtask_status.increment(succeeded=1)
+        elif isinstance(result, SMTPDataError) and not 400 <= result.smtp_code < 500:
+            log.warning(
+                u'BulkEmail ==> Task: %s, SubTask: %s, EmailId: %s, Email not delivered to %s due to error %s',
+                parent_task_id,
+                task_id,
+                email_id,
+                email,
+                result.smtp_error
+            )
+            total_recipients_failed += 1
+            subtask_status.increment(failed=1)
+        elif isinstance(result, SINGLE_EMAIL_FAILURE_ERRORS):
+            log.error(
+                u"BulkEmail ==> Status: Failed(SINGLE_EMAIL_FAILURE_ERRORS), Task: %s, SubTask: %s, \
+                EmailId: %s, Email address: %s, Exception: %s",
+                parent_task_id,
+                task_id,
+                email_id,
+                email,
+                result
+            )
+            total_recipients_failed += 1
+            subtask_status.increment(failed=1)
+        else:
+            # The recipient stays on the list, to be sent to when the task is retried.
+            error = error or result
+            continue
+        processed.add(index)
+        recipients_info[email] += 1
+
+    to_list[:] = [recipient for index, recipient in reversed(list(enumerate(recipients))) if index not in processed]
+    if error is not None:
+        raise error
+    return total_recipients_successful, total_recipients_failed
+
+
 def _get_current_task():
     """
     Stub to make it easier to test without actually running Celery.
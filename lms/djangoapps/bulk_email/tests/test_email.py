@@ -627,6 +627,29 @@ class TestEmailSendFromDashboardMockedHtmlToText(EmailSendFromDashboardTestCase)
             assert u'bulk_email/email/optout/' in html_template
 
 
+@patch.dict(settings.FEATURES, {'ENABLE_BULK_EMAIL_RECIPIENT_QUERY': True})
+@override_settings(BULK_EMAIL_RECIPIENTS_PER_QUERY=4)
+class TestEmailSendFromDashboardRecipientQuery(TestEmailSendFromDashboardMockedHtmlToText):
+    """
+    Tests email sending with the recipients read target by target, by pages.
+    """
+    def test_send_to_inactive(self):
+        """
+        Make sure emails aren't sent to inactive users.
+        """
+        self.students[0].is_active = False
+        self.students[0].save()
+        test_email = {
+            'action': 'Send email',
+            'send_to': '["learners"]',
+            'subject': 'test subject for learners',
+            'message': 'test message for learners'
+        }
+        response = self.client.post(self.send_mail_url, test_email)
+        self.assertEqual(json.loads(response.content.decode('utf-8')), self.success_content)
+        six.assertCountEqual(self, [e.to[0] for e in mail.outbox], [s.email for s in self.students[1:]])
+
+
 @skipIf(os.environ.get("TRAVIS") == 'true', "Skip this test in Travis CI.")
 class TestEmailSendFromDashboard(EmailSendFromDashboardTestCase):
     """
@@ -25,7 +25,8 @@ from bulk_email.models import (
 )
 from course_modes.models import CourseMode
 from openedx.core.djangoapps.course_groups.models import CourseCohort
-from student.tests.factories import UserFactory
+from student.roles import CourseInstructorRole, CourseStaffRole
+from student.tests.factories import CourseEnrollmentFactory, UserFactory
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory
 
@@ -147,6 +148,47 @@ class CourseEmailTest(ModuleStoreTestCase):
         self.assertEqual(target.short_display(), 'cohort-test cohort')
         self.assertEqual(target.long_display(), 'Cohort: test cohort')
 
+    def test_get_recipients(self):
+        course_id = CourseFactory.create().id
+        sender = UserFactory.create()
+        CourseStaffRole(course_id).add_users(sender)
+        learners = [UserFactory.create() for __ in range(4)]
+        for learner in learners + [sender]:
+            CourseEnrollmentFactory.create(user=learner, course_id=course_id)
+        Optout.objects.create(user=learners[0], course_id=course_id)
+        learners[1].is_active = False
+        learners[1].save()
+
+        sender.is_active = False
+        sender.save()
+
+        email = CourseEmail.create(course_id, sender, ['myself', 'staff', 'learners'], "dummy subject", "<html/>")
+        recipient_qsets = email.get_recipients(sender.id)
+        # The sender is in two of the targets, but is only sent the email once, even though inactive.
+        self.assertEqual(
+            sorted(user_id for recipients in recipient_qsets for user_id in recipients.values_list('id', flat=True)),
+            sorted([sender.id, learners[2].id, learners[3].id])
+        )
+        self.assertEqual(sum(recipients.count() for recipients in recipient_qsets), 3)
+
+    def test_get_recipients_staff_and_instructor(self):
+        course_id = CourseFactory.create().id
+        staff = UserFactory.create()
+        CourseStaffRole(course_id).add_users(staff)
+        CourseInstructorRole(course_id).add_users(staff)
+        learner = UserFactory.create()
+        for user in (staff, learner):
+            CourseEnrollmentFactory.create(user=user, course_id=course_id)
+
+        email = CourseEmail.create(course_id, staff, ['staff', 'learners'], "dummy subject", "<html/>")
+        recipient_qsets = email.get_recipients(staff.id)
+        # The staff member is in the staff target twice, through both roles, but is only sent the email once.
+        self.assertEqual(
+            sorted(user_id for recipients in recipient_qsets for user_id in recipients.values_list('id', flat=True)),
+            sorted([staff.id, learner.id])
+        )
+        self.assertEqual(sum(recipients.count() for recipients in recipient_qsets), 2)
+
 
 class OptoutTest(TestCase):
     def test_is_user_opted_out_for_course(self):
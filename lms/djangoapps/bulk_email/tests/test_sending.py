@@ -0,0 +1,119 @@
+"""
+Unit tests for the building blocks of the bulk email sending engine.
+"""
+
+
+import ddt
+from django.core.management import call_command
+from django.test import TestCase
+from mock import Mock, patch
+
+from bulk_email.models import CourseEmailTemplate
+from bulk_email.sending import CompiledEmailTemplate, RateLimiter, SMTPConnectionPool
+
+
+@ddt.ddt
+class CompiledEmailTemplateTest(TestCase):
+    """Test that compiled templates render the messages the templates do."""
+
+    def setUp(self):
+        super(CompiledEmailTemplateTest, self).setUp()
+        # load initial content (since we don't run migrations as part of tests):
+        call_command("loaddata", "course_email_template.json")
+        self.context = {
+            'course_title': u"<b>Course</b> & Title",
+            'course_url': "/location/of/course/url",
+            'course_image_url': "/location/of/course/image/url",
+            'course_end_date': "Jan 01, 2030",
+            'email_settings_url': "/location/of/email/settings/url",
+            'platform_name': 'edX',
+            'course_id': "course-v1:edx+100+1",
+        }
+        self.recipients = [
+            {
+                'name': u"<script>alert('Profile Name!');</alert>",
+                'email': 'first@example.com',
+                'user_id': 12345,
+                'unsubscribe_link': '/bulk_email/email/optout/first',
+            },
+            {
+                'name': u"Ren\xe9 {name}",
+                'email': 'second@example.com',
+                'user_id': 12346,
+                'unsubscribe_link': '/bulk_email/email/optout/second',
+            },
+        ]
+        self.body = u"Dear %%USER_FULLNAME%%, thanks for enrolling in %%COURSE_DISPLAY_NAME%%.\n" + u"long " * 400
+
+    @ddt.data(None, 'branded.template')
+    def test_render(self, template_name):
+        template = CourseEmailTemplate.get_template(name=template_name)
+        compiled_plain = CompiledEmailTemplate(template.plain_template, self.body, self.context)
+        compiled_html = CompiledEmailTemplate(template.html_template, self.body, self.context, html=True)
+        for recipient in self.recipients:
+            self.assertEqual(
+                compiled_plain.render(recipient),
+                template.render_plaintext(self.body, dict(self.context, **recipient))
+            )
+            self.assertEqual(
+                compiled_html.render(recipient),
+                template.render_htmltext(self.body, dict(self.context, **recipient))
+            )
+
+    def test_missing_context(self):
+        template = CourseEmailTemplate.get_template()
+        del self.context['course_url']
+        with self.assertRaises(KeyError):
+            CompiledEmailTemplate(template.plain_template, self.body, self.context)
+
+    def test_positional_field(self):
+        with self.assertRaises(ValueError):
+            CompiledEmailTemplate(u"{} {{message_body}}", self.body, self.context)
+
+
+class SMTPConnectionPoolTest(TestCase):
+    """Test the reuse of the connections of the pool."""
+
+    def test_reuse(self):
+        pool = SMTPConnectionPool(max_idle=60)
+        factory = Mock(side_effect=lambda: Mock())
+        connection = pool.checkout(factory)
+        pool.checkin(connection)
+        self.assertIs(pool.checkout(factory), connection)
+        self.assertIsNot(pool.checkout(factory), connection)
+        self.assertEqual(factory.call_count, 2)
+
+    def test_not_reusable(self):
+        pool = SMTPConnectionPool(max_idle=60)
+        connection = pool.checkout(Mock)
+        pool.checkin(connection, reusable=False)
+        connection.close.assert_called_once_with()
+        self.assertIsNot(pool.checkout(Mock), connection)
+
+    def test_idle(self):
+        pool = SMTPConnectionPool(max_idle=0)
+        connection = pool.checkout(Mock)
+        pool.checkin(connection)
+        self.assertIsNot(pool.checkout(Mock), connection)
+        connection.close.assert_called_once_with()
+
+
+class RateLimiterTest(TestCase):
+    """Test the spacing of the sends by the rate limiter."""
+
+    @patch('bulk_email.sending.time')
+    def test_wait(self, mock_time):
+        mock_time.time.return_value = 100.0
+        limiter = RateLimiter(rate=10)
+        for __ in range(3):
+            limiter.wait()
+        delays = [call[0][0] for call in mock_time.sleep.call_args_list]
+        self.assertEqual(len(delays), 2)
+        self.assertAlmostEqual(delays[0], 0.1)
+        self.assertAlmostEqual(delays[1], 0.2)
+
+    @patch('bulk_email.sending.time')
+    def test_unlimited(self, mock_time):
+        limiter = RateLimiter(rate=None)
+        limiter.wait()
+        self.assertFalse(mock_time.sleep.called)
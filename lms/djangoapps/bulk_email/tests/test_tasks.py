@@ -28,11 +28,13 @@ from boto.ses.exceptions import (
 from celery.states import FAILURE, SUCCESS
 from django.conf import settings
 from django.core.management import call_command
+from django.test.utils import override_settings
 from mock import Mock, patch
 from opaque_keys.edx.locator import CourseLocator
 from six.moves import range
 
 from bulk_email.models import SEND_TO_LEARNERS, SEND_TO_MYSELF, SEND_TO_STAFF, CourseEmail, Optout
+from bulk_email.sending import get_connection_pool
 from bulk_email.tasks import _get_course_email_context
 from lms.djangoapps.instructor_task.models import InstructorTask
 from lms.djangoapps.instructor_task.subtasks import SubtaskStatus, update_subtask_status
@@ -473,3 +475,43 @@ class TestBulkEmailInstructorTask(InstructorTaskCourseTestCase):
         self.assertIn('account_settings_url', result)
         self.assertIn('email_settings_url', result)
         self.assertIn('platform_name', result)
+
+
+@patch.dict('django.conf.settings.FEATURES', {'ENABLE_BULK_EMAIL_SENDING_ENGINE': True})
+@override_settings(BULK_EMAIL_SEND_WORKERS=1)
+class TestBulkEmailSendingEngineInstructorTask(TestBulkEmailInstructorTask):
+    """
+    Runs the instructor task tests with the sending engine, whose single sending
+    thread sends the emails in the same order as the loop does.
+    """
+    def setUp(self):
+        super(TestBulkEmailSendingEngineInstructorTask, self).setUp()
+        # Don't reuse the mocked connections of other tests.
+        get_connection_pool().close_all()
+        self.addCleanup(get_connection_pool().close_all)
+
+    @override_settings(BULK_EMAIL_SEND_WORKERS=4)
+    def test_concurrent_successful(self):
+        num_emails = settings.BULK_EMAIL_EMAILS_PER_TASK
+        self._create_students(num_emails - 1)
+        with patch('bulk_email.tasks.get_connection', autospec=True) as get_conn:
+            get_conn.return_value.send_messages.side_effect = cycle([None])
+            self._test_run_with_task(send_bulk_course_email, 'emailed', num_emails, num_emails)
+        sent_to = [call[0][0][0].to[0] for call in get_conn.return_value.send_messages.call_args_list]
+        self.assertEqual(len(sent_to), num_emails)
+        self.assertEqual(len(set(sent_to)), num_emails)
+        # The connections opened are kept for the next subtasks.
+        self.assertLessEqual(get_conn.return_value.open.call_count, 4)
+
+    @override_settings(BULK_EMAIL_SEND_WORKERS=4)
+    def test_concurrent_address_failures(self):
+        num_emails = settings.BULK_EMAIL_EMAILS_PER_TASK
+        self._create_students(num_emails - 1)
+        expected_fails = int((num_emails + 3) / 4.0)
+        with patch('bulk_email.tasks.get_connection', autospec=True) as get_conn:
+            get_conn.return_value.send_messages.side_effect = cycle([
+                SESIllegalAddressError(400, "Illegal address"), None, None, None
+            ])
+            self._test_run_with_task(
+                send_bulk_course_email, 'emailed', num_emails, num_emails - expected_fails, failed=expected_fails
+            )
@@ -21,8 +21,8 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from lms.djangoapps.courseware import courses
-from lms.djangoapps.ccx.models import CcxFieldOverride, CustomCourseForEdX
-from lms.djangoapps.ccx.overrides import override_field_for_ccx
+from lms.djangoapps.ccx.models import CustomCourseForEdX
+from lms.djangoapps.ccx.overrides import clear_overrides_for_ccx, override_field_for_ccx, override_fields_for_ccx
 from lms.djangoapps.ccx.utils import add_master_course_staff_to_ccx, assign_staff_role_to_ccx, is_email
 from lms.djangoapps.instructor.enrollment import enroll_email, get_email_params
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
@@ -466,25 +466,22 @@ class CCXListView(GenericAPIView):
 
             # Make sure start/due are overridden for entire course
             start = TODAY().replace(tzinfo=pytz.UTC)
-            override_field_for_ccx(ccx_course_object, master_course_object, 'start', start)
-            override_field_for_ccx(ccx_course_object, master_course_object, 'due', None)
-
-            # Enforce a static limit for the maximum amount of students that can be enrolled
-            override_field_for_ccx(
-                ccx_course_object,
-                master_course_object,
-                'max_student_enrollments_allowed',
-                valid_input['max_students_allowed']
-            )
+            overrides = [
+                (master_course_object, 'start', start),
+                (master_course_object, 'due', None),
+                # Enforce a static limit for the maximum amount of students that can be enrolled
+                (master_course_object, 'max_student_enrollments_allowed', valid_input['max_students_allowed']),
+            ]
 
             # Hide anything that can show up in the schedule
             hidden = 'visible_to_staff_only'
             for chapter in master_course_object.get_children():
-                override_field_for_ccx(ccx_course_object, chapter, hidden, True)
+                overrides.append((chapter, hidden, True))
                 for sequential in chapter.get_children():
-                    override_field_for_ccx(ccx_course_object, sequential, hidden, True)
+                    overrides.append((sequential, hidden, True))
                     for vertical in sequential.get_children():
-                        override_field_for_ccx(ccx_course_object, vertical, hidden, True)
+                        overrides.append((vertical, hidden, True))
+            override_fields_for_ccx(ccx_course_object, overrides)
 
             # make the coach user a coach on the master course
             make_user_coach(coach, master_course_key)
@@ -667,7 +664,7 @@ class CCXDetailView(GenericAPIView):
         ccx_course_overview = CourseOverview.get_from_id(ccx_course_key)
         # clean everything up with a single transaction
         with transaction.atomic():
-            CcxFieldOverride.objects.filter(ccx=ccx_course_object).delete()
+            clear_overrides_for_ccx(ccx_course_object)
             # remove all users enrolled in the CCX from the CourseEnrollment model
             CourseEnrollment.objects.filter(course_id=ccx_course_key).delete()
             ccx_course_overview.delete()
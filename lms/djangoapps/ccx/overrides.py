@@ -1,22 +1,37 @@
 """
 API related to providing field overrides for individual students.  This is used
 by the individual custom courses feature.
+
+The overrides of a CCX are loaded as a whole into a map, which is kept in the
+request cache and shared between processes through the django cache.  Shared
+maps are versioned per CCX through a counter kept in the cache, which every
+write to the overrides of the CCX increments.
 """
 
 
 import json
 import logging
+import time
 
+import six
 from ccx_keys.locator import CCXBlockUsageLocator, CCXLocator
+from django.core.cache import cache
 from django.db import transaction
 from opaque_keys.edx.keys import CourseKey, UsageKey
 
 from lms.djangoapps.ccx.models import CcxFieldOverride, CustomCourseForEdX
-from lms.djangoapps.courseware.field_overrides import FieldOverrideProvider
+from lms.djangoapps.courseware.field_overrides import (
+    OVERRIDE_ALL_BLOCKS,
+    FieldOverrideProvider,
+    clear_override_indexes,
+    override_index_key
+)
 from openedx.core.lib.cache_utils import get_cache
 
 log = logging.getLogger(__name__)
 
+CCX_OVERRIDES_CACHE_TIMEOUT = 24 * 60 * 60
+
 
 class CustomCoursesForEdxOverrideProvider(FieldOverrideProvider):
     """
@@ -48,6 +63,22 @@ class CustomCoursesForEdxOverrideProvider(FieldOverrideProvider):
             return get_override_for_ccx(ccx, block, name, default)
         return default
 
+    def get_all(self, course_key):
+        """
+        Return all of the overrides of the current ccx of the course.
+        """
+        ccx = get_current_ccx(course_key)
+        if not ccx:
+            return {}
+        # See get_override_for_ccx.
+        overrides = {OVERRIDE_ALL_BLOCKS: {'course_edit_method': None}}
+        for location, block_overrides in six.iteritems(_get_overrides_for_ccx(ccx)):
+            overrides[override_index_key(location)] = {
+                name: value for name, value in six.iteritems(block_overrides)
+                if not _is_override_metadata(name, block_overrides)
+            }
+        return overrides
+
     @classmethod
     def enabled_for(cls, block):
         """
@@ -102,6 +133,15 @@ def get_override_for_ccx(ccx, block, name, default=None):
         return default
 
 
+def _is_override_metadata(name, block_overrides):
+    """
+    Returns whether `name` in the overrides of a block, as returned by
+    _get_overrides_for_ccx, is the id or instance of another override rather
+    than the name of an overridden field.
+    """
+    return name.endswith('_id') and name[:-len('_id')] in block_overrides
+
+
 def _clean_ccx_key(block_location):
     """
     Converts the given BlockUsageKey from a CCX key to the
@@ -117,24 +157,86 @@ def _clean_ccx_key(block_location):
     return clean_key.version_agnostic().for_branch(None)
 
 
+def _overrides_version_cache_key(ccx):
+    return u'ccx.overrides.version.{}'.format(ccx.id)
+
+
+def _overrides_cache_key(ccx, version):
+    return u'ccx.overrides.{}.{}'.format(ccx.id, version)
+
+
+def _get_overrides_version(ccx):
+    """
+    Returns the current version of the shared override map of the `ccx`.
+    """
+    version_key = _overrides_version_cache_key(ccx)
+    version = cache.get(version_key)
+    if version is None:
+        # Start from the current time rather than from 0, so that maps cached
+        # under an evicted counter's versions aren't picked up again.
+        version = int(time.time() * 1000)
+        # Another process may have set a version in the meantime; keep theirs if so.
+        if not cache.add(version_key, version, CCX_OVERRIDES_CACHE_TIMEOUT):
+            version = cache.get(version_key, version)
+    return version
+
+
+def _invalidate_overrides_for_ccx(ccx):
+    """
+    Increments the version of the shared override map of the `ccx`, so that
+    every process reloads it from the database.
+
+    The version is incremented again once the current transaction commits, so
+    that a map loaded by another process before the commit is not kept.
+    """
+    version_key = _overrides_version_cache_key(ccx)
+
+    def increment_version():
+        try:
+            cache.incr(version_key)
+        except ValueError:
+            # No version yet, the next read starts a new one.
+            pass
+
+    increment_version()
+    transaction.on_commit(increment_version)
+    clear_override_indexes()
+
+
+def clear_overrides_for_ccx(ccx):
+    """
+    Deletes every field override of the `ccx`, e.g. when the ccx itself is
+    deleted, and invalidates its shared override map.
+    """
+    CcxFieldOverride.objects.filter(ccx=ccx).delete()
+    get_cache('ccx-overrides').pop(ccx, None)
+    _invalidate_overrides_for_ccx(ccx)
+
+
 def _get_overrides_for_ccx(ccx):
     """
-    Returns a dictionary mapping field name to overriden value for any
-    overrides set on this block for this CCX.
+    Returns a dictionary mapping the location of each block with overrides
+    in this CCX to a dictionary of the overridden fields of the block.  The
+    JSON value of each overridden field is under the name of the field, and
+    the id of its CcxFieldOverride is under the name suffixed with `_id`.
     """
     overrides_cache = get_cache('ccx-overrides')
 
     if ccx not in overrides_cache:
-        overrides = {}
-        query = CcxFieldOverride.objects.filter(
-            ccx=ccx,
-        )
+        cache_key = _overrides_cache_key(ccx, _get_overrides_version(ccx))
+        overrides = cache.get(cache_key)
+        if overrides is None:
+            overrides = {}
+            query = CcxFieldOverride.objects.filter(
+                ccx=ccx,
+            )
+
+            for override in query:
+                block_overrides = overrides.setdefault(override.location, {})
+                block_overrides[override.field] = json.loads(override.value)
+                block_overrides[override.field + "_id"] = override.id
 
-        for override in query:
-            block_overrides = overrides.setdefault(override.location, {})
-            block_overrides[override.field] = json.loads(override.value)
-            block_overrides[override.field + "_id"] = override.id
-            block_overrides[override.field + "_instance"] = override
+            cache.set(cache_key, overrides, CCX_OVERRIDES_CACHE_TIMEOUT)
 
         overrides_cache[ccx] = overrides
 
@@ -151,31 +253,89 @@ def override_field_for_ccx(ccx, block, name, value):
     field = block.fields[name]
     value_json = field.to_json(value)
     serialized_value = json.dumps(value_json)
-    override_has_changes = False
-    clean_ccx_key = _clean_ccx_key(block.location)
+    block_overrides = _get_overrides_for_ccx(ccx).setdefault(_clean_ccx_key(block.location), {})
 
-    override = get_override_for_ccx(ccx, block, name + "_instance")
-    if override:
-        override_has_changes = serialized_value != override.value
-
-    if not override:
+    override_id = block_overrides.get(name + "_id")
+    if override_id is None:
         override, created = CcxFieldOverride.objects.get_or_create(
             ccx=ccx,
             location=block.location,
             field=name,
             defaults={'value': serialized_value},
         )
-        if created:
-            _get_overrides_for_ccx(ccx).setdefault(clean_ccx_key, {})[name + "_id"] = override.id
-        else:
-            override_has_changes = serialized_value != override.value
+        override_id = override.id
+        if not created and serialized_value != override.value:
+            override.value = serialized_value
+            override.save()
+    elif serialized_value != json.dumps(block_overrides.get(name)):
+        CcxFieldOverride.objects.filter(id=override_id).update(value=serialized_value)
+    else:
+        return
+
+    block_overrides[name] = value_json
+    block_overrides[name + "_id"] = override_id
+    _invalidate_overrides_for_ccx(ccx)
 
-    if override_has_changes:
-        override.value = serialized_value
-        override.save()
 
-    _get_overrides_for_ccx(ccx).setdefault(clean_ccx_key, {})[name] = value_json
-    _get_overrides_for_ccx(ccx).setdefault(clean_ccx_key, {})[name + "_instance"] = override
+@transaction.atomic
+def override_fields_for_ccx(ccx, overrides):
+    """
+    Overrides many fields for the `ccx` at once.  `overrides` is an iterable
+    of (block, name, value) tuples, as would be passed to
+    override_field_for_ccx.  When a field of a block is given more than once,
+    the last value wins.
+
+    New overrides are inserted with a single query, and changed overrides are
+    updated with another.  Overrides found by the insert to exist already,
+    e.g. because the map of overrides was stale or another process inserted
+    them meanwhile, are read back and updated.
+    """
+    ccx_overrides = _get_overrides_for_ccx(ccx)
+    new_overrides = {}
+    changed_overrides = {}
+    for block, name, value in overrides:
+        value_json = block.fields[name].to_json(value)
+        serialized_value = json.dumps(value_json)
+        block_overrides = ccx_overrides.get(_clean_ccx_key(block.location), {})
+        override_id = block_overrides.get(name + "_id")
+        if override_id is None:
+            new_overrides[(_clean_ccx_key(block.location), name)] = CcxFieldOverride(
+                ccx=ccx,
+                location=block.location,
+                field=name,
+                value=serialized_value,
+            )
+        elif serialized_value != json.dumps(block_overrides.get(name)):
+            changed_overrides[override_id] = (
+                CcxFieldOverride(id=override_id, value=serialized_value), block_overrides, name, value_json
+            )
+        else:
+            changed_overrides.pop(override_id, None)
+
+    if not new_overrides and not changed_overrides:
+        return
+
+    if changed_overrides:
+        CcxFieldOverride.objects.bulk_update([change[0] for change in changed_overrides.values()], ['value'])
+        for __, block_overrides, name, value_json in changed_overrides.values():
+            block_overrides[name] = value_json
+    if new_overrides:
+        CcxFieldOverride.objects.bulk_create(list(new_overrides.values()), ignore_conflicts=True)
+        conflicting_overrides = []
+        existing_overrides = CcxFieldOverride.objects.filter(
+            ccx=ccx,
+            field__in={name for __, name in new_overrides},
+        ).values_list('id', 'location', 'field', 'value')
+        for override_id, location, name, serialized_value in existing_overrides:
+            new_override = new_overrides.get((_clean_ccx_key(location), name))
+            if new_override is not None and new_override.value != serialized_value:
+                conflicting_overrides.append(CcxFieldOverride(id=override_id, value=new_override.value))
+        if conflicting_overrides:
+            CcxFieldOverride.objects.bulk_update(conflicting_overrides, ['value'])
+        # The ids of the inserted rows aren't returned by every database, so
+        # the map is reloaded on its next read rather than updated here.
+        get_cache('ccx-overrides').pop(ccx, None)
+    _invalidate_overrides_for_ccx(ccx)
 
 
 def clear_override_for_ccx(ccx, block, name):
@@ -192,6 +352,7 @@ def clear_override_for_ccx(ccx, block, name):
             field=name).delete()
 
         clear_ccx_field_info_from_ccx_map(ccx, block, name)
+        _invalidate_overrides_for_ccx(ccx)
 
     except CcxFieldOverride.DoesNotExist:
         pass
@@ -201,14 +362,10 @@ def clear_ccx_field_info_from_ccx_map(ccx, block, name):
     """
     Remove field information from ccx overrides mapping dictionary
     """
-    try:
-        clean_ccx_key = _clean_ccx_key(block.location)
-        ccx_override_map = _get_overrides_for_ccx(ccx).setdefault(clean_ccx_key, {})
-        ccx_override_map.pop(name)
-        ccx_override_map.pop(name + "_id")
-        ccx_override_map.pop(name + "_instance")
-    except KeyError:
-        pass
+    clean_ccx_key = _clean_ccx_key(block.location)
+    ccx_override_map = _get_overrides_for_ccx(ccx).setdefault(clean_ccx_key, {})
+    ccx_override_map.pop(name, None)
+    ccx_override_map.pop(name + "_id", None)
 
 
 def bulk_delete_ccx_override_fields(ccx, ids):
@@ -219,3 +376,4 @@ def bulk_delete_ccx_override_fields(ccx, ids):
     ids = list(set(ids))
     if ids:
         CcxFieldOverride.objects.filter(ccx=ccx, id__in=ids).delete()
+        _invalidate_overrides_for_ccx(ccx)
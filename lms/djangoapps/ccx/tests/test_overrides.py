@@ -5,6 +5,7 @@ tests for overrides
 
 
 import datetime
+import json
 
 import mock
 import pytz
@@ -15,10 +16,15 @@ from six.moves import range
 
 from lms.djangoapps.courseware.courses import get_course_by_id
 from lms.djangoapps.courseware.testutils import FieldOverrideTestMixin
-from lms.djangoapps.ccx.models import CustomCourseForEdX
-from lms.djangoapps.ccx.overrides import override_field_for_ccx
+from lms.djangoapps.ccx.models import CcxFieldOverride, CustomCourseForEdX
+from lms.djangoapps.ccx.overrides import (
+    CustomCoursesForEdxOverrideProvider,
+    get_override_for_ccx,
+    override_field_for_ccx,
+    override_fields_for_ccx
+)
 from lms.djangoapps.ccx.tests.utils import flatten, iter_blocks
-from lms.djangoapps.courseware.field_overrides import OverrideFieldData
+from lms.djangoapps.courseware.field_overrides import OverrideFieldData, clear_override_indexes
 from lms.djangoapps.courseware.tests.test_field_overrides import inject_field_overrides
 from student.tests.factories import AdminFactory
 from xmodule.modulestore.tests.django_utils import TEST_DATA_SPLIT_MODULESTORE, SharedModuleStoreTestCase
@@ -149,6 +155,87 @@ class TestFieldOverrides(FieldOverrideTestMixin, SharedModuleStoreTestCase):
         with self.assertNumQueries(6):
             override_field_for_ccx(self.ccx, chapter, 'start', ccx_start)
 
+    def test_override_fields_in_bulk(self):
+        """
+        Test that many new overrides are written with a single insert.
+        """
+        ccx_due = datetime.datetime(2015, 1, 1, 00, 00, tzinfo=pytz.UTC)
+        blocks = list(iter_blocks(self.ccx_course))
+        chapter = self.ccx_course.get_children()[0]
+        get_override_for_ccx(self.ccx, chapter, 'due')
+        # One SAVEPOINT/RELEASE SAVEPOINT pair around the INSERT and the read back of conflicts.
+        with self.assertNumQueries(4):
+            override_fields_for_ccx(self.ccx, [(block, 'due', ccx_due) for block in blocks])
+        for block in blocks:
+            self.assertEqual(get_override_for_ccx(self.ccx, block, 'due'), ccx_due)
+        self.assertEqual(chapter.due, ccx_due)
+
+    def test_override_fields_in_bulk_update_existing_fields(self):
+        """
+        Test that changed overrides are updated with a single query, and that
+        unchanged ones aren't written.
+        """
+        ccx_start = datetime.datetime(2014, 12, 25, 00, 00, tzinfo=pytz.UTC)
+        new_ccx_start = datetime.datetime(2015, 12, 25, 00, 00, tzinfo=pytz.UTC)
+        chapters = self.ccx_course.get_children()
+        override_fields_for_ccx(self.ccx, [(chapter, 'start', ccx_start) for chapter in chapters])
+        get_override_for_ccx(self.ccx, chapters[0], 'start')
+        with self.assertNumQueries(3):
+            override_fields_for_ccx(self.ccx, [
+                (chapters[0], 'start', new_ccx_start),
+                (chapters[1], 'start', new_ccx_start),
+                (chapters[1], 'start', ccx_start),
+            ])
+        with self.assertNumQueries(2):      # 2 savepoints
+            override_fields_for_ccx(self.ccx, [(chapter, 'start', ccx_start) for chapter in chapters[1:]])
+        self.assertEqual(chapters[0].start, new_ccx_start)
+        self.assertEqual(chapters[1].start, ccx_start)
+
+    def test_override_fields_in_bulk_stale_map(self):
+        """
+        Test that overrides written since the map of overrides was read are
+        updated rather than inserted again.
+        """
+        ccx_start = datetime.datetime(2014, 12, 25, 00, 00, tzinfo=pytz.UTC)
+        new_ccx_start = datetime.datetime(2015, 12, 25, 00, 00, tzinfo=pytz.UTC)
+        chapters = self.ccx_course.get_children()
+        get_override_for_ccx(self.ccx, chapters[0], 'start')
+        CcxFieldOverride.objects.create(
+            ccx=self.ccx,
+            location=chapters[0].location,
+            field='start',
+            value=json.dumps(chapters[0].fields['start'].to_json(ccx_start)),
+        )
+        override_fields_for_ccx(self.ccx, [(chapter, 'start', new_ccx_start) for chapter in chapters])
+        self.assertEqual(
+            CcxFieldOverride.objects.filter(ccx=self.ccx, field='start').count(),
+            len(chapters)
+        )
+        for chapter in chapters:
+            self.assertEqual(get_override_for_ccx(self.ccx, chapter, 'start'), new_ccx_start)
+
+    def test_override_map_shared_between_requests(self):
+        """
+        Test that a later request reads the overrides of the ccx from the
+        cache, and that writing an override invalidates them.
+        """
+        ccx_start = datetime.datetime(2014, 12, 25, 00, 00, tzinfo=pytz.UTC)
+        new_ccx_start = datetime.datetime(2015, 12, 25, 00, 00, tzinfo=pytz.UTC)
+        chapter = self.ccx_course.get_children()[0]
+        override_field_for_ccx(self.ccx, chapter, 'start', ccx_start)
+
+        RequestCache.clear_all_namespaces()
+        with self.assertNumQueries(1):
+            self.assertEqual(get_override_for_ccx(self.ccx, chapter, 'start'), ccx_start)
+        RequestCache.clear_all_namespaces()
+        with self.assertNumQueries(0):
+            self.assertEqual(get_override_for_ccx(self.ccx, chapter, 'start'), ccx_start)
+
+        override_field_for_ccx(self.ccx, chapter, 'start', new_ccx_start)
+        RequestCache.clear_all_namespaces()
+        with self.assertNumQueries(1):
+            self.assertEqual(get_override_for_ccx(self.ccx, chapter, 'start'), new_ccx_start)
+
     def test_override_is_inherited(self):
         """
         Test that sequentials inherit overridden start date from chapter.
@@ -171,3 +258,37 @@ class TestFieldOverrides(FieldOverrideTestMixin, SharedModuleStoreTestCase):
         override_field_for_ccx(self.ccx, chapter, 'due', ccx_due)
         vertical = chapter.get_children()[0].get_children()[0]
         self.assertEqual(vertical.due, ccx_due)
+
+    def test_override_index_matches_provider(self):
+        """
+        Test that reading fields of every block of a ccx with overrides on every
+        block through the override index gives the same values as asking the ccx
+        provider on each read, without queries.
+        """
+        blocks = list(iter_blocks(self.ccx_course))
+        ccx_start = datetime.datetime(2014, 12, 25, 00, 00, tzinfo=pytz.UTC)
+        ccx_due = datetime.datetime(2015, 1, 1, 00, 00, tzinfo=pytz.UTC)
+        for block in blocks:
+            override_field_for_ccx(self.ccx, block, 'start', ccx_start)
+            override_field_for_ccx(self.ccx, block, 'due', ccx_due)
+        names = ('start', 'due', 'display_name', 'graded', 'visible_to_staff_only', 'course_edit_method')
+
+        def read_fields():
+            """
+            Read the overrides of the fields of every block, as the field data does on field reads.
+            """
+            return [
+                block._field_data.get_override(block, name)  # pylint: disable=protected-access
+                for block in blocks for name in names
+            ]
+
+        indexed = read_fields()
+        with self.assertNumQueries(0):
+            self.assertEqual(read_fields(), indexed)
+
+        with mock.patch.object(CustomCoursesForEdxOverrideProvider, 'get_all', return_value=None):
+            clear_override_indexes()
+            asked = read_fields()
+
+        self.assertEqual(indexed, asked)
+        self.assertEqual(indexed.count(ccx_due), len(blocks))
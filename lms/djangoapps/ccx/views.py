@@ -33,7 +33,8 @@ from lms.djangoapps.ccx.overrides import (
     bulk_delete_ccx_override_fields,
     clear_ccx_field_info_from_ccx_map,
     get_override_for_ccx,
-    override_field_for_ccx
+    override_field_for_ccx,
+    override_fields_for_ccx
 )
 from lms.djangoapps.ccx.permissions import VIEW_CCX_COACH_DASHBOARD
 from lms.djangoapps.ccx.utils import (
@@ -194,22 +195,24 @@ def create_ccx(request, course, ccx=None):
 
     # Make sure start/due are overridden for entire course
     start = TODAY().replace(tzinfo=pytz.UTC)
-    override_field_for_ccx(ccx, course, 'start', start)
-    override_field_for_ccx(ccx, course, 'due', None)
-
-    # Enforce a static limit for the maximum amount of students that can be enrolled
-    override_field_for_ccx(ccx, course, 'max_student_enrollments_allowed', settings.CCX_MAX_STUDENTS_ALLOWED)
-    # Save display name explicitly
-    override_field_for_ccx(ccx, course, 'display_name', name)
+    overrides = [
+        (course, 'start', start),
+        (course, 'due', None),
+        # Enforce a static limit for the maximum amount of students that can be enrolled
+        (course, 'max_student_enrollments_allowed', settings.CCX_MAX_STUDENTS_ALLOWED),
+        # Save display name explicitly
+        (course, 'display_name', name),
+    ]
 
     # Hide anything that can show up in the schedule
     hidden = 'visible_to_staff_only'
     for chapter in course.get_children():
-        override_field_for_ccx(ccx, chapter, hidden, True)
+        overrides.append((chapter, hidden, True))
         for sequential in chapter.get_children():
-            override_field_for_ccx(ccx, sequential, hidden, True)
+            overrides.append((sequential, hidden, True))
             for vertical in sequential.get_children():
-                override_field_for_ccx(ccx, vertical, hidden, True)
+                overrides.append((vertical, hidden, True))
+    override_fields_for_ccx(ccx, overrides)
 
     ccx_id = CCXLocator.from_course_locator(course.id, six.text_type(ccx.id))
 
@@ -254,11 +257,14 @@ def save_ccx(request, course, ccx=None):
     if not ccx:
         raise Http404
 
+    # The (block, field name, value) of each override, written at once below.
+    overrides = []
+
     def override_fields(parent, data, graded, earliest=None, ccx_ids_to_delete=None):
         """
-        Recursively apply CCX schedule data to CCX by overriding the
-        `visible_to_staff_only`, `start` and `due` fields for units in the
-        course.
+        Recursively collect the overrides of the `visible_to_staff_only`,
+        `start` and `due` fields of the units in the course that apply CCX
+        schedule data to CCX.
         """
         if ccx_ids_to_delete is None:
             ccx_ids_to_delete = []
@@ -268,14 +274,13 @@ def save_ccx(request, course, ccx=None):
 
         for unit in data:
             block = blocks[unit['location']]
-            override_field_for_ccx(
-                ccx, block, 'visible_to_staff_only', unit['hidden'])
+            overrides.append((block, 'visible_to_staff_only', unit['hidden']))
 
             start = parse_date(unit['start'])
             if start:
                 if not earliest or start < earliest:
                     earliest = start
-                override_field_for_ccx(ccx, block, 'start', start)
+                overrides.append((block, 'start', start))
             else:
                 ccx_ids_to_delete.append(get_override_for_ccx(ccx, block, 'start_id'))
                 clear_ccx_field_info_from_ccx_map(ccx, block, 'start')
@@ -284,7 +289,7 @@ def save_ccx(request, course, ccx=None):
             if 'due' in unit:  # checking that the key (due) exist in dict (unit).
                 due = parse_date(unit['due'])
                 if due:
-                    override_field_for_ccx(ccx, block, 'due', due)
+                    overrides.append((block, 'due', due))
                 else:
                     ccx_ids_to_delete.append(get_override_for_ccx(ccx, block, 'due_id'))
                     clear_ccx_field_info_from_ccx_map(ccx, block, 'due')
@@ -302,10 +307,10 @@ def save_ccx(request, course, ccx=None):
                 for component in block.get_children():
                     # override start and due date of problem (Copy dates of vertical into problems)
                     if start:
-                        override_field_for_ccx(ccx, component, 'start', start)
+                        overrides.append((component, 'start', start))
 
                     if due:
-                        override_field_for_ccx(ccx, component, 'due', due)
+                        overrides.append((component, 'due', due))
 
             if children:
                 override_fields(block, children, graded, earliest, ccx_ids_to_delete)
@@ -313,9 +318,8 @@ def save_ccx(request, course, ccx=None):
 
     graded = {}
     earliest, ccx_ids_to_delete = override_fields(course, json.loads(request.body.decode('utf8')), graded, [])
-    bulk_delete_ccx_override_fields(ccx, ccx_ids_to_delete)
     if earliest:
-        override_field_for_ccx(ccx, course, 'start', earliest)
+        overrides.append((course, 'start', earliest))
 
     # Attempt to automatically adjust grading policy
     changed = False
@@ -330,7 +334,11 @@ def save_ccx(request, course, ccx=None):
             changed = True
             section['min_count'] = count
     if changed:
-        override_field_for_ccx(ccx, course, 'grading_policy', policy)
+        overrides.append((course, 'grading_policy', policy))
+
+    with transaction.atomic():
+        bulk_delete_ccx_override_fields(ccx, ccx_ids_to_delete)
+        override_fields_for_ccx(ccx, overrides)
 
     # using CCX object as sender here.
     responses = SignalHandler.course_published.send(
@@ -240,6 +240,68 @@ def generate_user_certificates(student, course_key, course=None, insecure=False,
     return cert.status
 
 
+def bulk_generation_enabled():
+    """
+    Returns whether certificates are generated for many students at once by
+    generate_user_certificates_in_bulk.
+    """
+    return settings.FEATURES.get('ENABLE_BULK_CERTIFICATE_GENERATION', False)
+
+
+def generate_user_certificates_in_bulk(students, course_key, course=None, insecure=False, generation_mode='batch'):
+    """
+    Adds the add-cert requests of many students into the xqueue at once, as
+    generate_user_certificates would for each of them, and emits the
+    `edx.certificate.created` events of their certificates.
+
+    The state of the students in the course is read, and their certificates
+    are written, with a few queries for all of them; see
+    XQueueCertInterface.add_certs.
+
+    Returns a dict mapping the id of each of the students to the status of
+    their certificate, or to None if generate_user_certificates would have
+    returned None.
+    """
+    if not course:
+        course = modulestore().get_course(course_key, depth=0)
+
+    statuses = {student.id: None for student in students}
+    beta_tester_ids = set(list_with_level(course, u'beta').values_list('id', flat=True))
+    for student in students:
+        if student.id in beta_tester_ids:
+            message = u'Cancelling course certificate generation for user [{}] against course [{}], ' \
+                      u'user is a Beta Tester.'
+            log.info(message.format(student.username, course_key))
+    students = [student for student in students if student.id not in beta_tester_ids]
+
+    xqueue = XQueueCertInterface()
+    if insecure:
+        xqueue.use_https = False
+
+    generate_pdf = not has_html_certificates_enabled(course)
+
+    certificates = xqueue.add_certs(students, course_key, course=course, generate_pdf=generate_pdf)
+
+    log.info(u'Queued Certificate Generation tasks for %d users : %s', len(students), course_key)
+
+    created_events = []
+    for student in students:
+        cert = certificates[student.id]
+        if cert is None:
+            continue
+        if CertificateStatuses.is_passing_status(cert.status):
+            created_events.append((student, cert, {
+                'user_id': student.id,
+                'course_id': six.text_type(course_key),
+                'certificate_id': cert.verify_uuid,
+                'enrollment_mode': cert.mode,
+                'generation_mode': generation_mode
+            }))
+        statuses[student.id] = cert.status
+    emit_certificate_events('created', course_key, course, created_events)
+    return statuses
+
+
 def regenerate_user_certificates(student, course_key, course=None,
                                  forced_grade=None, template_file=None, insecure=False):
     """
@@ -643,6 +705,28 @@ def emit_certificate_event(event_name, user, course_id, course=None, event_data=
         tracker.emit(event_name, event_data)
 
 
+def emit_certificate_events(event_name, course_id, course, events):
+    """
+    Emits a certificate event for each of the (user, certificate, event_data)
+    tuples of `events`, as emit_certificate_event would, within a single
+    tracker context.
+    """
+    event_name = '.'.join(['edx', 'certificate', event_name])
+    context = {
+        'org_id': course.org,
+        'course_id': six.text_type(course_id)
+    }
+    with tracker.get_tracker().context(event_name, context):
+        for user, certificate, event_data in events:
+            data = dict(event_data or {})
+            data.update({
+                'user_id': user.id,
+                'course_id': six.text_type(course_id),
+                'certificate_url': get_certificate_url(user.id, course_id, user_certificate=certificate)
+            })
+            tracker.emit(event_name, data)
+
+
 def get_asset_url_by_slug(asset_slug):
     """
     Returns certificate template asset url for given asset_slug.
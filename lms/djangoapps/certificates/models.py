@@ -402,6 +402,13 @@ class GeneratedCertificate(models.Model):
         As well as the COURSE_CERT_CHANGED for any save event.
         """
         super(GeneratedCertificate, self).save(*args, **kwargs)
+        self.send_saved_signals()
+
+    def send_saved_signals(self):
+        """
+        Fires the signals of saving the certificate, for certificates written
+        without calling save(), e.g. with bulk queries.
+        """
         COURSE_CERT_CHANGED.send_robust(
             sender=self.__class__,
             user=self.user,
@@ -580,6 +587,22 @@ def certificate_status_for_student(student, course_id):
     return certificate_status(generated_certificate)
 
 
+def certificate_statuses_for_student(student, course_ids):
+    """
+    This returns a dictionary mapping each of the course ids to the
+    certificate status of the student in that course, as
+    certificate_status_for_student would return it, using a single query.
+    """
+    generated_certificates = {
+        generated_certificate.course_id: generated_certificate
+        for generated_certificate in GeneratedCertificate.objects.filter(user=student, course_id__in=course_ids)
+    }
+    return {
+        course_id: certificate_status(generated_certificates.get(course_id))
+        for course_id in course_ids
+    }
+
+
 def certificate_status(generated_certificate):
     """
     This returns a dictionary with a key for status, and other information.
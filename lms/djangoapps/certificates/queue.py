@@ -4,16 +4,20 @@
 import json
 import logging
 import random
+from datetime import datetime
 from uuid import uuid4
 
 import lxml.html
 import six
 from django.conf import settings
+from django.db import IntegrityError, transaction
 from django.test.client import RequestFactory
 from django.urls import reverse
 from django.utils.encoding import python_2_unicode_compatible
 from lxml.etree import ParserError, XMLSyntaxError
+from pytz import UTC
 from requests.auth import HTTPBasicAuth
+from simple_history.utils import bulk_create_with_history
 
 from capa.xqueue_interface import XQueueInterface, make_hashkey, make_xheader
 from course_modes.models import CourseMode
@@ -22,9 +26,14 @@ from lms.djangoapps.certificates.models import (
     CertificateWhitelist,
     ExampleCertificate,
     GeneratedCertificate,
+    certificate_status,
     certificate_status_for_student
 )
-from lms.djangoapps.grades.api import CourseGradeFactory
+from lms.djangoapps.grades.api import (
+    CourseGradeFactory,
+    clear_prefetched_course_grades,
+    prefetch_course_and_subsection_grades
+)
 from lms.djangoapps.verify_student.services import IDVerificationService
 from student.models import CourseEnrollment, UserProfile
 from xmodule.modulestore.django import modulestore
@@ -82,6 +91,20 @@ class XQueueCertInterface(object):
 
     """
 
+    # The statuses of the certificates that can be requested again.
+    VALID_STATUSES = [
+        status.generating,
+        status.unavailable,
+        status.deleted,
+        status.error,
+        status.notpassing,
+        status.downloadable,
+        status.auditing,
+        status.audit_passing,
+        status.audit_notpassing,
+        status.unverified,
+    ]
+
     def __init__(self, request=None):
 
         # Get basic auth (username/password) for
@@ -189,7 +212,6 @@ class XQueueCertInterface(object):
 
         raise NotImplementedError
 
-    # pylint: disable=too-many-statements
     def add_cert(self, student, course_id, course=None, forced_grade=None, template_file=None, generate_pdf=True):
         """
         Request a new certificate for a student.
@@ -234,61 +256,226 @@ class XQueueCertInterface(object):
             )
             return None
 
-        valid_statuses = [
-            status.generating,
-            status.unavailable,
-            status.deleted,
-            status.error,
-            status.notpassing,
-            status.downloadable,
-            status.auditing,
-            status.audit_passing,
-            status.audit_notpassing,
-            status.unverified,
+        cert_status_dict = certificate_status_for_student(student, course_id)
+        if not self._check_cert_status(student.id, course_id, cert_status_dict):
+            return None
+        cert_status = cert_status_dict.get('status')
+
+        # The caller can optionally pass a course in to avoid
+        # re-fetching it from Mongo. If they have not provided one,
+        # get it from the modulestore.
+        if course is None:
+            course = modulestore().get_course(course_id, depth=0)
+
+        profile = UserProfile.objects.get(user=student)
+        profile_name = profile.name
+
+        # Needed for access control in grading.
+        self.request.user = student
+        self.request.session = {}
+
+        is_whitelisted = self.whitelist.filter(user=student, course_id=course_id, whitelist=True).exists()
+        course_grade = CourseGradeFactory().read(student, course)
+        enrollment_mode, __ = CourseEnrollment.enrollment_mode_for_user(student, course_id)
+        user_is_verified = IDVerificationService.user_is_verified(student)
+
+        cert, created = GeneratedCertificate.objects.get_or_create(user=student, course_id=course_id)
+        generation = self._update_cert(
+            cert,
+            student,
+            course_id,
+            profile_name,
+            course_grade,
+            enrollment_mode,
+            cert_status,
+            is_whitelisted,
+            user_is_verified,
+            lambda: self.restricted.filter(user=student).exists(),
+            forced_grade,
+            template_file,
+            generate_pdf,
+        )
+        if generation is None:
+            cert.save()
+            return cert
+
+        # Finally, generate the certificate and send it off.
+        grade_contents, template_pdf = generation
+        return self._generate_cert(cert, course, student, grade_contents, template_pdf, generate_pdf)
+
+    def add_certs(self, students, course_id, course=None, template_file=None, generate_pdf=True):
+        """
+        Request new certificates for many students at once, as add_cert
+        would for each of them.
+
+        The grades, enrollment modes, ID verifications, whitelist and
+        restricted statuses, profile names and existing certificates of the
+        students are read with a few queries for all of them, and the
+        certificates are written with bulk queries.  The COURSE_CERT_CHANGED
+        and COURSE_CERT_AWARDED signals that saving each certificate sends
+        are sent once they have all been written.
+
+        Returns a dict mapping the id of each of the students to their
+        certificate, or to None if add_cert would have returned None.
+        """
+        certificates = {student.id: None for student in students}
+        if hasattr(course_id, 'ccx'):
+            LOGGER.warning(
+                u"Cannot create certificate generation tasks in the course '%s'; "
+                u"certificates are not allowed for CCX courses.",
+                six.text_type(course_id)
+            )
+            return certificates
+
+        if course is None:
+            course = modulestore().get_course(course_id, depth=0)
+
+        existing_certs = {
+            cert.user_id: cert
+            for cert in GeneratedCertificate.objects.filter(user__in=students, course_id=course_id)
+        }
+        cert_statuses = {student.id: certificate_status(existing_certs.get(student.id)) for student in students}
+        students = [
+            student for student in students
+            if self._check_cert_status(student.id, course_id, cert_statuses[student.id])
         ]
+        if not students:
+            return certificates
 
-        cert_status_dict = certificate_status_for_student(student, course_id)
+        profile_names = dict(UserProfile.objects.filter(user__in=students).values_list('user_id', 'name'))
+        whitelisted_ids = set(
+            self.whitelist.filter(user__in=students, course_id=course_id, whitelist=True).values_list(
+                'user_id', flat=True
+            )
+        )
+        restricted_ids = set(self.restricted.filter(user__in=students).values_list('user_id', flat=True))
+        verified_ids = set(IDVerificationService.get_verified_user_ids(students))
+        CourseEnrollment.bulk_fetch_enrollment_states(students, course_id)
+        prefetch_course_and_subsection_grades(course_id, students)
+
+        now = datetime.now(UTC)
+        new_certs, changed_certs, generated_certs = [], [], []
+        try:
+            for student, course_grade, error in CourseGradeFactory().iter(students, course):
+                if course_grade is None:
+                    LOGGER.warning(
+                        u"Cannot create certificate generation task for user %s in the course '%s'; "
+                        u"the course grade could not be read: %s",
+                        student.id,
+                        six.text_type(course_id),
+                        error
+                    )
+                    continue
+
+                cert = existing_certs.get(student.id)
+                if cert is None:
+                    cert = GeneratedCertificate(user=student, course_id=course_id, created_date=now)
+                    new_certs.append(cert)
+                else:
+                    changed_certs.append(cert)
+                enrollment_mode, __ = CourseEnrollment.enrollment_mode_for_user(student, course_id)
+                generation = self._update_cert(
+                    cert,
+                    student,
+                    course_id,
+                    profile_names.get(student.id, u''),
+                    course_grade,
+                    enrollment_mode,
+                    cert_statuses[student.id]['status'],
+                    student.id in whitelisted_ids,
+                    student.id in verified_ids,
+                    lambda student_id=student.id: student_id in restricted_ids,
+                    None,
+                    template_file,
+                    generate_pdf,
+                )
+                if generation is not None:
+                    grade_contents, template_pdf = generation
+                    contents = self._prepare_cert(cert, course, student, grade_contents, template_pdf, generate_pdf)
+                    generated_certs.append((cert, student, contents))
+                certificates[student.id] = cert
+        finally:
+            clear_prefetched_course_grades(course_id)
+
+        if not self._bulk_save_certs(new_certs, changed_certs):
+            # Another process created the certificates of some of the students
+            # meanwhile.  add_cert reads back the certificate of each student,
+            # and requests it as it would have been if it had existed already.
+            LOGGER.info(
+                u"Certificates were created concurrently in the course '%s'; "
+                u"requesting the %d new certificates one by one.",
+                six.text_type(course_id),
+                len(new_certs)
+            )
+            new_students = {cert.user_id: cert.user for cert in new_certs}
+            generated_certs = [generated for generated in generated_certs if generated[1].id not in new_students]
+            for student_id, student in six.iteritems(new_students):
+                certificates[student_id] = self.add_cert(
+                    student, course_id, course=course, template_file=template_file, generate_pdf=generate_pdf
+                )
+            new_certs = []
+
+        if generate_pdf:
+            failed_certs = {}
+            for cert, student, contents in generated_certs:
+                if not self._send_cert_to_xqueue(cert, student, contents):
+                    failed_certs[student.id] = cert
+            if failed_certs:
+                # Bulk inserts don't set the ids of the new certificates on every
+                # database, so the certificates are read back to be saved again.
+                saved_certs = list(GeneratedCertificate.objects.filter(user__in=failed_certs, course_id=course_id))
+                for saved_cert in saved_certs:
+                    saved_cert.status = failed_certs[saved_cert.user_id].status
+                    saved_cert.error_reason = failed_certs[saved_cert.user_id].error_reason
+                self._bulk_save_certs([], saved_certs)
+
+        for cert in new_certs + changed_certs:
+            cert.send_saved_signals()
+        return certificates
+
+    def _check_cert_status(self, student_id, course_id, cert_status_dict):
+        """
+        Returns whether a certificate can be requested for the student given
+        the status of their current certificate, and logs why if not.
+        """
         cert_status = cert_status_dict.get('status')
         download_url = cert_status_dict.get('download_url')
-        cert = None
         if download_url:
             self._log_pdf_cert_generation_discontinued_warning(
-                student.id, course_id, cert_status, download_url
+                student_id, course_id, cert_status, download_url
             )
-            return None
+            return False
 
-        if cert_status not in valid_statuses:
+        if cert_status not in self.VALID_STATUSES:
             LOGGER.warning(
                 (
                     u"Cannot create certificate generation task for user %s "
                     u"in the course '%s'; "
                     u"the certificate status '%s' is not one of %s."
                 ),
-                student.id,
+                student_id,
                 six.text_type(course_id),
                 cert_status,
-                six.text_type(valid_statuses)
+                six.text_type(self.VALID_STATUSES)
             )
-            return None
+            return False
+        return True
 
-        # The caller can optionally pass a course in to avoid
-        # re-fetching it from Mongo. If they have not provided one,
-        # get it from the modulestore.
-        if course is None:
-            course = modulestore().get_course(course_id, depth=0)
-
-        profile = UserProfile.objects.get(user=student)
-        profile_name = profile.name
+    # pylint: disable=too-many-statements
+    def _update_cert(self, cert, student, course_id, profile_name, course_grade, enrollment_mode, cert_status,
+                     is_whitelisted, user_is_verified, is_restricted, forced_grade, template_file, generate_pdf):
+        """
+        Updates the fields of the certificate of the student from their
+        grade, enrollment and status in the course, without saving it.
 
-        # Needed for access control in grading.
-        self.request.user = student
-        self.request.session = {}
+        `is_restricted` is a function returning whether the student is on
+        the embargoed country restricted list, only called when needed.
 
-        is_whitelisted = self.whitelist.filter(user=student, course_id=course_id, whitelist=True).exists()
-        course_grade = CourseGradeFactory().read(student, course)
-        enrollment_mode, __ = CourseEnrollment.enrollment_mode_for_user(student, course_id)
+        Returns the (grade_contents, template_pdf) to generate the certificate
+        with, or None if the certificate is not to be generated, in which case
+        its status has been set to the reason why.
+        """
         mode_is_verified = enrollment_mode in GeneratedCertificate.VERIFIED_CERTS_MODES
-        user_is_verified = IDVerificationService.user_is_verified(student)
         cert_mode = enrollment_mode
 
         is_eligible_for_certificate = CourseMode.is_eligible_for_certificate(enrollment_mode, cert_status)
@@ -332,7 +519,6 @@ class XQueueCertInterface(object):
             mode_is_verified,
             generate_pdf
         )
-        cert, created = GeneratedCertificate.objects.get_or_create(user=student, course_id=course_id)
 
         cert.mode = cert_mode
         cert.user = student
@@ -380,17 +566,15 @@ class XQueueCertInterface(object):
         cutoff = settings.AUDIT_CERT_CUTOFF_DATE
         if (cutoff and cert.created_date >= cutoff) and not is_eligible_for_certificate:
             cert.status = status.audit_passing if passing else status.audit_notpassing
-            cert.save()
             LOGGER.info(
                 u"Student %s with enrollment mode %s is not eligible for a certificate.",
                 student.id,
                 enrollment_mode
             )
-            return cert
+            return None
         # If they are not passing, short-circuit and don't generate cert
         elif not passing:
             cert.status = status.notpassing
-            cert.save()
 
             LOGGER.info(
                 (
@@ -402,14 +586,13 @@ class XQueueCertInterface(object):
                 six.text_type(course_id),
                 cert.status
             )
-            return cert
+            return None
 
         # Check to see whether the student is on the the embargoed
         # country restricted list. If so, they should not receive a
         # certificate -- set their status to restricted and log it.
-        if self.restricted.filter(user=student).exists():
+        if is_restricted():
             cert.status = status.restricted
-            cert.save()
 
             LOGGER.info(
                 (
@@ -422,11 +605,10 @@ class XQueueCertInterface(object):
                 cert.status,
                 six.text_type(course_id)
             )
-            return cert
+            return None
 
         if unverified:
             cert.status = status.unverified
-            cert.save()
             LOGGER.info(
                 (
                     u"User %s has a verified enrollment in course %s "
@@ -436,16 +618,29 @@ class XQueueCertInterface(object):
                 student.id,
                 six.text_type(course_id),
             )
-            return cert
+            return None
 
-        # Finally, generate the certificate and send it off.
-        return self._generate_cert(cert, course, student, grade_contents, template_pdf, generate_pdf)
+        return grade_contents, template_pdf
 
     def _generate_cert(self, cert, course, student, grade_contents, template_pdf, generate_pdf):
         """
         Generate a certificate for the student. If `generate_pdf` is True,
         sends a request to XQueue.
         """
+        contents = self._prepare_cert(cert, course, student, grade_contents, template_pdf, generate_pdf)
+        cert.save()
+        logging.info(u'certificate generated for user: %s with generate_pdf status: %s',
+                     student.username, generate_pdf)
+
+        if generate_pdf and not self._send_cert_to_xqueue(cert, student, contents):
+            cert.save()
+        return cert
+
+    def _prepare_cert(self, cert, course, student, grade_contents, template_pdf, generate_pdf):
+        """
+        Sets the key and status of a certificate to be generated, without
+        saving it, and returns the contents of its XQueue task.
+        """
         course_id = six.text_type(course.id)
 
         key = make_hashkey(random.random())
@@ -464,37 +659,75 @@ class XQueueCertInterface(object):
         else:
             cert.status = status.downloadable
             cert.verify_uuid = uuid4().hex
+        return contents
 
-        cert.save()
-        logging.info(u'certificate generated for user: %s with generate_pdf status: %s',
-                     student.username, generate_pdf)
+    def _send_cert_to_xqueue(self, cert, student, contents):
+        """
+        Sends the task generating the PDF of a saved certificate to the XQueue.
 
-        if generate_pdf:
-            try:
-                self._send_to_xqueue(contents, key)
-            except XQueueAddToQueueError as exc:
-                cert.status = ExampleCertificate.STATUS_ERROR
-                cert.error_reason = six.text_type(exc)
-                cert.save()
-                LOGGER.critical(
-                    (
-                        u"Could not add certificate task to XQueue.  "
-                        u"The course was '%s' and the student was '%s'."
-                        u"The certificate task status has been marked as 'error' "
-                        u"and can be re-submitted with a management command."
-                    ), course_id, student.id
-                )
-            else:
-                LOGGER.info(
-                    (
-                        u"The certificate status has been set to '%s'.  "
-                        u"Sent a certificate grading task to the XQueue "
-                        u"with the key '%s'. "
-                    ),
-                    cert.status,
-                    key
-                )
-        return cert
+        Returns whether the task was added to the queue.  If not, the status
+        of the certificate is set to error, and it is to be saved again.
+        """
+        try:
+            self._send_to_xqueue(contents, cert.key)
+        except XQueueAddToQueueError as exc:
+            cert.status = ExampleCertificate.STATUS_ERROR
+            cert.error_reason = six.text_type(exc)
+            LOGGER.critical(
+                (
+                    u"Could not add certificate task to XQueue.  "
+                    u"The course was '%s' and the student was '%s'."
+                    u"The certificate task status has been marked as 'error' "
+                    u"and can be re-submitted with a management command."
+                ), contents['course_id'], student.id
+            )
+            return False
+        LOGGER.info(
+            (
+                u"The certificate status has been set to '%s'.  "
+                u"Sent a certificate grading task to the XQueue "
+                u"with the key '%s'. "
+            ),
+            cert.status,
+            cert.key
+        )
+        return True
+
+    @staticmethod
+    def _bulk_save_certs(new_certs, changed_certs):
+        """
+        Writes the new and changed certificates, and their historical
+        records, with bulk queries rather than a query per certificate.
+
+        Returns False if one of the new certificates already existed, in
+        which case none of the new certificates are written.
+        """
+        now = datetime.now(UTC)
+        with transaction.atomic():
+            if changed_certs:
+                # bulk_update doesn't set auto_now fields.
+                for cert in changed_certs:
+                    cert.modified_date = now
+                GeneratedCertificate.objects.bulk_update(changed_certs, [
+                    'mode', 'grade', 'name', 'download_url', 'key', 'status', 'verify_uuid', 'error_reason',
+                    'modified_date',
+                ])
+                history_model = GeneratedCertificate.history.model
+                history_model.objects.bulk_create([
+                    history_model(
+                        history_date=now,
+                        history_type='~',
+                        **{field.attname: getattr(cert, field.attname) for field in GeneratedCertificate._meta.fields}
+                    )
+                    for cert in changed_certs
+                ])
+            if new_certs:
+                try:
+                    with transaction.atomic():
+                        bulk_create_with_history(new_certs, GeneratedCertificate)
+                except IntegrityError:
+                    return False
+        return True
 
     def add_example_cert(self, example_cert):
         """Add a task to create an example certificate.
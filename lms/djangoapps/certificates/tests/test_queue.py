@@ -367,6 +367,143 @@ class XQueueCertInterfaceAddCertificateTest(ModuleStoreTestCase):
             )
 
 
+@override_settings(CERT_QUEUE='certificates')
+class XQueueCertInterfaceAddCertsTest(ModuleStoreTestCase):
+    """Test that adding the certificates of many students at once matches adding them one at a time. """
+
+    ERROR_REASON = "Kaboom!"
+
+    def setUp(self):
+        super(XQueueCertInterfaceAddCertsTest, self).setUp()
+        self.course = CourseFactory.create()
+        self.xqueue = XQueueCertInterface()
+        self.students = []
+        for mode, verified, whitelisted in (
+                (CourseMode.HONOR, False, False),
+                (CourseMode.VERIFIED, True, False),
+                (CourseMode.VERIFIED, False, False),
+                (CourseMode.AUDIT, False, False),
+                (CourseMode.AUDIT, False, True),
+        ):
+            student = UserFactory.create()
+            CourseEnrollmentFactory(user=student, course_id=self.course.id, is_active=True, mode=mode)
+            if verified:
+                SoftwareSecurePhotoVerificationFactory.create(user=student, status='approved')
+            if whitelisted:
+                CertificateWhitelistFactory(course_id=self.course.id, user=student)
+            self.students.append(student)
+        GeneratedCertificateFactory(
+            user=self.students[0],
+            course_id=self.course.id,
+            status=CertificateStatuses.unavailable,
+            mode=GeneratedCertificate.MODES.honor,
+        )
+
+    def _get_certificates(self):
+        """
+        Returns the fields of the certificates of the students that are set by adding them.
+        """
+        return {
+            cert.user_id: (cert.status, cert.mode, cert.grade, cert.name, bool(cert.verify_uuid))
+            for cert in GeneratedCertificate.objects.filter(course_id=self.course.id)
+        }
+
+    @ddt.data(True, False)
+    def test_add_certs(self, generate_pdf):
+        with mock_passing_grade():
+            with patch.object(XQueueInterface, 'send_to_queue') as mock_send:
+                mock_send.return_value = (0, None)
+                for student in self.students:
+                    self.xqueue.add_cert(student, self.course.id, generate_pdf=generate_pdf)
+                expected = self._get_certificates()
+                expected_sends = mock_send.call_count
+                GeneratedCertificate.objects.filter(course_id=self.course.id).update(
+                    status=CertificateStatuses.unavailable
+                )
+                GeneratedCertificate.objects.filter(user=self.students[1]).delete()
+
+                mock_send.reset_mock()
+                certificates = self.xqueue.add_certs(self.students, self.course.id, generate_pdf=generate_pdf)
+
+        self.assertEqual(self._get_certificates(), expected)
+        self.assertEqual(mock_send.call_count, expected_sends)
+        self.assertEqual(set(certificates), {student.id for student in self.students})
+        for student in self.students:
+            self.assertEqual(certificates[student.id].status, expected[student.id][0])
+        self.assertEqual(
+            GeneratedCertificate.history.filter(user=self.students[0], status=expected[self.students[0].id][0]).count(),
+            2
+        )
+
+    def test_add_certs_signals(self):
+        with mock_passing_grade():
+            with patch('lms.djangoapps.certificates.models.COURSE_CERT_CHANGED') as mock_changed:
+                with patch('lms.djangoapps.certificates.models.COURSE_CERT_AWARDED') as mock_awarded:
+                    certificates = self.xqueue.add_certs(self.students, self.course.id, generate_pdf=False)
+
+        self.assertEqual(mock_changed.send_robust.call_count, len(self.students))
+        awarded = [
+            student.id for student in self.students
+            if CertificateStatuses.is_passing_status(certificates[student.id].status)
+        ]
+        self.assertTrue(awarded)
+        self.assertEqual(
+            sorted(call[1]['user'].id for call in mock_awarded.send_robust.call_args_list),
+            sorted(awarded)
+        )
+
+    def test_add_certs_created_concurrently(self):
+        def create_cert(*args):  # pylint: disable=unused-argument
+            """ Creates the certificate of a student after the existing ones are read """
+            GeneratedCertificateFactory(
+                user=self.students[1],
+                course_id=self.course.id,
+                status=CertificateStatuses.unavailable,
+                mode=GeneratedCertificate.MODES.verified,
+            )
+
+        with mock_passing_grade():
+            with patch('lms.djangoapps.certificates.queue.prefetch_course_and_subsection_grades') as mock_prefetch:
+                mock_prefetch.side_effect = create_cert
+                certificates = self.xqueue.add_certs(self.students, self.course.id, generate_pdf=False)
+
+        self.assertEqual(
+            GeneratedCertificate.objects.filter(course_id=self.course.id).count(),
+            len(self.students)
+        )
+        for student in self.students:
+            self.assertEqual(
+                certificates[student.id].status,
+                GeneratedCertificate.objects.get(user=student, course_id=self.course.id).status
+            )
+        self.assertEqual(certificates[self.students[1].id].status, CertificateStatuses.downloadable)
+
+    def test_add_certs_xqueue_error(self):
+        with mock_passing_grade():
+            with patch.object(XQueueInterface, 'send_to_queue') as mock_send:
+                mock_send.return_value = (1, self.ERROR_REASON)
+                certificates = self.xqueue.add_certs(self.students, self.course.id)
+
+        errored = [cert for cert in certificates.values() if cert and cert.status == ExampleCertificate.STATUS_ERROR]
+        self.assertTrue(errored)
+        for cert in errored:
+            self.assertEqual(
+                GeneratedCertificate.objects.get(user=cert.user, course_id=self.course.id).status,
+                ExampleCertificate.STATUS_ERROR
+            )
+            self.assertTrue(
+                GeneratedCertificate.history.filter(
+                    user=cert.user, status=ExampleCertificate.STATUS_ERROR, error_reason=cert.error_reason
+                ).exists()
+            )
+
+    def test_add_certs_not_passing(self):
+        with mock_passing_grade(letter_grade=None, percent=0.1):
+            certificates = self.xqueue.add_certs(self.students[:2], self.course.id, generate_pdf=False)
+        self.assertEqual(certificates[self.students[0].id].status, CertificateStatuses.notpassing)
+        self.assertEqual(certificates[self.students[1].id].status, CertificateStatuses.notpassing)
+
+
 @override_settings(CERT_QUEUE='certificates')
 class XQueueCertInterfaceExampleCertificateTest(TestCase):
     """Tests for the XQueue interface for certificate generation. """
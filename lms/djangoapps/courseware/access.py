@@ -18,6 +18,7 @@ from datetime import datetime
 import six
 from django.conf import settings  # pylint: disable=unused-import
 from django.contrib.auth.models import AnonymousUser
+from edx_django_utils.cache import RequestCache
 from edx_django_utils.monitoring import function_trace
 from opaque_keys.edx.keys import CourseKey, UsageKey
 from pytz import UTC
@@ -40,7 +41,11 @@ from lms.djangoapps.courseware.access_utils import (
     debug,
     in_preview_mode
 )
-from lms.djangoapps.courseware.masquerade import get_masquerade_role, is_masquerading_as_student
+from lms.djangoapps.courseware.masquerade import (
+    get_course_masquerade,
+    get_masquerade_role,
+    is_masquerading_as_student
+)
 from lms.djangoapps.ccx.custom_exception import CCXLocatorValidationException
 from lms.djangoapps.ccx.models import CustomCourseForEdX
 from mobile_api.models import IgnoreMobileAvailableFlagConfig
@@ -174,6 +179,121 @@ def has_access(user, action, obj, course_key=None):
                     .format(type(obj)))
 
 
+def has_access_many(user, action, blocks, course_key):
+    """
+    Check whether a user has the access to do action on each of the given
+    blocks of a course.
+
+    This is equivalent to calling has_access for each block, except that the
+    facts that depend only on the user (preview access, roles, masquerade,
+    beta testing and partition group assignments) are computed once per
+    request and course instead of once per block.
+
+    blocks: an iterable of descriptors or modules of the course.
+
+    Returns a list of AccessResponse objects, in the order of `blocks`.
+    """
+    # Just in case user is passed in as None, make them anonymous
+    if not user:
+        user = AnonymousUser()
+
+    access_context = get_bulk_access_context(user, course_key)
+    return [_has_access_block_in_bulk(access_context, action, block) for block in blocks]
+
+
+def has_access_to_block(user, action, block, course_key):
+    """
+    Same as has_access_many for a single block, for callers that are given
+    the blocks of a course one at a time, such as the module system when it
+    loads the children of a sequence.  The facts that depend only on the
+    user are still shared by all the calls of the request.
+    """
+    if not user:
+        user = AnonymousUser()
+
+    return _has_access_block_in_bulk(get_bulk_access_context(user, course_key), action, block)
+
+
+def _has_access_block_in_bulk(access_context, action, block):
+    """
+    Check if the user of `access_context` has access to the block, using the
+    facts already computed in `access_context`.
+    """
+    user, course_key = access_context.user, access_context.course_key
+    if not access_context.preview_access:
+        return ACCESS_DENIED
+
+    if isinstance(block, XModule):
+        block = block.descriptor
+
+    # Courses and error descriptors have their own policies, and anything
+    # else isn't a block of the course.
+    if isinstance(block, (CourseDescriptor, ErrorDescriptor)) or not isinstance(block, XBlock):
+        return has_access(user, action, block, course_key)
+
+    checkers = {
+        'load': lambda: _can_load_descriptor(user, block, course_key, access_context),
+        'staff': lambda: access_context.staff_access,
+        'instructor': lambda: access_context.instructor_access,
+    }
+
+    return _dispatch(checkers, action, user, block)
+
+
+class BulkAccessContext(object):
+    """
+    The facts that access to the blocks of a course depends on and that only
+    depend on the user, computed once for checking access to many blocks.
+    """
+    def __init__(self, user, course_key):
+        self.user = user
+        self.course_key = course_key
+        self.preview_access = not in_preview_mode() or has_staff_access_to_preview_mode(user, course_key)
+        self.user_role = get_user_role(user, course_key)
+        self.staff_access = _has_access_to_course(user, 'staff', course_key)
+        self.instructor_access = _has_access_to_course(user, 'instructor', course_key)
+        self.is_beta_tester = CourseBetaTesterRole(course_key).has_user(user)
+        self._user_groups = {}
+
+    def get_group_for_user(self, partition):
+        """
+        Returns the group of the partition the user is in.
+        """
+        if partition.id not in self._user_groups:
+            self._user_groups[partition.id] = partition.scheme.get_group_for_user(self.course_key, self.user, partition)
+        return self._user_groups[partition.id]
+
+
+def get_bulk_access_context(user, course_key):
+    """
+    Returns the BulkAccessContext of the user for the course.
+
+    Contexts are kept in the request cache, so that cohort and enrollment
+    track changes are picked up by the next request.  They are keyed on the
+    user's masquerade for the course, since masquerading changes the user's
+    effective role, and are dropped whenever the user's roles change.
+    """
+    masquerade = get_course_masquerade(user, course_key)
+    cache_key = (
+        user.id,
+        course_key,
+        in_preview_mode(),
+        (masquerade.role, masquerade.user_partition_id, masquerade.group_id, masquerade.user_name)
+        if masquerade else None,
+    )
+    request_cache = RequestCache('courseware.access.bulk_access_contexts')
+    cached_response = request_cache.get_cached_response(cache_key)
+    if cached_response.is_found:
+        role_cache, access_context = cached_response.value
+        if role_cache is getattr(user, '_roles', None):
+            return access_context
+
+    access_context = BulkAccessContext(user, course_key)
+    # Computing the context can populate the role cache.
+    request_cache.set(cache_key, (getattr(user, '_roles', None), access_context))
+    return access_context
+
+
 def has_staff_access_to_preview_mode(user, course_key):
     """
     Checks if given user can access course in preview mode.
@@ -437,13 +557,17 @@ def _has_access_error_desc(user, action, descriptor, course_key):
     return _dispatch(checkers, action, user, descriptor)
 
 
-def _has_group_access(descriptor, user, course_key):
+def _has_group_access(descriptor, user, course_key, access_context=None):
     """
     This function returns a boolean indicating whether or not `user` has
     sufficient group memberships to "load" a block (the `descriptor`)
+
+    access_context: an optional BulkAccessContext for `user` and `course_key`,
+        to reuse the user's role and group assignments across blocks.
     """
     # Allow staff and instructors roles group access, as they are not masquerading as a student.
-    if get_user_role(user, course_key) in ['staff', 'instructor']:
+    user_role = access_context.user_role if access_context else get_user_role(user, course_key)
+    if user_role in ['staff', 'instructor']:
         return ACCESS_GRANTED
 
     # use merged_group_access which takes group access on the block's
@@ -503,11 +627,14 @@ def _has_group_access(descriptor, user, course_key):
     # If missing_groups is NOT empty, we generate an error based on one of the particular groups they are missing.
     missing_groups = []
     for partition, groups in partition_groups:
-        user_group = partition.scheme.get_group_for_user(
-            course_key,
-            user,
-            partition,
-        )
+        if access_context:
+            user_group = access_context.get_group_for_user(partition)
+        else:
+            user_group = partition.scheme.get_group_for_user(
+                course_key,
+                user,
+                partition,
+            )
         if user_group not in groups:
             missing_groups.append((partition, user_group, groups))
 
@@ -538,42 +665,8 @@ def _has_access_descriptor(user, action, descriptor, course_key=None):
     (e.g. courses).  If you call this method directly instead of going through
     has_access(), it will not do the right thing.
     """
-    def can_load():
-        """
-        NOTE: This does not check that the student is enrolled in the course
-        that contains this module.  We may or may not want to allow non-enrolled
-        students to see modules.  If not, views should check the course, so we
-        don't have to hit the enrollments table on every module load.
-        """
-        # If the user (or the role the user is currently masquerading as) does not have
-        # access to this content, then deny access. The problem with calling _has_staff_access_to_descriptor
-        # before this method is that _has_staff_access_to_descriptor short-circuits and returns True
-        # for staff users in preview mode.
-        group_access_response = _has_group_access(descriptor, user, course_key)
-        if not group_access_response:
-            return group_access_response
-
-        # If the user has staff access, they can load the module and checks below are not needed.
-        staff_access_response = _has_staff_access_to_descriptor(user, descriptor, course_key)
-        if staff_access_response:
-            return staff_access_response
-
-        return (
-            _visible_to_nonstaff_users(descriptor, display_error_to_user=False) and
-            (
-                _has_detached_class_tag(descriptor) or
-                check_start_date(
-                    user,
-                    descriptor.days_early_for_beta,
-                    descriptor.start,
-                    course_key,
-                    display_error_to_user=False
-                )
-            )
-        )
-
     checkers = {
-        'load': can_load,
+        'load': lambda: _can_load_descriptor(user, descriptor, course_key),
         'staff': lambda: _has_staff_access_to_descriptor(user, descriptor, course_key),
         'instructor': lambda: _has_instructor_access_to_descriptor(user, descriptor, course_key)
     }
@@ -581,6 +674,48 @@ def _has_access_descriptor(user, action, descriptor, course_key=None):
     return _dispatch(checkers, action, user, descriptor)
 
 
+def _can_load_descriptor(user, descriptor, course_key, access_context=None):
+    """
+    NOTE: This does not check that the student is enrolled in the course
+    that contains this module.  We may or may not want to allow non-enrolled
+    students to see modules.  If not, views should check the course, so we
+    don't have to hit the enrollments table on every module load.
+
+    access_context: an optional BulkAccessContext for `user` and `course_key`,
+        to reuse the user-level facts the checks depend on across blocks.
+    """
+    # If the user (or the role the user is currently masquerading as) does not have
+    # access to this content, then deny access. The problem with calling _has_staff_access_to_descriptor
+    # before this method is that _has_staff_access_to_descriptor short-circuits and returns True
+    # for staff users in preview mode.
+    group_access_response = _has_group_access(descriptor, user, course_key, access_context)
+    if not group_access_response:
+        return group_access_response
+
+    # If the user has staff access, they can load the module and checks below are not needed.
+    if access_context:
+        staff_access_response = access_context.staff_access
+    else:
+        staff_access_response = _has_staff_access_to_descriptor(user, descriptor, course_key)
+    if staff_access_response:
+        return staff_access_response
+
+    return (
+        _visible_to_nonstaff_users(descriptor, display_error_to_user=False) and
+        (
+            _has_detached_class_tag(descriptor) or
+            check_start_date(
+                user,
+                descriptor.days_early_for_beta,
+                descriptor.start,
+                course_key,
+                display_error_to_user=False,
+                is_beta_tester=access_context.is_beta_tester if access_context else None,
+            )
+        )
+    )
+
+
 def _has_access_xmodule(user, action, xmodule, course_key):
     """
     Check if user has access to this xmodule.
@@ -44,11 +44,14 @@ def debug(*args, **kwargs):
         log.debug(*args, **kwargs)
 
 
-def adjust_start_date(user, days_early_for_beta, start, course_key):
+def adjust_start_date(user, days_early_for_beta, start, course_key, is_beta_tester=None):
     """
     If user is in a beta test group, adjust the start date by the appropriate number of
     days.
 
+    Arguments:
+        is_beta_tester: whether the user is a beta tester of the course, if already known.
+
     Returns:
         A datetime.  Either the same as start, or earlier for beta testers.
     """
@@ -56,7 +59,9 @@ def adjust_start_date(user, days_early_for_beta, start, course_key):
         # bail early if no beta testing is set up
         return start
 
-    if CourseBetaTesterRole(course_key).has_user(user):
+    if is_beta_tester is None:
+        is_beta_tester = CourseBetaTesterRole(course_key).has_user(user)
+    if is_beta_tester:
         debug(u"Adjust start time: user in beta role for %s", course_key)
         delta = timedelta(days_early_for_beta)
         effective = start - delta
@@ -65,13 +70,15 @@ def adjust_start_date(user, days_early_for_beta, start, course_key):
     return start
 
 
-def check_start_date(user, days_early_for_beta, start, course_key, display_error_to_user=True, now=None):
+def check_start_date(user, days_early_for_beta, start, course_key, display_error_to_user=True, now=None,
+                     is_beta_tester=None):
     """
     Verifies whether the given user is allowed access given the
     start date and the Beta offset for the given course.
 
     Arguments:
         display_error_to_user: If True, display this error to users in the UI.
+        is_beta_tester: whether the user is a beta tester of the course, if already known.
 
     Returns:
         AccessResponse: Either ACCESS_GRANTED or StartDateError.
@@ -87,7 +94,7 @@ def check_start_date(user, days_early_for_beta, start, course_key, display_error
 
         if now is None:
             now = datetime.now(UTC)
-        effective_start = adjust_start_date(user, days_early_for_beta, start, course_key)
+        effective_start = adjust_start_date(user, days_early_for_beta, start, course_key, is_beta_tester)
         if now > effective_start:
             return ACCESS_GRANTED
 
@@ -22,7 +22,8 @@ from contextlib import contextmanager
 
 import six
 from django.conf import settings
-from edx_django_utils.cache import DEFAULT_REQUEST_CACHE
+from edx_django_utils.cache import DEFAULT_REQUEST_CACHE, RequestCache
+from opaque_keys.edx.asides import AsideUsageKeyV1, AsideUsageKeyV2
 from xblock.field_data import FieldData
 
 from xmodule.modulestore.inheritance import InheritanceMixin
@@ -30,6 +31,11 @@ from xmodule.modulestore.inheritance import InheritanceMixin
 NOTSET = object()
 ENABLED_OVERRIDE_PROVIDERS_KEY = u'courseware.field_overrides.enabled_providers.{course_id}'
 ENABLED_MODULESTORE_OVERRIDE_PROVIDERS_KEY = u'courseware.modulestore_field_overrides.enabled_providers.{course_id}'
+OVERRIDE_INDEX_CACHE_NAMESPACE = u'courseware.field_overrides.index'
+
+# Key of the overrides that apply to every block, in the dicts returned by
+# FieldOverrideProvider.get_all.
+OVERRIDE_ALL_BLOCKS = u'*'
 
 
 def resolve_dotted(name):
@@ -62,6 +68,51 @@ def _lineage(block):
         parent = parent.get_parent()
 
 
+def override_index_key(location):
+    """
+    Returns the key under which overrides of the block at `location` are
+    indexed: the block's usage key in its underlying course, without any CCX,
+    version or branch information.
+    """
+    if hasattr(location, 'to_block_locator'):
+        location = location.to_block_locator()
+    if getattr(location, 'version_guid', None) is not None or getattr(location, 'branch', None) is not None:
+        location = location.version_agnostic().for_branch(None)
+    return location
+
+
+def _block_index_key(block):
+    """
+    Returns the override index key of the given block, or None if the block
+    has no location.  The key is kept on the block, as it is needed for every
+    field read.
+    """
+    try:
+        return block._override_index_key  # pylint: disable=protected-access
+    except AttributeError:
+        pass
+    usage_id = getattr(getattr(block, 'scope_ids', None), 'usage_id', None)
+    if isinstance(usage_id, (AsideUsageKeyV1, AsideUsageKeyV2)):
+        location = usage_id.usage_key
+    else:
+        location = getattr(block, 'location', None)
+    key = override_index_key(location) if location is not None else None
+    try:
+        block._override_index_key = key  # pylint: disable=protected-access
+    except AttributeError:
+        pass
+    return key
+
+
+def clear_override_indexes():
+    """
+    Discards the override indexes built during the current request, so that
+    overrides written since then are seen by later field reads.  To be called
+    by the APIs that write overrides.
+    """
+    RequestCache(OVERRIDE_INDEX_CACHE_NAMESPACE).clear()
+
+
 class _OverridesDisabled(threading.local):
     """
     A thread local used to manage state of overrides being disabled or not.
@@ -104,12 +155,32 @@ class FieldOverrideProvider(six.with_metaclass(ABCMeta, object)):
     A `FieldOverrideProvider` implementation is only responsible for looking up
     field overrides. To set overrides, there will be a domain specific API for
     the concrete override implementation being used.
+
+    Providers whose overrides are stored, rather than computed, should also
+    implement `get_all`, so that their overrides are loaded once per request
+    instead of being looked up on each field read.
     """
 
+    # The names of the fields the provider may override, or None if it may
+    # override any field.  The provider is skipped on reads of other fields.
+    overridden_fields = None
+
     def __init__(self, user, fallback_field_data):
         self.user = user
         self.fallback_field_data = fallback_field_data
 
+    def get_all(self, course_key):
+        """
+        Returns all of the overrides the provider has in the course, as a dict
+        mapping the override index keys of blocks (see `override_index_key`)
+        to dicts of field names to JSON values.  Overrides under the
+        `OVERRIDE_ALL_BLOCKS` key apply to every block.
+
+        Returns None if the overrides can't be listed, in which case `get` is
+        called on each field read.
+        """
+        return None
+
     @abstractmethod
     def get(self, block, name, default):  # pragma no cover
         """
@@ -135,6 +206,83 @@ class FieldOverrideProvider(six.with_metaclass(ABCMeta, object)):
         return False
 
 
+class _OverrideIndex(object):
+    """
+    The overrides of a user in a course, precompiled from the listed
+    overrides of the providers.
+
+    For each field name, `plan` returns the steps to follow to find an
+    override, in provider order.  Consecutive providers whose overrides are
+    listed are merged into a single dict probe, and providers that don't
+    override the field are left out, so that for most fields a read is one
+    dict probe.
+    """
+
+    def __init__(self, providers, course_key):
+        self._overridden_fields = [provider.overridden_fields for provider in providers]
+        self._listed = []
+        for provider in providers:
+            overrides = provider.get_all(course_key)
+            if overrides is not None:
+                overrides = dict(overrides)
+                overrides = (overrides, overrides.pop(OVERRIDE_ALL_BLOCKS, {}))
+            self._listed.append(overrides)
+        self._plans = {}
+
+    def plan(self, name):
+        """
+        Returns the steps to find an override of the field `name`.
+
+        Each step is a tuple of a dict mapping block index keys to JSON
+        values, the JSON value for blocks that aren't in it (or NOTSET), and
+        None; or, for providers that are to be asked, of None, NOTSET and the
+        position of the provider.
+        """
+        plan = self._plans.get(name)
+        if plan is None:
+            plan, values = [], {}
+            for position, overridden_fields in enumerate(self._overridden_fields):
+                if overridden_fields is not None and name not in overridden_fields:
+                    continue
+                listed = self._listed[position]
+                if listed is None:
+                    if values:
+                        plan.append((values, NOTSET, None))
+                        values = {}
+                    plan.append((None, NOTSET, position))
+                    continue
+                overrides, all_blocks = listed
+                if name in all_blocks:
+                    # Every block has an override from this provider, the rest can't be reached.
+                    plan.append((values, all_blocks[name], None))
+                    values = {}
+                    break
+                for key, block_overrides in six.iteritems(overrides):
+                    if name in block_overrides:
+                        values.setdefault(key, block_overrides[name])
+            if values:
+                plan.append((values, NOTSET, None))
+            self._plans[name] = plan = tuple(plan)
+        return plan
+
+
+def _get_override_index(user, course_key, providers):
+    """
+    Returns the override index of the user in the course for the given
+    providers, built once per request, or None if none of the providers can
+    list their overrides.
+    """
+    request_cache = RequestCache(OVERRIDE_INDEX_CACHE_NAMESPACE)
+    cache_key = (getattr(user, 'id', user), course_key, tuple(type(provider) for provider in providers))
+    index = request_cache.data.get(cache_key, NOTSET)
+    if index is NOTSET:
+        index = _OverrideIndex(providers, course_key)
+        if all(listed is None for listed in index._listed):  # pylint: disable=protected-access
+            index = None
+        request_cache.data[cache_key] = index
+    return index
+
+
 class OverrideFieldData(FieldData):
     """
     A :class:`~xblock.field_data.FieldData` which wraps another `FieldData`
@@ -171,7 +319,7 @@ class OverrideFieldData(FieldData):
             # to check for instance.providers after the instance is built. This
             # would allow for the case where we have registered providers but
             # none are enabled for the provided course
-            return cls(user, wrapped, enabled_providers)
+            return cls(user, wrapped, enabled_providers, course.id if course is not None else None)
 
         return wrapped
 
@@ -199,20 +347,54 @@ class OverrideFieldData(FieldData):
 
         return enabled_providers
 
-    def __init__(self, user, fallback, providers):
+    def __init__(self, user, fallback, providers, course_key=None):
         self.fallback = fallback
         self.providers = tuple(provider(user, fallback) for provider in providers)
+        self._user = user
+        self._course_key = course_key
+
+    def _override_index(self):
+        """
+        Returns the override index for this field data's user and course, if
+        there is one.
+
+        The index is read from the request cache on every lookup rather than
+        kept on the field data, which can outlive the request, e.g. on blocks
+        cached by the modulestore.
+        """
+        if self._course_key is None:
+            return None
+        return _get_override_index(self._user, self._course_key, self.providers)
 
     def get_override(self, block, name):
         """
         Checks for an override for the field identified by `name` in `block`.
         Returns the overridden value or `NOTSET` if no override is found.
         """
-        if not overrides_disabled():
+        if overrides_disabled():
+            return NOTSET
+
+        index = self._override_index()
+        key = _block_index_key(block) if index is not None else None
+        if key is None:
             for provider in self.providers:
                 value = provider.get(block, name, NOTSET)
                 if value is not NOTSET:
                     return value
+            return NOTSET
+
+        for values, default, position in index.plan(name):
+            if values is None:
+                value = self.providers[position].get(block, name, NOTSET)
+                if value is not NOTSET:
+                    return value
+            else:
+                value = values.get(key, default)
+                if value is not NOTSET:
+                    try:
+                        return block.fields[name].from_json(value)
+                    except KeyError:
+                        return value
         return NOTSET
 
     def get(self, block, name):
@@ -282,7 +464,7 @@ class OverrideModulestoreFieldData(OverrideFieldData):
 
         enabled_providers = cls._providers_for_block(block)
         if enabled_providers:
-            return cls(field_data, enabled_providers)
+            return cls(field_data, enabled_providers, block.location.course_key)
 
         return field_data
 
@@ -310,5 +492,5 @@ class OverrideModulestoreFieldData(OverrideFieldData):
 
         return enabled_providers
 
-    def __init__(self, fallback, providers):
-        super(OverrideModulestoreFieldData, self).__init__(None, fallback, providers)
+    def __init__(self, fallback, providers, course_key=None):  # pylint: disable=arguments-differ
+        super(OverrideModulestoreFieldData, self).__init__(None, fallback, providers, course_key)
@@ -46,7 +46,7 @@ from xblock.runtime import KvsFieldData
 
 import static_replace
 from capa.xqueue_interface import XQueueInterface
-from lms.djangoapps.courseware.access import get_user_role, has_access
+from lms.djangoapps.courseware.access import get_user_role, has_access, has_access_to_block
 from lms.djangoapps.courseware.entrance_exams import user_can_skip_entrance_exam, user_has_passed_entrance_exam
 from lms.djangoapps.courseware.masquerade import (
     MasqueradingKeyValueStore,
@@ -79,9 +79,7 @@ from openedx.core.lib.xblock_utils import (
     get_aside_from_xblock,
     hash_resource,
     is_xblock_aside,
-    replace_course_urls,
-    replace_jump_to_id_urls,
-    replace_static_urls
+    replace_urls
 )
 from openedx.core.lib.xblock_utils import request_token as xblock_request_token
 from openedx.core.lib.xblock_utils import wrap_xblock
@@ -351,7 +349,7 @@ def display_access_messages(user, block, view, frag, context):  # pylint: disabl
     """
     blocked_prior_sibling = RequestCache('display_access_messages_prior_sibling')
 
-    load_access = has_access(user, 'load', block, block.scope_ids.usage_id.course_key)
+    load_access = has_access_to_block(user, 'load', block, block.scope_ids.usage_id.course_key)
     if load_access:
         blocked_prior_sibling.delete(block.parent)
         return frag
@@ -706,27 +704,23 @@ def get_module_system_for_user(
     # prefix is going to have to be specific to the module, not the directory
     # that the xml was loaded from
 
-    # Rewrite urls beginning in /static to point to course-specific content
-    block_wrappers.append(partial(
-        replace_static_urls,
-        getattr(descriptor, 'data_dir', None),
-        course_id=course_id,
-        static_asset_path=static_asset_path or descriptor.static_asset_path
-    ))
-
+    # Rewrite urls beginning in /static to point to course-specific content.
     # Allow URLs of the form '/course/' refer to the root of multicourse directory
-    #   hierarchy of this course
-    block_wrappers.append(partial(replace_course_urls, course_id))
-
-    # this will rewrite intra-courseware links (/jump_to_id/<id>). This format
+    #   hierarchy of this course.
+    # Rewrite intra-courseware links (/jump_to_id/<id>). This format
     # is an improvement over the /course/... format for studio authored courses,
     # because it is agnostic to course-hierarchy.
+    # All three substitutions are applied in a single pass over the content.
     # NOTE: module_id is empty string here. The 'module_id' will get assigned in the replacement
     # function, we just need to specify something to get the reverse() to work.
     block_wrappers.append(partial(
-        replace_jump_to_id_urls,
-        course_id,
-        reverse('jump_to_id', kwargs={'course_id': text_type(course_id), 'module_id': ''}),
+        replace_urls,
+        static_replace.CourseUrlRewriter.for_request(
+            course_id,
+            data_directory=getattr(descriptor, 'data_dir', None),
+            static_asset_path=static_asset_path or descriptor.static_asset_path,
+            jump_to_id_base_url=reverse('jump_to_id', kwargs={'course_id': text_type(course_id), 'module_id': ''}),
+        ),
     ))
 
     block_wrappers.append(partial(display_access_messages, user))
@@ -905,7 +899,10 @@ def get_module_for_descriptor_internal(user, descriptor, student_data, course_id
     # that affects xblock visibility.
     user_needs_access_check = getattr(user, 'known', True) and not isinstance(user, SystemUser)
     if user_needs_access_check:
-        access = has_access(user, 'load', descriptor, course_id)
+        # The user-level facts of the check are shared by all of the blocks loaded for
+        # the request, e.g. the children of a sequence or vertical, or the chapters and
+        # sections listed by toc_for_course.
+        access = has_access_to_block(user, 'load', descriptor, course_id)
         # A descriptor should only be returned if either the user has access, or the user doesn't have access, but
         # the failed access has a message for the user and the caller of this function specifies it will check access
         # again. This allows blocks to show specific error message or upsells when access is denied.
@@ -5,11 +5,29 @@ Courseware services.
 
 import json
 
+from completion.models import BlockCompletion
+from completion.services import CompletionService
 from django.contrib.auth.models import User
 
 from lms.djangoapps.courseware.models import StudentModule
+from openedx.core.lib.cache_utils import request_cached
 from student.models import get_user_by_username_or_email
 
+COMPLETIONS_CACHE_NAMESPACE = 'courseware.services.completions'
+
+
+@request_cached(namespace=COMPLETIONS_CACHE_NAMESPACE)
+def get_course_completions(user, course_key):
+    """
+    Return a dict mapping the usage keys of all of the blocks the user has
+    completion values for in the course to those values.
+
+    The completions are read with a single query and cached for the rest of
+    the request, so that the sequence navigation, the vertical blocks and the
+    course outline all share them.
+    """
+    return BlockCompletion.get_learning_context_completions(user, course_key)
+
 
 class UserStateService(object):
     """
@@ -39,3 +57,39 @@ class UserStateService(object):
             return json.loads(student_module.state)
         except StudentModule.DoesNotExist:
             return {}
+
+
+class BulkCompletionService(CompletionService):
+    """
+    Completion service that can tell the completion of many verticals at once.
+
+    Rather than querying the completions of each vertical's children, all of
+    the user's completions in the course are read once per request, see
+    get_course_completions.
+    """
+
+    def verticals_are_complete(self, items):
+        """
+        Return a dict mapping the location of each of the given verticals to
+        whether it is complete, or to None if completion tracking is disabled.
+        """
+        if any(item.location.block_type != 'vertical' for item in items):
+            raise ValueError('The passed in xblock is not a vertical type!')
+
+        if not self.completion_tracking_enabled():
+            return {item.location: None for item in items}
+
+        completions = get_course_completions(self._user, self._context_key)
+        return {
+            item.location: all(
+                completions.get(child.location, 0.0) >= 1.0
+                for child in item.get_children() if child.location.block_type != 'discussion'
+            )
+            for item in items
+        }
+
+    def vertical_is_complete(self, item):
+        """
+        Return whether the vertical is complete, see verticals_are_complete.
+        """
+        return self.verticals_are_complete([item])[item.location]
@@ -9,7 +9,7 @@ import json
 from lms.djangoapps.courseware.models import StudentFieldOverride
 from openedx.core.lib.xblock_utils import is_xblock_aside
 
-from .field_overrides import FieldOverrideProvider
+from .field_overrides import FieldOverrideProvider, clear_override_indexes, override_index_key
 
 
 class IndividualStudentOverrideProvider(FieldOverrideProvider):
@@ -21,6 +21,19 @@ class IndividualStudentOverrideProvider(FieldOverrideProvider):
     def get(self, block, name, default):
         return get_override_for_user(self.user, block, name, default)
 
+    def get_all(self, course_key):
+        """
+        Return all of the user's overrides in the course, with a single query.
+        """
+        if self.user is None:
+            return None
+        overrides = {}
+        query = StudentFieldOverride.objects.filter(course_id=course_key, student_id=self.user.id)
+        for override in query:
+            block_overrides = overrides.setdefault(override_index_key(override.location), {})
+            block_overrides[override.field] = json.loads(override.value)
+        return overrides
+
     @classmethod
     def enabled_for(cls, course):
         """This simple override provider is always enabled"""
@@ -83,6 +96,7 @@ def override_field_for_user(user, block, name, value):
     field = block.fields[name]
     override.value = json.dumps(field.to_json(value))
     override.save()
+    clear_override_indexes()
 
 
 def clear_override_for_user(user, block, name):
@@ -98,5 +112,6 @@ def clear_override_for_user(user, block, name):
             student_id=user.id,
             location=block.location,
             field=name).delete()
+        clear_override_indexes()
     except StudentFieldOverride.DoesNotExist:
         pass
@@ -15,6 +15,7 @@ from django.contrib.auth.models import User
 from django.test import TestCase
 from django.test.client import RequestFactory
 from django.urls import reverse
+from edx_django_utils.cache import RequestCache
 from milestones.tests.utils import MilestonesTestCaseMixin
 from mock import Mock, patch
 from opaque_keys.edx.locator import CourseLocator
@@ -501,6 +502,50 @@ class AccessTestCase(LoginEnrollmentTestCase, ModuleStoreTestCase, MilestonesTes
 
         self.verify_access(mock_unit, expected_access, expected_error_type)
 
+    @patch.dict('django.conf.settings.FEATURES', {'DISABLE_START_DATES': False})
+    def test_has_access_many(self):
+        """
+        Tests that has_access_many matches has_access for each block.
+        """
+        chapter = ItemFactory.create(parent=self.course, category='chapter')
+        blocks = [
+            ItemFactory.create(parent=chapter, category='sequential', start=self.DATES[self.YESTERDAY]),
+            ItemFactory.create(parent=chapter, category='sequential', start=self.DATES[self.TOMORROW]),
+            ItemFactory.create(parent=chapter, category='sequential', visible_to_staff_only=True),
+            ItemFactory.create(
+                parent=chapter, category='sequential', start=self.DATES[self.TOMORROW], days_early_for_beta=2
+            ),
+        ]
+        users = [
+            self.anonymous_user, self.beta_user, self.student, self.global_staff, self.course_staff,
+            self.course_instructor,
+        ]
+        for user, action in itertools.product(users, ['load', 'staff', 'instructor']):
+            expected = [bool(access.has_access(user, action, block, self.course.id)) for block in blocks]
+            actual = [bool(response) for response in access.has_access_many(user, action, blocks, self.course.id)]
+            self.assertEqual(actual, expected, u'{} {}'.format(user, action))
+
+    def test_has_access_many_num_queries(self):
+        """
+        Tests that the user-level facts are only looked up once for many blocks.
+        """
+        chapter = ItemFactory.create(parent=self.course, category='chapter')
+        blocks = [ItemFactory.create(parent=chapter, category='sequential') for __ in range(10)]
+        user = UserFactory()
+
+        access.has_access_many(user, 'load', blocks[:1], self.course.id)
+        with self.assertNumQueries(0):
+            access.has_access_many(user, 'load', blocks, self.course.id)
+
+        # Changing the user's roles discards the facts computed for them.
+        CourseStaffRole(self.course.id).add_users(user)
+        self.assertTrue(all(access.has_access_many(user, 'staff', blocks, self.course.id)))
+
+        # The facts are only kept for the request.
+        access_context = access.get_bulk_access_context(user, self.course.id)
+        RequestCache.clear_all_namespaces()
+        self.assertIsNot(access.get_bulk_access_context(user, self.course.id), access_context)
+
     def test__has_access_course_can_enroll(self):
         yesterday = datetime.datetime.now(pytz.utc) - datetime.timedelta(days=1)
         tomorrow = datetime.datetime.now(pytz.utc) + datetime.timedelta(days=1)
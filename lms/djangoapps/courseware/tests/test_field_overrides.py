@@ -4,15 +4,18 @@ Tests for `field_overrides` module.
 import unittest
 
 from django.test.utils import override_settings
+from edx_django_utils.cache import RequestCache
 from xblock.field_data import DictFieldData
 
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory
 
 from ..field_overrides import (
+    OVERRIDE_ALL_BLOCKS,
     FieldOverrideProvider,
     OverrideFieldData,
     OverrideModulestoreFieldData,
+    clear_override_indexes,
     disable_overrides,
     resolve_dotted
 )
@@ -43,6 +46,58 @@ class TestOverrideProvider(FieldOverrideProvider):
         return True
 
 
+class TestListedOverrideProvider(FieldOverrideProvider):
+    """
+    A `FieldOverrideProvider` which lists its overrides, for testing.
+    """
+    overrides = {}
+    get_all_calls = 0
+
+    def get(self, block, name, default):
+        # Only asked about blocks that can't be found in the override index.
+        return default
+
+    def get_all(self, course_key):
+        TestListedOverrideProvider.get_all_calls += 1
+        return self.overrides
+
+    @classmethod
+    def enabled_for(cls, course):
+        return True
+
+
+class TestListedLastOverrideProvider(TestListedOverrideProvider):
+    """
+    A second `FieldOverrideProvider` which lists its overrides, for testing.
+    """
+    overrides = {}
+
+
+class TestDueOverrideProvider(FieldOverrideProvider):
+    """
+    A `FieldOverrideProvider` which computes due dates, for testing.
+    """
+    overridden_fields = ('due',)
+
+    def get(self, block, name, default):
+        assert name == 'due'
+        return 'computed due'
+
+    @classmethod
+    def enabled_for(cls, course):
+        return True
+
+
+class _Block(object):
+    """
+    The parts of a block used by `OverrideFieldData`.
+    """
+    fields = {}
+
+    def __init__(self, location):
+        self.location = location
+
+
 class OverrideFieldBase(SharedModuleStoreTestCase):
     """
     Base class for field data override tests.  Using override_settings and
@@ -145,6 +200,84 @@ class OverrideModulestoreFieldDataTests(FieldOverrideTestMixin, OverrideFieldDat
         self.assertIsInstance(data, DictFieldData)
 
 
+@override_settings(FIELD_OVERRIDE_PROVIDERS=(
+    'courseware.tests.test_field_overrides.TestListedOverrideProvider',
+    'courseware.tests.test_field_overrides.TestDueOverrideProvider',
+    'courseware.tests.test_field_overrides.TestListedLastOverrideProvider',
+))
+class OverrideIndexTests(OverrideFieldBase):
+    """
+    Tests for the override index of `OverrideFieldData`.
+    """
+
+    def setUp(self):
+        super(OverrideIndexTests, self).setUp()
+        OverrideFieldData.provider_classes = None
+        self.addCleanup(setattr, OverrideFieldData, 'provider_classes', None)
+        RequestCache.clear_all_namespaces()
+        self.addCleanup(RequestCache.clear_all_namespaces)
+
+        self.block = _Block(self.course.id.make_usage_key('html', 'block'))
+        self.other_block = _Block(self.course.id.make_usage_key('html', 'other'))
+        TestListedOverrideProvider.get_all_calls = 0
+        TestListedOverrideProvider.overrides = {
+            self.block.location: {'foo': 'first', 'due': 'listed due'},
+            OVERRIDE_ALL_BLOCKS: {'everywhere': 'first'},
+        }
+        TestListedLastOverrideProvider.overrides = {
+            self.block.location: {'foo': 'last', 'bar': 'last', 'everywhere': 'last'},
+            self.other_block.location: {'due': 'last due'},
+        }
+
+    def make_one(self):
+        """
+        Factory method.
+        """
+        return OverrideFieldData.wrap(TESTUSER, self.course, DictFieldData({'baz': 'original'}))
+
+    def test_get(self):
+        data = self.make_one()
+        self.assertEqual(data.get(self.block, 'foo'), 'first')
+        self.assertEqual(data.get(self.block, 'bar'), 'last')
+        self.assertEqual(data.get(self.block, 'everywhere'), 'first')
+        self.assertEqual(data.get(self.other_block, 'everywhere'), 'first')
+        self.assertEqual(data.get(self.block, 'baz'), 'original')
+        self.assertEqual(data.get(self.block, 'due'), 'listed due')
+        # Providers are asked in order, before the providers listed after them.
+        self.assertEqual(data.get(self.other_block, 'due'), 'computed due')
+        with disable_overrides():
+            self.assertEqual(data.get(self.block, 'baz'), 'original')
+            with self.assertRaises(KeyError):
+                data.get(self.block, 'foo')
+
+    def test_built_once_per_request(self):
+        for __ in range(10):
+            self.assertEqual(self.make_one().get(self.block, 'foo'), 'first')
+        self.assertEqual(TestListedOverrideProvider.get_all_calls, 2)
+
+    def test_clear_override_indexes(self):
+        data = self.make_one()
+        self.assertEqual(data.get(self.block, 'foo'), 'first')
+
+        TestListedOverrideProvider.overrides = {self.block.location: {'foo': 'changed'}}
+        clear_override_indexes()
+        self.assertEqual(data.get(self.block, 'foo'), 'changed')
+        self.assertEqual(TestListedOverrideProvider.get_all_calls, 4)
+
+    def test_outlives_request(self):
+        data = self.make_one()
+        self.assertEqual(data.get(self.block, 'foo'), 'first')
+
+        # A field data kept past the end of the request reads the index of the next one.
+        RequestCache.clear_all_namespaces()
+        TestListedOverrideProvider.overrides = {self.block.location: {'foo': 'next request'}}
+        self.assertEqual(data.get(self.block, 'foo'), 'next request')
+
+    def test_block_without_location(self):
+        data = self.make_one()
+        self.assertEqual(data.get('block', 'baz'), 'original')
+
+
 class ResolveDottedTests(unittest.TestCase):
     """
     Tests for `resolve_dotted`.
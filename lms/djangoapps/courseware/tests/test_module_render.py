@@ -1825,6 +1825,7 @@ class DetachedXBlock(XBlock):
 
 @patch.dict('django.conf.settings.FEATURES', {'DISPLAY_DEBUG_INFO_TO_STAFF': True, 'DISPLAY_HISTOGRAMS_TO_STAFF': True})
 @patch('lms.djangoapps.courseware.module_render.has_access', Mock(return_value=True, autospec=True))
+@patch('lms.djangoapps.courseware.module_render.has_access_to_block', Mock(return_value=True, autospec=True))
 class TestStaffDebugInfo(SharedModuleStoreTestCase):
     """Tests to verify that Staff Debug Info panel and histograms are displayed to staff."""
 
@@ -2035,6 +2036,7 @@ class TestAnonymousStudentId(SharedModuleStoreTestCase, LoginEnrollmentTestCase)
         self.user = UserFactory()
 
     @patch('lms.djangoapps.courseware.module_render.has_access', Mock(return_value=True, autospec=True))
+    @patch('lms.djangoapps.courseware.module_render.has_access_to_block', Mock(return_value=True, autospec=True))
     def _get_anonymous_id(self, course_id, xblock_class):
         location = course_id.make_usage_key('dummy_category', 'dummy_name')
         descriptor = Mock(
@@ -2512,6 +2514,9 @@ class TestFilteredChildren(SharedModuleStoreTestCase):
         patcher = patch('lms.djangoapps.courseware.module_render.has_access', self._has_access)
         patcher.start()
         self.addCleanup(patcher.stop)
+        patcher = patch('lms.djangoapps.courseware.module_render.has_access_to_block', self._has_access)
+        patcher.start()
+        self.addCleanup(patcher.stop)
 
     @ddt.data(*BLOCK_TYPES)
     @XBlock.register_temp_plugin(PureXBlockWithChildren, identifier='xblock')
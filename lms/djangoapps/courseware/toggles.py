@@ -45,3 +45,30 @@ def should_redirect_to_courseware_microfrontend(course_key):
         (not course_key.deprecated) and  # Old Mongo courses not supported
         REDIRECT_TO_COURSEWARE_MICROFRONTEND.is_enabled(course_key)
     )
+
+
+# Waffle flag to render only the active unit of a sequence along with the courseware page.
+#
+# .. toggle_name: courseware.lazy_unit_rendering
+# .. toggle_implementation: CourseWaffleFlag
+# .. toggle_default: False
+# .. toggle_description: Renders only the active unit of a subsection on the courseware page; the other units are
+#   fetched by the browser from the xblock_view endpoint when they are first shown.
+# .. toggle_category: performance
+# .. toggle_use_cases: incremental_release, open_edx
+# .. toggle_creation_date: 2020-04-01
+# .. toggle_expiration_date: None
+# .. toggle_warnings: Requires settings.FEATURES['ENABLE_XBLOCK_VIEW_ENDPOINT'].
+# .. toggle_tickets: None
+# .. toggle_status: supported
+COURSEWARE_LAZY_UNIT_RENDERING = CourseWaffleFlag(WAFFLE_FLAG_NAMESPACE, 'lazy_unit_rendering')
+
+
+def should_render_units_lazily(course_key):
+    """
+    Returns whether units of the course's subsections are to be fetched by the browser when first shown.
+    """
+    return (
+        settings.FEATURES.get('ENABLE_XBLOCK_VIEW_ENDPOINT', False) and
+        COURSEWARE_LAZY_UNIT_RENDERING.is_enabled(course_key)
+    )
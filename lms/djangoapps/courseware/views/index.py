@@ -75,6 +75,7 @@ from ..toggles import (
     COURSEWARE_MICROFRONTEND_COURSE_TEAM_PREVIEW,
     REDIRECT_TO_COURSEWARE_MICROFRONTEND,
     should_redirect_to_courseware_microfrontend,
+    should_render_units_lazily,
 )
 from ..url_helpers import get_microfrontend_url
 
@@ -568,6 +569,16 @@ class CoursewareIndex(View):
             section_context['prev_url'] = _compute_section_url(previous_of_active_section, 'last')
         if next_of_active_section:
             section_context['next_url'] = _compute_section_url(next_of_active_section, 'first')
+        if self.request.user.is_authenticated and should_render_units_lazily(self.course_key):
+            # Formatted by the sequence with the usage key of each unit it doesn't render.
+            section_context['unit_fragment_url'] = urllib.parse.unquote(reverse(
+                'xblock_view',
+                kwargs={
+                    'course_id': six.text_type(self.course_key),
+                    'usage_id': '{usage_key}',
+                    'view_name': STUDENT_VIEW,
+                },
+            ))
         # sections can hide data that masquerading staff should see when debugging issues with specific students
         section_context['specific_masquerade'] = self._is_masquerading_as_specific_student()
         return section_context
@@ -8,7 +8,9 @@ import json
 import ddt
 import mock
 import six
+from django.db import connection
 from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from edx_django_utils.cache import RequestCache
 from mock import Mock, patch
@@ -31,6 +33,8 @@ from openedx.core.djangoapps.course_groups.cohorts import set_course_cohorted
 from openedx.core.djangoapps.course_groups.tests.helpers import CohortFactory, config_course_cohorts
 from openedx.core.djangoapps.django_comment_common.comment_client.utils import (
     CommentClientMaintenanceError,
+    get_session,
+    perform_in_parallel,
     perform_request
 )
 from openedx.core.djangoapps.django_comment_common.models import (
@@ -1799,6 +1803,109 @@ class GroupModeratorPermissionsTestCase(ModuleStoreTestCase):
         })
 
 
+class ContentPermissionContextTestCase(ModuleStoreTestCase):
+    """
+    Test that the annotated content infos computed from a ContentPermissionContext
+    match the ones computed content by content.
+    """
+    def setUp(self):
+        super(ContentPermissionContextTestCase, self).setUp()
+        self.course = CourseFactory.create()
+        seed_permissions_roles(self.course.id)
+        self.group_moderator = UserFactory(username='group_moderator')
+        self.cohorted_user = UserFactory(username='cohorted')
+        self.plain_user = UserFactory(username='plain')
+        for user in (self.group_moderator, self.cohorted_user, self.plain_user):
+            CourseEnrollmentFactory(course_id=self.course.id, user=user)
+        CohortFactory(course_id=self.course.id, name='Test Cohort', users=[self.group_moderator, self.cohorted_user])
+        assign_role(self.course.id, self.group_moderator, 'Group Moderator')
+        set_discussion_division_settings(
+            self.course.id, enable_cohorts=True, division_scheme=CourseDiscussionSettings.COHORT
+        )
+        self.user_info = {'upvoted_ids': ['response_1'], 'downvoted_ids': [], 'subscribed_thread_ids': ['thread']}
+
+    def _make_content(self, content_id, author, content_type='comment', **kwargs):
+        """
+        Returns a thread or comment written by author.
+        """
+        content = {
+            'id': content_id,
+            'type': content_type,
+            'user_id': str(author.id),
+            'username': author.username,
+            'closed': False,
+            'commentable_id': 'test_commentable',
+            'thread_id': 'thread',
+        }
+        content.update(kwargs)
+        return content
+
+    def _make_thread(self, num_responses, num_comments):
+        """
+        Returns a thread with num_responses responses of num_comments comments each,
+        written in turns by the users of the course.
+        """
+        authors = [self.group_moderator, self.cohorted_user, self.plain_user]
+        responses = []
+        for response_index in range(num_responses):
+            response = self._make_content(
+                'response_{}'.format(response_index), authors[response_index % len(authors)],
+                children=[
+                    self._make_content(
+                        'comment_{}_{}'.format(response_index, comment_index),
+                        authors[comment_index % len(authors)],
+                    )
+                    for comment_index in range(num_comments)
+                ],
+            )
+            responses.append(response)
+        return self._make_content(
+            'thread', self.plain_user, content_type='thread', thread_type='discussion',
+            endorsed_responses=responses[:1], non_endorsed_responses=responses[1:],
+        )
+
+    def _get_infos(self, user, thread, enabled):
+        """
+        Returns the annotated content infos of the thread for the user.
+        """
+        RequestCache.clear_all_namespaces()
+        with patch.dict('django.conf.settings.FEATURES', {'ENABLE_DISCUSSION_PERMISSION_CONTEXT': enabled}):
+            return utils.get_annotated_content_infos(self.course.id, thread, user, self.user_info)
+
+    def test_infos(self):
+        thread = self._make_thread(num_responses=6, num_comments=3)
+        for user in (self.group_moderator, self.cohorted_user, self.plain_user):
+            infos = self._get_infos(user, thread, enabled=True)
+            self.assertEqual(len(infos), 25)
+            self.assertEqual(infos, self._get_infos(user, thread, enabled=False))
+        self.assertTrue(infos['response_1']['ability']['can_vote'])
+        self.assertFalse(infos['thread']['ability']['can_vote'])
+
+    def test_closed(self):
+        thread = self._make_thread(num_responses=2, num_comments=2)
+        thread['closed'] = True
+        thread['non_endorsed_responses'][0]['closed'] = True
+        infos = self._get_infos(self.cohorted_user, thread, enabled=True)
+        self.assertEqual(infos, self._get_infos(self.cohorted_user, thread, enabled=False))
+        self.assertFalse(infos['response_1']['ability']['can_reply'])
+        self.assertTrue(infos['response_0']['ability']['can_reply'])
+
+    def test_large_thread_queries(self):
+        """
+        Test that the annotation of a large thread is the same, in fewer queries,
+        with the permission context.
+        """
+        thread = self._make_thread(num_responses=200, num_comments=5)
+        query_counts = {}
+        results = {}
+        for enabled in (False, True):
+            with CaptureQueriesContext(connection) as queries:
+                results[enabled] = self._get_infos(self.group_moderator, thread, enabled)
+            query_counts[enabled] = len(queries)
+        self.assertEqual(results[True], results[False])
+        self.assertLess(query_counts[True], query_counts[False])
+
+
 class ClientConfigurationTestCase(TestCase):
     """Simple test cases to ensure enabling/disabling the use of the comment service works as intended."""
 
@@ -1828,6 +1935,49 @@ class ClientConfigurationTestCase(TestCase):
         self.assertEqual(result, {})
 
 
+@patch.dict('django.conf.settings.FEATURES', {'ENABLE_COMMENTS_SERVICE_SESSIONS': True})
+class ClientSessionTestCase(TestCase):
+    """Tests for the pooled session and the parallel requests of the comments service client."""
+
+    def setUp(self):
+        super(ClientSessionTestCase, self).setUp()
+        RequestCache.clear_all_namespaces()
+        config = ForumsConfig.current()
+        config.enabled = True
+        config.save()
+
+    @patch('requests.Session.request')
+    def test_session(self, mock_request):
+        response = Mock()
+        response.status_code = 200
+        response.json = lambda: {}
+        mock_request.return_value = response
+
+        with patch.object(ForumsConfig, 'current', wraps=ForumsConfig.current) as mock_current:
+            self.assertEqual(perform_request('GET', 'http://localhost:4567/api/v1/threads'), {})
+            self.assertEqual(perform_request('GET', 'http://localhost:4567/api/v1/threads'), {})
+        self.assertEqual(mock_request.call_count, 2)
+        self.assertEqual(mock_current.call_count, 1)
+        self.assertIs(get_session(), get_session())
+
+    def test_parallel(self):
+        self.assertEqual(perform_in_parallel(lambda: 1, lambda: 2, lambda: 3), [1, 2, 3])
+
+    def test_parallel_exception(self):
+        def fail():
+            raise CommentClientMaintenanceError('service disabled')
+
+        with self.assertRaises(CommentClientMaintenanceError):
+            perform_in_parallel(lambda: 1, fail)
+
+    @patch.dict('django.conf.settings.FEATURES', {'ENABLE_COMMENTS_SERVICE_SESSIONS': False})
+    def test_sequential(self):
+        calls = []
+        results = perform_in_parallel(lambda: calls.append(1) or 1, lambda: calls.append(2) or 2)
+        self.assertEqual(results, [1, 2])
+        self.assertEqual(calls, [1, 2])
+
+
 def set_discussion_division_settings(
         course_key, enable_cohorts=False, always_divide_inline_discussions=False,
         divided_discussions=[], division_scheme=CourseDiscussionSettings.COHORT
@@ -19,7 +19,7 @@ from six import text_type
 from six.moves import map
 
 from lms.djangoapps.courseware import courses
-from lms.djangoapps.courseware.access import has_access
+from lms.djangoapps.courseware.access import has_access, has_access_many
 from lms.djangoapps.discussion.django_comment_client.constants import TYPE_ENTRY, TYPE_SUBCATEGORY
 from lms.djangoapps.discussion.django_comment_client.permissions import (
     check_permissions_by_view,
@@ -36,6 +36,7 @@ from openedx.core.djangoapps.django_comment_common.models import (
     Role
 )
 from openedx.core.djangoapps.django_comment_common.utils import get_course_discussion_settings
+from openedx.core.djangoapps.user_api.models import UserRetirementRequest
 from openedx.core.lib.cache_utils import request_cached
 from student.models import get_user_by_username_or_email
 from student.roles import GlobalStaff
@@ -146,20 +147,61 @@ def get_accessible_discussion_xblocks(course, user, include_all=False):
     return get_accessible_discussion_xblocks_by_course_id(course.id, user, include_all=include_all)
 
 
+def discussion_block_structure_enabled():
+    """
+    Returns whether the discussion xblocks accessible to a user are read from
+    the course block structure rather than from the modulestore.
+    """
+    return settings.FEATURES.get('ENABLE_DISCUSSION_BLOCK_STRUCTURE', False)
+
+
 @request_cached()
 def get_accessible_discussion_xblocks_by_course_id(course_id, user=None, include_all=False):  # pylint: disable=invalid-name
     """
     Return a list of all valid discussion xblocks in this course.
     Checks for the given user's access if include_all is False.
+
+    When the block structure is enabled and the user's access is checked,
+    the list is of DiscussionEntry objects holding the fields of the xblocks
+    read by the discussion maps.  Lists of all the xblocks are still read
+    from the modulestore: they are built by the publish-time tasks, which
+    can run before the course block structure is updated.
     """
+    if discussion_block_structure_enabled() and not include_all:
+        return _get_accessible_discussion_entries(course_id, user)
+
     all_xblocks = modulestore().get_items(course_id, qualifiers={'category': 'discussion'}, include_orphans=False)
+    xblocks = [xblock for xblock in all_xblocks if has_required_keys(xblock)]
+    if include_all:
+        return xblocks
 
     return [
-        xblock for xblock in all_xblocks
-        if has_required_keys(xblock) and (include_all or has_access(user, 'load', xblock, course_id))
+        xblock for xblock, access in zip(xblocks, has_access_many(user, 'load', xblocks, course_id))
+        if access
     ]
 
 
+def _get_accessible_discussion_entries(course_id, user):
+    """
+    Returns the DiscussionEntry of each valid discussion xblock in this
+    course, read from the collected block structure of the course and
+    filtered by the course block access transformers for the given user.
+    """
+    # Imported here to avoid a circular import with the course blocks transformers.
+    from lms.djangoapps.course_blocks.api import get_course_block_access_transformers, get_course_blocks
+    from lms.djangoapps.discussion.transformer import DiscussionTransformer
+    from openedx.core.djangoapps.content.block_structure.transformers import BlockStructureTransformers
+
+    transformers = get_course_block_access_transformers(user)
+    transformers.append(DiscussionTransformer())
+    block_structure = get_course_blocks(
+        user,
+        modulestore().make_course_usage_key(course_id),
+        transformers=BlockStructureTransformers(transformers),
+    )
+    return DiscussionTransformer.get_entries(block_structure)
+
+
 def get_discussion_id_map_entry(xblock):
     """
     Returns a tuple of (discussion_id, metadata) suitable for inclusion in the results of get_discussion_id_map().
@@ -214,16 +256,20 @@ def get_cached_discussion_id_map_by_course_id(course_id, discussion_ids, user):
     """
     include_all = getattr(user, 'is_community_ta', False)
     try:
-        entries = []
+        xblocks = []
         for discussion_id in discussion_ids:
             key = get_cached_discussion_key(course_id, discussion_id)
             if not key:
                 continue
             xblock = _get_item_from_modulestore(key)
-            if not (has_required_keys(xblock) and (include_all or has_access(user, 'load', xblock, course_id))):
-                continue
-            entries.append(get_discussion_id_map_entry(xblock))
-        return dict(entries)
+            if has_required_keys(xblock):
+                xblocks.append(xblock)
+        if not include_all:
+            xblocks = [
+                xblock for xblock, access in zip(xblocks, has_access_many(user, 'load', xblocks, course_id))
+                if access
+            ]
+        return dict(get_discussion_id_map_entry(xblock) for xblock in xblocks)
     except DiscussionIdMapIsNotCached:
         return get_discussion_id_map_by_course_id(course_id, user)
 
@@ -566,11 +612,24 @@ class QueryCountDebugMiddleware(MiddlewareMixin):
         return response
 
 
-def get_ability(course_id, content, user):
+def permission_context_enabled():
+    """
+    Returns whether the annotated content infos of the threads of a page are
+    computed from a single ContentPermissionContext.
+    """
+    return settings.FEATURES.get('ENABLE_DISCUSSION_PERMISSION_CONTEXT', False)
+
+
+def get_ability(course_id, content, user, group_ids=None):
     """
     Return a dictionary of forums-oriented actions and the user's permission to perform them
+
+    group_ids, when given, is the (user_group_id, content_user_group_id) pair
+    that would be returned by get_user_group_ids.
     """
-    (user_group_id, content_user_group_id) = get_user_group_ids(course_id, content, user)
+    if group_ids is None:
+        group_ids = get_user_group_ids(course_id, content, user)
+    (user_group_id, content_user_group_id) = group_ids
     return {
         'editable': check_permissions_by_view(
             user,
@@ -635,7 +694,116 @@ def get_user_group_ids(course_id, content, user=None):
     return user_group_id, content_user_group_id
 
 
-def get_annotated_content_info(course_id, content, user, user_info):
+class ContentPermissionContext(object):
+    """
+    The permissions of a user on the threads and comments of a course, with
+    everything they depend on loaded once rather than for each content.
+
+    The ability of the user on a content only depends on a few of its fields:
+    its type, whether it is closed, whether the user wrote it, its
+    commentable and, for group moderators, the group of its author.  The
+    ability is computed by get_ability once for each combination of these.
+    """
+    # Marks a field missing from a content, which the permission checks treat differently from any value.
+    _MISSING = object()
+
+    def __init__(self, user, course_id):
+        self.user = user
+        self.course_id = course_id
+        self._abilities = {}
+        self._content_user_group_ids = {}
+
+        # Group permissions are only granted when discussions are divided and
+        # both users are in a group, see check_permissions_by_view.
+        division_scheme = get_course_discussion_settings(course_id).division_scheme
+        self._needs_group_ids = division_scheme != CourseDiscussionSettings.NONE and any(
+            has_permission(user, permission, course_id)
+            for permission in ('group_edit_content', 'group_delete_thread', 'group_delete_comment',
+                               'group_openclose_thread')
+        )
+        self._user_group_id = get_group_id_for_user_from_cache(user, course_id) if self._needs_group_ids else None
+        self._needs_group_ids = self._needs_group_ids and self._user_group_id is not None
+
+    def load_content_users(self, contents):
+        """
+        Loads the groups of the authors of the given contents, and of their
+        children, with a query for the users rather than one per content.
+        """
+        if not self._needs_group_ids:
+            return
+
+        usernames = set()
+
+        def collect(content):
+            if content.get('username'):
+                usernames.add(content['username'])
+            for child in _get_content_children(content):
+                collect(child)
+        for content in contents:
+            collect(content)
+        usernames.difference_update(self._content_user_group_ids)
+        if not usernames:
+            return
+
+        users = {user.username: user for user in User.objects.filter(username__in=usernames)}
+        retired_user_ids = set(
+            UserRetirementRequest.objects.filter(user__in=list(users.values())).values_list('user_id', flat=True)
+        )
+        for username in usernames:
+            user = users.get(username)
+            if user is None:
+                # The username may be the email of another user, see get_user_by_username_or_email.
+                continue
+            if user.id in retired_user_ids:
+                self._content_user_group_ids[username] = None
+            else:
+                self._content_user_group_ids[username] = get_group_id_for_user_from_cache(user, self.course_id)
+
+    def _get_content_user_group_id(self, content):
+        """
+        Returns the group of the author of the content, as get_user_group_ids would.
+        """
+        username = content.get('username')
+        if not username:
+            return None
+        if username not in self._content_user_group_ids:
+            self._content_user_group_ids[username] = get_user_group_ids(self.course_id, content, None)[1]
+        return self._content_user_group_ids[username]
+
+    def get_ability(self, content):
+        """
+        Returns the ability of the user on the content, as get_ability would.
+        """
+        if self._needs_group_ids:
+            group_ids = (self._user_group_id, self._get_content_user_group_id(content))
+        else:
+            group_ids = (None, None)
+        user_id = content.get('user_id', self._MISSING)
+        key = (
+            content.get('type', self._MISSING),
+            content.get('closed', self._MISSING),
+            content.get('commentable_id', self._MISSING),
+            user_id == str(self.user.id),
+            is_content_authored_by(content, self.user),
+            group_ids,
+        )
+        if key not in self._abilities:
+            self._abilities[key] = get_ability(self.course_id, content, self.user, group_ids)
+        return dict(self._abilities[key])
+
+
+def _get_content_children(content):
+    """
+    Returns the comments of a thread, or the sub comments of a comment.
+    """
+    return (
+        content.get('children', []) +
+        content.get('endorsed_responses', []) +
+        content.get('non_endorsed_responses', [])
+    )
+
+
+def get_annotated_content_info(course_id, content, user, user_info, permission_context=None):
     """
     Get metadata for an individual content (thread or comment)
     """
@@ -647,25 +815,30 @@ def get_annotated_content_info(course_id, content, user, user_info):
     return {
         'voted': voted,
         'subscribed': content['id'] in user_info['subscribed_thread_ids'],
-        'ability': get_ability(course_id, content, user),
+        'ability': (
+            permission_context.get_ability(content) if permission_context is not None
+            else get_ability(course_id, content, user)
+        ),
     }
 
 # TODO: RENAME
 
 
-def get_annotated_content_infos(course_id, thread, user, user_info):
+def get_annotated_content_infos(course_id, thread, user, user_info, permission_context=None):
     """
     Get metadata for a thread and its children
     """
+    if permission_context is None and permission_context_enabled():
+        permission_context = ContentPermissionContext(user, course_id)
+        permission_context.load_content_users([thread])
+
     infos = {}
 
     def annotate(content):
-        infos[str(content['id'])] = get_annotated_content_info(course_id, content, user, user_info)
-        for child in (
-                content.get('children', []) +
-                content.get('endorsed_responses', []) +
-                content.get('non_endorsed_responses', [])
-        ):
+        infos[str(content['id'])] = get_annotated_content_info(
+            course_id, content, user, user_info, permission_context
+        )
+        for child in _get_content_children(content):
             annotate(child)
     annotate(thread)
     return infos
@@ -675,9 +848,13 @@ def get_metadata_for_threads(course_id, threads, user, user_info):
     """
     Returns annotated content information for the specified course, threads, and user information
     """
+    permission_context = None
+    if permission_context_enabled():
+        permission_context = ContentPermissionContext(user, course_id)
+        permission_context.load_content_users(threads)
 
     def infogetter(thread):
-        return get_annotated_content_infos(course_id, thread, user, user_info)
+        return get_annotated_content_infos(course_id, thread, user, user_info, permission_context)
 
     metadata = {}
     for thread in threads:
@@ -0,0 +1,108 @@
+"""
+Tests for the DiscussionTransformer.
+"""
+
+
+from edx_django_utils.cache import RequestCache
+from mock import patch
+
+from lms.djangoapps.course_blocks.api import get_course_block_access_transformers
+from lms.djangoapps.discussion.django_comment_client.utils import (
+    get_accessible_discussion_xblocks,
+    get_accessible_discussion_xblocks_by_course_id,
+    get_discussion_category_map
+)
+from lms.djangoapps.discussion.transformer import DiscussionTransformer
+from openedx.core.djangoapps.content.block_structure.tests.helpers import clear_registered_transformers_cache
+from student.tests.factories import UserFactory
+from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
+
+
+class DiscussionTransformerTestCase(ModuleStoreTestCase):
+    """
+    Verify that the discussion maps read from the block structure match
+    those read from the modulestore.
+    """
+    def setUp(self):
+        super(DiscussionTransformerTestCase, self).setUp()
+        self.user = UserFactory.create()
+        self.course = CourseFactory.create(discussion_topics={})
+        vertical = ItemFactory.create(
+            parent=ItemFactory.create(
+                parent=ItemFactory.create(parent=self.course, category='chapter'),
+                category='sequential',
+            ),
+            category='vertical',
+        )
+        for discussion_id, category, target, staff_only in (
+                ('first', 'Week 1', 'Topic A', False),
+                ('second', 'Week 1 / Section', 'Topic B', False),
+                ('third', 'Week 2', 'Topic A', False),
+                ('hidden', 'Week 2', 'Staff', True),
+        ):
+            ItemFactory.create(
+                parent=vertical,
+                category='discussion',
+                discussion_id=discussion_id,
+                discussion_category=category,
+                discussion_target=target,
+                visible_to_staff_only=staff_only,
+            )
+
+        patcher = patch(
+            'openedx.core.djangoapps.content.block_structure.transformer_registry.'
+            'TransformerRegistry.get_registered_transformers'
+        )
+        mock_registry = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(clear_registered_transformers_cache)
+        mock_registry.return_value = {
+            transformer.__class__ for transformer in get_course_block_access_transformers(self.user)
+        } | {DiscussionTransformer}
+
+    def _get_discussion_ids(self, include_all=False, enabled=True):
+        """
+        Returns the ids of the discussions accessible to the user.
+        """
+        RequestCache.clear_all_namespaces()
+        with patch.dict('django.conf.settings.FEATURES', {'ENABLE_DISCUSSION_BLOCK_STRUCTURE': enabled}):
+            xblocks = get_accessible_discussion_xblocks_by_course_id(self.course.id, self.user, include_all)
+        return sorted(xblock.discussion_id for xblock in xblocks)
+
+    def _get_category_map(self, enabled=True):
+        """
+        Returns the discussion category map of the user.
+        """
+        RequestCache.clear_all_namespaces()
+        with patch.dict('django.conf.settings.FEATURES', {'ENABLE_DISCUSSION_BLOCK_STRUCTURE': enabled}):
+            return get_discussion_category_map(self.course, self.user, exclude_unstarted=False)
+
+    def test_accessible_discussions(self):
+        self.assertEqual(self._get_discussion_ids(), ['first', 'second', 'third'])
+        self.assertEqual(self._get_discussion_ids(), self._get_discussion_ids(enabled=False))
+
+    def test_include_all(self):
+        self.assertEqual(self._get_discussion_ids(include_all=True), ['first', 'hidden', 'second', 'third'])
+
+    def test_include_all_reads_modulestore(self):
+        """
+        The lists of all the discussions are built on publish, possibly before
+        the block structure of the course is updated, so they aren't read from it.
+        """
+        with patch('lms.djangoapps.course_blocks.api.get_course_blocks') as mock_get_blocks:
+            self._get_discussion_ids(include_all=True)
+        mock_get_blocks.assert_not_called()
+
+    def test_community_ta(self):
+        """
+        Community TAs get every discussion of the course, as before.
+        """
+        self.user.is_community_ta = True
+        RequestCache.clear_all_namespaces()
+        with patch.dict('django.conf.settings.FEATURES', {'ENABLE_DISCUSSION_BLOCK_STRUCTURE': True}):
+            xblocks = get_accessible_discussion_xblocks(self.course, self.user)
+        self.assertEqual(sorted(xblock.discussion_id for xblock in xblocks), ['first', 'hidden', 'second', 'third'])
+
+    def test_category_map(self):
+        self.assertEqual(self._get_category_map(), self._get_category_map(enabled=False))
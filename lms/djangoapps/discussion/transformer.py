@@ -0,0 +1,93 @@
+"""
+Discussion Transformer
+"""
+
+
+from openedx.core.djangoapps.content.block_structure.transformer import BlockStructureTransformer
+
+
+class DiscussionEntry(object):
+    """
+    The fields of a discussion xblock read when building the discussion
+    category and id maps, as collected by the DiscussionTransformer.
+    """
+    def __init__(self, location, discussion_id, discussion_category, discussion_target, sort_key, start):
+        self.location = location
+        self.discussion_id = discussion_id
+        self.discussion_category = discussion_category
+        self.discussion_target = discussion_target
+        self.sort_key = sort_key
+        self.start = start
+
+
+class DiscussionTransformer(BlockStructureTransformer):
+    """
+    The DiscussionTransformer collects, when the course is published, the
+    fields of each discussion xblock that the discussion category and id
+    maps are built from, so that they don't have to be loaded from the
+    modulestore for each request.
+
+    No runtime transformations are performed; the discussions a user has
+    access to are those left in the block structure by the course block
+    access transformers.
+
+    The following value is stored as a transformer_block_field on each
+    discussion xblock that has the keys required by the maps:
+
+        entry: (dict) the discussion_id, discussion_category,
+            discussion_target, sort_key and start of the xblock.
+    """
+    WRITE_VERSION = 1
+    READ_VERSION = 1
+    ENTRY_FIELD_NAME = 'entry'
+
+    @classmethod
+    def name(cls):
+        """
+        Unique identifier for the transformer's class;
+        same identifier used in setup.py.
+        """
+        return u'discussion'
+
+    @classmethod
+    def collect(cls, block_structure):
+        """
+        Collects the fields of the discussion xblocks.
+        """
+        # Imported here to avoid a circular import with the discussion utils.
+        from lms.djangoapps.discussion.django_comment_client.utils import has_required_keys
+
+        for block_key in block_structure.topological_traversal():
+            if block_key.block_type != 'discussion':
+                continue
+            xblock = block_structure.get_xblock(block_key)
+            if not has_required_keys(xblock):
+                continue
+            block_structure.set_transformer_block_field(block_key, cls, cls.ENTRY_FIELD_NAME, {
+                'discussion_id': xblock.discussion_id,
+                'discussion_category': xblock.discussion_category,
+                'discussion_target': xblock.discussion_target,
+                'sort_key': getattr(xblock, 'sort_key', None),
+                'start': xblock.start,
+            })
+
+    def transform(self, block_structure, usage_context):
+        """
+        Perform no transformations.
+        """
+        pass
+
+    @classmethod
+    def get_entries(cls, block_structure):
+        """
+        Returns a DiscussionEntry for each of the discussion xblocks in the
+        given block structure, in the order of the course.
+        """
+        entries = []
+        for block_key in block_structure.topological_traversal():
+            if block_key.block_type != 'discussion':
+                continue
+            entry = block_structure.get_transformer_block_field(block_key, cls, cls.ENTRY_FIELD_NAME)
+            if entry is not None:
+                entries.append(DiscussionEntry(location=block_key, **entry))
+        return entries
@@ -66,6 +66,28 @@ def track_memory_usage(metric, course_id):
         memory_used = total_usage - baseline_usage
 
 
+def _iterate_by_pk(queryset, item_fields, items_per_query):
+    """
+    Yields the values of `item_fields` of the items of the queryset in order of
+    their pk, reading no more than `items_per_query` items per query.
+
+    Each query starts after the last pk read by the previous one, so that, unlike
+    with an OFFSET, reading a page doesn't get slower the further into the
+    queryset it is, and no query holds the whole queryset in memory.  `item_fields`
+    must include 'pk'.
+    """
+    queryset = queryset.order_by('pk').values(*item_fields)
+    last_pk = None
+    while True:
+        page_queryset = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        items = list(page_queryset[:items_per_query])
+        for item in items:
+            yield item
+        if len(items) < items_per_query:
+            return
+        last_pk = items[-1]['pk']
+
+
 def _generate_items_for_subtask(
     item_querysets,  # pylint: disable=bad-continuation
     item_fields,
@@ -73,6 +95,7 @@ def _generate_items_for_subtask(
     items_per_task,
     total_num_subtasks,
     course_id,
+    items_per_query=None,
 ):
     """
     Generates a chunk of "items" that should be passed into a subtask.
@@ -82,9 +105,10 @@ def _generate_items_for_subtask(
         `item_fields` : the fields that should be included in the dict that is returned.
             These are in addition to the 'pk' field.
         `total_num_items` : the result of summing the count of each queryset in `item_querysets`.
-        `items_per_query` : size of chunks to break the query operation into.
         `items_per_task` : maximum size of chunks to break each query chunk into for use by a subtask.
         `course_id` : course_id of the course. Only needed for the track_memory_usage context manager.
+        `items_per_query` : if given, each queryset is read by pages of this many items, by _iterate_by_pk,
+            rather than with a single query.  Querysets combined with union() can't be read by pages.
 
     Returns:  yields a list of dicts, where each dict contains the fields in `item_fields`, plus the 'pk' field.
 
@@ -99,7 +123,11 @@ def _generate_items_for_subtask(
 
     with track_memory_usage('course_email.subtask_generation.memory', course_id):
         for queryset in item_querysets:
-            for item in queryset.values(*all_item_fields).iterator():
+            if items_per_query:
+                items = _iterate_by_pk(queryset, all_item_fields, items_per_query)
+            else:
+                items = queryset.values(*all_item_fields).iterator()
+            for item in items:
                 if len(items_for_task) == items_per_task and num_subtasks < total_num_subtasks - 1:
                     yield items_for_task
                     num_items_queued += items_per_task
@@ -282,6 +310,7 @@ def queue_subtasks_for_query(
     item_fields,
     items_per_task,
     total_num_items,
+    items_per_query=None,
 ):
     """
     Generates and queues subtasks to each execute a chunk of "items" generated by a queryset.
@@ -297,6 +326,8 @@ def queue_subtasks_for_query(
             These are in addition to the 'pk' field.
         `items_per_task` : maximum size of chunks to break each query chunk into for use by a subtask.
         `total_num_items` : total amount of items that will be put into subtasks
+        `items_per_query` : if given, the number of items read by each query of the querysets,
+            which are then read by pages in order of their pk.
 
     Returns:  the task progress as stored in the InstructorTask object.
 
@@ -328,6 +359,7 @@ def queue_subtasks_for_query(
         items_per_task,
         total_num_subtasks,
         entry.course_id,
+        items_per_query,
     )
 
     # Now create the subtasks, and start them running.
@@ -8,13 +8,20 @@ from time import time
 from django.contrib.auth.models import User
 from django.db.models import Q
 
-from lms.djangoapps.certificates.api import generate_user_certificates
+from lms.djangoapps.certificates.api import (
+    bulk_generation_enabled,
+    generate_user_certificates,
+    generate_user_certificates_in_bulk
+)
 from lms.djangoapps.certificates.models import CertificateStatuses, GeneratedCertificate
 from student.models import CourseEnrollment
 from xmodule.modulestore.django import modulestore
 
 from .runner import TaskProgress
 
+# The number of students whose certificates are generated together when bulk generation is enabled.
+CERTIFICATE_GENERATION_CHUNK_SIZE = 100
+
 
 def generate_students_certificates(
         _xmodule_instance_args, _entry_id, course_id, task_input, action_name):
@@ -73,6 +80,10 @@ def generate_students_certificates(
     task_progress.update_task_state(extra_meta=current_step)
 
     course = modulestore().get_course(course_id, depth=0)
+    if bulk_generation_enabled():
+        _generate_certificates_in_chunks(students_require_certs, course_id, course, task_progress)
+        return task_progress.update_task_state(extra_meta=current_step)
+
     # Generate certificate for each student
     for student in students_require_certs:
         task_progress.attempted += 1
@@ -90,6 +101,24 @@ def generate_students_certificates(
     return task_progress.update_task_state(extra_meta=current_step)
 
 
+def _generate_certificates_in_chunks(students, course_id, course, task_progress):
+    """
+    Generates the certificates of the students CERTIFICATE_GENERATION_CHUNK_SIZE
+    at a time, updating the task progress after each chunk.
+    """
+    students = list(students)
+    for start in range(0, len(students), CERTIFICATE_GENERATION_CHUNK_SIZE):
+        chunk = students[start:start + CERTIFICATE_GENERATION_CHUNK_SIZE]
+        statuses = generate_user_certificates_in_bulk(chunk, course_id, course=course)
+        for student in chunk:
+            task_progress.attempted += 1
+            if CertificateStatuses.is_passing_status(statuses[student.id]):
+                task_progress.succeeded += 1
+            else:
+                task_progress.failed += 1
+        task_progress.update_task_state(extra_meta={'step': 'Generating Certificates'})
+
+
 def students_require_certificate(course_id, enrolled_students, statuses_to_regenerate=None):
     """
     Returns list of students where certificates needs to be generated.
@@ -28,7 +28,7 @@ class TestSubtasks(InstructorTaskCourseTestCase):
             random_id = uuid4().hex[:8]
             self.create_student(username='student{0}'.format(random_id))
 
-    def _queue_subtasks(self, create_subtask_fcn, items_per_task, initial_count, extra_count):
+    def _queue_subtasks(self, create_subtask_fcn, items_per_task, initial_count, extra_count, items_per_query=None):
         """Queue subtasks while enrolling more students into course in the middle of the process."""
 
         task_id = str(uuid4())
@@ -57,6 +57,7 @@ class TestSubtasks(InstructorTaskCourseTestCase):
                 item_fields=[],
                 items_per_task=items_per_task,
                 total_num_items=initial_count,
+                items_per_query=items_per_query,
             )
 
     def test_queue_subtasks_for_query1(self):
@@ -82,3 +83,18 @@ class TestSubtasks(InstructorTaskCourseTestCase):
         self.assertEqual(len(mock_create_subtask_fcn_args[0][0][0]), 3)
         self.assertEqual(len(mock_create_subtask_fcn_args[1][0][0]), 3)
         self.assertEqual(len(mock_create_subtask_fcn_args[2][0][0]), 5)
+
+    def test_queue_subtasks_for_query_by_pages(self):
+        """Test queue_subtasks_for_query() if the items are read by pages of items_per_query items."""
+
+        mock_create_subtask_fcn = Mock()
+        self._queue_subtasks(mock_create_subtask_fcn, 3, 7, 0, items_per_query=2)
+
+        # Check the items of the subtasks, in order of their pk
+        items = [
+            item['pk']
+            for args in mock_create_subtask_fcn.call_args_list
+            for item in args[0][0]
+        ]
+        self.assertEqual(items, sorted(items))
+        self.assertEqual(len(set(items)), 7)
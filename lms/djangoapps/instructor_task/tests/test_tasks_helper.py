@@ -2248,6 +2248,37 @@ class TestCertificateGeneration(InstructorTaskModuleTestCase):
         with self.assertNumQueries(3):
             self.assertCertificatesGenerated(task_input, expected_results)
 
+    @patch.dict('django.conf.settings.FEATURES', {'ENABLE_BULK_CERTIFICATE_GENERATION': True})
+    @patch('lms.djangoapps.instructor_task.tasks_helper.certs.CERTIFICATE_GENERATION_CHUNK_SIZE', 3)
+    def test_certificate_generation_in_bulk(self):
+        """
+        Verify that certificates generated in chunks of students are those generated one student at a time.
+        """
+        students = self._create_students(10)
+        for student in students[:2]:
+            GeneratedCertificateFactory.create(
+                user=student,
+                course_id=self.course.id,
+                status=CertificateStatuses.downloadable,
+                mode='honor'
+            )
+        for student in students[2:7]:
+            CertificateWhitelistFactory.create(user=student, course_id=self.course.id, whitelist=True)
+
+        expected_results = {
+            'action_name': 'certificates generated',
+            'total': 10,
+            'attempted': 8,
+            'succeeded': 5,
+            'failed': 3,
+            'skipped': 2
+        }
+        self.assertCertificatesGenerated({'student_set': None}, expected_results)
+        for student in students[2:7]:
+            self.assertTrue(CertificateStatuses.is_passing_status(
+                GeneratedCertificate.objects.get(user=student, course_id=self.course.id).status
+            ))
+
     @ddt.data(
         CertificateStatuses.downloadable,
         CertificateStatuses.generating,
@@ -5,13 +5,13 @@ Module implementing `xblock.runtime.Runtime` functionality for the LMS
 
 import six
 import xblock.reference.plugins
-from completion.services import CompletionService
 from django.conf import settings
 from django.urls import reverse
 from edx_django_utils.cache import DEFAULT_REQUEST_CACHE
 
 from badges.service import BadgingService
 from badges.utils import badges_enabled
+from lms.djangoapps.courseware.services import BulkCompletionService
 from lms.djangoapps.lms_xblock.models import XBlockAsidesConfig
 from lms.djangoapps.teams.services import TeamsService
 from openedx.core.djangoapps.user_api.course_tag import api as user_course_tag_api
@@ -149,7 +149,7 @@ class LmsModuleSystem(ModuleSystem):  # pylint: disable=abstract-method
         services = kwargs.setdefault('services', {})
         user = kwargs.get('user')
         if user and user.is_authenticated:
-            services['completion'] = CompletionService(user=user, context_key=kwargs.get('course_id'))
+            services['completion'] = BulkCompletionService(user=user, context_key=kwargs.get('course_id'))
         services['fs'] = xblock.reference.plugins.FSService()
         services['i18n'] = ModuleI18nService
         services['library_tools'] = LibraryToolsService(store)
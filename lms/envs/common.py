@@ -478,6 +478,173 @@ FEATURES = {
     # .. toggle_status: supported
     # .. toggle_warnings: None
     'ENABLE_ORA_USER_STATE_UPLOAD_DATA': False,
+
+    # .. toggle_name: ENABLE_STATIC_URL_REWRITE_TABLE
+    # .. toggle_implementation: DjangoSetting
+    # .. toggle_default: False
+    # .. toggle_description: Resolve course /static/ URLs through the per-course, per-process rewrite table in
+    #      static_replace.rewrite_table instead of checking staticfiles storage and the contentstore for every
+    #      URL on every render. Tables are precomputed by Studio on publish.
+    # .. toggle_category: performance
+    # .. toggle_use_cases: incremental_release, open_edx
+    # .. toggle_creation_date: 2020-04-01
+    # .. toggle_expiration_date: None
+    # .. toggle_tickets: None
+    # .. toggle_status: supported
+    # .. toggle_warnings: None
+    'ENABLE_STATIC_URL_REWRITE_TABLE': False,
+
+    # .. toggle_name: ENABLE_ENROLLMENT_COUNTS
+    # .. toggle_implementation: DjangoSetting
+    # .. toggle_default: False
+    # .. toggle_description: Set to True to keep the number of active enrollments of each course and mode in the
+    #      CourseEnrollmentCount table as enrollments change, and to read enrollment counts and enforce the
+    #      maximum enrollment of courses from it rather than counting enrollments. Run the
+    #      repair_enrollment_counts management command on all courses after enabling it, and again if it was
+    #      disabled for a while.
+    # .. toggle_category: performance
+    # .. toggle_use_cases: incremental_release, open_edx
+    # .. toggle_creation_date: 2020-04-01
+    # .. toggle_expiration_date: None
+    # .. toggle_tickets: None
+    # .. toggle_status: supported
+    # .. toggle_warnings: None
+    'ENABLE_ENROLLMENT_COUNTS': False,
+
+    # .. toggle_name: ENABLE_ENROLLMENT_SNAPSHOT
+    # .. toggle_implementation: DjangoSetting
+    # .. toggle_default: False
+    # .. toggle_description: Set to True to load all of the enrollments of the user of a request at once, the first time one of
+    #      them is looked up, and to answer the later enrollment lookups of the request for that user from
+    #      them.
+    # .. toggle_category: performance
+    # .. toggle_use_cases: incremental_release, open_edx
+    # .. toggle_creation_date: 2020-04-01
+    # .. toggle_expiration_date: None
+    # .. toggle_tickets: None
+    # .. toggle_status: supported
+    # .. toggle_warnings: None
+    'ENABLE_ENROLLMENT_SNAPSHOT': False,
+
+    # .. toggle_name: ENABLE_COURSE_OVERVIEW_SHARED_CACHE
+    # .. toggle_implementation: DjangoSetting
+    # .. toggle_default: False
+    # .. toggle_description: Set to True to keep course overviews in the django cache, to read many of them with one cache round
+    #      trip, and to serve an overview of a previous CourseOverview version while it is regenerated in a
+    #      celery task instead of regenerating it during the request.
+    # .. toggle_category: performance
+    # .. toggle_use_cases: incremental_release, open_edx
+    # .. toggle_creation_date: 2020-04-01
+    # .. toggle_expiration_date: None
+    # .. toggle_tickets: None
+    # .. toggle_status: supported
+    # .. toggle_warnings: None
+    'ENABLE_COURSE_OVERVIEW_SHARED_CACHE': False,
+
+    # .. toggle_name: ENABLE_COMMENTS_SERVICE_SESSIONS
+    # .. toggle_implementation: DjangoSetting
+    # .. toggle_default: False
+    # .. toggle_description: Set to True to send the requests to the comments service through a keep-alive connection pool per
+    #      process, of COMMENTS_SERVICE_POOL_SIZE connections, to read the forums configuration once per
+    #      request, and to let views make their independent comments service requests concurrently.
+    # .. toggle_category: performance
+    # .. toggle_use_cases: incremental_release, open_edx
+    # .. toggle_creation_date: 2020-04-01
+    # .. toggle_expiration_date: None
+    # .. toggle_tickets: None
+    # .. toggle_status: supported
+    # .. toggle_warnings: None
+    'ENABLE_COMMENTS_SERVICE_SESSIONS': False,
+
+    # .. toggle_name: ENABLE_DISCUSSION_BLOCK_STRUCTURE
+    # .. toggle_implementation: DjangoSetting
+    # .. toggle_default: False
+    # .. toggle_description: Set to True to read the discussion xblocks accessible to a user, from which the discussion category
+    #      and id maps are built, from the course block structure collected on publish, rather than loading
+    #      them from the modulestore and checking access to each of them on every request.
+    # .. toggle_category: performance
+    # .. toggle_use_cases: incremental_release, open_edx
+    # .. toggle_creation_date: 2020-04-01
+    # .. toggle_expiration_date: None
+    # .. toggle_tickets: None
+    # .. toggle_status: supported
+    # .. toggle_warnings: None
+    'ENABLE_DISCUSSION_BLOCK_STRUCTURE': False,
+
+    # .. toggle_name: ENABLE_DISCUSSION_PERMISSION_CONTEXT
+    # .. toggle_implementation: DjangoSetting
+    # .. toggle_default: False
+    # .. toggle_description: Set to True to compute the abilities of the user on the threads and comments of a discussion page
+    #      from the user's forum permissions, discussion settings and group loaded once per page, rather than
+    #      checking the permissions of each comment separately.
+    # .. toggle_category: performance
+    # .. toggle_use_cases: incremental_release, open_edx
+    # .. toggle_creation_date: 2020-04-01
+    # .. toggle_expiration_date: None
+    # .. toggle_tickets: None
+    # .. toggle_status: supported
+    # .. toggle_warnings: None
+    'ENABLE_DISCUSSION_PERMISSION_CONTEXT': False,
+
+    # .. toggle_name: ENABLE_BULK_EMAIL_SENDING_ENGINE
+    # .. toggle_implementation: DjangoSetting
+    # .. toggle_default: False
+    # .. toggle_description: Set to True to render each bulk email's templates once per email rather than once per recipient, and
+    #      to send the messages of each bulk email subtask concurrently over a pool of persistent SMTP
+    #      connections, see BULK_EMAIL_SEND_WORKERS.
+    # .. toggle_category: performance
+    # .. toggle_use_cases: incremental_release, open_edx
+    # .. toggle_creation_date: 2020-04-01
+    # .. toggle_expiration_date: None
+    # .. toggle_tickets: None
+    # .. toggle_status: supported
+    # .. toggle_warnings: None
+    'ENABLE_BULK_EMAIL_SENDING_ENGINE': False,
+
+    # .. toggle_name: ENABLE_BULK_EMAIL_RECIPIENT_QUERY
+    # .. toggle_implementation: DjangoSetting
+    # .. toggle_default: False
+    # .. toggle_description: Set to True to read the recipients of a bulk email target by target, without duplicates
+    #      and leaving out opted out users, in pages of BULK_EMAIL_RECIPIENTS_PER_QUERY users as the subtasks are
+    #      queued.
+    # .. toggle_category: performance
+    # .. toggle_use_cases: incremental_release, open_edx
+    # .. toggle_creation_date: 2020-04-01
+    # .. toggle_expiration_date: None
+    # .. toggle_tickets: None
+    # .. toggle_status: supported
+    # .. toggle_warnings: None
+    'ENABLE_BULK_EMAIL_RECIPIENT_QUERY': False,
+
+    # .. toggle_name: ENABLE_BULK_CERTIFICATE_GENERATION
+    # .. toggle_implementation: DjangoSetting
+    # .. toggle_default: False
+    # .. toggle_description: Set to True to generate the certificates of a course for chunks of learners at once, reading their
+    #      grades, enrollments, verification and whitelist status with a few queries per chunk and writing
+    #      their certificates in bulk.
+    # .. toggle_category: performance
+    # .. toggle_use_cases: incremental_release, open_edx
+    # .. toggle_creation_date: 2020-04-01
+    # .. toggle_expiration_date: None
+    # .. toggle_tickets: None
+    # .. toggle_status: supported
+    # .. toggle_warnings: None
+    'ENABLE_BULK_CERTIFICATE_GENERATION': False,
+
+    # .. toggle_name: ENABLE_HASHED_COHORT_ASSIGNMENT
+    # .. toggle_implementation: DjangoSetting
+    # .. toggle_default: False
+    # .. toggle_description: Set to True to assign learners who visit a cohorted course without a cohort to the random cohort
+    #      they are hashed to, inserting their membership without locking rows, so that learners arriving at
+    #      course start don't contend for locks.
+    # .. toggle_category: performance
+    # .. toggle_use_cases: incremental_release, open_edx
+    # .. toggle_creation_date: 2020-04-01
+    # .. toggle_expiration_date: None
+    # .. toggle_tickets: None
+    # .. toggle_status: supported
+    # .. toggle_warnings: None
+    'ENABLE_HASHED_COHORT_ASSIGNMENT': False,
 }
 
 # Settings for the course reviews tool template and identification key, set either to None to disable course reviews
@@ -2237,6 +2404,21 @@ BULK_EMAIL_LOG_SENT_EMAILS = False
 # parallel, and what the SES rate is.
 BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS = 0.02
 
+# Number of threads sending the emails of a bulk email subtask concurrently, each over
+# its own SMTP connection, when FEATURES['ENABLE_BULK_EMAIL_SENDING_ENGINE'] is on.
+BULK_EMAIL_SEND_WORKERS = 4
+
+# Maximum number of bulk emails sent per second by each worker process, across its
+# sending threads, or None for no limit.
+BULK_EMAIL_MAX_SENDS_PER_SECOND = None
+
+# Seconds after which an idle pooled SMTP connection is closed rather than reused.
+BULK_EMAIL_CONNECTION_MAX_IDLE = 60
+
+# Number of recipients read by each query of a bulk email's recipients, when
+# FEATURES['ENABLE_BULK_EMAIL_RECIPIENT_QUERY'] is on.
+BULK_EMAIL_RECIPIENTS_PER_QUERY = 10000
+
 ############################# Email Opt In ####################################
 
 # Minimum age for organization-wide email opt in
@@ -3354,6 +3536,9 @@ CREDENTIALS_PUBLIC_SERVICE_URL = 'http://localhost:8005'
 
 COMMENTS_SERVICE_URL = 'http://localhost:18080'
 COMMENTS_SERVICE_KEY = 'password'
+# The maximum number of keep-alive connections to the comments service kept by each process,
+# see ENABLE_COMMENTS_SERVICE_SESSIONS.
+COMMENTS_SERVICE_POOL_SIZE = 10
 
 # Reverification checkpoint name pattern
 CHECKPOINT_PATTERN = r'(?P<checkpoint_name>[^/]+)'
@@ -336,6 +336,7 @@ LOGGING = get_logger_config(LOG_DIR,
 COURSE_LISTINGS = ENV_TOKENS.get('COURSE_LISTINGS', {})
 COMMENTS_SERVICE_URL = ENV_TOKENS.get("COMMENTS_SERVICE_URL", '')
 COMMENTS_SERVICE_KEY = ENV_TOKENS.get("COMMENTS_SERVICE_KEY", '')
+COMMENTS_SERVICE_POOL_SIZE = ENV_TOKENS.get('COMMENTS_SERVICE_POOL_SIZE', COMMENTS_SERVICE_POOL_SIZE)
 CERT_QUEUE = ENV_TOKENS.get("CERT_QUEUE", 'test-pull')
 
 # git repo loading  environment
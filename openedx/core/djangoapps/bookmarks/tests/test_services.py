@@ -58,6 +58,24 @@ class BookmarksServiceTests(BookmarksTestsBase):
         with self.assertNumQueries(1):
             self.assertFalse(bookmark_service.is_bookmarked(usage_key=self.sequential_1.location))
 
+    def test_are_bookmarked(self):
+        """
+        Verifies are_bookmarked returns the status of all the blocks with a single query.
+        """
+        usage_keys = [self.sequential_1.location, self.vertical_2.location, self.sequential_2.location]
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                self.bookmark_service.are_bookmarked(usage_keys),
+                {
+                    self.sequential_1.location: True,
+                    self.vertical_2.location: False,
+                    self.sequential_2.location: True,
+                }
+            )
+            self.assertTrue(self.bookmark_service.is_bookmarked(usage_key=self.sequential_1.location))
+
+        self.assertEqual(self.bookmark_service.are_bookmarked([]), {})
+
     def test_set_bookmarked(self):
         """
         Verifies set_bookmarked returns Bool as expected.
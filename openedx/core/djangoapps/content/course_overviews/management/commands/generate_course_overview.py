@@ -4,26 +4,102 @@ Command to load course overviews.
 
 
 import logging
+from multiprocessing import Pool
 
 import six
 from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
 from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
 
+from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
 from openedx.core.djangoapps.content.course_overviews.tasks import (
     DEFAULT_ALL_COURSES,
     DEFAULT_CHUNK_SIZE,
     DEFAULT_FORCE_UPDATE,
+    chunks,
     enqueue_async_course_overview_update_tasks
 )
+from xmodule.modulestore.django import clear_existing_modulestores, modulestore
 
 log = logging.getLogger(__name__)
 
 
+def get_stale_course_keys(course_keys):
+    """
+    Returns the keys of the courses whose overviews are missing, of a
+    previous CourseOverview version, or older than the last change to the
+    course in the modulestore.
+
+    The overviews and the course indexes are each read with a single query.
+    Overviews of courses the modulestore doesn't record the last change of
+    are all considered stale.
+    """
+    overviews = {
+        course_id: (version, modified)
+        for course_id, version, modified in CourseOverview.objects.filter(
+            id__in=course_keys
+        ).values_list('id', 'version', 'modified')
+    }
+    last_updates = modulestore().get_course_index_last_updates()
+
+    stale_course_keys = []
+    for course_key in course_keys:
+        overview = overviews.get(course_key)
+        last_update = last_updates.get(course_key)
+        if (
+            overview is None or
+            overview[0] < CourseOverview.VERSION or
+            last_update is None or
+            last_update > overview[1]
+        ):
+            stale_course_keys.append(course_key)
+    return stale_course_keys
+
+
+def _init_worker():
+    """
+    Make a pool worker open its own modulestore connections.
+    """
+    clear_existing_modulestores()
+
+
+def regenerate_course_overviews(course_key_strings):
+    """
+    Regenerates the overviews of the courses from the modulestore, committing
+    them together.  Returns a dict of the lists of the courses whose overviews
+    were created, updated and failed.
+    """
+    course_keys = [CourseKey.from_string(course_key_string) for course_key_string in course_key_strings]
+    existing_course_keys = set(CourseOverview.objects.filter(id__in=course_keys).values_list('id', flat=True))
+    result = {'created': [], 'updated': [], 'failed': []}
+    with transaction.atomic():
+        for course_key in course_keys:
+            try:
+                with transaction.atomic():
+                    CourseOverview.load_from_module_store(course_key)
+            except Exception:  # pylint: disable=broad-except
+                log.exception(u'An error occurred while generating course overview for %s', course_key)
+                result['failed'].append(six.text_type(course_key))
+            else:
+                result['updated' if course_key in existing_course_keys else 'created'].append(
+                    six.text_type(course_key)
+                )
+    return result
+
+
 class Command(BaseCommand):
     """
     Example usage:
         $ ./manage.py lms generate_course_overview --all-courses --settings=devstack --chunk-size=100
         $ ./manage.py lms generate_course_overview 'edX/DemoX/Demo_Course' --settings=devstack
+        $ ./manage.py lms generate_course_overview --all-courses --stale-only --processes=8 --settings=devstack
+
+    With --stale-only, the overviews are regenerated by this command rather
+    than by celery tasks, and only for the courses that changed since their
+    overview was generated.  With --all-courses, the courses are then those
+    with a split course index or an overview, which leaves out the courses of
+    the old Mongo modulestore that don't have an overview yet.
     """
     args = '<course_id course_id ...>'
     help = 'Generates and stores course overview for one or more courses.'
@@ -52,6 +128,19 @@ class Command(BaseCommand):
             default=DEFAULT_CHUNK_SIZE,
             help=u'The maximum number of courses each task will generate a course overview for.'
         )
+        parser.add_argument(
+            '--stale-only',
+            action='store_true',
+            default=False,
+            help=u'Only regenerate the missing, outdated and changed course overviews, in this process.'
+        )
+        parser.add_argument(
+            '--processes',
+            action='store',
+            type=int,
+            default=1,
+            help=u'The number of processes regenerating course overviews with --stale-only.'
+        )
         parser.add_argument(
             '--routing-key',
             dest='routing_key',
@@ -62,6 +151,9 @@ class Command(BaseCommand):
         if not options.get('all_courses') and len(args) < 1:
             raise CommandError('At least one course or --all-courses must be specified.')
 
+        if options.get('stale_only'):
+            return self._regenerate_stale(args, options)
+
         kwargs = {}
         for key in ('all_courses', 'force_update', 'chunk_size', 'routing_key'):
             if options.get(key):
@@ -74,3 +166,53 @@ class Command(BaseCommand):
             )
         except InvalidKeyError as exc:
             raise CommandError(u'Invalid Course Key: ' + six.text_type(exc))
+
+    def _regenerate_stale(self, course_ids, options):
+        """
+        Regenerate the stale course overviews, in chunks of courses committed together.
+        """
+        if options.get('all_courses'):
+            course_keys = set(modulestore().get_course_index_last_updates())
+            course_keys.update(CourseOverview.get_all_course_keys())
+            course_keys = sorted(course_keys, key=six.text_type)
+        else:
+            try:
+                course_keys = [CourseKey.from_string(course_id) for course_id in course_ids]
+            except InvalidKeyError as exc:
+                raise CommandError(u'Invalid Course Key: ' + six.text_type(exc))
+
+        stale_course_keys = get_stale_course_keys(course_keys)
+        log.info(u'%d of %d course overviews are stale.', len(stale_course_keys), len(course_keys))
+        course_key_chunks = list(chunks(
+            [six.text_type(course_key) for course_key in stale_course_keys],
+            options.get('chunk_size') or DEFAULT_CHUNK_SIZE
+        ))
+
+        processes = options.get('processes') or 1
+        if processes > 1 and len(course_key_chunks) > 1:
+            # The connections of this process can't be shared with the workers.
+            connections.close_all()
+            pool = Pool(processes, initializer=_init_worker)
+            try:
+                results = pool.map(regenerate_course_overviews, course_key_chunks, chunksize=1)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            results = [regenerate_course_overviews(chunk) for chunk in course_key_chunks]
+
+        summary = {'created': [], 'updated': [], 'failed': []}
+        for result in results:
+            for key, changed_course_ids in six.iteritems(result):
+                summary[key].extend(changed_course_ids)
+        for key in ('created', 'updated', 'failed'):
+            if summary[key]:
+                log.info(u'Course overviews %s: %s', key, u', '.join(summary[key]))
+        log.info(
+            u'Checked %d course overviews: %d up to date, %d created, %d updated, %d failed.',
+            len(course_keys),
+            len(course_keys) - len(stale_course_keys),
+            len(summary['created']),
+            len(summary['updated']),
+            len(summary['failed']),
+        )
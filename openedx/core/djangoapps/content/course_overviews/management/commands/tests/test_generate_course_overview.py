@@ -80,6 +80,34 @@ class TestGenerateCourseOverview(ModuleStoreTestCase):
         self.assertEqual(CourseOverview.get_from_id(self.course_key_1).display_name, updated_course_name)
         self.assertNotEqual(CourseOverview.get_from_id(self.course_key_2).display_name, updated_course_name)
 
+    def test_stale_only(self):
+        """
+        Test that only the overviews of changed courses are regenerated with --stale-only.
+        """
+        self.command.handle(all_courses=True)
+        course = self.store.get_course(self.course_key_1)
+        course.display_name = u'test_generate_course_overview.course_edit'
+        self.store.update_item(course, self.user.id)
+
+        with patch.object(
+            CourseOverview, 'load_from_module_store', wraps=CourseOverview.load_from_module_store
+        ) as mock_load_from_module_store:
+            self.command.handle(all_courses=True, stale_only=True)
+        mock_load_from_module_store.assert_called_once_with(self.course_key_1)
+
+    def test_stale_only_version(self):
+        """
+        Test that missing and outdated overviews are regenerated with --stale-only.
+        """
+        self.command.handle(six.text_type(self.course_key_1), all_courses=False)
+        CourseOverview.objects.filter(id=self.course_key_1).update(version=CourseOverview.VERSION - 1)
+
+        self.command.handle(
+            six.text_type(self.course_key_1), six.text_type(self.course_key_2), all_courses=False, stale_only=True
+        )
+        self._assert_courses_in_overview(self.course_key_1, self.course_key_2)
+        self.assertEqual(CourseOverview.objects.get(id=self.course_key_1).version, CourseOverview.VERSION)
+
     def test_invalid_key(self):
         """
         Test that CommandError is raised for invalid key.
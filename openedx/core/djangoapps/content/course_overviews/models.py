@@ -5,11 +5,13 @@ Declaration of CourseOverview model
 
 import json
 import logging
+import time
 
 import six
 from ccx_keys.locator import CCXLocator
 from config_models.models import ConfigurationModel
 from django.conf import settings
+from django.core.cache import cache
 from django.db import models, transaction
 from django.db.models import Q
 from django.db.models.fields import BooleanField, DateTimeField, DecimalField, FloatField, IntegerField, TextField
@@ -18,6 +20,7 @@ from django.db.utils import IntegrityError
 from django.template import defaultfilters
 from django.utils.encoding import python_2_unicode_compatible
 from django.utils.functional import cached_property
+from edx_django_utils.monitoring import set_custom_metric
 from model_utils.models import TimeStampedModel
 from opaque_keys.edx.django.models import CourseKeyField, UsageKeyField
 from six import text_type  # pylint: disable=ungrouped-imports
@@ -39,6 +42,58 @@ from xmodule.tabs import CourseTab
 
 log = logging.getLogger(__name__)
 
+SHARED_CACHE_KEY = u'course_overview.{}.{}'
+SHARED_CACHE_VERSION_KEY = u'course_overview.version.{}'
+SHARED_CACHE_TIMEOUT = 24 * 60 * 60
+REGENERATION_LOCK_KEY = u'course_overview.regenerating.{}'
+REGENERATION_LOCK_TIMEOUT = 5 * 60
+METRICS_NAMESPACE = u'course_overview.metrics'
+
+
+def shared_cache_enabled():
+    """
+    Returns whether course overviews are read through the django cache.
+    """
+    return settings.FEATURES.get('ENABLE_COURSE_OVERVIEW_SHARED_CACHE', False)
+
+
+def _shared_cache_key(course_id, version):
+    return SHARED_CACHE_KEY.format(course_id, version)
+
+
+def _get_shared_cache_versions(course_ids):
+    """
+    Returns a dict mapping each of the course_ids to the current version of
+    its overview in the django cache, which every save of the overview
+    increments.
+    """
+    version_keys = {SHARED_CACHE_VERSION_KEY.format(course_id): course_id for course_id in course_ids}
+    versions = {
+        version_keys[version_key]: version
+        for version_key, version in six.iteritems(cache.get_many(list(version_keys)))
+    }
+    for version_key, course_id in six.iteritems(version_keys):
+        if course_id not in versions:
+            # Start from the current time rather than from 0, so that overviews cached
+            # under an evicted counter's versions aren't picked up again.
+            version = int(time.time() * 1000)
+            # Another process may have set a version in the meantime; keep theirs if so.
+            if not cache.add(version_key, version, SHARED_CACHE_TIMEOUT):
+                version = cache.get(version_key, version)
+            versions[course_id] = version
+    return versions
+
+
+def _increment_metric(name, count):
+    """
+    Adds `count` to the custom metric `name` of the current request.
+    """
+    if not count:
+        return
+    metrics = RequestCache(METRICS_NAMESPACE).data
+    metrics[name] = metrics.get(name, 0) + count
+    set_custom_metric(name, metrics[name])
+
 
 class CourseOverviewCaseMismatchException(Exception):
     pass
@@ -358,13 +413,16 @@ class CourseOverview(TimeStampedModel):
             - IOError if some other error occurs while trying to load the
                 course from the module store.
         """
-        try:
-            course_overview = cls.objects.select_related('image_set').get(id=course_id)
-            if course_overview.version < cls.VERSION:
-                # Reload the overview from the modulestore to update the version
-                course_overview = cls.load_from_module_store(course_id)
-        except cls.DoesNotExist:
-            course_overview = None
+        if shared_cache_enabled():
+            course_overview = cls._get_shared_overviews([course_id]).get(course_id)
+        else:
+            try:
+                course_overview = cls.objects.select_related('image_set').get(id=course_id)
+                if course_overview.version < cls.VERSION:
+                    # Reload the overview from the modulestore to update the version
+                    course_overview = cls.load_from_module_store(course_id)
+            except cls.DoesNotExist:
+                course_overview = None
 
         # Regenerate the thumbnail images if they're missing (either because
         # they were never generated, or because they were flushed out after
@@ -389,13 +447,16 @@ class CourseOverview(TimeStampedModel):
 
         Returns: dict[CourseKey, CourseOverview|None]
         """
-        overviews = {
-            overview.id: overview
-            for overview in cls.objects.select_related('image_set').filter(
-                id__in=course_ids,
-                version__gte=cls.VERSION
-            )
-        }
+        if shared_cache_enabled():
+            overviews = cls._get_shared_overviews(course_ids)
+        else:
+            overviews = {
+                overview.id: overview
+                for overview in cls.objects.select_related('image_set').filter(
+                    id__in=course_ids,
+                    version__gte=cls.VERSION
+                )
+            }
         for course_id in course_ids:
             if course_id not in overviews:
                 try:
@@ -404,6 +465,71 @@ class CourseOverview(TimeStampedModel):
                     overviews[course_id] = None
         return overviews
 
+    @classmethod
+    def _get_shared_overviews(cls, course_ids):
+        """
+        Return a dict mapping the course_ids of existing CourseOverviews to
+        them, read from the django cache, then from the database with a
+        single query for the ones that aren't cached.
+
+        Cached overviews are keyed on the version of the overview when it was
+        read from the database, so that one read before a save isn't picked
+        up once the save has incremented the version.
+
+        Overviews of a previous version are returned as they are, and their
+        regeneration is queued.
+        """
+        versions = _get_shared_cache_versions(course_ids)
+        cache_keys = {
+            _shared_cache_key(course_id, version): course_id for course_id, version in six.iteritems(versions)
+        }
+        overviews = {
+            cache_keys[cache_key]: overview
+            for cache_key, overview in six.iteritems(cache.get_many(list(cache_keys)))
+        }
+        _increment_metric('course_overview_cache_hits', len(overviews))
+
+        missing_course_ids = [course_id for course_id in course_ids if course_id not in overviews]
+        if missing_course_ids:
+            loaded_overviews = {
+                overview.id: overview
+                for overview in cls.objects.select_related('image_set').filter(id__in=missing_course_ids)
+            }
+            for course_id, overview in six.iteritems(loaded_overviews):
+                # Don't replace an overview cached by another process in the meantime.
+                cache.add(_shared_cache_key(course_id, versions[course_id]), overview, SHARED_CACHE_TIMEOUT)
+            overviews.update(loaded_overviews)
+            _increment_metric('course_overview_cache_misses', len(missing_course_ids))
+
+        stale_course_ids = [
+            course_id for course_id, overview in six.iteritems(overviews) if overview.version < cls.VERSION
+        ]
+        if stale_course_ids:
+            _increment_metric('course_overview_stale_served', len(stale_course_ids))
+            cls._regenerate_later(stale_course_ids)
+        return overviews
+
+    @classmethod
+    def _regenerate_later(cls, course_ids):
+        """
+        Queue the regeneration of the CourseOverviews of the courses from the
+        modulestore, unless it was queued in the last few minutes.
+        """
+        # Imported here as the tasks module imports this one.
+        from openedx.core.djangoapps.content.course_overviews.tasks import async_course_overview_update
+
+        course_ids = [
+            course_id for course_id in course_ids
+            if cache.add(REGENERATION_LOCK_KEY.format(course_id), True, REGENERATION_LOCK_TIMEOUT)
+        ]
+        if course_ids:
+            log.info(u'Queueing the regeneration of the CourseOverviews of %d courses.', len(course_ids))
+            async_course_overview_update.delay(
+                *[six.text_type(course_id) for course_id in course_ids],
+                force_update=True
+            )
+            _increment_metric('course_overview_regenerations_queued', len(course_ids))
+
     def clean_id(self, padding_char='='):
         """
         Returns a unique deterministic base32-encoded ID for the course.
@@ -1089,6 +1215,30 @@ def _invalidate_overview_cache(**kwargs):  # pylint: disable=unused-argument
     RequestCache('course_overview').clear()
 
 
+def _invalidate_shared_overview_cache(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Increment the version of the overview of the course in the django cache,
+    now and again once the current transaction commits so that an overview
+    read by another process before the commit isn't kept.
+    """
+    course_id = instance.id if isinstance(instance, CourseOverview) else instance.course_overview_id
+    version_key = SHARED_CACHE_VERSION_KEY.format(course_id)
+
+    def increment_version():
+        try:
+            cache.incr(version_key)
+        except ValueError:
+            # No version yet, the next read starts a new one.
+            pass
+
+    increment_version()
+    transaction.on_commit(increment_version)
+
+
+post_save.connect(_invalidate_shared_overview_cache, sender=CourseOverview)
+post_save.connect(_invalidate_shared_overview_cache, sender=CourseOverviewImageSet)
+post_delete.connect(_invalidate_shared_overview_cache, sender=CourseOverview)
+post_delete.connect(_invalidate_shared_overview_cache, sender=CourseOverviewImageSet)
 post_save.connect(_invalidate_overview_cache, sender=CourseOverview)
 post_save.connect(_invalidate_overview_cache, sender=CourseOverviewImageConfig)
 post_delete.connect(_invalidate_overview_cache, sender=CourseOverview)
@@ -13,9 +13,11 @@ import mock
 import pytz
 import six
 from django.conf import settings
+from django.core.cache import cache
 from django.db.utils import IntegrityError
 from django.test.utils import override_settings
 from django.utils import timezone
+from edx_django_utils.cache import RequestCache
 from opaque_keys.edx.keys import CourseKey
 from PIL import Image
 from six.moves import range  # pylint: disable=ungrouped-imports
@@ -42,7 +44,13 @@ from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory, check_mongo_calls_range
 
-from ..models import CourseOverview, CourseOverviewImageConfig, CourseOverviewImageSet
+from ..models import (
+    CourseOverview,
+    CourseOverviewImageConfig,
+    CourseOverviewImageSet,
+    _get_shared_cache_versions,
+    _shared_cache_key
+)
 from .factories import CourseOverviewFactory
 
 
@@ -595,6 +603,61 @@ class CourseOverviewTestCase(CatalogIntegrationMixin, ModuleStoreTestCase, Cache
         assert mock_load_from_modulestore.call_count == 3
 
 
+@mock.patch.dict('django.conf.settings.FEATURES', {'ENABLE_COURSE_OVERVIEW_SHARED_CACHE': True})
+class CourseOverviewSharedCacheTestCase(ModuleStoreTestCase):
+    """
+    Tests for reading CourseOverviews through the django cache.
+    """
+    def setUp(self):
+        super(CourseOverviewSharedCacheTestCase, self).setUp()
+        self.course_ids = [CourseFactory.create(emit_signals=True).id for __ in range(3)]
+        cache.clear()
+        RequestCache.clear_all_namespaces()
+
+    def test_multi_get(self):
+        with self.assertNumQueries(1):
+            overviews = CourseOverview.get_from_ids(self.course_ids)
+        self.assertEqual(set(overviews), set(self.course_ids))
+
+        RequestCache.clear_all_namespaces()
+        with self.assertNumQueries(0):
+            self.assertEqual(CourseOverview.get_from_ids(self.course_ids), overviews)
+            self.assertEqual(CourseOverview.get_from_id(self.course_ids[0]), overviews[self.course_ids[0]])
+
+    def test_invalidated_on_save(self):
+        overview = CourseOverview.get_from_id(self.course_ids[0])
+        overview.display_name = u'Updated'
+        overview.save()
+        RequestCache.clear_all_namespaces()
+        self.assertEqual(CourseOverview.get_from_id(self.course_ids[0]).display_name, u'Updated')
+
+    def test_overview_read_before_save_not_kept(self):
+        stale_overview = CourseOverview.objects.get(id=self.course_ids[0])
+        version = _get_shared_cache_versions([self.course_ids[0]])[self.course_ids[0]]
+        overview = CourseOverview.objects.get(id=self.course_ids[0])
+        overview.display_name = u'Updated'
+        overview.save()
+        # Cached by a process that read the overview before it was saved.
+        cache.add(_shared_cache_key(self.course_ids[0], version), stale_overview)
+        RequestCache.clear_all_namespaces()
+        self.assertEqual(CourseOverview.get_from_id(self.course_ids[0]).display_name, u'Updated')
+
+    def test_stale_overview_served_while_regenerated(self):
+        # Updated without signals, as by a deployment of a new CourseOverview version.
+        CourseOverview.objects.filter(id=self.course_ids[0]).update(version=CourseOverview.VERSION - 1)
+        with mock.patch.object(CourseOverview, 'load_from_module_store') as mock_load_from_module_store:
+            with mock.patch(
+                'openedx.core.djangoapps.content.course_overviews.tasks.async_course_overview_update.delay'
+            ) as mock_update:
+                overview = CourseOverview.get_from_id(self.course_ids[0])
+                RequestCache.clear_all_namespaces()
+                CourseOverview.get_from_ids(self.course_ids)
+
+        self.assertEqual(overview.version, CourseOverview.VERSION - 1)
+        mock_load_from_module_store.assert_not_called()
+        mock_update.assert_called_once_with(six.text_type(self.course_ids[0]), force_update=True)
+
+
 @ddt.ddt
 class CourseOverviewImageSetTestCase(ModuleStoreTestCase):
     """
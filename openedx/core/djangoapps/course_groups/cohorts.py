@@ -4,14 +4,16 @@ forums, and to the cohort admin views.
 """
 
 
+import hashlib
 import logging
 import random
 
 import six
+from django.conf import settings
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
 from django.core.validators import validate_email
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
 from django.db.models.signals import m2m_changed, post_save
 from django.dispatch import receiver
 from django.http import Http404
@@ -21,7 +23,7 @@ from eventtracking import tracker
 
 from lms.djangoapps.courseware import courses
 from openedx.core.lib.cache_utils import request_cached
-from student.models import get_user_by_username_or_email
+from student.models import CourseEnrollment, get_user_by_username_or_email
 
 from .models import (
     CohortMembership,
@@ -117,6 +119,26 @@ def local_random():
     return _local_random
 
 
+def hashed_cohort_assignment_enabled():
+    """
+    Returns whether learners are assigned random cohorts by hashing them,
+    without locking their cohort membership rows.
+    """
+    return settings.FEATURES.get('ENABLE_HASHED_COHORT_ASSIGNMENT', False)
+
+
+def _hashed_cohort(cohorts, user_id, course_key):
+    """
+    Returns the cohort of `cohorts` that the user is hashed to in the course.
+
+    The same cohort is returned for the user for as long as the cohorts of
+    the course don't change, and learners are spread evenly among them.
+    """
+    cohorts = sorted(cohorts, key=lambda cohort: cohort.id)
+    digest = hashlib.md5(u'{}:{}'.format(course_key, user_id).encode('utf-8')).hexdigest()
+    return cohorts[int(digest, 16) % len(cohorts)]
+
+
 def is_course_cohorted(course_key):
     """
     Given a course key, return a boolean for whether or not the course is
@@ -256,8 +278,12 @@ def get_cohort(user, course_key, assign=True, use_cached=False):
             assignment.delete()
             break
         else:
-            course_user_group = get_random_cohort(course_key)
-        add_user_to_cohort(course_user_group, user)
+            course_user_group = get_random_cohort(course_key, user)
+        if hashed_cohort_assignment_enabled():
+            CohortMembership.assign_new(course_user_group, user)
+            _cohort_assigned(user, course_user_group)
+        else:
+            add_user_to_cohort(course_user_group, user)
         return course_user_group
     except ValueError:
         # user already in cohort
@@ -273,16 +299,22 @@ def get_cohort(user, course_key, assign=True, use_cached=False):
         return get_cohort(user, course_key, assign, use_cached)
 
 
-def get_random_cohort(course_key):
+def get_random_cohort(course_key, user=None):
     """
     Helper method to get a cohort for random assignment.
 
     If there are multiple cohorts of type RANDOM in the course, one of them will be randomly selected.
     If there are no existing cohorts of type RANDOM in the course, one will be created.
+
+    If the user being assigned is given and hashed cohort assignment is
+    enabled, the cohort the user is hashed to is selected, so that retries
+    after a concurrent assignment pick the same cohort.
     """
     course = courses.get_course(course_key)
     cohorts = get_course_cohorts(course, assignment_type=CourseCohort.RANDOM)
-    if cohorts:
+    if cohorts and user is not None and hashed_cohort_assignment_enabled():
+        cohort = _hashed_cohort(cohorts, user.id, course_key)
+    elif cohorts:
         cohort = local_random().choice(cohorts)
     else:
         cohort = CourseCohort.create(
@@ -293,6 +325,101 @@ def get_random_cohort(course_key):
     return cohort
 
 
+def bulk_assign_cohorts(course_key, batch_size=1000):
+    """
+    Assigns a cohort to each of the learners enrolled in the course who
+    don't have one yet, as get_cohort would on their first visit to the
+    course, with a few queries per batch of `batch_size` learners.
+
+    Learners pre-registered in a cohort are added to it; the others are
+    assigned the random cohort they are hashed to.  Assigning the learners
+    of a course before it starts spares the courseware from assigning
+    thousands of them at once.
+
+    Returns the number of learners assigned a cohort.
+    """
+    if not is_course_cohorted(course_key):
+        return 0
+
+    course = courses.get_course(course_key)
+    random_cohorts = get_course_cohorts(course, assignment_type=CourseCohort.RANDOM)
+    if not random_cohorts:
+        random_cohorts = [get_random_cohort(course_key)]
+
+    preassignments = {}
+    for assignment in UnregisteredLearnerCohortAssignments.objects.filter(
+            course_id=course_key
+    ).select_related('course_user_group'):
+        preassignments.setdefault(assignment.email, assignment)
+
+    unassigned_users = CourseEnrollment.objects.users_enrolled_in(course_key).exclude(
+        id__in=CohortMembership.objects.filter(course_id=course_key).values('user_id')
+    ).order_by('id')
+
+    assigned_count = 0
+    last_user_id = 0
+    while True:
+        users = list(unassigned_users.filter(id__gt=last_user_id)[:batch_size])
+        if not users:
+            break
+        last_user_id = users[-1].id
+        assigned_count += _bulk_add_users_to_cohorts(course_key, users, random_cohorts, preassignments)
+    return assigned_count
+
+
+def _bulk_add_users_to_cohorts(course_key, users, random_cohorts, preassignments):
+    """
+    Adds the users, who have no cohort in the course, to their cohorts with
+    bulk inserts, and returns the number of users added.
+
+    If some of them were assigned a cohort in the meantime, the others are
+    assigned one at a time by get_cohort.
+    """
+    cohorts_by_user = []
+    used_preassignment_ids = []
+    for user in users:
+        assignment = preassignments.get(user.email)
+        if assignment is not None:
+            cohorts_by_user.append((user, assignment.course_user_group))
+            used_preassignment_ids.append(assignment.id)
+        else:
+            cohorts_by_user.append((user, _hashed_cohort(random_cohorts, user.id, course_key)))
+
+    try:
+        with transaction.atomic():
+            CohortMembership.objects.bulk_create([
+                CohortMembership(course_user_group=cohort, user=user, course_id=course_key)
+                for user, cohort in cohorts_by_user
+            ])
+            CourseUserGroup.users.through.objects.bulk_create([
+                CourseUserGroup.users.through(courseusergroup_id=cohort.id, user_id=user.id)
+                for user, cohort in cohorts_by_user
+            ])
+            UnregisteredLearnerCohortAssignments.objects.filter(id__in=used_preassignment_ids).delete()
+    except IntegrityError:
+        log.info(
+            u"Learners of course '%s' were assigned cohorts during their bulk assignment; "
+            u"assigning the others one at a time.",
+            course_key
+        )
+        assigned_user_ids = set(
+            CohortMembership.objects.filter(user__in=users, course_id=course_key).values_list('user_id', flat=True)
+        )
+        unassigned_users = [user for user in users if user.id not in assigned_user_ids]
+        for user in unassigned_users:
+            get_cohort(user, course_key)
+        return len(unassigned_users)
+
+    for user, cohort in cohorts_by_user:
+        # Emit the event that adding the user to the cohort's users would have.
+        tracker.emit(
+            "edx.cohort.user_added",
+            {"cohort_id": cohort.id, "cohort_name": cohort.name, "user_id": user.id}
+        )
+        _cohort_assigned(user, cohort, cache=False)
+    return len(cohorts_by_user)
+
+
 def migrate_cohort_settings(course):
     """
     Migrate all the cohort settings associated with this course from modulestore to mysql.
@@ -462,20 +589,7 @@ def add_user_to_cohort(cohort, username_or_email_or_user):
             user = get_user_by_username_or_email(username_or_email_or_user)
 
         membership, previous_cohort = CohortMembership.assign(cohort, user)
-        tracker.emit(
-            "edx.cohort.user_add_requested",
-            {
-                "user_id": user.id,
-                "cohort_id": cohort.id,
-                "cohort_name": cohort.name,
-                "previous_cohort_id": getattr(previous_cohort, 'id', None),
-                "previous_cohort_name": getattr(previous_cohort, 'name', None),
-            }
-        )
-        cache = RequestCache(COHORT_CACHE_NAMESPACE).data
-        cache_key = _cohort_cache_key(user.id, membership.course_id)
-        cache[cache_key] = membership.course_user_group
-        COHORT_MEMBERSHIP_UPDATED.send(sender=None, user=user, course_key=membership.course_id)
+        _cohort_assigned(user, membership.course_user_group, previous_cohort)
         return user, getattr(previous_cohort, 'name', None), False
     except User.DoesNotExist as ex:
         # If username_or_email is an email address, store in database.
@@ -510,6 +624,28 @@ def add_user_to_cohort(cohort, username_or_email_or_user):
                 raise ex
 
 
+def _cohort_assigned(user, cohort, previous_cohort=None, cache=True):
+    """
+    Emits the event of the user being added to the cohort, caches their new
+    cohort unless `cache` is False, and notifies the receivers of
+    COHORT_MEMBERSHIP_UPDATED.
+    """
+    tracker.emit(
+        "edx.cohort.user_add_requested",
+        {
+            "user_id": user.id,
+            "cohort_id": cohort.id,
+            "cohort_name": cohort.name,
+            "previous_cohort_id": getattr(previous_cohort, 'id', None),
+            "previous_cohort_name": getattr(previous_cohort, 'name', None),
+        }
+    )
+    course_key = cohort.course_id
+    if cache:
+        RequestCache(COHORT_CACHE_NAMESPACE).data[_cohort_cache_key(user.id, course_key)] = cohort
+    COHORT_MEMBERSHIP_UPDATED.send(sender=None, user=user, course_key=course_key)
+
+
 def get_group_info_for_cohort(cohort, use_cached=False):
     """
     Get the ids of the group and partition to which this cohort has been linked
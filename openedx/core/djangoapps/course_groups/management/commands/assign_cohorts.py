@@ -0,0 +1,52 @@
+"""
+Management command to assign cohorts to the learners of courses who don't have one yet.
+"""
+
+
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
+
+from openedx.core.djangoapps.course_groups.cohorts import bulk_assign_cohorts
+
+log = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    Assign cohorts to the enrolled learners of courses who don't have one yet.
+    """
+    help = """
+    Assigns a cohort to each of the learners enrolled in the given cohorted
+    courses who don't have one yet, as they would be assigned on their first
+    visit to the course.  Run it before a course starts so that learners
+    don't have to be assigned cohorts while they all arrive at once.
+
+    example:
+        manage.py lms assign_cohorts course-v1:edX+DemoX+Demo_Course --batch-size 500
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'course_keys',
+            nargs='+',
+            help='Keys of the courses whose learners to assign cohorts'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of learners assigned cohorts with each set of inserts'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            course_keys = [CourseKey.from_string(course_key) for course_key in options['course_keys']]
+        except InvalidKeyError as error:
+            raise CommandError(u'Invalid course key: {}'.format(error))
+
+        for course_key in course_keys:
+            assigned_count = bulk_assign_cohorts(course_key, batch_size=options['batch_size'])
+            log.info(u'Assigned cohorts to %d learners of course %s', assigned_count, course_key)
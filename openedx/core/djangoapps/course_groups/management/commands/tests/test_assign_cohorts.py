@@ -0,0 +1,37 @@
+"""
+Tests for the assign_cohorts management command.
+"""
+
+
+import six
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from openedx.core.djangoapps.course_groups.cohorts import get_cohort
+from openedx.core.djangoapps.course_groups.tests.helpers import config_course_cohorts
+from student.models import CourseEnrollment
+from student.tests.factories import UserFactory
+from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
+from xmodule.modulestore.tests.factories import CourseFactory
+
+
+class AssignCohortsTest(ModuleStoreTestCase):
+    """
+    Tests for the assign_cohorts management command.
+    """
+    def setUp(self):
+        super(AssignCohortsTest, self).setUp()
+        self.course = CourseFactory.create()
+        config_course_cohorts(self.course, is_cohorted=True, auto_cohorts=["AutoGroup"])
+        self.users = [UserFactory.create() for __ in range(3)]
+        for user in self.users:
+            CourseEnrollment.enroll(user, self.course.id)
+
+    def test_assign_cohorts(self):
+        call_command('assign_cohorts', six.text_type(self.course.id), '--batch-size', '2')
+        for user in self.users:
+            self.assertEqual(get_cohort(user, self.course.id, assign=False).name, "AutoGroup")
+
+    def test_invalid_course_key(self):
+        with self.assertRaises(CommandError):
+            call_command('assign_cohorts', 'invalid-course-key')
@@ -127,6 +127,22 @@ class CohortMembership(models.Model):
                 membership.save()
         return membership, previous_cohort
 
+    @classmethod
+    def assign_new(cls, cohort, user):
+        """
+        Assign a user who has no cohort in the course to the cohort.
+
+        Unlike assign, no row is locked, so learners assigned at the same
+        time don't wait on each other; an IntegrityError is raised if the
+        user was assigned a cohort in the course in the meantime.
+        Returns the CohortMembership.
+        """
+        with transaction.atomic():
+            membership = cls(course_user_group=cohort, user=user, course_id=cohort.course_id)
+            membership.save(force_insert=True)
+            cohort.users.add(user)
+        return membership
+
     def save(self, force_insert=False, force_update=False, using=None, update_fields=None):
         self.full_clean(validate_unique=False)
 
@@ -22,7 +22,13 @@ from xmodule.modulestore.tests.django_utils import TEST_DATA_MIXED_MODULESTORE,
 from xmodule.modulestore.tests.factories import ToyCourseFactory
 
 from .. import cohorts
-from ..models import CourseCohort, CourseUserGroup, CourseUserGroupPartitionGroup, UnregisteredLearnerCohortAssignments
+from ..models import (
+    CohortMembership,
+    CourseCohort,
+    CourseUserGroup,
+    CourseUserGroupPartitionGroup,
+    UnregisteredLearnerCohortAssignments
+)
 from ..tests.helpers import CohortFactory, CourseCohortFactory, config_course_cohorts, config_course_cohorts_legacy
 
 
@@ -510,6 +516,86 @@ class TestCohorts(ModuleStoreTestCase):
             self.assertGreater(num_users, 1)
             self.assertLess(num_users, 50)
 
+    @patch.dict('django.conf.settings.FEATURES', {'ENABLE_HASHED_COHORT_ASSIGNMENT': True})
+    def test_hashed_cohort_assignment(self):
+        """
+        Make sure cohorts.get_cohort() spreads users among the random cohorts
+        they are hashed to when hashed assignment is enabled.
+        """
+        course = modulestore().get_course(self.toy_course_key)
+        groups = ["group_{0}".format(n) for n in range(5)]
+        config_course_cohorts(course, is_cohorted=True, auto_cohorts=groups)
+
+        for i in range(100):
+            user = UserFactory(username="test_{0}".format(i), email="a@b{0}.com".format(i))
+            cohort = cohorts.get_cohort(user, course.id)
+            self.assertEqual(cohort, cohorts.get_random_cohort(course.id, user))
+            self.assertEqual(cohorts.get_cohort(user, course.id, use_cached=False), cohort)
+
+        for cohort_name in groups:
+            num_users = cohorts.get_cohort_by_name(course.id, cohort_name).users.count()
+            self.assertGreater(num_users, 1)
+            self.assertLess(num_users, 50)
+
+    @patch.dict('django.conf.settings.FEATURES', {'ENABLE_HASHED_COHORT_ASSIGNMENT': True})
+    def test_hashed_cohort_assignment_concurrent(self):
+        """
+        Make sure cohorts.get_cohort() returns the cohort a user was assigned
+        by another worker while it was assigning one.
+        """
+        course = modulestore().get_course(self.toy_course_key)
+        config_course_cohorts(course, is_cohorted=True, auto_cohorts=["AutoGroup"])
+        user = UserFactory(username="test", email="a@b.com")
+        other_cohort = CohortFactory(course_id=course.id, name="OtherCohort")
+
+        def assign_concurrently(cohort, user):
+            """Assign the user to another cohort before failing as a concurrent assignment would."""
+            CohortMembership.assign(other_cohort, user)
+            raise IntegrityError("Duplicate entry")
+
+        with patch.object(CohortMembership, 'assign_new', side_effect=assign_concurrently):
+            self.assertEqual(cohorts.get_cohort(user, course.id), other_cohort)
+
+    def test_bulk_assign_cohorts(self):
+        """
+        Make sure cohorts.bulk_assign_cohorts() assigns the enrolled users
+        without a cohort as cohorts.get_cohort() would.
+        """
+        course = modulestore().get_course(self.toy_course_key)
+        groups = ["group_{0}".format(n) for n in range(3)]
+        config_course_cohorts(course, is_cohorted=True, auto_cohorts=groups)
+        manual_cohort = CohortFactory(course_id=course.id, name="ManualCohort")
+
+        users = [UserFactory(username="test_{0}".format(i), email="a@b{0}.com".format(i)) for i in range(7)]
+        for user in users[:6]:
+            CourseEnrollment.enroll(user, course.id)
+        cohorts.add_user_to_cohort(manual_cohort, users[0])
+        cohorts.add_user_to_cohort(manual_cohort, "preassigned@example.com")
+        preassigned_user = UserFactory(username="preassigned", email="preassigned@example.com")
+        CourseEnrollment.enroll(preassigned_user, course.id)
+
+        self.assertEqual(cohorts.bulk_assign_cohorts(course.id, batch_size=2), 6)
+        self.assertEqual(cohorts.bulk_assign_cohorts(course.id, batch_size=2), 0)
+
+        with patch.dict('django.conf.settings.FEATURES', {'ENABLE_HASHED_COHORT_ASSIGNMENT': True}):
+            for user in users[1:6]:
+                cohort = cohorts.get_cohort(user, course.id, assign=False)
+                self.assertEqual(cohort, cohorts.get_random_cohort(course.id, user))
+                self.assertIn(user, cohort.users.all())
+        self.assertEqual(cohorts.get_cohort(users[0], course.id, assign=False), manual_cohort)
+        self.assertEqual(cohorts.get_cohort(preassigned_user, course.id, assign=False), manual_cohort)
+        self.assertIsNone(cohorts.get_cohort(users[6], course.id, assign=False))
+        self.assertFalse(UnregisteredLearnerCohortAssignments.objects.filter(course_id=course.id).exists())
+
+    def test_bulk_assign_cohorts_not_cohorted(self):
+        """
+        Make sure cohorts.bulk_assign_cohorts() assigns no cohorts in courses that aren't cohorted.
+        """
+        user = UserFactory(username="test", email="a@b.com")
+        CourseEnrollment.enroll(user, self.toy_course_key)
+        self.assertEqual(cohorts.bulk_assign_cohorts(self.toy_course_key), 0)
+        self.assertFalse(CohortMembership.objects.filter(course_id=self.toy_course_key).exists())
+
     def test_get_course_cohorts_noop(self):
         """
         Tests get_course_cohorts returns an empty list when no cohorts exist.
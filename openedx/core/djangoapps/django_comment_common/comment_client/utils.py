@@ -3,16 +3,35 @@
 
 
 import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from uuid import uuid4
 
 import requests
 import six
+from django.conf import settings
+from django.db import connections
+from django.utils import translation
 from django.utils.translation import get_language
+from edx_django_utils.cache import RequestCache
+from edx_django_utils.monitoring import set_custom_metric
+from requests.adapters import HTTPAdapter
 
 from .settings import SERVICE_HOST as COMMENTS_SERVICE
 
 log = logging.getLogger(__name__)
 
+REQUEST_CACHE_NAMESPACE = 'comment_client'
+
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+# The call context of the request, for the threads of perform_in_parallel.
+_fanout_local = threading.local()
+
 
 def strip_none(dic):
     return dict([(k, v) for k, v in six.iteritems(dic) if v is not None])
@@ -31,11 +50,140 @@ def extract(dic, keys):
         return strip_none({k: dic.get(k) for k in keys})
 
 
-def perform_request(method, url, data_or_params=None, raw=False,
-                    metric_action=None, metric_tags=None, paged_results=False):
+def sessions_enabled():
+    """
+    Returns whether requests to the comments service go through the pooled
+    session, and whether perform_in_parallel makes its calls concurrently.
+    """
+    return settings.FEATURES.get('ENABLE_COMMENTS_SERVICE_SESSIONS', False)
+
+
+def get_session():
+    """
+    Returns the requests session shared by the threads of this process, whose
+    pool keeps up to COMMENTS_SERVICE_POOL_SIZE connections to the comments
+    service alive between requests.
+
+    The pid is checked so that worker processes forked after the session was
+    created don't share its sockets with their parent.
+    """
+    global _session, _session_pid  # pylint: disable=global-statement
+    if _session is not None and _session_pid == os.getpid():
+        return _session
+    with _session_lock:
+        if _session is None or _session_pid != os.getpid():
+            pool_size = getattr(settings, 'COMMENTS_SERVICE_POOL_SIZE', 10)
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+            session = requests.Session()
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _session, _session_pid = session, os.getpid()
+    return _session
+
+
+def _connections_opened(url):
+    """
+    Returns the number of connections the session has opened so far to the
+    host of `url`.
+    """
+    adapter = get_session().get_adapter(url)
+    return adapter.poolmanager.connection_from_url(url).num_connections
+
+
+class _CallContext(object):
+    """
+    The forums configuration read for a request, and the counters behind the
+    metrics of its comments service calls.
+    """
+    def __init__(self, config):
+        self.config = config
+        self.requests = 0
+        self.connections_opened = 0
+        self.fanout_count = 0
+        self.fanout_seconds = 0.0
+
+    def report(self):
+        """Sets the custom metrics of the calls made so far."""
+        set_custom_metric('comment_client_requests', self.requests)
+        set_custom_metric('comment_client_connections_opened', self.connections_opened)
+        set_custom_metric('comment_client_connections_reused', max(self.requests - self.connections_opened, 0))
+        if self.fanout_count:
+            set_custom_metric('comment_client_fanout_count', self.fanout_count)
+            set_custom_metric('comment_client_fanout_seconds', round(self.fanout_seconds, 3))
+
+
+def _get_call_context():
+    """
+    Returns the _CallContext of the current request, or None when sessions
+    aren't enabled.
+
+    Threads started by perform_in_parallel use the context of the request that
+    started them, so the forums configuration is read once per request.
+    """
+    if not sessions_enabled():
+        return None
+
+    context = getattr(_fanout_local, 'context', None)
+    if context is not None:
+        return context
+    request_cache = RequestCache(REQUEST_CACHE_NAMESPACE)
+    cached_response = request_cache.get_cached_response('context')
+    if cached_response.is_found:
+        return cached_response.value
     # To avoid dependency conflict
     from openedx.core.djangoapps.django_comment_common.models import ForumsConfig
-    config = ForumsConfig.current()
+    context = _CallContext(ForumsConfig.current())
+    request_cache.set('context', context)
+    return context
+
+
+def perform_in_parallel(*functions):
+    """
+    Calls each of the given functions, which take no arguments and would each
+    make requests to the comments service, and returns their results in the
+    same order.
+
+    With sessions enabled, the functions are called concurrently, each from
+    its own thread, and the first exception raised by one of them is raised
+    once all of them are done.  Otherwise they are called one after the other.
+    """
+    if len(functions) < 2 or not sessions_enabled():
+        return [function() for function in functions]
+
+    context = _get_call_context()
+    language = get_language()
+
+    def call(function):
+        _fanout_local.context = context
+        try:
+            with translation.override(language):
+                return function()
+        finally:
+            _fanout_local.context = None
+            # Threads of the pool don't go through the request cycle that
+            # would close their database connections.
+            connections.close_all()
+
+    start = time.time()
+    with ThreadPoolExecutor(max_workers=len(functions)) as executor:
+        futures = [executor.submit(call, function) for function in functions]
+    context.fanout_count += 1
+    context.fanout_seconds += time.time() - start
+    # Metrics set from the threads of the pool would be lost.
+    context.report()
+
+    return [future.result() for future in futures]
+
+
+def perform_request(method, url, data_or_params=None, raw=False,
+                    metric_action=None, metric_tags=None, paged_results=False):
+    context = _get_call_context()
+    if context is None:
+        # To avoid dependency conflict
+        from openedx.core.djangoapps.django_comment_common.models import ForumsConfig
+        config = ForumsConfig.current()
+    else:
+        config = context.config
 
     if not config.enabled:
         raise CommentClientMaintenanceError('service disabled')
@@ -63,14 +211,31 @@ def perform_request(method, url, data_or_params=None, raw=False,
         data = None
         params = data_or_params.copy()
         params.update(request_id_dict)
-    response = requests.request(
-        method,
-        url,
-        data=data,
-        params=params,
-        headers=headers,
-        timeout=config.connection_timeout
-    )
+    if context is None:
+        response = requests.request(
+            method,
+            url,
+            data=data,
+            params=params,
+            headers=headers,
+            timeout=config.connection_timeout
+        )
+    else:
+        # Under perform_in_parallel, connections opened by the other threads
+        # may be counted too, so the counters are approximate.
+        connections_before = _connections_opened(url)
+        response = get_session().request(
+            method,
+            url,
+            data=data,
+            params=params,
+            headers=headers,
+            timeout=config.connection_timeout
+        )
+        context.requests += 1
+        context.connections_opened += _connections_opened(url) - connections_before
+        if getattr(_fanout_local, 'context', None) is None:
+            context.report()
 
     metric_tags.append(u'status_code:{}'.format(response.status_code))
     status_code = int(response.status_code)
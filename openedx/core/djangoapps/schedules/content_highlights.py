@@ -5,6 +5,9 @@ schedule experience built on the Schedules app.
 
 
 import logging
+from datetime import datetime
+
+from pytz import utc
 
 from openedx.core.djangoapps.course_date_signals.utils import spaced_out_sections
 from openedx.core.djangoapps.schedules.config import COURSE_UPDATE_WAFFLE_FLAG
@@ -82,6 +85,71 @@ def get_next_section_highlights(user, course_key, start_date, target_date):
     return highlights
 
 
+class CourseHighlights(object):
+    """
+    The highlights of a course, read from the modulestore once to be given
+    to many of its learners.
+
+    When every learner sees all of the sections of the course, the sections
+    with highlights are found once for all of them, rather than by binding
+    the course to each learner.
+
+    Raises:
+        CourseUpdateDoesNotExist: if highlights are disabled for the course.
+    """
+    def __init__(self, course_key):
+        self.course_key = course_key
+        self.course_descriptor = _get_course_with_highlights(course_key)
+        sections = self.course_descriptor.get_children()
+        if self.course_descriptor.entrance_exam_enabled or any(map(_section_access_varies, sections)):
+            self._sections_with_highlights = None
+        else:
+            self._sections_with_highlights = list(filter(_section_has_highlights, sections))
+        self._spaced_out_sections = None
+
+    def get_week_highlights(self, user, week_num):
+        """
+        Returns the highlights of the user for a given week, as get_week_highlights does.
+        """
+        __, sections_with_highlights = self._get_course_and_sections(user)
+        return _get_highlights_for_week(sections_with_highlights, week_num, self.course_key)
+
+    def get_next_section_highlights(self, user, start_date, target_date):
+        """
+        Returns the highlights of the user and the week number of the next
+        section, as get_next_section_highlights does.
+        """
+        course, sections_with_highlights = self._get_course_and_sections(user)
+        if course is not self.course_descriptor:
+            return _get_highlights_for_next_section(course, sections_with_highlights, start_date, target_date)
+        if self._spaced_out_sections is None:
+            self._spaced_out_sections = list(spaced_out_sections(course))
+        return _get_highlights_for_next_section(
+            course, sections_with_highlights, start_date, target_date, self._spaced_out_sections
+        )
+
+    def _get_course_and_sections(self, user):
+        """
+        Returns the course as seen by the user, and its sections with highlights.
+        """
+        if self._sections_with_highlights is not None:
+            return self.course_descriptor, self._sections_with_highlights
+        course_module = _get_course_module(self.course_descriptor, user)
+        return course_module, _get_sections_with_highlights(course_module)
+
+
+def _section_access_varies(section):
+    """
+    Returns whether some learners may not see the section, so that the
+    sections of their course are not those of other learners.
+    """
+    return bool(
+        section.visible_to_staff_only or
+        section.group_access or
+        (section.start is not None and section.start > datetime.now(utc))
+    )
+
+
 def _get_course_with_highlights(course_key):
     # pylint: disable=missing-docstring
     if not COURSE_UPDATE_WAFFLE_FLAG.is_enabled(course_key):
@@ -151,8 +219,10 @@ def _get_highlights_for_week(sections, week_num, course_key):
     return section.highlights
 
 
-def _get_highlights_for_next_section(course_module, sections, start_date, target_date):
-    for index, section, weeks_to_complete in spaced_out_sections(course_module):
+def _get_highlights_for_next_section(course_module, sections, start_date, target_date, course_sections=None):
+    if course_sections is None:
+        course_sections = spaced_out_sections(course_module)
+    for index, section, weeks_to_complete in course_sections:
         if not _section_has_highlights(section):
             continue
 
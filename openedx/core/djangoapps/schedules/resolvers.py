@@ -19,8 +19,15 @@ from opaque_keys.edx.keys import CourseKey
 from lms.djangoapps.courseware.utils import verified_upgrade_deadline_link, can_show_verified_upgrade
 from lms.djangoapps.discussion.notification_prefs.views import UsernameCipher
 from openedx.core.djangoapps.ace_common.template_context import get_base_template_context
-from openedx.core.djangoapps.schedules.config import COURSE_UPDATE_SHOW_UNSUBSCRIBE_WAFFLE_SWITCH
-from openedx.core.djangoapps.schedules.content_highlights import get_week_highlights, get_next_section_highlights
+from openedx.core.djangoapps.schedules.config import (
+    BATCH_CONTEXT_WAFFLE_SWITCH,
+    COURSE_UPDATE_SHOW_UNSUBSCRIBE_WAFFLE_SWITCH
+)
+from openedx.core.djangoapps.schedules.content_highlights import (
+    CourseHighlights,
+    get_next_section_highlights,
+    get_week_highlights
+)
 from openedx.core.djangoapps.schedules.exceptions import CourseUpdateDoesNotExist
 from openedx.core.djangoapps.schedules.message_types import CourseUpdate, InstructorLedCourseUpdate
 from openedx.core.djangoapps.schedules.models import Schedule, ScheduleExperience
@@ -28,6 +35,7 @@ from openedx.core.djangoapps.schedules.utils import PrefixedDebugLoggerMixin
 from openedx.core.djangoapps.site_configuration.models import SiteConfiguration
 from openedx.core.djangolib.translation_utils import translate_date
 from openedx.features.course_experience import course_home_url_name
+from xmodule.modulestore.django import modulestore
 
 LOG = logging.getLogger(__name__)
 
@@ -82,6 +90,7 @@ class BinnedSchedulesBaseResolver(PrefixedDebugLoggerMixin, RecipientResolver):
     def __attrs_post_init__(self):
         # TODO: in the next refactor of this task, pass in current_datetime instead of reproducing it here
         self.current_datetime = self.target_datetime - datetime.timedelta(days=self.day_offset)
+        self.course_context = CourseContextCache()
 
     def send(self, msg_type):
         for (user, language, context) in self.schedules_for_bin():
@@ -262,11 +271,11 @@ class RecurringNudgeResolver(BinnedSchedulesBaseResolver):
             raise InvalidContextError
         context = {
             'course_name': first_schedule.enrollment.course.display_name,
-            'course_url': _get_trackable_course_home_url(first_schedule.enrollment.course_id),
+            'course_url': self.course_context.get_course_url(first_schedule.enrollment.course_id),
         }
 
         # Information for including upsell messaging in template.
-        context.update(_get_upsell_information_for_schedule(user, first_schedule))
+        context.update(self.course_context.get_upsell_information(user, first_schedule))
 
         return context
 
@@ -296,7 +305,7 @@ class UpgradeReminderResolver(BinnedSchedulesBaseResolver):
                 # We don't want to include instructor led courses in this email
                 continue
 
-            upsell_context = _get_upsell_information_for_schedule(user, schedule)
+            upsell_context = self.course_context.get_upsell_information(user, schedule)
             if not upsell_context['show_upsell']:
                 continue
 
@@ -306,7 +315,7 @@ class UpgradeReminderResolver(BinnedSchedulesBaseResolver):
             course_id_str = str(schedule.enrollment.course_id)
             course_id_strs.append(course_id_str)
             course_links.append({
-                'url': _get_trackable_course_home_url(schedule.enrollment.course_id),
+                'url': self.course_context.get_course_url(schedule.enrollment.course_id),
                 'name': schedule.enrollment.course.display_name
             })
 
@@ -324,12 +333,12 @@ class UpgradeReminderResolver(BinnedSchedulesBaseResolver):
         return context
 
 
-def _get_upsell_information_for_schedule(user, schedule):
+def _get_upsell_information_for_schedule(user, schedule, course_descriptor=None):
     template_context = {}
     enrollment = schedule.enrollment
     course = enrollment.course
 
-    verified_upgrade_link = _get_verified_upgrade_link(user, schedule)
+    verified_upgrade_link = _get_verified_upgrade_link(user, schedule, course_descriptor)
     has_verified_upgrade_link = verified_upgrade_link is not None
 
     if has_verified_upgrade_link:
@@ -343,9 +352,11 @@ def _get_upsell_information_for_schedule(user, schedule):
     return template_context
 
 
-def _get_verified_upgrade_link(user, schedule):
+def _get_verified_upgrade_link(user, schedule, course_descriptor=None):
     enrollment = schedule.enrollment
-    if enrollment.dynamic_upgrade_deadline is not None and can_show_verified_upgrade(user, enrollment):
+    if enrollment.dynamic_upgrade_deadline is not None and can_show_verified_upgrade(
+        user, enrollment, course=course_descriptor
+    ):
         return verified_upgrade_deadline_link(user, enrollment.course)
 
 
@@ -386,7 +397,7 @@ class CourseUpdateResolver(BinnedSchedulesBaseResolver):
             user = enrollment.user
 
             try:
-                week_highlights = get_week_highlights(user, enrollment.course_id, week_num)
+                week_highlights = self.course_context.get_week_highlights(user, enrollment.course_id, week_num)
             except CourseUpdateDoesNotExist:
                 LOG.warning(
                     u'Weekly highlights for user {} in week {} of course {} does not exist or is disabled'.format(
@@ -405,7 +416,7 @@ class CourseUpdateResolver(BinnedSchedulesBaseResolver):
 
                 template_context.update({
                     'course_name': schedule.enrollment.course.display_name,
-                    'course_url': _get_trackable_course_home_url(enrollment.course_id),
+                    'course_url': self.course_context.get_course_url(enrollment.course_id),
 
                     'week_num': week_num,
                     'week_highlights': week_highlights,
@@ -414,7 +425,7 @@ class CourseUpdateResolver(BinnedSchedulesBaseResolver):
                     'course_ids': [str(enrollment.course_id)],
                     'unsubscribe_url': unsubscribe_url,
                 })
-                template_context.update(_get_upsell_information_for_schedule(user, schedule))
+                template_context.update(self.course_context.get_upsell_information(user, schedule))
 
                 yield (user, schedule.enrollment.course.closest_released_language, template_context, course.self_paced)
 
@@ -433,6 +444,9 @@ class CourseNextSectionUpdate(PrefixedDebugLoggerMixin, RecipientResolver):
     log_prefix = 'Next Section Course Update'
     experience_filter = Q(experience__experience_type=ScheduleExperience.EXPERIENCES.course_updates)
 
+    def __attrs_post_init__(self):
+        self.course_context = CourseContextCache()
+
     def send(self):
         schedules = self.get_schedules()
         for (user, language, context, is_self_paced) in schedules:
@@ -477,7 +491,9 @@ class CourseNextSectionUpdate(PrefixedDebugLoggerMixin, RecipientResolver):
             ))
 
             try:
-                week_highlights, week_num = get_next_section_highlights(user, course.id, start_date, target_date)
+                week_highlights, week_num = self.course_context.get_next_section_highlights(
+                    user, course.id, start_date, target_date
+                )
             except CourseUpdateDoesNotExist:
                 LOG.warning(
                     u'Weekly highlights for user {} of course {} does not exist or is disabled'.format(
@@ -496,18 +512,96 @@ class CourseNextSectionUpdate(PrefixedDebugLoggerMixin, RecipientResolver):
 
             template_context.update({
                 'course_name': course.display_name,
-                'course_url': _get_trackable_course_home_url(enrollment.course_id),
+                'course_url': self.course_context.get_course_url(enrollment.course_id),
                 'week_num': week_num,
                 'week_highlights': week_highlights,
                 # This is used by the bulk email optout policy
                 'course_ids': [str(enrollment.course_id)],
                 'unsubscribe_url': unsubscribe_url,
             })
-            template_context.update(_get_upsell_information_for_schedule(user, schedule))
+            template_context.update(self.course_context.get_upsell_information(user, schedule))
 
             yield (user, enrollment.course.closest_released_language, template_context, course.self_paced)
 
 
+class CourseContextCache(object):
+    """
+    Builds the parts of the template contexts of the messages of a resolver
+    that are the same for all of the learners of a course: the course home
+    url, the course that the upsell of each learner is checked against, and
+    the course highlights.
+
+    When the schedules.batch_template_context switch is on, each of them is
+    computed once per course for all of the schedules of the resolver, rather
+    than once per schedule.
+    """
+    def __init__(self, enabled=None):
+        self.enabled = BATCH_CONTEXT_WAFFLE_SWITCH.is_enabled() if enabled is None else enabled
+        self._course_urls = {}
+        self._course_descriptors = {}
+        self._highlights = {}
+
+    def get_course_url(self, course_id):
+        """
+        Returns the trackable home page URL of the course.
+        """
+        if not self.enabled:
+            return _get_trackable_course_home_url(course_id)
+        if course_id not in self._course_urls:
+            self._course_urls[course_id] = _get_trackable_course_home_url(course_id)
+        return self._course_urls[course_id]
+
+    def get_upsell_information(self, user, schedule):
+        """
+        Returns the upsell template context of the user for the schedule.
+        """
+        if not self.enabled:
+            return _get_upsell_information_for_schedule(user, schedule)
+        course_id = schedule.enrollment.course_id
+        if course_id not in self._course_descriptors:
+            self._course_descriptors[course_id] = modulestore().get_course(course_id, depth=0)
+        return _get_upsell_information_for_schedule(user, schedule, self._course_descriptors[course_id])
+
+    def get_week_highlights(self, user, course_id, week_num):
+        """
+        Returns the highlights of the user for a given week of the course.
+
+        Raises:
+            CourseUpdateDoesNotExist: if highlights do not exist for the week.
+        """
+        if not self.enabled:
+            return get_week_highlights(user, course_id, week_num)
+        return self._get_highlights(course_id).get_week_highlights(user, week_num)
+
+    def get_next_section_highlights(self, user, course_id, start_date, target_date):
+        """
+        Returns the highlights of the user for the section of the course
+        after the one due on the target date, and the week number of that
+        section.
+
+        Raises:
+            CourseUpdateDoesNotExist: if highlights do not exist for the date.
+        """
+        if not self.enabled:
+            return get_next_section_highlights(user, course_id, start_date, target_date)
+        return self._get_highlights(course_id).get_next_section_highlights(user, start_date, target_date)
+
+    def _get_highlights(self, course_id):
+        """
+        Returns the CourseHighlights of the course, or raises the
+        CourseUpdateDoesNotExist error that reading them raised.
+        """
+        if course_id not in self._highlights:
+            try:
+                self._highlights[course_id] = CourseHighlights(course_id)
+            except CourseUpdateDoesNotExist as error:
+                self._highlights[course_id] = error
+        highlights = self._highlights[course_id]
+        if isinstance(highlights, CourseUpdateDoesNotExist):
+            raise highlights
+        return highlights
+
+
 def _get_trackable_course_home_url(course_id):
     """
     Get the home page URL for the course.
@@ -6,7 +6,7 @@ import mock
 
 from openedx.core.djangoapps.schedules.config import COURSE_UPDATE_WAFFLE_FLAG
 from openedx.core.djangoapps.schedules.content_highlights import (
-    course_has_highlights, get_week_highlights, get_next_section_highlights,
+    CourseHighlights, course_has_highlights, get_week_highlights, get_next_section_highlights,
 )
 from openedx.core.djangoapps.schedules.exceptions import CourseUpdateDoesNotExist
 from openedx.core.djangoapps.waffle_utils.testutils import override_waffle_flag
@@ -136,6 +136,44 @@ class TestContentHighlights(ModuleStoreTestCase):
         with self.assertRaises(CourseUpdateDoesNotExist):
             get_week_highlights(self.user, self.course_key, week_num=1)
 
+    @override_waffle_flag(COURSE_UPDATE_WAFFLE_FLAG, True)
+    def test_course_highlights(self):
+        with self.store.bulk_operations(self.course_key):
+            self._create_chapter(highlights=[u'a', u'b', u'á'])
+            self._create_chapter(highlights=[])
+            self._create_chapter(highlights=[u'skipped a week'])
+
+        course_highlights = CourseHighlights(self.course_key)
+        other_user = UserFactory.create()
+        CourseEnrollment.enroll(other_user, self.course_key)
+        with mock.patch('openedx.core.djangoapps.schedules.content_highlights._get_course_module') as mock_module:
+            for user in (self.user, other_user):
+                self.assertEqual(course_highlights.get_week_highlights(user, week_num=1), [u'a', u'b', u'á'])
+                self.assertEqual(course_highlights.get_week_highlights(user, week_num=2), [u'skipped a week'])
+                with self.assertRaises(CourseUpdateDoesNotExist):
+                    course_highlights.get_week_highlights(user, week_num=3)
+        # The sections are the same for every learner, so the course isn't bound to each of them.
+        self.assertFalse(mock_module.called)
+
+    @override_waffle_flag(COURSE_UPDATE_WAFFLE_FLAG, True)
+    def test_course_highlights_staff_only(self):
+        with self.store.bulk_operations(self.course_key):
+            self._create_chapter(highlights=[u"I'm a secret!"], visible_to_staff_only=True)
+            self._create_chapter(highlights=[u'public'])
+
+        course_highlights = CourseHighlights(self.course_key)
+        self.assertEqual(course_highlights.get_week_highlights(self.user, week_num=1), [u'public'])
+        with self.assertRaises(CourseUpdateDoesNotExist):
+            course_highlights.get_week_highlights(self.user, week_num=2)
+
+    @override_waffle_flag(COURSE_UPDATE_WAFFLE_FLAG, False)
+    def test_course_highlights_flag_disabled(self):
+        with self.store.bulk_operations(self.course_key):
+            self._create_chapter(highlights=[u'highlights'])
+
+        with self.assertRaises(CourseUpdateDoesNotExist):
+            CourseHighlights(self.course_key)
+
     @override_waffle_flag(COURSE_UPDATE_WAFFLE_FLAG, True)
     @mock.patch('openedx.core.djangoapps.course_date_signals.utils.get_expected_duration')
     def test_get_next_section_highlights(self, mock_duration):
@@ -157,3 +195,18 @@ class TestContentHighlights(ModuleStoreTestCase):
         )
         with self.assertRaises(CourseUpdateDoesNotExist):
             get_next_section_highlights(self.user, self.course_key, yesterday, tomorrow.date())
+
+    @override_waffle_flag(COURSE_UPDATE_WAFFLE_FLAG, True)
+    @mock.patch('openedx.core.djangoapps.course_date_signals.utils.get_expected_duration')
+    def test_course_next_section_highlights(self, mock_duration):
+        mock_duration.return_value = datetime.timedelta(days=2)
+        yesterday = datetime.datetime.utcnow() - datetime.timedelta(days=1)
+        today = datetime.datetime.utcnow()
+        with self.store.bulk_operations(self.course_key):
+            self._create_chapter(highlights=[u'a', u'b', u'á'])
+            self._create_chapter(highlights=[u'skipped a week'])
+
+        self.assertEqual(
+            CourseHighlights(self.course_key).get_next_section_highlights(self.user, yesterday, today.date()),
+            get_next_section_highlights(self.user, self.course_key, yesterday, today.date()),
+        )
@@ -13,10 +13,12 @@ from django.test.utils import override_settings
 from mock import Mock, patch
 from waffle.testutils import override_switch
 
+from openedx.core.djangoapps.schedules import resolvers
 from openedx.core.djangoapps.schedules.config import COURSE_UPDATE_WAFFLE_FLAG
 from openedx.core.djangoapps.schedules.models import Schedule
 from openedx.core.djangoapps.schedules.resolvers import (
     BinnedSchedulesBaseResolver,
+    CourseContextCache,
     CourseUpdateResolver,
     CourseNextSectionUpdate,
 )
@@ -24,7 +26,7 @@ from openedx.core.djangoapps.schedules.tests.factories import ScheduleConfigFact
 from openedx.core.djangoapps.site_configuration.tests.factories import SiteConfigurationFactory, SiteFactory
 from openedx.core.djangoapps.waffle_utils.testutils import override_waffle_flag
 from openedx.core.djangolib.testing.utils import CacheIsolationMixin, skip_unless_lms
-from student.tests.factories import CourseEnrollmentFactory
+from student.tests.factories import CourseEnrollmentFactory, UserFactory
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 
@@ -98,6 +100,7 @@ class TestBinnedSchedulesBaseResolver(SchedulesResolverTestMixin, TestCase):
         self.assertEqual(result, mock_query.exclude.return_value)
 
 
+@ddt.ddt
 @skip_unless_lms
 @skipUnless('openedx.core.djangoapps.schedules.apps.SchedulesConfig' in settings.INSTALLED_APPS,
             "Can't test schedules if the app isn't installed")
@@ -127,11 +130,13 @@ class TestCourseUpdateResolver(SchedulesResolverTestMixin, ModuleStoreTestCase):
             bin_num=CourseUpdateResolver.bin_num_for_user_id(self.user.id),
         )
 
+    @ddt.data(False, True)
     @override_settings(CONTACT_MAILING_ADDRESS='123 Sesame Street')
     @override_waffle_flag(COURSE_UPDATE_WAFFLE_FLAG, True)
-    def test_schedule_context(self):
-        resolver = self.create_resolver()
-        schedules = list(resolver.schedules_for_bin())
+    def test_schedule_context(self, batch_context):
+        with override_switch('schedules.batch_template_context', batch_context):
+            resolver = self.create_resolver()
+            schedules = list(resolver.schedules_for_bin())
         expected_context = {
             'contact_email': 'info@example.com',
             'contact_mailing_address': '123 Sesame Street',
@@ -241,3 +246,79 @@ class TestCourseNextSectionUpdateResolver(SchedulesResolverTestMixin, ModuleStor
             mock_get_schedules.return_value = Schedule.objects.all()
             schedules = list(resolver.get_schedules())
         self.assertIn('optout', schedules[0][2]['unsubscribe_url'])
+
+
+@skip_unless_lms
+@skipUnless('openedx.core.djangoapps.schedules.apps.SchedulesConfig' in settings.INSTALLED_APPS,
+            "Can't test schedules if the app isn't installed")
+class TestCourseContextCache(SchedulesResolverTestMixin, ModuleStoreTestCase):
+    """
+    Tests that the contexts built once per course are those built for each schedule.
+    """
+    NUM_COURSES = 3
+    NUM_LEARNERS_PER_COURSE = 40
+
+    def setUp(self):
+        super(TestCourseContextCache, self).setUp()
+        self.courses = []
+        for __ in range(self.NUM_COURSES):
+            course = CourseFactory(highlights_enabled_for_messaging=True, self_paced=True)
+            with self.store.bulk_operations(course.id):
+                ItemFactory.create(parent=course, category='chapter', highlights=[u'good stuff'])
+                ItemFactory.create(parent=course, category='chapter', highlights=[u'more good stuff'])
+            self.courses.append(course)
+
+    def _enroll_learners(self):
+        """
+        Enrolls learners in each of the courses, and returns the start date of their schedules.
+        """
+        with patch('openedx.core.djangoapps.schedules.signals.get_current_site') as mock_get_current_site:
+            mock_get_current_site.return_value = self.site_config.site
+            for course in self.courses:
+                for __ in range(self.NUM_LEARNERS_PER_COURSE):
+                    enrollment = CourseEnrollmentFactory(course_id=course.id, user=UserFactory(), mode=u'audit')
+        return enrollment.schedule.start_date
+
+    def _get_contexts(self, target_datetime, enabled):
+        """
+        Returns the contexts of the course update messages of every bin, built
+        with one course context cache shared by the resolvers of the bins.
+        """
+        contexts = []
+        course_context = CourseContextCache(enabled=enabled)
+        for bin_num in range(CourseUpdateResolver.num_bins):
+            resolver = CourseUpdateResolver(
+                async_send_task=Mock(name='async_send_task'),
+                site=self.site_config.site,
+                target_datetime=target_datetime,
+                day_offset=-7,
+                bin_num=bin_num,
+            )
+            resolver.course_context = course_context
+            contexts.extend(
+                (user.id, dict(context))
+                for user, __, context, __ in resolver.schedules_for_bin()
+            )
+        return sorted(contexts, key=lambda user_context: (user_context[0], user_context[1]['course_ids']))
+
+    @override_waffle_flag(COURSE_UPDATE_WAFFLE_FLAG, True)
+    def test_contexts(self):
+        target_datetime = self._enroll_learners()
+        contexts = {}
+        highlights_reads = {}
+        course_url_reads = {}
+        for enabled in (False, True):
+            course_url = resolvers._get_trackable_course_home_url  # pylint: disable=protected-access
+            with patch.object(resolvers, 'CourseHighlights', wraps=resolvers.CourseHighlights) as mock_highlights, \
+                    patch.object(resolvers, 'get_week_highlights', wraps=resolvers.get_week_highlights) as mock_week, \
+                    patch.object(resolvers, '_get_trackable_course_home_url', wraps=course_url) as mock_course_url:
+                contexts[enabled] = self._get_contexts(target_datetime, enabled)
+            highlights_reads[enabled] = mock_highlights.call_count + mock_week.call_count
+            course_url_reads[enabled] = mock_course_url.call_count
+
+        num_schedules = self.NUM_COURSES * self.NUM_LEARNERS_PER_COURSE
+        self.assertEqual(len(contexts[True]), num_schedules)
+        self.assertEqual(contexts[True], contexts[False])
+        # The highlights and the course url are read once per course, rather than once per schedule.
+        self.assertEqual(highlights_reads, {False: num_schedules, True: self.NUM_COURSES})
+        self.assertEqual(course_url_reads, {False: num_schedules, True: self.NUM_COURSES})
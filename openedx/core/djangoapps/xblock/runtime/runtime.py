@@ -7,7 +7,6 @@ import logging
 import crum
 from completion import waffle as completion_waffle
 from completion.models import BlockCompletion
-from completion.services import CompletionService
 from django.contrib.auth import get_user_model
 from django.core.exceptions import PermissionDenied
 from django.utils.lru_cache import lru_cache
@@ -22,6 +21,7 @@ from xblock.runtime import KvsFieldData, MemoryIdManager, NullI18nService, Runti
 import track.contexts
 import track.views
 from lms.djangoapps.courseware.model_data import DjangoKeyValueStore, FieldDataCache
+from lms.djangoapps.courseware.services import BulkCompletionService
 from lms.djangoapps.grades.api import signals as grades_signals
 from openedx.core.djangoapps.xblock.apps import get_xblock_app_config
 from openedx.core.djangoapps.xblock.runtime.blockstore_field_data import BlockstoreChildrenData, BlockstoreFieldData
@@ -227,7 +227,7 @@ class XBlockRuntime(RuntimeShim, Runtime):
             return self.block_field_datas[block.scope_ids]
         elif service_name == "completion":
             context_key = block.scope_ids.usage_id.context_key
-            return CompletionService(user=self.user, context_key=context_key)
+            return BulkCompletionService(user=self.user, context_key=context_key)
         # Check if the XBlockRuntimeSystem wants to handle this:
         service = self.system.get_service(block, service_name)
         # Otherwise, fall back to the base implementation which loads services
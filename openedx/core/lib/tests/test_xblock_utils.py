@@ -9,19 +9,23 @@ import ddt
 import six
 from django.conf import settings
 from django.test.client import RequestFactory
-from mock import patch
+from edx_django_utils.cache import RequestCache
+from mock import Mock, patch
 from opaque_keys.edx.asides import AsideUsageKeyV1, AsideUsageKeyV2
 from web_fragments.fragment import Fragment
 from xblock.core import XBlockAside
 
 from openedx.core.lib.url_utils import quote_slashes
+from static_replace import CourseUrlRewriter
 from openedx.core.lib.xblock_builtin import get_css_dependencies, get_js_dependencies
 from openedx.core.lib.xblock_utils import (
+    REWRITTEN_CONTENT_CACHE_NAMESPACE,
     get_aside_from_xblock,
     is_xblock_aside,
     replace_course_urls,
     replace_jump_to_id_urls,
     replace_static_urls,
+    replace_urls,
     request_token,
     sanitize_html_id,
     wrap_fragment,
@@ -177,6 +181,74 @@ class TestXblockUtils(SharedModuleStoreTestCase):
         self.assertIsInstance(test_replace, Fragment)
         self.assertEqual(test_replace.content, anchor_tag)
 
+    @ddt.data('course_mongo', 'course_split')
+    def test_replace_urls(self, course_id):
+        """
+        Verify that replace_urls matches the separate static, course and jump-to URL wrappers.
+        """
+        course = getattr(self, course_id)
+        content = u'<a href="/static/id"><a href="/course/id"><a href="/jump_to_id/id"><img src=\'/static/img.png\'>'
+        expected = Fragment(content)
+        for wrapper in (
+            lambda frag: replace_static_urls(None, course, 'baseview', frag, None, course_id=course.id),
+            lambda frag: replace_course_urls(course.id, course, 'baseview', frag, None),
+            lambda frag: replace_jump_to_id_urls(course.id, '/base_url/', course, 'baseview', frag, None),
+        ):
+            expected = wrapper(expected)
+
+        test_replace = replace_urls(
+            url_rewriter=CourseUrlRewriter(course.id, jump_to_id_base_url='/base_url/'),
+            block=course,
+            view='baseview',
+            frag=self.create_fragment(content),
+            context=None
+        )
+        self.assertIsInstance(test_replace, Fragment)
+        self.assertEqual(test_replace.content, expected.content)
+        self.assertEqual(test_replace.resources[0].data, u'body {background-color:red;}')
+
+    @ddt.data('course_mongo', 'course_split')
+    def test_replace_urls_skips_rewritten_children(self, course_id):
+        """
+        Verify that replace_urls doesn't rescan the content of children that have already been rewritten.
+        """
+        course = getattr(self, course_id)
+        RequestCache.clear_all_namespaces()
+        chapter = ItemFactory.create(parent=course, category='chapter')
+        course = self.store.get_item(course.location)
+        url_rewriter = CourseUrlRewriter(course.id, jump_to_id_base_url='/base_url/')
+        child_content = replace_urls(
+            url_rewriter, chapter, 'student_view', Fragment(u'<a href="/course/child">' * 500), None
+        ).content
+
+        parent = Fragment(u'<div><a href="/course/parent">{}</div>'.format(child_content))
+        pattern = url_rewriter._pattern  # pylint: disable=protected-access
+        with patch.object(url_rewriter, '_pattern', Mock(wraps=pattern)) as mock_pattern:
+            test_replace = replace_urls(url_rewriter, course, 'student_view', parent, None)
+
+        self.assertEqual(
+            test_replace.content,
+            u'<div><a href="/courses/{}/parent">{}</div>'.format(course.id, child_content)
+        )
+        scanned = u''.join(call[0][1] for call in mock_pattern.sub.call_args_list)
+        self.assertEqual(scanned, u'<div><a href="/course/parent"></div>')
+        # Only the content of the parent is still kept for the request.
+        self.assertEqual(
+            list(RequestCache(REWRITTEN_CONTENT_CACHE_NAMESPACE).data),
+            [six.text_type(course.location)]
+        )
+
+    def test_url_rewriter_for_request(self):
+        """
+        Verify that a single url rewriter is created per course and request.
+        """
+        RequestCache.clear_all_namespaces()
+        url_rewriter = CourseUrlRewriter.for_request(self.course_mongo.id)
+        self.assertIs(CourseUrlRewriter.for_request(self.course_mongo.id), url_rewriter)
+        self.assertIsNot(CourseUrlRewriter.for_request(self.course_split.id), url_rewriter)
+        RequestCache.clear_all_namespaces()
+        self.assertIsNot(CourseUrlRewriter.for_request(self.course_mongo.id), url_rewriter)
+
     def test_sanitize_html_id(self):
         """
         Verify that colons and dashes are replaced.
@@ -19,6 +19,7 @@ from django.contrib.auth.models import User
 from django.contrib.staticfiles.storage import staticfiles_storage
 from django.urls import reverse
 from django.utils.html import escape
+from edx_django_utils.cache import RequestCache
 from lxml import etree, html
 from opaque_keys.edx.asides import AsideUsageKeyV1, AsideUsageKeyV2
 from pytz import UTC
@@ -37,6 +38,9 @@ from xmodule.x_module import PREVIEW_VIEWS, STUDIO_VIEW, XModule, XModuleDescrip
 
 log = logging.getLogger(__name__)
 
+# Request cache namespace holding the url-rewritten content of each rendered block.
+REWRITTEN_CONTENT_CACHE_NAMESPACE = 'xblock_utils.rewritten_content'
+
 
 def wrap_fragment(fragment, new_content):
     """
@@ -272,6 +276,31 @@ def replace_static_urls(data_dir, block, view, frag, context, course_id=None, st
     ))
 
 
+def replace_urls(url_rewriter, block, view, frag, context):  # pylint: disable=unused-argument
+    """
+    Substitutes the /static/, /course/ and /jump_to_id/ urls of the supplied
+    fragment in a single pass, using a :class:`static_replace.CourseUrlRewriter`.
+
+    This is equivalent to applying replace_static_urls, replace_course_urls and
+    replace_jump_to_id_urls in sequence, except that the content of child blocks,
+    which were rewritten when they were rendered, is not scanned again when it
+    is included in the content of their parent.  The content of the children is
+    dropped from the request cache once their parent is rewritten, so only the
+    content of the blocks whose parent hasn't been rendered yet is kept.
+    """
+    rewritten_content = RequestCache(REWRITTEN_CONTENT_CACHE_NAMESPACE).data
+    preserved = []
+    if getattr(block, 'has_children', False):
+        for child_id in getattr(block, 'children', None) or []:
+            child_content = rewritten_content.pop(text_type(child_id), None)
+            if child_content:
+                preserved.append(child_content)
+
+    content = url_rewriter.rewrite(frag.content, preserved)
+    rewritten_content[text_type(block.location)] = content
+    return wrap_fragment(frag, content)
+
+
 def grade_histogram(module_id):
     '''
     Print out a histogram of grades on a given problem in staff member debug info.
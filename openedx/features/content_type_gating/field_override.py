@@ -17,6 +17,8 @@ class ContentTypeGatingFieldOverride(FieldOverrideProvider):
     :class:`~courseware.field_overrides.FieldOverrideProvider` which forces
     graded content to only be accessible to the Full Access group
     """
+    overridden_fields = ('group_access',)
+
     def get(self, block, name, default):
         if name != 'group_access':
             return default
@@ -16,6 +16,7 @@ from lms.djangoapps.course_api.blocks.api import get_blocks
 from lms.djangoapps.course_blocks.api import get_course_blocks
 from lms.djangoapps.course_blocks.utils import get_student_module_as_dict
 from lms.djangoapps.courseware.access import has_access
+from lms.djangoapps.courseware.services import get_course_completions
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
 from openedx.core.lib.cache_utils import request_cached
 from openedx.features.course_experience import RELATIVE_DATES_FLAG
@@ -73,7 +74,7 @@ def get_course_outline_block_tree(request, course_id, user=None, allow_start_dat
         if last_completed_child_position:
             # Mutex w/ NOT 'course_block_completions'
             recurse_mark_complete(
-                course_block_completions=BlockCompletion.get_learning_context_completions(user, course_key),
+                course_block_completions=get_course_completions(user, course_key),
                 latest_completion=last_completed_child_position,
                 block=block
             )
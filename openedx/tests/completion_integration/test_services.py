@@ -7,9 +7,11 @@ import ddt
 from completion.models import BlockCompletion
 from completion.services import CompletionService
 from completion.test_utils import CompletionWaffleTestMixin
+from edx_django_utils.cache import RequestCache
 from opaque_keys.edx.keys import CourseKey
 from six.moves import range
 
+from lms.djangoapps.courseware.services import BulkCompletionService
 from openedx.core.djangolib.testing.utils import skip_unless_lms
 from student.tests.factories import UserFactory
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
@@ -165,3 +167,55 @@ class CompletionServiceTestCase(CompletionWaffleTestMixin, SharedModuleStoreTest
         self.assertEqual(self.completion_service.can_mark_block_complete_on_view(self.vertical), False)
         self.assertEqual(self.completion_service.can_mark_block_complete_on_view(self.html), True)
         self.assertEqual(self.completion_service.can_mark_block_complete_on_view(self.problem), False)
+
+
+@skip_unless_lms
+class BulkCompletionServiceTestCase(CompletionServiceTestCase):
+    """
+    Test that the BulkCompletionService returns the same data as the CompletionService.
+    """
+    def setUp(self):
+        super(BulkCompletionServiceTestCase, self).setUp()
+        RequestCache.clear_all_namespaces()
+        self.addCleanup(RequestCache.clear_all_namespaces)
+        self.completion_service = BulkCompletionService(self.user, self.course_key)
+
+    def test_vertical_completion(self):
+        self.assertEqual(
+            self.completion_service.vertical_is_complete(self.vertical),
+            False,
+        )
+
+        for block_key in self.block_keys:
+            BlockCompletion.objects.submit_completion(
+                user=self.user,
+                block_key=block_key,
+                completion=1.0
+            )
+
+        # The completions are read once per request.
+        RequestCache.clear_all_namespaces()
+        self.assertEqual(
+            self.completion_service.vertical_is_complete(self.vertical),
+            True,
+        )
+
+    def test_verticals_are_complete(self):
+        self.completion_service.completion_tracking_enabled()
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                self.completion_service.verticals_are_complete([self.vertical]),
+                {self.vertical.location: False},
+            )
+            self.assertEqual(self.completion_service.vertical_is_complete(self.vertical), False)
+
+    def test_verticals_are_complete_tracking_disabled(self):
+        self.override_waffle_switch(False)
+        self.assertEqual(
+            self.completion_service.verticals_are_complete([self.vertical]),
+            {self.vertical.location: None},
+        )
+
+    def test_verticals_are_complete_not_vertical(self):
+        with self.assertRaises(ValueError):
+            self.completion_service.verticals_are_complete([self.vertical, self.sequence])